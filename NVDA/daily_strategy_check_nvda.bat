@@ -50,7 +50,7 @@ echo ========================================
 echo [步骤 4/4] 记录策略执行日志...
 echo ========================================
 echo.
-k:/QT/.venv/Scripts/python.exe -m src.pipeline.log_strategy_execution_nvda
+k:/QT/.venv/Scripts/python.exe -m src.pipeline.log_strategy_execution NVDA
 echo.
 
 echo ========================================
@@ -10,15 +10,9 @@ call .venv\Scripts\activate.bat
 
 echo.
 echo ============================================================
-echo 📈 第一步: 生成周度分析报告
+echo 📈 并行生成周度/月度报告、策略对比和评分报告
 echo ============================================================
-python src\analysis\strategy_analyzer.py
-
-echo.
-echo ============================================================
-echo 📊 第二步: 生成策略对比和评分报告
-echo ============================================================
-python src\analysis\strategy_scorer.py
+python -m src.pipeline.run_reports %*
 
 echo.
 echo ============================================================
@@ -9,8 +9,8 @@ echo [INFO] 激活Python虚拟环境...
 call .venv\Scripts\activate.bat
 
 echo.
-echo [INFO] 生成周度分析报告...
-python src\analysis\strategy_analyzer.py
+echo [INFO] 生成周度和月度分析报告...
+python -m src.pipeline.run_reports --reports-only %*
 
 echo.
 echo ============================================================
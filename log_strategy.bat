@@ -16,7 +16,7 @@ if exist venv\Scripts\activate.bat (
 
 REM 执行日志记录脚本
 echo 正在记录策略执行情况...
-python src\pipeline\log_strategy_execution.py
+python src\pipeline\log_strategy_execution.py TSLA
 
 echo.
 echo ============================================================
@@ -1,6 +1,11 @@
 """
 手动发送三支股票的日度策略邮件
+
+用法:
+    python send_all_strategy_emails.py            # 每支股票一封, 共用 SMTP 连接
+    python send_all_strategy_emails.py --digest   # 合并为一封汇总邮件
 """
+import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -12,7 +17,7 @@ sys.path.insert(0, str(project_root))
 from src.notification.email_service import EmailService
 
 
-def send_stock_summary(symbol: str, base_path: Path):
+def send_stock_summary(symbol: str, base_path: Path, service: EmailService = None):
     """发送指定股票的策略总结邮件"""
     print(f"\n{'='*60}")
     print(f"📧 发送 {symbol} 日度策略邮件")
@@ -54,7 +59,7 @@ def send_stock_summary(symbol: str, base_path: Path):
         total_return = 0
     
     # 发送邮件
-    service = EmailService()
+    service = service or EmailService()
     
     # 构建邮件主题和内容
     subject = f"[{symbol}策略] 📊 日度策略回测完成"
@@ -206,6 +211,10 @@ def send_stock_summary(symbol: str, base_path: Path):
 
 def main():
     """主函数 - 发送所有股票的邮件"""
+    parser = argparse.ArgumentParser(description="批量发送日度策略邮件")
+    parser.add_argument("--digest", action="store_true", help="合并为一封汇总邮件")
+    args = parser.parse_args()
+    
     print("="*60)
     print("📧 批量发送日度策略邮件")
     print("="*60)
@@ -218,9 +227,12 @@ def main():
     
     results = {}
     
-    for symbol, base_path in stocks:
-        success = send_stock_summary(symbol, base_path)
-        results[symbol] = success
+    # 一批发送: 每个账户只握手一次
+    service = EmailService()
+    with service.batch(digest=args.digest, title="📊 日度策略回测汇总"):
+        for symbol, base_path in stocks:
+            success = send_stock_summary(symbol, base_path, service)
+            results[symbol] = success
     
     print(f"\n{'='*60}")
     print("📊 发送结果汇总")
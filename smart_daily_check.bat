@@ -9,7 +9,7 @@ echo [INFO] 激活Python虚拟环境...
 call .venv\Scripts\activate.bat
 
 echo.
-echo [INFO] 运行三个股票的每日策略并自动记录结果...
+echo [INFO] 运行全部已配置股票的每日策略并自动记录结果...
 python src\pipeline\smart_daily_check.py
 
 echo.
@@ -0,0 +1,235 @@
+"""
+结构化策略执行日志
+
+STRATEGY_EXECUTION_LOG.md 是给人看的; 同一条日志同时以一行 JSON 追加到旁边的
+STRATEGY_EXECUTION_LOG.jsonl, 供程序读取:
+1. 每条记录一次 O_APPEND 写入, 不读取、不重写已有内容
+2. 记录按执行时间顺序追加, 读取最近 N 天时从文件末尾向前读, 遇到更早的记录即停止,
+   耗时只与读取的天数有关, 与日志总长度无关
+3. 结构化日志不存在时(首次追加或首次读取), 先把 Markdown 日志中已有的历史条目
+   导入一次; 之后 .jsonl 文件本身就表示已导入
+
+记录字段与 weekly_strategy_review 使用的条目字段一致:
+    date, time, symbol, strategy_type, data_date, close, price_change_pct, volume,
+    avg_volume_5d, signal_date, signal_action, signal_price, signal_reason,
+    signal_count_7d, price_gap, price_gap_pct
+"""
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+def parse_log_entries(content, days=7):
+    """解析 Markdown 日志条目(days 为 None 时返回全部)"""
+    entries = []
+    
+    # 匹配日志条目
+    pattern = r'### (\d{4}-\d{2}-\d{2}) \(周.*?\)\n(.*?)(?=\n### \d{4}-\d{2}-\d{2}|\n## 📝 记录模板|$)'
+    matches = re.findall(pattern, content, re.DOTALL)
+    
+    cutoff = datetime.now() - timedelta(days=days) if days is not None else None
+    
+    for date_str, entry_content in matches:
+        entry_date = datetime.strptime(date_str, '%Y-%m-%d')
+        
+        if cutoff is None or entry_date >= cutoff:
+            # 解析关键信息
+            entry = {
+                'date': date_str,
+                'datetime': entry_date,
+                'content': entry_content
+            }
+            
+            # 提取市场数据
+            close_match = re.search(r'TSLA最新收盘:\s*\$?([\d.]+)', entry_content)
+            if close_match:
+                entry['close'] = float(close_match.group(1))
+            
+            # 提取信号信息
+            signal_date_match = re.search(r'最新信号日期:\s*(\d{4}-\d{2}-\d{2}|无历史信号)', entry_content)
+            if signal_date_match:
+                entry['signal_date'] = signal_date_match.group(1)
+            
+            signal_action_match = re.search(r'信号类型:\s*(N/A|\w+)', entry_content)
+            if signal_action_match:
+                entry['signal_action'] = signal_action_match.group(1)
+            
+            signal_price_match = re.search(r'信号价格:\s*\$?([\d.]+)', entry_content)
+            if signal_price_match:
+                entry['signal_price'] = float(signal_price_match.group(1))
+            
+            # 提取近7天信号数
+            signal_count_match = re.search(r'近7天信号数:\s*(\d+)', entry_content)
+            if signal_count_match:
+                entry['signal_count_7d'] = int(signal_count_match.group(1))
+            
+            # 提取价差
+            price_gap_match = re.search(r'价差:\s*\$?([\d.-]+)\s*\(([\d.+-]+)%\)', entry_content)
+            if price_gap_match:
+                entry['price_gap'] = float(price_gap_match.group(1))
+                entry['price_gap_pct'] = float(price_gap_match.group(2))
+            
+            entries.append(entry)
+    
+    # 按日期排序
+    entries.sort(key=lambda x: x['datetime'])
+    
+    return entries
+
+
+def make_log_record(
+    symbol: str,
+    strategy_type: str,
+    latest_signal: Optional[Dict],
+    latest_price: Optional[Dict],
+    recent_signal_count: int,
+    now: Optional[datetime] = None
+) -> Dict:
+    """
+    由日志脚本读取到的数据生成一条结构化记录
+
+    Args:
+        symbol: 股票代码
+        strategy_type: 策略类型说明
+        latest_signal: read_latest_signal() 的结果
+        latest_price: read_latest_price() 的结果
+        recent_signal_count: 近7天信号数
+        now: 执行时间, 默认当前时间
+    """
+    now = now or datetime.now()
+    record = {
+        "date": now.strftime('%Y-%m-%d'),
+        "time": now.strftime('%H:%M'),
+        "symbol": symbol,
+        "strategy_type": strategy_type,
+        "signal_count_7d": int(recent_signal_count),
+    }
+    if latest_price:
+        record.update({
+            "data_date": str(latest_price['date']),
+            "close": latest_price['close'],
+            "price_change_pct": latest_price['price_change'],
+            "volume": latest_price['volume'],
+            "avg_volume_5d": latest_price['avg_volume_5d'],
+        })
+    if latest_signal:
+        record.update({
+            "signal_date": latest_signal['date'],
+            "signal_action": latest_signal['action'],
+            "signal_price": latest_signal['price'],
+            "signal_reason": latest_signal['reason'],
+        })
+    else:
+        # 与 Markdown 日志及 parse_log_entries 的取值一致
+        record["signal_date"] = "无历史信号"
+        record["signal_action"] = "N/A"
+    if latest_price and latest_signal:
+        price_diff = latest_price['close'] - latest_signal['price']
+        record["price_gap"] = price_diff
+        record["price_gap_pct"] = price_diff / latest_signal['price'] * 100
+    return record
+
+
+class ExecutionJournal:
+    """
+    按时间顺序追加的 JSON Lines 执行日志
+
+    Args:
+        path: .jsonl 文件路径
+        block_size: 从文件末尾向前读取时每次读取的字节数
+        markdown_log: 对应的 Markdown 日志, 结构化日志建立时从中导入历史条目
+    """
+
+    def __init__(self, path: Path, block_size: int = 64 * 1024, markdown_log: Optional[Path] = None):
+        self.path = Path(path)
+        self.block_size = block_size
+        self.markdown_log = Path(markdown_log) if markdown_log is not None else None
+
+    @classmethod
+    def beside(cls, markdown_log: Path) -> 'ExecutionJournal':
+        """与 Markdown 日志同名的 .jsonl 日志"""
+        return cls(Path(markdown_log).with_suffix('.jsonl'), markdown_log=markdown_log)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _write(self, records: List[Dict]):
+        """把多条记录一次 O_APPEND 写入(不存在时创建文件)"""
+        data = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def import_markdown(self, pending: Optional[Dict] = None) -> int:
+        """
+        结构化日志尚不存在时, 导入 Markdown 日志中的全部历史条目
+
+        日度脚本先写 Markdown 再追加结构化记录, 因此 pending(即将追加的记录)
+        与 Markdown 最后一条同一天时, 那一条是本次运行刚写入的, 不重复导入。
+
+        Returns:
+            int: 导入的条目数(已导入过或没有 Markdown 日志时为 0)
+        """
+        if self.exists() or self.markdown_log is None or not self.markdown_log.exists():
+            return 0
+        with open(self.markdown_log, 'r', encoding='utf-8') as f:
+            history = parse_log_entries(f.read(), days=None)
+        if pending and history and history[-1]['date'] == pending.get('date'):
+            history.pop()
+        self._write([
+            {key: value for key, value in entry.items() if key not in ('datetime', 'content')}
+            for entry in history
+        ])
+        return len(history)
+
+    def append(self, record: Dict):
+        """追加一条记录(单次 O_APPEND 写入), 首次追加前导入 Markdown 历史"""
+        self.import_markdown(pending=record)
+        self._write([record])
+
+    def extend(self, records: List[Dict]):
+        """按顺序追加多条记录"""
+        for record in records:
+            self.append(record)
+
+    def _reversed_lines(self) -> Iterator[bytes]:
+        """从文件末尾开始逐行向前读取"""
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            tail = b""
+            while position > 0:
+                step = min(self.block_size, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + tail).split(b"\n")
+                tail = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if tail.strip():
+                yield tail
+
+    def last_days(self, days: int = 7, now: Optional[datetime] = None) -> List[Dict]:
+        """
+        最近 N 天的记录, 按时间顺序返回
+
+        与 Markdown 解析的口径一致: 执行日期(零点) >= 当前时间 - N 天。
+        """
+        if not self.exists():
+            return []
+        cutoff = (now or datetime.now()) - timedelta(days=days)
+        records = []
+        for line in self._reversed_lines():
+            record = json.loads(line)
+            if datetime.strptime(record['date'], '%Y-%m-%d') < cutoff:
+                break
+            records.append(record)
+        records.reverse()
+        return records
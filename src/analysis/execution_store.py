@@ -0,0 +1,211 @@
+"""
+策略执行记录存储
+
+每次策略执行追加一行到 SQLite 表中:
+1. 追加即一次 INSERT 事务, 不再读取并重写整个 JSON 文件, 多个进程同时写入也不会丢记录
+2. 按 (日期, 策略类型) 建立索引, 周度/月度分析只读取所需日期范围
+3. 首次打开(读取或追加)时自动导入旧的 strategy_execution_records.json(旧文件保留不动)
+
+用法:
+    store = ExecutionRecordStore(data_dir / "strategy_execution_records.db", "TSLA")
+    store.append({"strategy_type": "daily", "signals_count": 12, ...})
+    records = store.query("2025-11-10", "2025-11-16", strategy_type="daily")
+"""
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from src.utils.sqlite_wal import enable_wal
+
+
+# 记录字段(timestamp 之外)及其 SQLite 类型
+COLUMNS = {
+    "strategy_type": "TEXT NOT NULL",
+    "signals_count": "INTEGER",
+    "new_signals_count": "INTEGER",
+    "latest_signal_date": "TEXT",
+    "latest_signal_action": "TEXT",
+    "latest_signal_price": "REAL",
+    "latest_price": "REAL",
+    "price_change": "REAL",
+    "notes": "TEXT",
+}
+
+DateLike = Union[str, date, datetime, None]
+
+
+def _day(value: DateLike) -> Optional[str]:
+    """日期 -> 'YYYY-MM-DD'"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value[:10]
+    return value.strftime('%Y-%m-%d')
+
+
+class ExecutionRecordStore:
+    """
+    只追加的执行记录表
+
+    Args:
+        path: SQLite 数据库文件
+        symbol: 股票代码
+        legacy_json: 旧版 JSON 记录文件, 数据库首次创建时导入
+    """
+
+    def __init__(self, path: Path, symbol: str, legacy_json: Optional[Path] = None):
+        self.path = Path(path)
+        self.symbol = symbol
+        self.legacy_json = Path(legacy_json) if legacy_json is not None else None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库, 本实例首次连接时切换 WAL、建表(幂等)并导入旧记录"""
+        if self._ready:
+            return sqlite3.connect(self.path, timeout=30)
+        with self._lock:
+            if not self._ready:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            if not self._ready:
+                try:
+                    # WAL: 读取不阻塞追加; 须在建表事务之前切换
+                    enable_wal(conn)
+                    self._create(conn)
+                except Exception:
+                    conn.close()
+                    raise
+                self._ready = True
+            return conn
+
+    def _readable(self) -> bool:
+        """读取前检查: 数据库不存在但有旧 JSON 记录时, 由 _connect() 建库并导入"""
+        if self.path.exists():
+            return True
+        return self.legacy_json is not None and self.legacy_json.exists()
+
+    def _create(self, conn: sqlite3.Connection):
+        columns = ", ".join(f"{name} {kind}" for name, kind in COLUMNS.items())
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS executions ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "symbol TEXT NOT NULL, timestamp TEXT NOT NULL, day TEXT NOT NULL, "
+                f"{columns})"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_day_type ON executions (day, strategy_type)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_type_day ON executions (strategy_type, day)")
+            # 另一个进程可能已同时建表并导入过
+            empty = conn.execute("SELECT COUNT(*) FROM executions").fetchone()[0] == 0
+            if empty and self.legacy_json is not None and self.legacy_json.exists():
+                with open(self.legacy_json, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f).get("executions", [])
+                for record in legacy:
+                    self._insert(conn, record)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _insert(self, conn: sqlite3.Connection, record: Dict):
+        timestamp = record.get("timestamp") or datetime.now().isoformat()
+        names = ["symbol", "timestamp", "day", *COLUMNS]
+        values = [self.symbol, timestamp, _day(timestamp), *(record.get(name) for name in COLUMNS)]
+        conn.execute(
+            f"INSERT INTO executions ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            values
+        )
+
+    def append(self, record: Dict) -> Dict:
+        """
+        追加一条记录(单个事务, 原子写入)
+
+        Args:
+            record: 含 strategy_type 等字段的字典, 缺少 timestamp 时使用当前时间
+
+        Returns:
+            实际写入的记录
+        """
+        record = dict(record)
+        record.setdefault("timestamp", datetime.now().isoformat())
+        with closing(self._connect()) as conn, conn:
+            self._insert(conn, record)
+        return record
+
+    @staticmethod
+    def _where(start: DateLike, end: DateLike, strategy_type: Optional[str]):
+        """范围条件, 走 (day, strategy_type) 索引"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("day >= ?")
+            params.append(_day(start))
+        if end is not None:
+            clauses.append("day <= ?")
+            params.append(_day(end))
+        if strategy_type is not None:
+            clauses.append("strategy_type = ?")
+            params.append(strategy_type)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        start: DateLike = None,
+        end: DateLike = None,
+        strategy_type: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        按日期范围(含两端)和策略类型查询, 按时间顺序返回
+
+        Args:
+            start: 开始日期, None 表示不限
+            end: 结束日期, None 表示不限
+            strategy_type: 策略类型 (daily/weekly), None 表示全部
+        """
+        if not self._readable():
+            return []
+        where, params = self._where(start, end, strategy_type)
+        names = ["timestamp", *COLUMNS]
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(names)} FROM executions{where} ORDER BY timestamp, id",
+                params
+            ).fetchall()
+        return [dict(zip(names, row)) for row in rows]
+
+    def query_frame(self, start: DateLike = None, end: DateLike = None,
+                    strategy_type: Optional[str] = None) -> pd.DataFrame:
+        """query 的 DataFrame 版本"""
+        records = self.query(start, end, strategy_type)
+        df = pd.DataFrame(records, columns=["timestamp", *COLUMNS])
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return df
+
+    def summarize(self, start: DateLike = None, end: DateLike = None,
+                  strategy_type: Optional[str] = None) -> Dict:
+        """日期范围内的执行次数、新信号数和最近一次执行时间(在数据库内聚合)"""
+        empty = {"runs": 0, "new_signals": 0, "last_run": None}
+        if not self._readable():
+            return empty
+        where, params = self._where(start, end, strategy_type)
+        with closing(self._connect()) as conn:
+            runs, new_signals, last_run = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(new_signals_count), 0), MAX(timestamp) "
+                f"FROM executions{where}",
+                params
+            ).fetchone()
+        return {"runs": runs, "new_signals": new_signals, "last_run": last_run}
+
+    def __len__(self) -> int:
+        if not self._readable():
+            return 0
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
@@ -8,6 +8,7 @@
 4. 策略考核和改进建议
 """
 import pandas as pd
+import numpy as np
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -17,6 +18,98 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from analysis.execution_store import ExecutionRecordStore
+from backtest.metrics import SIDE_BUY, SIDE_SELL, match_fifo
+
+
+SIGNAL_COLUMNS = ['date', 'action', 'quantity', 'reason', 'price']
+TRADE_COLUMNS = ['entry_date', 'exit_date', 'quantity', 'entry_price', 'exit_price', 'profit']
+
+
+def parse_signals(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    规范化信号表: 日期转为时间, 动作统一为 BUY/SELL (兼容 "TradeAction.BUY"), 按日期排序
+    """
+    if df.empty:
+        return pd.DataFrame({
+            column: pd.Series(dtype='datetime64[ns]' if column == 'date' else object)
+            for column in SIGNAL_COLUMNS
+        })
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df['action'] = df['action'].astype(str).str.replace('TradeAction.', '', regex=False)
+    return df.sort_values('date', kind='stable')
+
+
+def round_trips_from_fills(fills: pd.DataFrame) -> pd.DataFrame:
+    """
+    成交记录 (date, action, quantity, price, commission) -> 逐笔平仓记录
+    
+    每笔卖出按 FIFO 配对先前的买入, entry_date 为最早被配对的买入日期,
+    profit 与 match_fifo 的已实现盈亏一致(含双边佣金)。
+    """
+    if fills.empty:
+        return pd.DataFrame(columns=TRADE_COLUMNS)
+    
+    dates = pd.to_datetime(fills['date']).to_numpy()
+    actions = fills['action'].astype(str).str.replace('TradeAction.', '', regex=False).to_numpy()
+    quantities = fills['quantity'].to_numpy(dtype=np.float64)
+    prices = fills['price'].to_numpy(dtype=np.float64)
+    commissions = (fills['commission'].to_numpy(dtype=np.float64)
+                   if 'commission' in fills else np.zeros(len(fills)))
+    sides = np.where(actions == "BUY", SIDE_BUY, SIDE_SELL)
+    profits = match_fifo(sides, quantities, prices, commissions)
+    
+    rows = []
+    lots = []  # [[剩余数量, 日期, 价格], ...]
+    for i in range(len(fills)):
+        qty = quantities[i]
+        if qty <= 0:
+            continue
+        if sides[i] == SIDE_BUY:
+            lots.append([qty, dates[i], prices[i]])
+            continue
+        if not lots:
+            continue
+        entry_date = lots[0][1]
+        remaining, matched, cost = qty, 0.0, 0.0
+        while remaining > 0 and lots:
+            take = min(lots[0][0], remaining)
+            cost += take * lots[0][2]
+            lots[0][0] -= take
+            remaining -= take
+            matched += take
+            if lots[0][0] <= 0:
+                lots.pop(0)
+        rows.append({
+            'entry_date': entry_date,
+            'exit_date': dates[i],
+            'quantity': matched,
+            'entry_price': cost / matched,
+            'exit_price': prices[i],
+            'profit': profits[len(rows)],
+        })
+    return pd.DataFrame(rows, columns=TRADE_COLUMNS)
+
+
+def parse_trades(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    规范化交易表: 已是逐笔平仓格式 (entry_date, exit_date, profit) 时直接使用,
+    否则视为成交记录并按 FIFO 配对; 按入场日期排序
+    """
+    if df.empty:
+        return pd.DataFrame({
+            column: pd.Series(dtype='datetime64[ns]' if column.endswith('_date') else np.float64)
+            for column in TRADE_COLUMNS
+        })
+    if 'entry_date' not in df.columns:
+        df = round_trips_from_fills(df)
+    else:
+        df = df.copy()
+    df['entry_date'] = pd.to_datetime(df['entry_date'])
+    df['exit_date'] = pd.to_datetime(df['exit_date'])
+    return df.sort_values('entry_date', kind='stable')
+
 
 class StrategyAnalyzer:
     """策略分析器"""
@@ -42,25 +135,16 @@ class StrategyAnalyzer:
         self.daily_results_dir = self.data_dir / "backtest_results" / "daily"
         self.weekly_results_dir = self.data_dir / "backtest_results" / "weekly"
         
-        # 执行记录文件
+        # 执行记录: 只追加的 SQLite 表, 首次使用时导入旧的 JSON 记录
         self.execution_log_file = self.data_dir / "strategy_execution_records.json"
-        
-        # 确保记录文件存在
-        if not self.execution_log_file.exists():
-            self._init_execution_log()
-    
-    def _init_execution_log(self):
-        """初始化执行记录文件"""
-        # 确保目录存在
-        self.execution_log_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        initial_data = {
-            "symbol": self.symbol,
-            "created_at": datetime.now().isoformat(),
-            "executions": []
-        }
-        with open(self.execution_log_file, 'w', encoding='utf-8') as f:
-            json.dump(initial_data, f, indent=2, ensure_ascii=False)
+        self.execution_store = ExecutionRecordStore(
+            self.data_dir / "strategy_execution_records.db",
+            symbol,
+            legacy_json=self.execution_log_file
+        )
+        
+        # 已排序的信号/交易数据缓存: {(文件路径): (修改时间, DataFrame)}
+        self._frames = {}
     
     def record_execution(
         self,
@@ -88,13 +172,7 @@ class StrategyAnalyzer:
             price_change: 价格变动
             notes: 备注
         """
-        # 读取现有记录
-        with open(self.execution_log_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 添加新记录
-        execution = {
-            "timestamp": datetime.now().isoformat(),
+        self.execution_store.append({
             "strategy_type": strategy_type,
             "signals_count": signals_count,
             "new_signals_count": new_signals_count,
@@ -104,15 +182,32 @@ class StrategyAnalyzer:
             "latest_price": latest_price,
             "price_change": price_change,
             "notes": notes
-        }
+        })
         
-        data["executions"].append(execution)
+        print(f"✅ 执行记录已保存: {self.symbol} {strategy_type}")
+    
+    def results_file(self, kind: str, strategy_type: str = "daily") -> Path:
+        """
+        回测结果文件路径
         
-        # 保存
-        with open(self.execution_log_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        Args:
+            kind: signals / trades / equity_curve
+            strategy_type: 策略类型 (daily/weekly)
+        """
+        results_dir = self.daily_results_dir if strategy_type == "daily" else self.weekly_results_dir
+        return results_dir / f"{kind}_{strategy_type}.csv"
+    
+    def report_file(self, kind: str, period: str) -> Path:
+        """
+        周度/月度报告文件路径
         
-        print(f"✅ 执行记录已保存: {self.symbol} {strategy_type}")
+        Args:
+            kind: weekly / monthly
+            period: analyze_week / analyze_month 结果中的 period
+        """
+        if kind == "weekly":
+            return self.data_dir / f"weekly_report_{period.replace(' ', '_').replace('~', 'to')}.md"
+        return self.data_dir / f"monthly_report_{period.replace('年', '_').replace('月', '')}.md"
     
     def load_signals(self, strategy_type: str = "daily") -> pd.DataFrame:
         """
@@ -124,17 +219,10 @@ class StrategyAnalyzer:
         Returns:
             信号DataFrame
         """
-        if strategy_type == "daily":
-            signal_file = self.daily_results_dir / "signals_daily.csv"
-        else:
-            signal_file = self.weekly_results_dir / "signals_weekly.csv"
-        
+        signal_file = self.results_file("signals", strategy_type)
         if not signal_file.exists():
-            return pd.DataFrame()
-        
-        df = pd.read_csv(signal_file)
-        df['date'] = pd.to_datetime(df['date'])
-        return df.sort_values('date')
+            return parse_signals(pd.DataFrame())
+        return parse_signals(pd.read_csv(signal_file))
     
     def load_trades(self, strategy_type: str = "daily") -> pd.DataFrame:
         """
@@ -146,18 +234,50 @@ class StrategyAnalyzer:
         Returns:
             交易DataFrame
         """
-        if strategy_type == "daily":
-            trade_file = self.daily_results_dir / "trades_daily.csv"
-        else:
-            trade_file = self.weekly_results_dir / "trades_weekly.csv"
-        
+        trade_file = self.results_file("trades", strategy_type)
         if not trade_file.exists():
-            return pd.DataFrame()
+            return parse_trades(pd.DataFrame())
+        return parse_trades(pd.read_csv(trade_file))
+    
+    def _sorted_frame(self, kind: str, strategy_type: str) -> pd.DataFrame:
+        """
+        按日期排序的信号/交易数据, 文件未修改时复用上次读取的结果
         
-        df = pd.read_csv(trade_file)
-        df['entry_date'] = pd.to_datetime(df['entry_date'])
-        df['exit_date'] = pd.to_datetime(df['exit_date'])
-        return df.sort_values('entry_date')
+        Args:
+            kind: "signals" 或 "trades"
+            strategy_type: 策略类型 (daily/weekly)
+        """
+        path = self.results_file(kind, strategy_type)
+        mtime = path.stat().st_mtime_ns if path.exists() else None
+        cached = self._frames.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        df = self.load_signals(strategy_type) if kind == "signals" else self.load_trades(strategy_type)
+        df = df.reset_index(drop=True)
+        self._frames[path] = (mtime, df)
+        return df
+    
+    def _date_range(self, kind: str, strategy_type: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """
+        日期范围查询(含两端): 在已排序的日期列上二分定位, 不逐行筛选
+        
+        信号按 date, 交易按 entry_date 筛选。
+        """
+        df = self._sorted_frame(kind, strategy_type)
+        if df.empty:
+            return df
+        dates = df['date' if kind == "signals" else 'entry_date'].to_numpy()
+        lo = dates.searchsorted(pd.Timestamp(start_date).to_datetime64(), side='left')
+        hi = dates.searchsorted(pd.Timestamp(end_date).to_datetime64(), side='right')
+        return df.iloc[lo:hi]
+    
+    def _period_executions(self, start_date: datetime, end_date: datetime) -> Dict:
+        """日期范围内的执行记录汇总"""
+        return {
+            strategy_type: self.execution_store.summarize(start_date, end_date, strategy_type)
+            for strategy_type in ("daily", "weekly")
+        }
     
     def analyze_week(self, start_date: str = None) -> Dict:
         """
@@ -178,38 +298,18 @@ class StrategyAnalyzer:
         
         end_date = start_date + timedelta(days=6)
         
-        # 加载数据
-        daily_signals = self.load_signals("daily")
-        weekly_signals = self.load_signals("weekly")
-        daily_trades = self.load_trades("daily")
-        weekly_trades = self.load_trades("weekly")
-        
-        # 筛选本周数据
-        week_daily_signals = daily_signals[
-            (daily_signals['date'] >= start_date) & 
-            (daily_signals['date'] <= end_date)
-        ]
-        
-        week_weekly_signals = weekly_signals[
-            (weekly_signals['date'] >= start_date) & 
-            (weekly_signals['date'] <= end_date)
-        ]
-        
-        week_daily_trades = daily_trades[
-            (daily_trades['entry_date'] >= start_date) & 
-            (daily_trades['entry_date'] <= end_date)
-        ]
-        
-        week_weekly_trades = weekly_trades[
-            (weekly_trades['entry_date'] >= start_date) & 
-            (weekly_trades['entry_date'] <= end_date)
-        ]
+        # 按日期范围读取本周数据
+        week_daily_signals = self._date_range("signals", "daily", start_date, end_date)
+        week_weekly_signals = self._date_range("signals", "weekly", start_date, end_date)
+        week_daily_trades = self._date_range("trades", "daily", start_date, end_date)
+        week_weekly_trades = self._date_range("trades", "weekly", start_date, end_date)
         
         # 分析结果
         analysis = {
             "symbol": self.symbol,
             "period": f"{start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}",
             "week_number": start_date.isocalendar()[1],
+            "executions": self._period_executions(start_date, end_date),
             
             "daily_strategy": {
                 "signals_count": len(week_daily_signals),
@@ -259,38 +359,18 @@ class StrategyAnalyzer:
         else:
             end_date = datetime(year, month + 1, 1) - timedelta(days=1)
         
-        # 加载数据
-        daily_signals = self.load_signals("daily")
-        weekly_signals = self.load_signals("weekly")
-        daily_trades = self.load_trades("daily")
-        weekly_trades = self.load_trades("weekly")
-        
-        # 筛选本月数据
-        month_daily_signals = daily_signals[
-            (daily_signals['date'] >= start_date) & 
-            (daily_signals['date'] <= end_date)
-        ]
-        
-        month_weekly_signals = weekly_signals[
-            (weekly_signals['date'] >= start_date) & 
-            (weekly_signals['date'] <= end_date)
-        ]
-        
-        month_daily_trades = daily_trades[
-            (daily_trades['entry_date'] >= start_date) & 
-            (daily_trades['entry_date'] <= end_date)
-        ]
-        
-        month_weekly_trades = weekly_trades[
-            (weekly_trades['entry_date'] >= start_date) & 
-            (weekly_trades['entry_date'] <= end_date)
-        ]
+        # 按日期范围读取本月数据
+        month_daily_signals = self._date_range("signals", "daily", start_date, end_date)
+        month_weekly_signals = self._date_range("signals", "weekly", start_date, end_date)
+        month_daily_trades = self._date_range("trades", "daily", start_date, end_date)
+        month_weekly_trades = self._date_range("trades", "weekly", start_date, end_date)
         
         # 分析结果
         analysis = {
             "symbol": self.symbol,
             "period": f"{year}年{month}月",
             "date_range": f"{start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}",
+            "executions": self._period_executions(start_date, end_date),
             
             "daily_strategy": {
                 "signals_count": len(month_daily_signals),
@@ -423,7 +503,7 @@ class StrategyAnalyzer:
         
         # 保存到文件
         if save_to_file:
-            report_file = self.data_dir / f"weekly_report_{analysis['period'].replace(' ', '_').replace('~', 'to')}.md"
+            report_file = self.report_file("weekly", analysis['period'])
             with open(report_file, 'w', encoding='utf-8') as f:
                 f.write(report)
             print(f"✅ 周度报告已保存: {report_file}")
@@ -602,7 +682,7 @@ class StrategyAnalyzer:
         
         # 保存到文件
         if save_to_file:
-            report_file = self.data_dir / f"monthly_report_{analysis['period'].replace('年', '_').replace('月', '')}.md"
+            report_file = self.report_file("monthly", analysis['period'])
             with open(report_file, 'w', encoding='utf-8') as f:
                 f.write(report)
             print(f"✅ 月度报告已保存: {report_file}")
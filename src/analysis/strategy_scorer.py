@@ -32,10 +32,16 @@ class StrategyScorer:
         "risk_reward": 0.10      # 风险收益比权重 10%
     }
     
-    def __init__(self):
-        self.symbols = ["TSLA", "NVDA", "INTC"]
+    def __init__(self, symbols: List[str] = None, data_dirs: Dict[str, Path] = None):
+        """
+        Args:
+            symbols: 股票代码, 默认 TSLA/NVDA/INTC
+            data_dirs: {股票代码: 数据目录}, 未指定的使用 StrategyAnalyzer 默认目录
+        """
+        self.symbols = list(symbols or ["TSLA", "NVDA", "INTC"])
+        data_dirs = data_dirs or {}
         self.analyzers = {
-            symbol: StrategyAnalyzer(symbol) for symbol in self.symbols
+            symbol: StrategyAnalyzer(symbol, data_dirs.get(symbol)) for symbol in self.symbols
         }
     
     def score_strategy(
@@ -63,8 +69,27 @@ class StrategyScorer:
         else:
             analysis = analyzer.analyze_month()
         
-        strategy_data = analysis[f"{strategy_type}_strategy"]
+        return self.score_analysis(symbol, strategy_type, period, analysis[f"{strategy_type}_strategy"])
+    
+    def score_analysis(
+        self,
+        symbol: str,
+        strategy_type: str,
+        period: str,
+        strategy_data: Dict
+    ) -> Dict:
+        """
+        按已有的分析结果打分(不读取数据)
         
+        Args:
+            symbol: 股票代码
+            strategy_type: 策略类型 (daily/weekly)
+            period: 评估周期 (week/month)
+            strategy_data: analyze_week/analyze_month 结果中的 "<strategy_type>_strategy"
+        
+        Returns:
+            评分结果字典
+        """
         # 计算各项得分 (0-100分)
         scores = {}
         
@@ -201,52 +226,63 @@ class StrategyScorer:
         else:
             return "D 不及格"
     
-    def compare_all_strategies(self, period: str = "month") -> pd.DataFrame:
+    def compare_all_strategies(self, period: str = "month", score_results: List[Dict] = None) -> pd.DataFrame:
         """
         对比所有策略
         
         Args:
             period: 评估周期 (week/month)
+            score_results: 已算好的评分结果(如报告编排器并行计算的结果), 默认逐个计算
         
         Returns:
             对比结果DataFrame
         """
-        results = []
+        if score_results is None:
+            score_results = [
+                self.score_strategy(symbol, strategy_type, period)
+                for symbol in self.symbols
+                for strategy_type in ["daily", "weekly"]
+            ]
         
-        for symbol in self.symbols:
-            for strategy_type in ["daily", "weekly"]:
-                score_result = self.score_strategy(symbol, strategy_type, period)
-                results.append({
-                    "股票": symbol,
-                    "策略": strategy_type,
-                    "总分": score_result['total_score'],
-                    "等级": score_result['grade'],
-                    "胜率": f"{score_result['win_rate']:.1f}%",
-                    "盈亏": f"${score_result['total_profit']:.2f}",
-                    "交易次数": score_result['trades_count'],
-                    "胜率分": score_result['scores']['win_rate'],
-                    "盈利分": score_result['scores']['profit'],
-                    "稳定分": score_result['scores']['consistency'],
-                    "频率分": score_result['scores']['frequency'],
-                    "风险收益分": score_result['scores']['risk_reward']
-                })
+        results = []
+        for score_result in score_results:
+            results.append({
+                "股票": score_result['symbol'],
+                "策略": score_result['strategy_type'],
+                "总分": score_result['total_score'],
+                "等级": score_result['grade'],
+                "胜率": f"{score_result['win_rate']:.1f}%",
+                "盈亏": f"${score_result['total_profit']:.2f}",
+                "交易次数": score_result['trades_count'],
+                "胜率分": score_result['scores']['win_rate'],
+                "盈利分": score_result['scores']['profit'],
+                "稳定分": score_result['scores']['consistency'],
+                "频率分": score_result['scores']['frequency'],
+                "风险收益分": score_result['scores']['risk_reward']
+            })
         
         df = pd.DataFrame(results)
         df = df.sort_values('总分', ascending=False)
         return df
     
-    def generate_comparison_report(self, period: str = "month", save_to_file: bool = True) -> str:
+    def generate_comparison_report(
+        self,
+        period: str = "month",
+        save_to_file: bool = True,
+        score_results: List[Dict] = None
+    ) -> str:
         """
         生成策略对比报告
         
         Args:
             period: 评估周期
             save_to_file: 是否保存到文件
+            score_results: 已算好的评分结果, 见 compare_all_strategies
         
         Returns:
             报告内容 (Markdown格式)
         """
-        df = self.compare_all_strategies(period)
+        df = self.compare_all_strategies(period, score_results)
         
         period_name = "周度" if period == "week" else "月度"
         
@@ -0,0 +1,223 @@
+"""
+成交记录持仓账本
+
+trades_daily.csv 按时间顺序记录回测成交(date, action, symbol, quantity, price, commission, total)。
+原先每次获取持仓都用 iterrows() 从头遍历整个文件, 并按比例摊薄成本。这里:
+1. 把成交回放成按股票分组的持仓批次(lot)表, 支持先进先出(fifo)和平均成本(average)
+2. 批次表和已处理到的字节位置(高水位)保存在成交文件旁的 <文件名>.ledger.json 中
+3. 之后只解析高水位之后新追加的成交; 文件被重写(前缀校验和不一致)时从头回放
+
+快照没有写进 CSV 本身: 成交文件还会被 pandas 和报告脚本直接读取, 需要保持原格式。
+
+用法:
+    ledger = TradeLedger(project_root / "NVDA" / "backtest_results" / "daily" / "trades_daily.csv")
+    ledger.refresh()
+    info = ledger.position(current_price=180.0)          # 文件内全部股票合计
+    all_positions = ledger.positions({'TSLA': 420.0})    # 按股票
+"""
+import csv
+import io
+import json
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SNAPSHOT_VERSION = 1
+METHODS = ("fifo", "average")
+
+
+class TradeLedger:
+    """
+    按股票记录持仓批次的成交账本
+
+    Args:
+        trades_path: 成交记录 CSV
+        method: 成本计算方法, "fifo" 或 "average"
+        snapshot_path: 快照文件, 默认 <trades_path>.ledger.json
+    """
+
+    def __init__(self, trades_path: Path, method: str = "fifo", snapshot_path: Optional[Path] = None):
+        if method not in METHODS:
+            raise ValueError(f"不支持的成本计算方法: {method}, 可选 {METHODS}")
+        self.trades_path = Path(trades_path)
+        self.method = method
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else \
+            self.trades_path.with_name(self.trades_path.name + ".ledger.json")
+        self._reset()
+        self._load_snapshot()
+
+    def _reset(self):
+        self.offset = 0             # 已处理的字节数(高水位)
+        self.crc = 0                # 已处理部分的校验和
+        self.mtime_ns = 0
+        self.rows = 0
+        self.columns: Optional[List[str]] = None
+        self.lots: Dict[str, List[List]] = {}        # symbol -> [[数量, 单位成本, 日期], ...]
+        self.realized: Dict[str, float] = {}
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('method') != self.method:
+            return
+        self.offset = snapshot['offset']
+        self.crc = snapshot['crc']
+        self.mtime_ns = snapshot['mtime_ns']
+        self.rows = snapshot['rows']
+        self.columns = snapshot['columns']
+        self.lots = snapshot['lots']
+        self.realized = snapshot['realized']
+
+    def _save_snapshot(self):
+        tmp_path = self.snapshot_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': SNAPSHOT_VERSION,
+                'method': self.method,
+                'offset': self.offset,
+                'crc': self.crc,
+                'mtime_ns': self.mtime_ns,
+                'rows': self.rows,
+                'columns': self.columns,
+                'lots': self.lots,
+                'realized': self.realized,
+            }, f, ensure_ascii=False)
+        tmp_path.replace(self.snapshot_path)
+
+    def refresh(self) -> int:
+        """
+        应用高水位之后的新成交
+
+        Returns:
+            int: 本次应用的成交笔数
+        """
+        if not self.trades_path.exists():
+            if self.rows:
+                self._reset()
+            return 0
+
+        stat = self.trades_path.stat()
+        if stat.st_size == self.offset and stat.st_mtime_ns == self.mtime_ns:
+            return 0
+
+        data = self.trades_path.read_bytes()
+        if self.offset > len(data) or zlib.crc32(data[:self.offset]) != self.crc:
+            self._reset()   # 文件被重写, 从头回放
+
+        # 只处理完整的行, 末尾未写完的行留到下次
+        end = data.rfind(b"\n") + 1
+        if end <= self.offset:
+            return 0
+        new = data[self.offset:end]
+        reader = csv.reader(io.StringIO(new.decode('utf-8-sig' if self.offset == 0 else 'utf-8')))
+        if self.columns is None:
+            self.columns = next(reader, None)
+        applied = 0
+        for values in reader:
+            if values:
+                self.apply(dict(zip(self.columns, values)))
+                applied += 1
+
+        self.rows += applied
+        self.crc = zlib.crc32(new, self.crc)
+        self.offset = end
+        self.mtime_ns = stat.st_mtime_ns
+        self._save_snapshot()
+        return applied
+
+    def apply(self, trade: Dict):
+        """按成本计算方法应用一笔成交"""
+        symbol = trade.get('symbol') or ''
+        quantity = float(trade['quantity'])
+        price = float(trade['price'])
+        commission = float(trade.get('commission') or 0)
+        lots = self.lots.setdefault(symbol, [])
+
+        if trade['action'] == 'BUY':
+            unit_cost = (quantity * price + commission) / quantity if quantity else price
+            if self.method == "average" and lots:
+                held, cost, date = lots[0]
+                total = held + quantity
+                lots[0] = [total, (held * cost + quantity * unit_cost) / total, date]
+            else:
+                lots.append([quantity, unit_cost, trade.get('date', '')])
+        elif trade['action'] == 'SELL':
+            remaining = quantity
+            cost = 0.0
+            while remaining > 0 and lots:
+                lot = lots[0]
+                used = min(remaining, lot[0])
+                cost += used * lot[1]
+                lot[0] -= used
+                remaining -= used
+                if lot[0] <= 0:
+                    lots.pop(0)
+            sold = quantity - remaining     # 超出持仓的卖出不计入
+            if sold > 0:
+                proceeds = sold * price - commission * sold / quantity
+                self.realized[symbol] = self.realized.get(symbol, 0.0) + proceeds - cost
+
+    def holding(self, symbol: Optional[str] = None):
+        """(持仓数量, 持仓成本), symbol 为 None 时合计文件内全部股票"""
+        symbols = self.lots if symbol is None else [symbol]
+        quantity = cost = 0.0
+        for name in symbols:
+            for held, unit_cost, _ in self.lots.get(name, []):
+                quantity += held
+                cost += held * unit_cost
+        return quantity, cost
+
+    def position(self, symbol: Optional[str] = None, current_price: float = 0) -> dict:
+        """
+        持仓信息, 结构与 get_current_position() 相同
+
+        Args:
+            symbol: 股票代码, None 表示合计文件内全部股票
+            current_price: 当前价格
+        """
+        quantity, cost = self.holding(symbol)
+        if quantity > 0:
+            market_value = quantity * current_price
+            profit_loss = market_value - cost
+            return {
+                'symbol': symbol,
+                'quantity': int(quantity),
+                'avg_price': cost / quantity,
+                'current_price': current_price,
+                'market_value': market_value,
+                'profit_loss': profit_loss,
+                'profit_loss_pct': profit_loss / cost * 100 if cost > 0 else 0
+            }
+        return {
+            'symbol': symbol,
+            'quantity': 0,
+            'avg_price': 0,
+            'current_price': current_price,
+            'market_value': 0,
+            'profit_loss': 0,
+            'profit_loss_pct': 0
+        }
+
+    def positions(self, prices: Optional[Dict[str, float]] = None) -> Dict[str, dict]:
+        """全部股票的持仓信息(只含仍有持仓的股票)"""
+        prices = prices or {}
+        return {
+            symbol: self.position(symbol, prices.get(symbol, 0))
+            for symbol, lots in self.lots.items() if lots
+        }
+
+
+def current_position(trades_path: Path, symbol: str, current_price: float, method: str = "fifo") -> dict:
+    """
+    由成交文件得到合计持仓, 供各日度检查脚本的 get_current_position() 使用
+
+    成交文件按股票分目录保存, 这里合计文件内全部成交, 返回的 symbol 字段用传入的代码。
+    """
+    ledger = TradeLedger(trades_path, method)
+    ledger.refresh()
+    info = ledger.position(current_price=current_price)
+    info['symbol'] = symbol
+    return info
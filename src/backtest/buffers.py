@@ -0,0 +1,125 @@
+"""
+回测账户的紧凑存储
+
+- EquityBuffer: 按交易日历预分配的净值/现金/持仓市值数组
+- FillLog: 结构化成交日志(NumPy 结构化数组)
+
+两者都可以 reset() 后复用, 参数优化时反复回测不会持续分配小对象。
+"""
+from typing import List, Optional
+
+import numpy as np
+
+
+FILL_DTYPE = np.dtype([
+    ('date', 'datetime64[ns]'),
+    ('side', 'i1'),          # 1 = BUY, -1 = SELL
+    ('symbol_id', 'i4'),     # FillLog.symbols 中的下标
+    ('quantity', 'f8'),
+    ('price', 'f8'),
+    ('commission', 'f8'),
+])
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    """扩容数组并保留已有数据"""
+    grown = np.empty(capacity, dtype=array.dtype)
+    grown[:array.size] = array
+    return grown
+
+
+class EquityBuffer:
+    """预分配的每日净值缓冲区"""
+
+    __slots__ = ('dates', 'equity', 'cash', 'exposure', 'size')
+
+    def __init__(self, capacity: int = 0):
+        self.dates = np.empty(capacity, dtype='datetime64[ns]')
+        self.equity = np.empty(capacity, dtype=np.float64)
+        self.cash = np.empty(capacity, dtype=np.float64)
+        self.exposure = np.empty(capacity, dtype=np.float64)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return self.equity.size
+
+    def reserve(self, capacity: int):
+        """确保至少能容纳 capacity 个交易日"""
+        if capacity <= self.capacity:
+            return
+        self.dates = _grow(self.dates, capacity)
+        self.equity = _grow(self.equity, capacity)
+        self.cash = _grow(self.cash, capacity)
+        self.exposure = _grow(self.exposure, capacity)
+
+    def append(self, date, equity: float, cash: float, exposure: float):
+        """写入一个交易日(容量不足时按倍数扩容)"""
+        i = self.size
+        if i >= self.capacity:
+            self.reserve(max(2 * self.capacity, 64))
+        self.dates[i] = date
+        self.equity[i] = equity
+        self.cash[i] = cash
+        self.exposure[i] = exposure
+        self.size = i + 1
+
+    def reset(self):
+        """清空数据, 保留已分配的内存"""
+        self.size = 0
+
+
+class FillLog:
+    """结构化成交日志"""
+
+    __slots__ = ('records', 'size', 'symbols', '_symbol_ids')
+
+    def __init__(self, capacity: int = 16):
+        self.records = np.empty(capacity, dtype=FILL_DTYPE)
+        self.size = 0
+        self.symbols: List[str] = []
+        self._symbol_ids: dict = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def symbol_id(self, symbol: str) -> int:
+        """股票代码 -> 整数编号"""
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return sid
+
+    def append(
+        self,
+        date,
+        side: int,
+        symbol: str,
+        quantity: float,
+        price: float,
+        commission: float
+    ):
+        """追加一笔成交"""
+        i = self.size
+        if i >= self.records.size:
+            self.records = _grow(self.records, max(2 * self.records.size, 16))
+        self.records[i] = (date, side, self.symbol_id(symbol), quantity, price, commission)
+        self.size = i + 1
+
+    def view(self, symbol: Optional[str] = None) -> np.ndarray:
+        """已记录成交的视图(可按股票代码过滤)"""
+        records = self.records[:self.size]
+        if symbol is None:
+            return records
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            return records[:0]
+        return records[records['symbol_id'] == sid]
+
+    def reset(self):
+        """清空数据, 保留已分配的内存"""
+        self.size = 0
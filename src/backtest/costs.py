@@ -0,0 +1,176 @@
+"""
+交易成本模型
+
+回测账户、策略内的模拟持仓和模拟券商共用同一个成本模型:
+1. 佣金: 按成交额比例 + 每股费用, 可设最低/最高佣金
+2. 价差: 成交价向不利方向偏移半个买卖价差
+3. 市场冲击: coefficient × (最高价 - 最低价) / 收盘价 × sqrt(成交量占K线成交量比例)
+
+回测账户只做多(卖出超过持仓会被拒绝), 因此不计借券费。
+
+每个计算都有标量版本(逐笔成交)和数组版本(整批成交一次算完), 优化器可以用
+cost_sensitivity() 在不重跑回测的情况下评估成本放大/缩小后的影响。
+
+默认模型 DEFAULT_COST_MODEL 只收 0.1% 佣金, 与原先各处硬编码的 1.001 / 0.999 一致。
+"""
+from dataclasses import dataclass, field, replace
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+@dataclass(frozen=True)
+class CommissionSchedule:
+    """佣金规则"""
+    rate: float = 0.001             # 按成交额比例
+    per_share: float = 0.0          # 每股费用
+    minimum: float = 0.0            # 每笔最低佣金
+    max_rate: Optional[float] = None  # 每笔最高佣金占成交额比例
+
+    def commissions(self, notional: ArrayLike, quantity: ArrayLike) -> np.ndarray:
+        """按成交额和股数计算佣金(数组)"""
+        notional = np.abs(np.asarray(notional, dtype=np.float64))
+        quantity = np.abs(np.asarray(quantity, dtype=np.float64))
+        fee = notional * self.rate
+        if self.per_share:
+            fee = fee + quantity * self.per_share
+        if self.minimum:
+            fee = np.where(quantity > 0, np.maximum(fee, self.minimum), 0.0)
+        if self.max_rate is not None:
+            fee = np.minimum(fee, notional * self.max_rate)
+        return fee
+
+    def commission(self, notional: float, quantity: float) -> float:
+        """单笔佣金"""
+        return float(self.commissions(notional, quantity))
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """
+    交易成本模型
+
+    Args:
+        commission: 佣金规则
+        spread_bps: 买卖价差(基点), 成交价偏移其一半
+        impact_coefficient: 市场冲击系数, 0 表示不计冲击
+    """
+    commission: CommissionSchedule = field(default_factory=CommissionSchedule)
+    spread_bps: float = 0.0
+    impact_coefficient: float = 0.0
+
+    @classmethod
+    def flat(cls, rate: float = 0.001) -> "CostModel":
+        """只按成交额比例收佣金的模型"""
+        return cls(commission=CommissionSchedule(rate=rate))
+
+    def scaled(self, factor: float) -> "CostModel":
+        """所有成本按 factor 缩放后的模型"""
+        schedule = self.commission
+        return replace(
+            self,
+            commission=replace(schedule, rate=schedule.rate * factor, per_share=schedule.per_share * factor,
+                               minimum=schedule.minimum * factor),
+            spread_bps=self.spread_bps * factor,
+            impact_coefficient=self.impact_coefficient * factor,
+        )
+
+    # ------------------------------------------------------------ 数组版本
+    def slippage_rates(
+        self,
+        quantities: ArrayLike,
+        volumes: Optional[ArrayLike] = None,
+        ranges: Optional[ArrayLike] = None,
+        prices: Optional[ArrayLike] = None
+    ) -> np.ndarray:
+        """
+        每笔成交价相对参考价的不利偏移比例(价差 + 冲击)
+
+        Args:
+            quantities: 成交股数
+            volumes: 所在K线成交量, None 时不计冲击
+            ranges: 所在K线最高价 - 最低价
+            prices: 参考价(收盘价), 与 ranges 一起给出
+        """
+        quantities = np.abs(np.asarray(quantities, dtype=np.float64))
+        rates = np.full(quantities.shape, self.spread_bps / 20_000)
+        if self.impact_coefficient and volumes is not None and ranges is not None and prices is not None:
+            volumes = np.asarray(volumes, dtype=np.float64)
+            participation = np.divide(quantities, volumes, out=np.ones_like(quantities), where=volumes > 0)
+            volatility = np.asarray(ranges, dtype=np.float64) / np.asarray(prices, dtype=np.float64)
+            rates = rates + self.impact_coefficient * volatility * np.sqrt(np.minimum(participation, 1.0))
+        return rates
+
+    def fill_prices(
+        self,
+        sides: ArrayLike,
+        prices: ArrayLike,
+        quantities: ArrayLike,
+        volumes: Optional[ArrayLike] = None,
+        ranges: Optional[ArrayLike] = None
+    ) -> np.ndarray:
+        """成交价: 买入(side > 0)上浮, 卖出下浮"""
+        prices = np.asarray(prices, dtype=np.float64)
+        rates = self.slippage_rates(quantities, volumes, ranges, prices)
+        return prices * (1 + np.sign(np.asarray(sides, dtype=np.float64)) * rates)
+
+    def trade_costs(
+        self,
+        sides: ArrayLike,
+        prices: ArrayLike,
+        quantities: ArrayLike,
+        volumes: Optional[ArrayLike] = None,
+        ranges: Optional[ArrayLike] = None
+    ) -> np.ndarray:
+        """每笔成交的总成本(滑点 + 佣金), 以参考价计"""
+        prices = np.asarray(prices, dtype=np.float64)
+        quantities = np.abs(np.asarray(quantities, dtype=np.float64))
+        fills = self.fill_prices(sides, prices, quantities, volumes, ranges)
+        slippage = np.abs(fills - prices) * quantities
+        return slippage + self.commission.commissions(fills * quantities, quantities)
+
+    # ------------------------------------------------------------ 标量版本
+    def fill_price(self, side: int, price: float, quantity: float,
+                   volume: Optional[float] = None, bar_range: Optional[float] = None) -> float:
+        """单笔成交价, side: 1 买入 / -1 卖出"""
+        if not self.spread_bps and not self.impact_coefficient:
+            return price
+        return float(self.fill_prices(side, price, quantity, volume, bar_range))
+
+    def buy_cash(self, quantity: float, price: float) -> float:
+        """买入 quantity 股需支付的现金(含佣金)"""
+        notional = quantity * price
+        return notional + self.commission.commission(notional, quantity)
+
+    def sell_cash(self, quantity: float, price: float) -> float:
+        """卖出 quantity 股收到的现金(扣佣金)"""
+        notional = quantity * price
+        return notional - self.commission.commission(notional, quantity)
+
+
+DEFAULT_COST_MODEL = CostModel.flat(0.001)
+
+
+def cost_sensitivity(
+    model: CostModel,
+    sides: ArrayLike,
+    prices: ArrayLike,
+    quantities: ArrayLike,
+    factors: Sequence[float],
+    volumes: Optional[ArrayLike] = None,
+    ranges: Optional[ArrayLike] = None
+) -> np.ndarray:
+    """
+    成本按各 factor 缩放后整批成交的总成本
+
+    成交数组只准备一次, 每个 factor 一次数组运算, 不需要重跑回测。
+
+    Returns:
+        np.ndarray: 与 factors 等长的总成本
+    """
+    return np.array([
+        model.scaled(factor).trade_costs(sides, prices, quantities, volumes, ranges).sum()
+        for factor in factors
+    ])
@@ -10,6 +10,12 @@ from enum import Enum
 import pandas as pd
 import numpy as np
 
+from src.backtest.buffers import EquityBuffer, FillLog
+from src.backtest.costs import CostModel
+from src.backtest.metrics import (
+    PerformanceStats, compute_performance, SIDE_BUY, SIDE_SELL
+)
+
 
 class TradeAction(Enum):
     """交易动作"""
@@ -18,7 +24,7 @@ class TradeAction(Enum):
     HOLD = "HOLD"
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """单笔交易记录"""
     date: datetime
@@ -39,7 +45,7 @@ class Trade:
         return "BUY" if self.action == TradeAction.BUY else "SELL"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """持仓信息"""
     symbol: str
@@ -68,26 +74,118 @@ class Position:
 
 @dataclass
 class BacktestAccount:
-    """回测账户"""
+    """
+    回测账户
+    
+    每日净值/现金/持仓市值写入预分配的 NumPy 缓冲区(EquityBuffer),
+    成交同时写入结构化成交日志(FillLog), 供指标内核直接读取。
+    """
     initial_cash: float
     cash: float = field(default=0.0)
     positions: Dict[str, Position] = field(default_factory=dict)
     trades: List[Trade] = field(default_factory=list)
-    equity_curve: List[tuple[datetime, float]] = field(default_factory=list)
     commission_rate: float = 0.001  # 0.1% 佣金率
+    cost_model: Optional[CostModel] = None  # 设置后按成本模型计算成交价和佣金, 否则按 commission_rate
+    equity_buffer: EquityBuffer = field(default_factory=EquityBuffer, repr=False)
+    fills: FillLog = field(default_factory=FillLog, repr=False)
     
     def __post_init__(self):
         if self.cash == 0.0:
             self.cash = self.initial_cash
     
+    @property
+    def equity_curve(self) -> List[tuple[datetime, float]]:
+        """资产净值曲线 [(日期, 净值), ...]"""
+        buffer = self.equity_buffer
+        dates = pd.DatetimeIndex(buffer.dates[:buffer.size])
+        return list(zip(dates, buffer.equity[:buffer.size].tolist()))
+    
+    @property
+    def exposure_curve(self) -> np.ndarray:
+        """每日持仓市值"""
+        return self.equity_buffer.exposure[:self.equity_buffer.size]
+    
+    def reserve(self, num_days: int):
+        """按交易日历长度预分配净值缓冲区"""
+        self.equity_buffer.reserve(num_days)
+    
+    def to_state(self) -> Dict:
+        """导出账户状态(可 JSON 序列化, 用于断点续跑)"""
+        buffer = self.equity_buffer
+        n = buffer.size
+        return {
+            "initial_cash": self.initial_cash,
+            "cash": self.cash,
+            "commission_rate": self.commission_rate,
+            "positions": [
+                [pos.symbol, pos.quantity, pos.avg_cost] for pos in self.positions.values()
+            ],
+            "trades": [
+                [pd.Timestamp(t.date).isoformat(), t.action.value, t.symbol,
+                 t.quantity, t.price, t.commission]
+                for t in self.trades
+            ],
+            "dates": buffer.dates[:n].astype('int64').tolist(),
+            "equity": buffer.equity[:n].tolist(),
+            "cash_curve": buffer.cash[:n].tolist(),
+            "exposure": buffer.exposure[:n].tolist(),
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> "BacktestAccount":
+        """由 to_state() 的结果恢复账户"""
+        account = cls(
+            initial_cash=state["initial_cash"],
+            commission_rate=state["commission_rate"]
+        )
+        account.cash = state["cash"]
+        for symbol, quantity, avg_cost in state["positions"]:
+            account.positions[symbol] = Position(symbol, quantity, avg_cost)
+        for date, action, symbol, quantity, price, commission in state["trades"]:
+            trade = Trade(pd.Timestamp(date), TradeAction(action), symbol, quantity, price, commission)
+            account.trades.append(trade)
+            account.fills.append(
+                trade.date,
+                SIDE_BUY if trade.action == TradeAction.BUY else SIDE_SELL,
+                symbol, quantity, price, commission
+            )
+        n = len(state["equity"])
+        buffer = account.equity_buffer
+        buffer.reserve(n)
+        buffer.dates[:n] = np.asarray(state["dates"], dtype='int64').view('datetime64[ns]')
+        buffer.equity[:n] = state["equity"]
+        buffer.cash[:n] = state["cash_curve"]
+        buffer.exposure[:n] = state["exposure"]
+        buffer.size = n
+        return account
+    
+    def reset(self):
+        """恢复初始状态, 复用已分配的缓冲区"""
+        self.cash = self.initial_cash
+        self.positions.clear()
+        self.trades.clear()
+        self.equity_buffer.reset()
+        self.fills.reset()
+    
     def get_position(self, symbol: str) -> Optional[Position]:
         """获取持仓"""
         return self.positions.get(symbol)
     
-    def execute_trade(self, trade: Trade, current_price: float):
-        """执行交易"""
-        # 计算佣金
-        trade.commission = trade.total_cost * self.commission_rate
+    def execute_trade(self, trade: Trade, current_price: float,
+                      volume: Optional[float] = None, bar_range: Optional[float] = None):
+        """
+        执行交易
+
+        Args:
+            volume / bar_range: 当日成交量和振幅(最高价-最低价), 成本模型计算市场冲击时使用
+        """
+        # 计算成交价和佣金
+        if self.cost_model is not None:
+            side = 1 if trade.action == TradeAction.BUY else -1
+            trade.price = self.cost_model.fill_price(side, trade.price, trade.quantity, volume, bar_range)
+            trade.commission = self.cost_model.commission.commission(trade.quantity * trade.price, trade.quantity)
+        else:
+            trade.commission = trade.total_cost * self.commission_rate
         
         if trade.action == TradeAction.BUY:
             # 检查现金是否足够
@@ -122,19 +220,41 @@ class BacktestAccount:
         
         # 记录交易
         self.trades.append(trade)
+        self.fills.append(
+            trade.date,
+            SIDE_BUY if trade.action == TradeAction.BUY else SIDE_SELL,
+            trade.symbol,
+            trade.quantity,
+            trade.price,
+            trade.commission
+        )
         return True
     
+    def get_positions_value(self, current_prices: Dict[str, float]) -> float:
+        """计算持仓市值"""
+        value = 0.0
+        for pos in self.positions.values():
+            value += pos.quantity * current_prices.get(pos.symbol, pos.avg_cost)
+        return value
+    
     def get_total_equity(self, current_prices: Dict[str, float]) -> float:
         """计算总资产"""
-        positions_value = sum(
-            pos.quantity * current_prices.get(pos.symbol, pos.avg_cost)
-            for pos in self.positions.values()
-        )
-        return self.cash + positions_value
+        return self.cash + self.get_positions_value(current_prices)
+    
+    def mark_to_market(self, symbol: str, price: float) -> tuple[float, float]:
+        """
+        单股票快速估值
+        
+        Returns:
+            (总资产, 持仓市值)
+        """
+        position = self.positions.get(symbol)
+        exposure = position.quantity * price if position else 0.0
+        return self.cash + exposure, exposure
     
-    def record_equity(self, date: datetime, equity: float):
-        """记录资产净值"""
-        self.equity_curve.append((date, equity))
+    def record_equity(self, date: datetime, equity: float, exposure: float = 0.0):
+        """记录资产净值(及持仓市值)"""
+        self.equity_buffer.append(date, equity, self.cash, exposure)
 
 
 @dataclass
@@ -151,6 +271,31 @@ class BacktestMetrics:
     avg_profit: float  # 平均盈利
     avg_loss: float  # 平均亏损
     profit_factor: float  # 盈亏比
+    sortino_ratio: float = 0.0  # 索提诺比率
+    calmar_ratio: float = 0.0  # 卡玛比率
+    exposure: float = 0.0  # 平均仓位
+    turnover: float = 0.0  # 年化换手率
+    
+    @classmethod
+    def from_stats(cls, stats: PerformanceStats) -> "BacktestMetrics":
+        """由指标内核结果构造"""
+        return cls(
+            total_return=stats.total_return,
+            annual_return=stats.annual_return,
+            sharpe_ratio=stats.sharpe_ratio,
+            max_drawdown=stats.max_drawdown,
+            win_rate=stats.win_rate,
+            total_trades=stats.total_trades,
+            profit_trades=stats.profit_trades,
+            loss_trades=stats.loss_trades,
+            avg_profit=stats.avg_profit,
+            avg_loss=stats.avg_loss,
+            profit_factor=stats.profit_factor,
+            sortino_ratio=stats.sortino_ratio,
+            calmar_ratio=stats.calmar_ratio,
+            exposure=stats.exposure,
+            turnover=stats.turnover
+        )
     
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -166,9 +311,22 @@ class BacktestMetrics:
             "平均盈利": f"${self.avg_profit:.2f}",
             "平均亏损": f"${self.avg_loss:.2f}",
             "盈亏比": f"{self.profit_factor:.2f}",
+            "索提诺比率": f"{self.sortino_ratio:.2f}",
+            "卡玛比率": f"{self.calmar_ratio:.2f}",
+            "平均仓位": f"{self.exposure:.2%}",
+            "年化换手率": f"{self.turnover:.2f}",
         }
 
 
+def bar_liquidity(price_data: pd.DataFrame) -> tuple[list, list]:
+    """每日成交量和振幅(最高价-最低价), 缺列时为 None, 供成本模型计算市场冲击"""
+    n = len(price_data)
+    volumes = price_data['volume'].tolist() if 'volume' in price_data else [None] * n
+    ranges = ((price_data['high'] - price_data['low']).tolist()
+              if 'high' in price_data and 'low' in price_data else [None] * n)
+    return volumes, ranges
+
+
 class Backtester:
     """回测引擎"""
     
@@ -176,11 +334,13 @@ class Backtester:
         self,
         initial_cash: float = 100000.0,
         commission_rate: float = 0.001,
-        risk_free_rate: float = 0.02  # 无风险利率(年化)
+        risk_free_rate: float = 0.02,  # 无风险利率(年化)
+        cost_model: Optional[CostModel] = None  # 交易成本模型, 默认只按 commission_rate 收佣金
     ):
         self.account = BacktestAccount(
             initial_cash=initial_cash,
-            commission_rate=commission_rate
+            commission_rate=commission_rate,
+            cost_model=cost_model
         )
         self.risk_free_rate = risk_free_rate
         self.current_date: Optional[datetime] = None
@@ -200,17 +360,56 @@ class Backtester:
         Returns:
             回测性能指标
         """
+        # 确保价格数据按日期排序
+        price_data = price_data.sort_values('date').reset_index(drop=True)
+        
+        # 按交易日历长度预分配净值缓冲区
+        self.account.reserve(len(price_data))
+        
+        self._process_bars(price_data, signals)
+        
+        # 计算性能指标
+        return self._calculate_metrics()
+    
+    def advance(
+        self,
+        price_data: pd.DataFrame,
+        signals: List[tuple[datetime, TradeAction, int]]
+    ) -> BacktestMetrics:
+        """
+        断点续跑: 只处理账户最后记录日期之后的交易日
+        
+        账户需已通过 run() 或 BacktestAccount.from_state() 建立历史。
+        结果与对完整历史调用 run() 一致。
+        """
+        buffer = self.account.equity_buffer
+        price_data = price_data.sort_values('date').reset_index(drop=True)
+        
+        if buffer.size > 0:
+            last_date = pd.Timestamp(buffer.dates[buffer.size - 1])
+            price_data = price_data[pd.to_datetime(price_data['date']) > last_date]
+        
+        self.account.reserve(buffer.size + len(price_data))
+        self._process_bars(price_data, signals)
+        return self._calculate_metrics()
+    
+    def _process_bars(
+        self,
+        price_data: pd.DataFrame,
+        signals: List[tuple[datetime, TradeAction, int]]
+    ):
+        """逐日执行信号并记录资产净值"""
         # 转换信号为字典便于查询
         signal_dict = {date: (action, qty) for date, action, qty in signals}
+        symbol = "TSLA"  # 当前只支持单股票
         
-        # 确保价格数据按日期排序
-        price_data = price_data.sort_values('date').reset_index(drop=True)
+        volumes, ranges = bar_liquidity(price_data)
         
         # 遍历每个交易日
-        for idx, row in price_data.iterrows():
-            self.current_date = row['date']
-            current_price = row['close']
-            symbol = "TSLA"  # 当前只支持单股票
+        for current_date, current_price, volume, bar_range in zip(
+            price_data['date'].tolist(), price_data['close'].tolist(), volumes, ranges
+        ):
+            self.current_date = current_date
             
             # 检查是否有信号
             if self.current_date in signal_dict:
@@ -224,122 +423,43 @@ class Backtester:
                         quantity=quantity,
                         price=current_price
                     )
-                    self.account.execute_trade(trade, current_price)
+                    self.account.execute_trade(trade, current_price, volume, bar_range)
             
             # 记录当日资产净值
-            equity = self.account.get_total_equity({symbol: current_price})
-            self.account.record_equity(self.current_date, equity)
-        
-        # 计算性能指标
-        return self._calculate_metrics()
+            equity, exposure = self.account.mark_to_market(symbol, current_price)
+            self.account.record_equity(self.current_date, equity, exposure)
     
     def _calculate_metrics(self) -> BacktestMetrics:
         """计算回测指标"""
-        if not self.account.equity_curve:
+        buffer = self.account.equity_buffer
+        n = buffer.size
+        if n == 0:
             raise ValueError("没有资产净值数据")
         
-        # 转换为 DataFrame
-        equity_df = pd.DataFrame(
-            self.account.equity_curve,
-            columns=['date', 'equity']
-        )
-        equity_df['returns'] = equity_df['equity'].pct_change()
-        
-        # 总收益率
-        initial_equity = self.account.initial_cash
-        final_equity = equity_df['equity'].iloc[-1]
-        total_return = (final_equity - initial_equity) / initial_equity
-        
-        # 年化收益率
-        days = (equity_df['date'].iloc[-1] - equity_df['date'].iloc[0]).days
-        years = days / 365.25
-        annual_return = (1 + total_return) ** (1 / years) - 1 if years > 0 else 0
-        
-        # 夏普比率
-        daily_returns = equity_df['returns'].dropna()
-        if len(daily_returns) > 0 and daily_returns.std() > 0:
-            excess_returns = daily_returns - (self.risk_free_rate / 252)
-            sharpe_ratio = np.sqrt(252) * excess_returns.mean() / daily_returns.std()
-        else:
-            sharpe_ratio = 0.0
-        
-        # 最大回撤
-        equity_df['cummax'] = equity_df['equity'].cummax()
-        equity_df['drawdown'] = (equity_df['equity'] - equity_df['cummax']) / equity_df['cummax']
-        max_drawdown = abs(equity_df['drawdown'].min())
-        
-        # 交易统计
-        trades = self.account.trades
-        total_trades = len(trades)
+        years = int((buffer.dates[n - 1] - buffer.dates[0]) // np.timedelta64(1, 'D')) / 365.25
         
-        if total_trades == 0:
-            return BacktestMetrics(
-                total_return=total_return,
-                annual_return=annual_return,
-                sharpe_ratio=sharpe_ratio,
-                max_drawdown=max_drawdown,
-                win_rate=0.0,
-                total_trades=0,
-                profit_trades=0,
-                loss_trades=0,
-                avg_profit=0.0,
-                avg_loss=0.0,
-                profit_factor=0.0
-            )
-        
-        # 计算每笔交易的盈亏
-        trade_pnls = []
-        for i in range(len(trades)):
-            if trades[i].action == TradeAction.SELL and i > 0:
-                # 找到对应的买入交易
-                for j in range(i - 1, -1, -1):
-                    if trades[j].action == TradeAction.BUY:
-                        pnl = (trades[i].price - trades[j].price) * trades[i].quantity - trades[i].commission - trades[j].commission
-                        trade_pnls.append(pnl)
-                        break
-        
-        if not trade_pnls:
-            win_rate = 0.0
-            profit_trades = 0
-            loss_trades = 0
-            avg_profit = 0.0
-            avg_loss = 0.0
-            profit_factor = 0.0
-        else:
-            profit_trades = sum(1 for pnl in trade_pnls if pnl > 0)
-            loss_trades = sum(1 for pnl in trade_pnls if pnl < 0)
-            win_rate = profit_trades / len(trade_pnls) if trade_pnls else 0
-            
-            profits = [pnl for pnl in trade_pnls if pnl > 0]
-            losses = [abs(pnl) for pnl in trade_pnls if pnl < 0]
-            
-            avg_profit = np.mean(profits) if profits else 0
-            avg_loss = np.mean(losses) if losses else 0
-            
-            total_profit = sum(profits) if profits else 0
-            total_loss = sum(losses) if losses else 0
-            profit_factor = total_profit / total_loss if total_loss > 0 else 0
-        
-        return BacktestMetrics(
-            total_return=total_return,
-            annual_return=annual_return,
-            sharpe_ratio=sharpe_ratio,
-            max_drawdown=max_drawdown,
-            win_rate=win_rate,
-            total_trades=len(trade_pnls),
-            profit_trades=profit_trades,
-            loss_trades=loss_trades,
-            avg_profit=avg_profit,
-            avg_loss=avg_loss,
-            profit_factor=profit_factor
+        fills = self.account.fills.view()
+        stats = compute_performance(
+            buffer.equity[:n],
+            initial_cash=self.account.initial_cash,
+            years=years,
+            fill_sides=fills['side'],
+            fill_quantities=fills['quantity'],
+            fill_prices=fills['price'],
+            fill_commissions=fills['commission'],
+            fill_symbols=fills['symbol_id'],
+            exposure_values=buffer.exposure[:n],
+            risk_free_rate=self.risk_free_rate
         )
+        return BacktestMetrics.from_stats(stats)
     
     def get_equity_curve(self) -> pd.DataFrame:
         """获取资产净值曲线"""
-        return pd.DataFrame(
-            self.account.equity_curve,
-            columns=['date', 'equity']
-        )
+        buffer = self.account.equity_buffer
+        return pd.DataFrame({
+            'date': buffer.dates[:buffer.size].copy(),
+            'equity': buffer.equity[:buffer.size].copy()
+        })
     
     def get_trades(self) -> pd.DataFrame:
         """获取交易记录"""
@@ -12,9 +12,10 @@ from typing import Optional
 import pandas as pd
 from datetime import datetime
 
+from src.backtest.costs import CostModel
 from src.backtest.engine import (
     Backtester, BacktestAccount, Trade, TradeAction,
-    BacktestMetrics
+    BacktestMetrics, bar_liquidity
 )
 
 
@@ -49,9 +50,10 @@ class EnhancedBacktester(Backtester):
         initial_cash: float = 100000.0,
         commission_rate: float = 0.001,
         risk_free_rate: float = 0.02,
-        risk_config: Optional[RiskConfig] = None
+        risk_config: Optional[RiskConfig] = None,
+        cost_model: Optional[CostModel] = None
     ):
-        super().__init__(initial_cash, commission_rate, risk_free_rate)
+        super().__init__(initial_cash, commission_rate, risk_free_rate, cost_model)
         self.risk_config = risk_config or RiskConfig()
         
         # 止损跟踪
@@ -78,17 +80,22 @@ class EnhancedBacktester(Backtester):
         # 确保价格数据按日期排序
         price_data = price_data.sort_values('date').reset_index(drop=True)
         
+        # 按交易日历长度预分配净值缓冲区
+        self.account.reserve(len(price_data))
+        symbol = "TSLA"
+        volumes, ranges = bar_liquidity(price_data)
+        
         # 遍历每个交易日
-        for idx, row in price_data.iterrows():
-            self.current_date = row['date']
-            current_price = row['close']
-            symbol = "TSLA"
+        for current_date, current_price, volume, bar_range in zip(
+            price_data['date'].tolist(), price_data['close'].tolist(), volumes, ranges
+        ):
+            self.current_date = current_date
             
             # 1. 检查风险控制(在执行新信号前)
             self._check_risk_controls(symbol, current_price)
             
             # 2. 更新峰值资产(用于回撤计算)
-            current_equity = self.account.get_total_equity({symbol: current_price})
+            current_equity, _ = self.account.mark_to_market(symbol, current_price)
             if current_equity > self.peak_equity:
                 self.peak_equity = current_equity
             
@@ -115,7 +122,7 @@ class EnhancedBacktester(Backtester):
                             quantity=adjusted_qty,
                             price=current_price
                         )
-                        success = self.account.execute_trade(trade, current_price)
+                        success = self.account.execute_trade(trade, current_price, volume, bar_range)
                         
                         # 记录建仓价格
                         if success and action == TradeAction.BUY:
@@ -128,8 +135,8 @@ class EnhancedBacktester(Backtester):
                     self.position_highest_prices[symbol] = current_price
             
             # 5. 记录当日资产净值
-            equity = self.account.get_total_equity({symbol: current_price})
-            self.account.record_equity(self.current_date, equity)
+            equity, exposure = self.account.mark_to_market(symbol, current_price)
+            self.account.record_equity(self.current_date, equity, exposure)
         
         # 计算并返回性能指标
         metrics = self._calculate_metrics()
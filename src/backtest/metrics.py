@@ -0,0 +1,272 @@
+"""
+回测绩效指标计算内核
+
+直接基于 NumPy 数组(资产净值序列 + 成交数组)计算绩效指标,
+不构造 DataFrame,便于参数优化时每秒调用上千次。
+
+成交按 FIFO 逐笔配对(单次遍历),支持分批建仓/分批平仓。
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+# 成交方向编码
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+
+@dataclass(frozen=True)
+class PerformanceStats:
+    """绩效指标(纯数值, 供回测引擎与优化器使用)"""
+    total_return: float
+    annual_return: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    calmar_ratio: float
+    max_drawdown: float
+    exposure: float  # 平均持仓占净值比例
+    turnover: float  # 年化换手率(成交额 / 平均净值)
+    win_rate: float
+    total_trades: int  # 平仓交易笔数
+    profit_trades: int
+    loss_trades: int
+    avg_profit: float
+    avg_loss: float
+    profit_factor: float
+
+
+def simple_returns(equity: np.ndarray) -> np.ndarray:
+    """净值序列 -> 简单收益率序列(长度 n-1)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size < 2:
+        return np.empty(0, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = equity[1:] / equity[:-1] - 1.0
+    return returns[np.isfinite(returns)]
+
+
+def max_drawdown(equity: np.ndarray) -> float:
+    """最大回撤(正数)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = (equity - peak) / peak
+    drawdown = drawdown[np.isfinite(drawdown)]
+    return float(-drawdown.min()) if drawdown.size else 0.0
+
+
+def sharpe_ratio(
+    returns: np.ndarray,
+    risk_free_rate: float = 0.02,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> float:
+    """年化夏普比率(样本标准差, 与 pandas.Series.std 一致)"""
+    if returns.size < 2:
+        return 0.0
+    std = returns.std(ddof=1)
+    if not std > 0:
+        return 0.0
+    excess = returns.mean() - risk_free_rate / periods_per_year
+    return float(np.sqrt(periods_per_year) * excess / std)
+
+
+def sortino_ratio(
+    returns: np.ndarray,
+    risk_free_rate: float = 0.02,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> float:
+    """年化索提诺比率(仅以下行波动作分母)"""
+    if returns.size < 2:
+        return 0.0
+    target = risk_free_rate / periods_per_year
+    downside = np.minimum(returns - target, 0.0)
+    downside_dev = np.sqrt(np.mean(downside * downside))
+    if not downside_dev > 0:
+        return 0.0
+    return float(np.sqrt(periods_per_year) * (returns.mean() - target) / downside_dev)
+
+
+def calmar_ratio(annual_return: float, max_dd: float) -> float:
+    """卡玛比率 = 年化收益 / 最大回撤"""
+    return float(annual_return / max_dd) if max_dd > 0 else 0.0
+
+
+def rolling_sharpe(
+    returns: np.ndarray,
+    window: int = 63,
+    risk_free_rate: float = 0.02,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR
+) -> np.ndarray:
+    """
+    滚动夏普比率(基于累加和, O(n))
+
+    Returns:
+        与 returns 等长的数组, 前 window-1 个位置为 NaN
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n = returns.size
+    result = np.full(n, np.nan)
+    if window < 2 or n < window:
+        return result
+
+    csum = np.concatenate(([0.0], np.cumsum(returns)))
+    csum_sq = np.concatenate(([0.0], np.cumsum(returns * returns)))
+    win_sum = csum[window:] - csum[:-window]
+    win_sum_sq = csum_sq[window:] - csum_sq[:-window]
+
+    mean = win_sum / window
+    var = (win_sum_sq - window * mean * mean) / (window - 1)
+    std = np.sqrt(np.maximum(var, 0.0))
+    excess = mean - risk_free_rate / periods_per_year
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(std > 0, np.sqrt(periods_per_year) * excess / std, 0.0)
+    result[window - 1:] = values
+    return result
+
+
+def match_fifo(
+    sides: np.ndarray,
+    quantities: np.ndarray,
+    prices: np.ndarray,
+    commissions: np.ndarray,
+    symbols: Optional[Sequence] = None
+) -> np.ndarray:
+    """
+    FIFO 逐笔配对, 单次遍历成交数组
+
+    每笔卖出按先进先出消耗买入批次, 买入佣金按成交数量分摊。
+
+    Args:
+        sides: 成交方向数组 (SIDE_BUY / SIDE_SELL)
+        quantities: 成交数量
+        prices: 成交价格
+        commissions: 佣金
+        symbols: 股票代码(可选, 不同代码分别配对)
+
+    Returns:
+        每笔卖出对应的已实现盈亏数组
+    """
+    n = len(sides)
+    pnls = np.empty(n, dtype=np.float64)
+    count = 0
+    lots: dict = {}  # {symbol: deque([[剩余数量, 价格, 每股佣金], ...])}
+
+    for i in range(n):
+        qty = float(quantities[i])
+        if qty <= 0:
+            continue
+        key = symbols[i] if symbols is not None else None
+        queue = lots.get(key)
+        if queue is None:
+            queue = lots[key] = deque()
+
+        if sides[i] == SIDE_BUY:
+            queue.append([qty, float(prices[i]), float(commissions[i]) / qty])
+            continue
+
+        if not queue:
+            continue
+
+        sell_price = float(prices[i])
+        remaining = qty
+        matched = 0.0
+        pnl = 0.0
+        while remaining > 0 and queue:
+            lot = queue[0]
+            take = lot[0] if lot[0] <= remaining else remaining
+            pnl += (sell_price - lot[1]) * take - lot[2] * take
+            lot[0] -= take
+            remaining -= take
+            matched += take
+            if lot[0] <= 0:
+                queue.popleft()
+
+        pnl -= float(commissions[i]) * matched / qty
+        pnls[count] = pnl
+        count += 1
+
+    return pnls[:count]
+
+
+def compute_performance(
+    equity: np.ndarray,
+    initial_cash: float,
+    years: float,
+    fill_sides: Optional[np.ndarray] = None,
+    fill_quantities: Optional[np.ndarray] = None,
+    fill_prices: Optional[np.ndarray] = None,
+    fill_commissions: Optional[np.ndarray] = None,
+    fill_symbols: Optional[Sequence] = None,
+    exposure_values: Optional[np.ndarray] = None,
+    risk_free_rate: float = 0.02
+) -> PerformanceStats:
+    """
+    计算完整绩效指标
+
+    Args:
+        equity: 每日资产净值
+        initial_cash: 初始资金
+        years: 回测区间年数
+        fill_*: 成交数组(见 match_fifo)
+        exposure_values: 每日持仓市值(可选, 用于计算平均仓位)
+        risk_free_rate: 无风险利率(年化)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.size == 0:
+        raise ValueError("没有资产净值数据")
+
+    total_return = (equity[-1] - initial_cash) / initial_cash
+    annual_return = (1 + total_return) ** (1 / years) - 1 if years > 0 else 0.0
+
+    returns = simple_returns(equity)
+    mdd = max_drawdown(equity)
+
+    exposure = 0.0
+    if exposure_values is not None and len(exposure_values):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.abs(np.asarray(exposure_values, dtype=np.float64)) / equity
+        exposure = float(np.nanmean(ratio))
+
+    turnover = 0.0
+    pnls = np.empty(0, dtype=np.float64)
+    if fill_sides is not None and len(fill_sides):
+        quantities = np.asarray(fill_quantities, dtype=np.float64)
+        prices = np.asarray(fill_prices, dtype=np.float64)
+        traded_value = float(np.dot(quantities, prices))
+        mean_equity = float(equity.mean())
+        if mean_equity > 0:
+            turnover = traded_value / mean_equity / years if years > 0 else traded_value / mean_equity
+        pnls = match_fifo(
+            np.asarray(fill_sides), quantities, prices,
+            np.asarray(fill_commissions, dtype=np.float64), fill_symbols
+        )
+
+    profits = pnls[pnls > 0]
+    losses = -pnls[pnls < 0]
+    total_profit = float(profits.sum())
+    total_loss = float(losses.sum())
+
+    return PerformanceStats(
+        total_return=float(total_return),
+        annual_return=float(annual_return),
+        sharpe_ratio=sharpe_ratio(returns, risk_free_rate),
+        sortino_ratio=sortino_ratio(returns, risk_free_rate),
+        calmar_ratio=calmar_ratio(float(annual_return), mdd),
+        max_drawdown=mdd,
+        exposure=exposure,
+        turnover=turnover,
+        win_rate=profits.size / pnls.size if pnls.size else 0.0,
+        total_trades=int(pnls.size),
+        profit_trades=int(profits.size),
+        loss_trades=int(losses.size),
+        avg_profit=float(profits.mean()) if profits.size else 0.0,
+        avg_loss=float(losses.mean()) if losses.size else 0.0,
+        profit_factor=total_profit / total_loss if total_loss > 0 else 0.0
+    )
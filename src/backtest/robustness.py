@@ -0,0 +1,253 @@
+"""
+回测结果稳健性分析 (Monte Carlo / Bootstrap)
+
+单条资产曲线只是历史的一种可能路径。本模块对回测结果重采样,
+得到最大回撤、年化收益(CAGR)、夏普比率的分布和置信区间:
+
+1. 日收益率的循环块自助法 (block bootstrap), 保留短期自相关
+2. 交易顺序置换 / 交易自助重采样, 考察交易先后顺序对回撤的影响
+
+所有路径按批次向量化计算, 1万条路径通常只需数秒。
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.metrics import (
+    TRADING_DAYS_PER_YEAR, SIDE_BUY, SIDE_SELL, match_fifo
+)
+
+
+METRIC_NAMES = ("max_drawdown", "cagr", "sharpe")
+
+
+@dataclass
+class RobustnessResult:
+    """重采样结果: 每条路径一个指标值"""
+    method: str
+    max_drawdown: np.ndarray
+    cagr: np.ndarray
+    sharpe: np.ndarray
+
+    @property
+    def n_paths(self) -> int:
+        return self.max_drawdown.size
+
+    def confidence_interval(self, metric: str, level: float = 0.95) -> Tuple[float, float]:
+        """指标的双侧置信区间(分位数法)"""
+        values = getattr(self, metric)
+        alpha = (1 - level) / 2
+        lo, hi = np.nanquantile(values, [alpha, 1 - alpha])
+        return float(lo), float(hi)
+
+    def summary(self, level: float = 0.95) -> Dict[str, Dict[str, float]]:
+        """各指标的均值、中位数和置信区间"""
+        result = {}
+        for metric in METRIC_NAMES:
+            values = getattr(self, metric)
+            lo, hi = self.confidence_interval(metric, level)
+            result[metric] = {
+                "mean": float(np.nanmean(values)),
+                "median": float(np.nanmedian(values)),
+                "ci_low": lo,
+                "ci_high": hi,
+            }
+        return result
+
+    def to_frame(self) -> pd.DataFrame:
+        """每条路径一行的 DataFrame"""
+        return pd.DataFrame({
+            "max_drawdown": self.max_drawdown,
+            "cagr": self.cagr,
+            "sharpe": self.sharpe,
+        })
+
+
+def returns_from_equity(equity_df: pd.DataFrame) -> np.ndarray:
+    """由 Backtester.get_equity_curve() 的结果计算日收益率"""
+    equity = equity_df['equity'].to_numpy(dtype=np.float64)
+    returns = equity[1:] / equity[:-1] - 1.0
+    return returns[np.isfinite(returns)]
+
+
+def pnls_from_trades(trades_df: pd.DataFrame) -> np.ndarray:
+    """由 Backtester.get_trades() 的结果按 FIFO 计算每笔平仓盈亏"""
+    if trades_df.empty:
+        return np.empty(0, dtype=np.float64)
+    sides = np.where(trades_df['action'].to_numpy() == "BUY", SIDE_BUY, SIDE_SELL)
+    return match_fifo(
+        sides,
+        trades_df['quantity'].to_numpy(dtype=np.float64),
+        trades_df['price'].to_numpy(dtype=np.float64),
+        trades_df['commission'].to_numpy(dtype=np.float64),
+        trades_df['symbol'].to_numpy() if 'symbol' in trades_df else None
+    )
+
+
+def _path_metrics(
+    returns: np.ndarray,
+    periods_per_year: float,
+    risk_free_rate: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    批量计算路径指标
+
+    Args:
+        returns: (路径数, 期数) 的收益率矩阵
+    """
+    n_periods = returns.shape[1]
+    growth = np.cumprod(1.0 + returns, axis=1)
+    # 起点净值为1, 纳入回撤计算
+    peak = np.maximum(np.maximum.accumulate(growth, axis=1), 1.0)
+    max_dd = np.max(1.0 - growth / peak, axis=1)
+
+    final = growth[:, -1]
+    with np.errstate(invalid='ignore'):
+        cagr = np.where(final > 0, final ** (periods_per_year / n_periods) - 1.0, -1.0)
+
+    if n_periods > 1:
+        std = returns.std(axis=1, ddof=1)
+        excess = returns.mean(axis=1) - risk_free_rate / periods_per_year
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = np.where(std > 0, np.sqrt(periods_per_year) * excess / std, 0.0)
+    else:
+        sharpe = np.zeros(returns.shape[0])
+    return max_dd, cagr, sharpe
+
+
+def _run_batches(sampler, n_paths: int, batch_size: int, periods_per_year: float,
+                 risk_free_rate: float, method: str) -> RobustnessResult:
+    """分批生成路径并汇总指标, 控制内存占用"""
+    max_dd = np.empty(n_paths)
+    cagr = np.empty(n_paths)
+    sharpe = np.empty(n_paths)
+    for start in range(0, n_paths, batch_size):
+        size = min(batch_size, n_paths - start)
+        batch = sampler(size)
+        end = start + size
+        max_dd[start:end], cagr[start:end], sharpe[start:end] = _path_metrics(
+            batch, periods_per_year, risk_free_rate
+        )
+    return RobustnessResult(method=method, max_drawdown=max_dd, cagr=cagr, sharpe=sharpe)
+
+
+def block_bootstrap(
+    returns: np.ndarray,
+    n_paths: int = 10000,
+    block_size: int = 5,
+    risk_free_rate: float = 0.02,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    batch_size: int = 2000,
+    seed: Optional[int] = None
+) -> RobustnessResult:
+    """
+    日收益率循环块自助法
+
+    Args:
+        returns: 日收益率序列
+        n_paths: 路径数
+        block_size: 块长度(交易日)
+        batch_size: 每批路径数
+        seed: 随机种子
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n = returns.size
+    if n < 2:
+        raise ValueError("收益率序列过短, 无法重采样")
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    offsets = np.arange(block_size)
+    rng = np.random.default_rng(seed)
+
+    def sampler(size: int) -> np.ndarray:
+        starts = rng.integers(0, n, size=(size, n_blocks))
+        idx = (starts[:, :, None] + offsets) % n
+        return returns[idx.reshape(size, -1)[:, :n]]
+
+    return _run_batches(sampler, n_paths, batch_size, periods_per_year,
+                        risk_free_rate, method=f"block_bootstrap({block_size})")
+
+
+def trade_resample(
+    pnls: np.ndarray,
+    initial_cash: float,
+    years: float,
+    n_paths: int = 10000,
+    replace: bool = False,
+    batch_size: int = 2000,
+    seed: Optional[int] = None
+) -> RobustnessResult:
+    """
+    交易顺序置换 (replace=False) 或交易自助重采样 (replace=True)
+
+    每条路径以 initial_cash 起步, 依次累加每笔交易盈亏;
+    收益率以交易前的资产为基数, 夏普按每年交易笔数年化(不扣无风险利率)。
+
+    Args:
+        pnls: 每笔平仓盈亏 (见 pnls_from_trades)
+        initial_cash: 初始资金
+        years: 原回测区间年数, 用于年化
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    n = pnls.size
+    if n == 0:
+        raise ValueError("没有可重采样的交易")
+    if years <= 0:
+        raise ValueError("years 必须为正数")
+    rng = np.random.default_rng(seed)
+
+    def sampler(size: int) -> np.ndarray:
+        if replace:
+            sampled = pnls[rng.integers(0, n, size=(size, n))]
+        else:
+            sampled = rng.permuted(np.broadcast_to(pnls, (size, n)), axis=1)
+        equity = initial_cash + np.cumsum(sampled, axis=1)
+        before = np.empty_like(equity)
+        before[:, 0] = initial_cash
+        before[:, 1:] = equity[:, :-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(before > 0, sampled / before, -1.0)
+
+    method = "trade_bootstrap" if replace else "trade_permutation"
+    return _run_batches(sampler, n_paths, batch_size, n / years, 0.0, method=method)
+
+
+def analyze_backtest(
+    equity_df: pd.DataFrame,
+    trades_df: Optional[pd.DataFrame] = None,
+    initial_cash: Optional[float] = None,
+    n_paths: int = 10000,
+    block_size: int = 5,
+    seed: Optional[int] = None
+) -> Dict[str, RobustnessResult]:
+    """
+    对一次回测做完整的稳健性分析
+
+    Args:
+        equity_df: Backtester.get_equity_curve() 的结果 (date, equity)
+        trades_df: Backtester.get_trades() 的结果(可选)
+        initial_cash: 初始资金, 默认取资产曲线首值
+
+    Returns:
+        {方法名: RobustnessResult}
+    """
+    results = {
+        "bootstrap": block_bootstrap(
+            returns_from_equity(equity_df), n_paths=n_paths,
+            block_size=block_size, seed=seed
+        )
+    }
+
+    if trades_df is not None and not trades_df.empty:
+        pnls = pnls_from_trades(trades_df)
+        if pnls.size > 1:
+            dates = pd.to_datetime(equity_df['date'])
+            years = (dates.iloc[-1] - dates.iloc[0]).days / 365.25
+            if years > 0:
+                cash = initial_cash if initial_cash is not None else float(equity_df['equity'].iloc[0])
+                results["permutation"] = trade_resample(
+                    pnls, cash, years, n_paths=n_paths, seed=seed
+                )
+    return results
@@ -2,267 +2,402 @@
 回测可视化报告生成器
 
 生成资产净值曲线、回撤曲线、月度收益热力图等图表
+
+渲染方式:
+1. 强制使用 Agg 后端, 不依赖显示器, 可在计划任务/服务器上运行
+2. 不经过 pyplot 全局状态: ChartRenderer 为每种图表保留一个 Figure/Axes 模板,
+   每次只清空坐标轴重新绘制, 不重复创建窗口、布局和颜色条
+3. 月度收益表由 resample 一次算出, 不再逐行分组
+4. 多个回测结果目录在进程池中并行渲染, 每个进程一个 ChartRenderer
+
+用法:
+    python -m src.backtest.visualizer                                   # backtest_results
+    python -m src.backtest.visualizer backtest_results/daily NVDA/backtest_results/daily --workers 4
 """
+import argparse
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-import pandas as pd
-import matplotlib.pyplot as plt
+from typing import Dict, Optional, Sequence, Tuple
+
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.dates as mdates
+from matplotlib import colormaps
+from matplotlib.figure import Figure
 from matplotlib.gridspec import GridSpec
+import pandas as pd
 import numpy as np
 
 # 设置中文字体
-plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS']
-plt.rcParams['axes.unicode_minus'] = False
+matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS']
+matplotlib.rcParams['axes.unicode_minus'] = False
+
+# 图片分辨率
+DPI = 300
+
+MONTH_LABELS = ['1月', '2月', '3月', '4月', '5月', '6月',
+                '7月', '8月', '9月', '10月', '11月', '12月']
+
+
+def drawdown_series(equity: pd.Series) -> pd.Series:
+    """回撤 (%)"""
+    running_max = equity.cummax()
+    return (equity - running_max) / running_max * 100
+
+
+def monthly_returns_table(equity_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    月度收益率表 (%): 行为年份, 列为 1-12 月
+
+    每月取最后一个交易日的资产净值, 与上一个有数据的月份相比; 第一个月为 NaN。
+    """
+    equity = pd.Series(
+        equity_df['equity'].to_numpy(dtype=np.float64),
+        index=pd.to_datetime(equity_df['date'])
+    ).sort_index()
+    month_end = equity.resample('ME').last().dropna()
+    returns = month_end.pct_change().to_numpy() * 100
+
+    years, year_index = np.unique(month_end.index.year, return_inverse=True)
+    table = np.full((len(years), 12), np.nan)
+    table[year_index, month_end.index.month - 1] = returns
+    return pd.DataFrame(table, index=years, columns=range(1, 13))
+
+
+def _format_date_axis(ax, rotation: int = 45, yearly: bool = True):
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    if yearly:
+        ax.xaxis.set_major_locator(mdates.YearLocator())
+    ax.tick_params(axis='x', labelrotation=rotation)
+
+
+class ChartRenderer:
+    """
+    复用 Figure/Axes 模板的图表渲染器
+
+    同一进程内渲染多个回测结果时, 每种图表只创建一次 Figure, 之后只清空坐标轴重画。
+
+    Args:
+        dpi: 输出分辨率
+    """
+
+    def __init__(self, dpi: int = DPI):
+        self.dpi = dpi
+        self._templates: Dict[Tuple, Tuple[Figure, list, dict]] = {}
+
+    def _template(self, key: Tuple, build) -> Tuple[Figure, list, dict]:
+        """取出(或创建)模板并清空坐标轴; build(fig) 返回坐标轴列表"""
+        template = self._templates.get(key)
+        if template is None:
+            fig = Figure(figsize=key[1])
+            template = (fig, build(fig), {})
+            self._templates[key] = template
+        else:
+            for ax in template[1]:
+                ax.clear()
+        return template
+
+    def _save(self, fig: Figure, output_path: Path, tight_layout: bool = True):
+        if tight_layout:
+            fig.tight_layout()
+        fig.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
+
+    def equity_curve(self, equity_df: pd.DataFrame, output_path: Path):
+        """资产净值曲线"""
+        fig, (ax,), _ = self._template(("equity", (12, 6)), lambda f: [f.add_subplot()])
+        dates = equity_df['date']
+        equity = equity_df['equity']
+
+        ax.plot(dates, equity, linewidth=2, color='#2E86DE')
+        ax.fill_between(dates, equity, alpha=0.3, color='#2E86DE')
+
+        # 标注起点和终点
+        initial_equity = equity.iloc[0]
+        final_equity = equity.iloc[-1]
+        ax.scatter(dates.iloc[0], initial_equity,
+                   color='green', s=100, zorder=5, label=f'起点: ${initial_equity:,.0f}')
+        ax.scatter(dates.iloc[-1], final_equity,
+                   color='red', s=100, zorder=5, label=f'终点: ${final_equity:,.0f}')
+
+        ax.set_title('资产净值曲线', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('日期', fontsize=12)
+        ax.set_ylabel('资产净值 ($)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='upper left', fontsize=10)
+        _format_date_axis(ax)
+
+        self._save(fig, output_path)
+
+    def drawdown(self, equity_df: pd.DataFrame, output_path: Path):
+        """回撤曲线"""
+        fig, (ax,), _ = self._template(("drawdown", (12, 6)), lambda f: [f.add_subplot()])
+        dates = equity_df['date']
+        drawdown = drawdown_series(equity_df['equity'])
+
+        ax.fill_between(dates, drawdown, 0, where=drawdown < 0,
+                        color='#E74C3C', alpha=0.5, label='回撤区域')
+        ax.plot(dates, drawdown, linewidth=1.5, color='#E74C3C')
+
+        # 标注最大回撤
+        position = int(np.argmin(drawdown.to_numpy()))
+        max_dd_date = dates.iloc[position]
+        max_dd_value = drawdown.iloc[position]
+        ax.scatter(max_dd_date, max_dd_value, color='darkred', s=100, zorder=5,
+                   label=f'最大回撤: {max_dd_value:.2f}%')
+        ax.annotate(f'{max_dd_value:.2f}%',
+                    xy=(max_dd_date, max_dd_value),
+                    xytext=(10, -10), textcoords='offset points',
+                    fontsize=10, color='darkred',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7))
+
+        ax.set_title('回撤曲线', fontsize=16, fontweight='bold', pad=20)
+        ax.set_xlabel('日期', fontsize=12)
+        ax.set_ylabel('回撤 (%)', fontsize=12)
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='lower left', fontsize=10)
+        ax.axhline(y=0, color='black', linestyle='--', linewidth=0.8)
+        _format_date_axis(ax)
+
+        self._save(fig, output_path)
+
+    def monthly_returns(self, equity_df: pd.DataFrame, output_path: Path):
+        """月度收益热力图"""
+        table = monthly_returns_table(equity_df)
+        figsize = (14, max(8, len(table) * 0.4))
+        fig, (ax,), state = self._template(("monthly", figsize), lambda f: [f.add_subplot()])
+
+        values = table.to_numpy()
+        im = ax.imshow(values, cmap=colormaps['RdYlGn'], aspect='auto', vmin=-10, vmax=10)
+
+        ax.set_xticks(np.arange(12))
+        ax.set_yticks(np.arange(len(table)))
+        ax.set_xticklabels(MONTH_LABELS)
+        ax.set_yticklabels(table.index)
+
+        # 添加数值标注
+        rows, cols = np.nonzero(~np.isnan(values))
+        for i, j in zip(rows, cols):
+            value = values[i, j]
+            ax.text(j, i, f'{value:.1f}%', ha='center', va='center',
+                    color='white' if abs(value) > 5 else 'black', fontsize=9)
+
+        ax.set_title('月度收益率热力图', fontsize=16, fontweight='bold', pad=20)
+        # 颜色条只创建一次(色阶固定), 之后指向新的图像
+        if 'colorbar' not in state:
+            state['colorbar'] = fig.colorbar(im, ax=ax, label='收益率 (%)')
+        else:
+            state['colorbar'].update_normal(im)
+
+        self._save(fig, output_path)
+
+    def trades_distribution(self, trades_df: pd.DataFrame, output_path: Path):
+        """交易分布图"""
+        if trades_df.empty:
+            return
+
+        def build(fig):
+            gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
+            return [fig.add_subplot(gs[0, 0]), fig.add_subplot(gs[0, 1]),
+                    fig.add_subplot(gs[1, 0]), fig.add_subplot(gs[1, 1])]
+
+        fig, (ax1, ax2, ax3, ax4), _ = self._template(("trades", (14, 10)), build)
+        actions = trades_df['action'].astype(str).str.replace('TradeAction.', '', regex=False)
+        is_buy = (actions == 'BUY').to_numpy()
+        is_sell = (actions == 'SELL').to_numpy()
+
+        # 1. 交易类型分布
+        action_counts = actions.value_counts()
+        colors = ['#27AE60' if action == 'BUY' else '#E74C3C' for action in action_counts.index]
+        ax1.bar(action_counts.index, action_counts.values, color=colors, alpha=0.7)
+        ax1.set_title('交易类型分布', fontsize=12, fontweight='bold')
+        ax1.set_ylabel('交易次数', fontsize=10)
+        for i, v in enumerate(action_counts.values):
+            ax1.text(i, v + 0.5, str(v), ha='center', va='bottom')
+
+        # 2. 交易价格分布
+        prices = trades_df['price'].to_numpy()
+        ax2.hist(prices[is_buy], bins=20, alpha=0.6, color='green', label='买入价格')
+        ax2.hist(prices[is_sell], bins=20, alpha=0.6, color='red', label='卖出价格')
+        ax2.set_title('交易价格分布', fontsize=12, fontweight='bold')
+        ax2.set_xlabel('价格 ($)', fontsize=10)
+        ax2.set_ylabel('频数', fontsize=10)
+        ax2.legend()
+
+        # 3. 交易数量分布
+        quantity = trades_df['quantity']
+        ax3.hist(quantity, bins=15, color='#3498DB', alpha=0.7, edgecolor='black')
+        ax3.set_title('交易数量分布', fontsize=12, fontweight='bold')
+        ax3.set_xlabel('数量', fontsize=10)
+        ax3.set_ylabel('频数', fontsize=10)
+        ax3.axvline(quantity.mean(), color='red', linestyle='--', linewidth=2,
+                    label=f"平均: {quantity.mean():.1f}")
+        ax3.legend()
+
+        # 4. 交易时间序列
+        dates = pd.to_datetime(trades_df['date']).to_numpy()
+        ax4.scatter(dates[is_buy], prices[is_buy],
+                    color='green', marker='^', s=100, alpha=0.6, label='买入')
+        ax4.scatter(dates[is_sell], prices[is_sell],
+                    color='red', marker='v', s=100, alpha=0.6, label='卖出')
+        ax4.set_title('交易时间序列', fontsize=12, fontweight='bold')
+        ax4.set_xlabel('日期', fontsize=10)
+        ax4.set_ylabel('价格 ($)', fontsize=10)
+        ax4.legend()
+        ax4.grid(True, alpha=0.3)
+        _format_date_axis(ax4, yearly=False)
+
+        fig.suptitle('交易分布分析', fontsize=16, fontweight='bold', y=0.995)
+
+        self._save(fig, output_path, tight_layout=False)
+
+
+# 每个进程一个渲染器
+_renderer: Optional[ChartRenderer] = None
+
+
+def get_renderer(dpi: int = DPI) -> ChartRenderer:
+    """当前进程的共享渲染器"""
+    global _renderer
+    if _renderer is None or _renderer.dpi != dpi:
+        _renderer = ChartRenderer(dpi)
+    return _renderer
 
 
 def plot_equity_curve(equity_df: pd.DataFrame, output_path: Path):
     """绘制资产净值曲线"""
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    ax.plot(equity_df['date'], equity_df['equity'], linewidth=2, color='#2E86DE')
-    ax.fill_between(equity_df['date'], equity_df['equity'], 
-                     alpha=0.3, color='#2E86DE')
-    
-    # 标注起点和终点
-    initial_equity = equity_df['equity'].iloc[0]
-    final_equity = equity_df['equity'].iloc[-1]
-    
-    ax.scatter(equity_df['date'].iloc[0], initial_equity, 
-              color='green', s=100, zorder=5, label=f'起点: ${initial_equity:,.0f}')
-    ax.scatter(equity_df['date'].iloc[-1], final_equity, 
-              color='red', s=100, zorder=5, label=f'终点: ${final_equity:,.0f}')
-    
-    ax.set_title('资产净值曲线', fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('日期', fontsize=12)
-    ax.set_ylabel('资产净值 ($)', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper left', fontsize=10)
-    
-    # 格式化日期轴
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    ax.xaxis.set_major_locator(mdates.YearLocator())
-    plt.xticks(rotation=45)
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    get_renderer().equity_curve(equity_df, output_path)
 
 
 def plot_drawdown(equity_df: pd.DataFrame, output_path: Path):
     """绘制回撤曲线"""
-    # 计算回撤
-    equity_df['cummax'] = equity_df['equity'].cummax()
-    equity_df['drawdown'] = (equity_df['equity'] - equity_df['cummax']) / equity_df['cummax'] * 100
-    
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    ax.fill_between(equity_df['date'], equity_df['drawdown'], 0,
-                     where=equity_df['drawdown'] < 0,
-                     color='#E74C3C', alpha=0.5, label='回撤区域')
-    ax.plot(equity_df['date'], equity_df['drawdown'], 
-            linewidth=1.5, color='#E74C3C')
-    
-    # 标注最大回撤
-    max_dd_idx = equity_df['drawdown'].idxmin()
-    max_dd_date = equity_df.loc[max_dd_idx, 'date']
-    max_dd_value = equity_df.loc[max_dd_idx, 'drawdown']
-    
-    ax.scatter(max_dd_date, max_dd_value, 
-              color='darkred', s=100, zorder=5, 
-              label=f'最大回撤: {max_dd_value:.2f}%')
-    ax.annotate(f'{max_dd_value:.2f}%', 
-                xy=(max_dd_date, max_dd_value),
-                xytext=(10, -10), textcoords='offset points',
-                fontsize=10, color='darkred',
-                bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7))
-    
-    ax.set_title('回撤曲线', fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('日期', fontsize=12)
-    ax.set_ylabel('回撤 (%)', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='lower left', fontsize=10)
-    ax.axhline(y=0, color='black', linestyle='--', linewidth=0.8)
-    
-    # 格式化日期轴
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    ax.xaxis.set_major_locator(mdates.YearLocator())
-    plt.xticks(rotation=45)
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    get_renderer().drawdown(equity_df, output_path)
 
 
 def plot_monthly_returns(equity_df: pd.DataFrame, output_path: Path):
     """绘制月度收益热力图"""
-    # 计算月度收益率
-    equity_df['year'] = equity_df['date'].dt.year
-    equity_df['month'] = equity_df['date'].dt.month
-    
-    # 按月分组,取最后一天的资产净值
-    monthly = equity_df.groupby(['year', 'month'])['equity'].last().reset_index()
-    monthly['returns'] = monthly['equity'].pct_change() * 100
-    
-    # 创建数据透视表
-    pivot_table = monthly.pivot(index='year', columns='month', values='returns')
-    
-    # 绘制热力图
-    fig, ax = plt.subplots(figsize=(14, max(8, len(pivot_table) * 0.4)))
-    
-    # 创建颜色映射
-    cmap = plt.cm.RdYlGn
-    im = ax.imshow(pivot_table.values, cmap=cmap, aspect='auto', 
-                   vmin=-10, vmax=10)
-    
-    # 设置坐标轴
-    ax.set_xticks(np.arange(12))
-    ax.set_yticks(np.arange(len(pivot_table)))
-    ax.set_xticklabels(['1月', '2月', '3月', '4月', '5月', '6月',
-                        '7月', '8月', '9月', '10月', '11月', '12月'])
-    ax.set_yticklabels(pivot_table.index)
-    
-    # 添加数值标注
-    for i in range(len(pivot_table)):
-        for j in range(12):
-            value = pivot_table.iloc[i, j]
-            if not pd.isna(value):
-                text_color = 'white' if abs(value) > 5 else 'black'
-                ax.text(j, i, f'{value:.1f}%', 
-                       ha='center', va='center', 
-                       color=text_color, fontsize=9)
-    
-    ax.set_title('月度收益率热力图', fontsize=16, fontweight='bold', pad=20)
-    plt.colorbar(im, ax=ax, label='收益率 (%)')
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    get_renderer().monthly_returns(equity_df, output_path)
 
 
 def plot_trades_distribution(trades_df: pd.DataFrame, output_path: Path):
     """绘制交易分布图"""
-    if trades_df.empty:
-        return
-    
-    fig = plt.figure(figsize=(14, 10))
-    gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
-    
-    # 1. 交易类型分布
-    ax1 = fig.add_subplot(gs[0, 0])
-    action_counts = trades_df['action'].value_counts()
-    colors = ['#27AE60' if action == 'BUY' else '#E74C3C' 
-              for action in action_counts.index]
-    ax1.bar(action_counts.index, action_counts.values, color=colors, alpha=0.7)
-    ax1.set_title('交易类型分布', fontsize=12, fontweight='bold')
-    ax1.set_ylabel('交易次数', fontsize=10)
-    for i, v in enumerate(action_counts.values):
-        ax1.text(i, v + 0.5, str(v), ha='center', va='bottom')
-    
-    # 2. 交易价格分布
-    ax2 = fig.add_subplot(gs[0, 1])
-    buy_prices = trades_df[trades_df['action'] == 'BUY']['price']
-    sell_prices = trades_df[trades_df['action'] == 'SELL']['price']
-    
-    bins = 20
-    ax2.hist(buy_prices, bins=bins, alpha=0.6, color='green', label='买入价格')
-    ax2.hist(sell_prices, bins=bins, alpha=0.6, color='red', label='卖出价格')
-    ax2.set_title('交易价格分布', fontsize=12, fontweight='bold')
-    ax2.set_xlabel('价格 ($)', fontsize=10)
-    ax2.set_ylabel('频数', fontsize=10)
-    ax2.legend()
-    
-    # 3. 交易数量分布
-    ax3 = fig.add_subplot(gs[1, 0])
-    ax3.hist(trades_df['quantity'], bins=15, color='#3498DB', alpha=0.7, edgecolor='black')
-    ax3.set_title('交易数量分布', fontsize=12, fontweight='bold')
-    ax3.set_xlabel('数量', fontsize=10)
-    ax3.set_ylabel('频数', fontsize=10)
-    ax3.axvline(trades_df['quantity'].mean(), color='red', 
-               linestyle='--', linewidth=2, label=f"平均: {trades_df['quantity'].mean():.1f}")
-    ax3.legend()
-    
-    # 4. 交易时间序列
-    ax4 = fig.add_subplot(gs[1, 1])
-    trades_df['date'] = pd.to_datetime(trades_df['date'])
-    
-    buy_trades = trades_df[trades_df['action'] == 'BUY']
-    sell_trades = trades_df[trades_df['action'] == 'SELL']
-    
-    ax4.scatter(buy_trades['date'], buy_trades['price'], 
-               color='green', marker='^', s=100, alpha=0.6, label='买入')
-    ax4.scatter(sell_trades['date'], sell_trades['price'], 
-               color='red', marker='v', s=100, alpha=0.6, label='卖出')
-    
-    ax4.set_title('交易时间序列', fontsize=12, fontweight='bold')
-    ax4.set_xlabel('日期', fontsize=10)
-    ax4.set_ylabel('价格 ($)', fontsize=10)
-    ax4.legend()
-    ax4.grid(True, alpha=0.3)
-    ax4.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
-    
-    fig.suptitle('交易分布分析', fontsize=16, fontweight='bold', y=0.995)
-    
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
-
-
-def generate_report(results_dir: Path):
-    """生成完整的可视化报告"""
-    print("📊 生成可视化报告...")
-    print()
-    
+    get_renderer().trades_distribution(trades_df, output_path)
+
+
+def _results_file(results_dir: Path, kind: str) -> Optional[Path]:
+    """<kind>.csv, 不存在时取 <kind>_<策略类型>.csv (如 equity_curve_daily.csv)"""
+    path = results_dir / f"{kind}.csv"
+    if path.exists():
+        return path
+    return next(iter(sorted(results_dir.glob(f"{kind}_*.csv"))), None)
+
+
+def generate_report(results_dir: Path, verbose: bool = True, dpi: int = DPI) -> Path:
+    """
+    生成完整的可视化报告
+
+    Args:
+        results_dir: 回测结果目录 (equity_curve[_*].csv, trades[_*].csv)
+        verbose: 是否打印进度
+        dpi: 输出分辨率
+
+    Returns:
+        图表目录
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    results_dir = Path(results_dir)
+    renderer = get_renderer(dpi)
+
+    log("📊 生成可视化报告...")
+    log()
+
     # 读取数据
-    equity_df = pd.read_csv(results_dir / "equity_curve.csv")
+    equity_df = pd.read_csv(_results_file(results_dir, "equity_curve"))
     equity_df['date'] = pd.to_datetime(equity_df['date'])
-    
-    trades_path = results_dir / "trades.csv"
-    if trades_path.exists():
-        trades_df = pd.read_csv(trades_path)
-    else:
-        trades_df = pd.DataFrame()
-    
+
+    trades_path = _results_file(results_dir, "trades")
+    trades_df = pd.read_csv(trades_path) if trades_path is not None else pd.DataFrame()
+
     # 创建图表目录
     charts_dir = results_dir / "charts"
     charts_dir.mkdir(exist_ok=True)
-    
+
     # 生成各类图表
-    print("  生成资产净值曲线...")
-    plot_equity_curve(equity_df, charts_dir / "equity_curve.png")
-    
-    print("  生成回撤曲线...")
-    plot_drawdown(equity_df.copy(), charts_dir / "drawdown.png")
-    
-    print("  生成月度收益热力图...")
-    plot_monthly_returns(equity_df.copy(), charts_dir / "monthly_returns.png")
-    
+    log("  生成资产净值曲线...")
+    renderer.equity_curve(equity_df, charts_dir / "equity_curve.png")
+
+    log("  生成回撤曲线...")
+    renderer.drawdown(equity_df, charts_dir / "drawdown.png")
+
+    log("  生成月度收益热力图...")
+    renderer.monthly_returns(equity_df, charts_dir / "monthly_returns.png")
+
     if not trades_df.empty:
-        print("  生成交易分布图...")
-        plot_trades_distribution(trades_df, charts_dir / "trades_distribution.png")
-    
-    print()
-    print(f"✅ 所有图表已保存到: {charts_dir}")
-    print()
-    print("生成的图表:")
-    print("  - equity_curve.png         资产净值曲线")
-    print("  - drawdown.png             回撤曲线")
-    print("  - monthly_returns.png      月度收益热力图")
+        log("  生成交易分布图...")
+        renderer.trades_distribution(trades_df, charts_dir / "trades_distribution.png")
+
+    log()
+    log(f"✅ 所有图表已保存到: {charts_dir}")
+    log()
+    log("生成的图表:")
+    log("  - equity_curve.png         资产净值曲线")
+    log("  - drawdown.png             回撤曲线")
+    log("  - monthly_returns.png      月度收益热力图")
     if not trades_df.empty:
-        print("  - trades_distribution.png  交易分布分析")
+        log("  - trades_distribution.png  交易分布分析")
+    return charts_dir
 
 
-def main():
+def _render_timed(results_dir: Path, dpi: int) -> float:
+    start = time.perf_counter()
+    generate_report(results_dir, verbose=False, dpi=dpi)
+    return time.perf_counter() - start
+
+
+def generate_reports(
+    results_dirs: Sequence[Path],
+    max_workers: Optional[int] = None,
+    dpi: int = DPI
+) -> Dict[Path, float]:
+    """
+    在进程池中并行渲染多个回测结果目录的图表
+
+    Returns:
+        {结果目录: 渲染耗时(秒)}
+    """
+    results_dirs = [Path(d) for d in results_dirs]
+    if max_workers == 0 or len(results_dirs) == 1:
+        return {d: _render_timed(d, dpi) for d in results_dirs}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(results_dirs, pool.map(_render_timed, results_dirs, [dpi] * len(results_dirs))))
+
+
+def main(argv: Optional[Sequence[str]] = None):
     project_root = Path(__file__).parent.parent.parent
-    results_dir = project_root / "backtest_results"
-    
-    if not results_dir.exists():
-        print("❌ 错误: 未找到回测结果目录")
+    parser = argparse.ArgumentParser(description="生成回测图表")
+    parser.add_argument("results_dirs", nargs="*", type=Path, help="回测结果目录, 默认 backtest_results")
+    parser.add_argument("--workers", type=int, default=None, help="进程数, 0 表示不使用进程池")
+    parser.add_argument("--dpi", type=int, default=DPI, help="输出分辨率")
+    args = parser.parse_args(argv)
+
+    results_dirs = args.results_dirs or [project_root / "backtest_results"]
+    missing = [d for d in results_dirs if not d.exists()]
+    if missing:
+        print(f"❌ 错误: 未找到回测结果目录: {', '.join(map(str, missing))}")
         print("请先运行: python -m src.pipeline.run_backtest")
         return
-    
-    generate_report(results_dir)
+
+    if len(results_dirs) == 1:
+        generate_report(results_dirs[0], dpi=args.dpi)
+        return
+
+    start = time.perf_counter()
+    timings = generate_reports(results_dirs, args.workers, args.dpi)
+    for results_dir, seconds in timings.items():
+        print(f"  ✅ {results_dir / 'charts'}  {seconds:.2f}s")
+    print(f"✅ {len(timings)} 个结果目录的图表已生成, 总耗时 {time.perf_counter() - start:.2f}s")
 
 
 if __name__ == "__main__":
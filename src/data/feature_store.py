@@ -0,0 +1,242 @@
+"""
+按股票代码共享的特征缓存
+
+同一份K线数据上, 日度策略、改进策略、动量信号模型和网格搜索都会计算
+相同的均线、动量和均量。FeatureStore 以 (指标, 参数, 数据版本) 为键:
+
+- 数据版本: 日期与 OHLCV 的 SHA1, 数据更新后自动换用新版本
+- 每个特征数组只计算一次, 缓存在内存中; 指定 cache_dir 时同时写入磁盘 (.npy),
+  下次运行以内存映射方式读取
+- 返回只读数组, 消费者按下标或切片读取, 不产生拷贝
+
+用法:
+    features = get_feature_store().for_bars("TSLA", bars)
+    ma20 = features.sma(20)               # 20日收盘均线
+    mom5 = features.momentum(5)           # 5日动量
+    vol20 = features.prior_mean(20)       # 前20日平均成交量(不含当日)
+"""
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.data.loader import PriceBar
+
+
+FIELDS = ('date', 'open', 'high', 'low', 'close', 'volume')
+
+# 共享缓存的磁盘目录(未设置时只缓存在内存中)
+CACHE_DIR_ENV = "QT_FEATURE_CACHE_DIR"
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """截至当日(含)的 window 日均值, 与逐窗口 np.mean 结果逐位相同; 不足窗口为 NaN"""
+    out = np.full(values.size, np.nan)
+    if values.size >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def prior_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """当日之前 window 日的均值(不含当日); 不足窗口为 NaN"""
+    out = np.full(values.size, np.nan)
+    if values.size > window:
+        out[window:] = sliding_window_view(values[:-1], window).mean(axis=1)
+    return out
+
+
+def momentum(values: np.ndarray, window: int) -> np.ndarray:
+    """window 日变化率 (v[i] - v[i-window]) / v[i-window]; 不足窗口为 NaN"""
+    out = np.full(values.size, np.nan)
+    if values.size > window:
+        base = values[:-window]
+        out[window:] = (values[window:] - base) / base
+    return out
+
+
+FEATURES: Dict[str, Callable[..., np.ndarray]] = {
+    'sma': rolling_mean,
+    'prior_mean': prior_mean,
+    'momentum': momentum,
+}
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+def bars_to_columns(bars: Sequence[PriceBar]) -> Dict[str, np.ndarray]:
+    """K线 -> 列数组(日期为 datetime64[D])"""
+    return {
+        'date': np.array([bar.date for bar in bars], dtype='datetime64[D]'),
+        'open': np.array([bar.open for bar in bars], dtype=np.float64),
+        'high': np.array([bar.high for bar in bars], dtype=np.float64),
+        'low': np.array([bar.low for bar in bars], dtype=np.float64),
+        'close': np.array([bar.close for bar in bars], dtype=np.float64),
+        'volume': np.array([bar.volume for bar in bars], dtype=np.float64),
+    }
+
+
+def frame_to_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """价格 DataFrame (date, open, high, low, close, volume) -> 列数组"""
+    return {
+        'date': pd.to_datetime(df['date']).to_numpy().astype('datetime64[D]'),
+        **{field: df[field].to_numpy(dtype=np.float64) for field in FIELDS[1:]}
+    }
+
+
+def data_version(columns: Dict[str, np.ndarray]) -> str:
+    """数据版本号: 全部列内容的 SHA1"""
+    digest = hashlib.sha1()
+    for field in FIELDS:
+        digest.update(np.ascontiguousarray(columns[field]).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SymbolFeatures:
+    """一个股票代码在一个数据版本上的全部特征"""
+
+    def __init__(
+        self,
+        symbol: str,
+        version: str,
+        columns: Dict[str, np.ndarray],
+        cache_dir: Optional[Path] = None
+    ):
+        self.symbol = symbol
+        self.version = version
+        self._columns = {name: _read_only(np.array(values)) for name, values in columns.items()}
+        self._features: Dict[Tuple, np.ndarray] = {}
+        self.cache_dir = Path(cache_dir) / symbol / version if cache_dir is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self._columns['close'].size
+
+    def column(self, field: str) -> np.ndarray:
+        """原始列(只读)"""
+        return self._columns[field]
+
+    def _path(self, key: Tuple) -> Path:
+        indicator, field, params = key
+        suffix = "_".join(f"{name}{value}" for name, value in params)
+        return self.cache_dir / f"{indicator}_{field}_{suffix}.npy"
+
+    def get(self, indicator: str, field: str = 'close', **params) -> np.ndarray:
+        """
+        读取特征数组(只读), 未缓存时计算一次
+
+        Args:
+            indicator: FEATURES 中的指标名
+            field: 输入列
+            **params: 指标参数, 如 window=20
+        """
+        key = (indicator, field, tuple(sorted(params.items())))
+        cached = self._features.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        path = self._path(key) if self.cache_dir is not None else None
+        if path is not None and path.exists():
+            values = np.load(path, mmap_mode='r')
+            self.hits += 1
+        else:
+            values = _read_only(FEATURES[indicator](self._columns[field], **params))
+            self.misses += 1
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix('.tmp.npy')
+                np.save(tmp_path, values)
+                tmp_path.replace(path)
+        self._features[key] = values
+        return values
+
+    def sma(self, window: int, field: str = 'close') -> np.ndarray:
+        return self.get('sma', field, window=window)
+
+    def prior_mean(self, window: int, field: str = 'volume') -> np.ndarray:
+        return self.get('prior_mean', field, window=window)
+
+    def momentum(self, window: int, field: str = 'close') -> np.ndarray:
+        return self.get('momentum', field, window=window)
+
+
+class FeatureStore:
+    """
+    按 (股票代码, 数据版本) 管理 SymbolFeatures
+
+    Args:
+        cache_dir: 磁盘缓存目录, None 表示只缓存在内存中
+        max_entries: 内存中最多保留的 (股票代码, 数据版本) 数
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 16):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], SymbolFeatures]" = OrderedDict()
+
+    def for_columns(self, symbol: str, columns: Dict[str, np.ndarray]) -> SymbolFeatures:
+        """按列数组取特征集合"""
+        key = (symbol, data_version(columns))
+        features = self._entries.get(key)
+        if features is not None:
+            self._entries.move_to_end(key)
+            return features
+
+        features = SymbolFeatures(symbol, key[1], columns, self.cache_dir)
+        self._entries[key] = features
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if self.cache_dir is not None:
+            self._prune_disk(symbol, key[1])
+        return features
+
+    def for_bars(self, symbol: str, bars: Sequence[PriceBar]) -> SymbolFeatures:
+        """按K线取特征集合"""
+        return self.for_columns(symbol, bars_to_columns(bars))
+
+    def for_frame(self, symbol: str, df: pd.DataFrame) -> SymbolFeatures:
+        """按价格 DataFrame 取特征集合"""
+        return self.for_columns(symbol, frame_to_columns(df))
+
+    def versions(self, symbol: str) -> List[str]:
+        """内存中该股票代码的数据版本"""
+        return [version for sym, version in self._entries if sym == symbol]
+
+    def _prune_disk(self, symbol: str, version: str):
+        """删除该股票代码旧数据版本的磁盘缓存"""
+        symbol_dir = self.cache_dir / symbol
+        if not symbol_dir.exists():
+            return
+        for path in symbol_dir.iterdir():
+            if path.is_dir() and path.name != version:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        """清空内存缓存"""
+        self._entries.clear()
+
+
+_shared_store: Optional[FeatureStore] = None
+
+
+def get_feature_store() -> FeatureStore:
+    """
+    进程内共享的特征缓存
+
+    设置环境变量 QT_FEATURE_CACHE_DIR 时同时缓存到该目录。
+    """
+    global _shared_store
+    if _shared_store is None:
+        cache_dir = os.getenv(CACHE_DIR_ENV)
+        _shared_store = FeatureStore(Path(cache_dir) if cache_dir else None)
+    return _shared_store
@@ -9,7 +9,6 @@ from pathlib import Path
 from typing import Callable, Optional
 
 import pandas as pd
-import yfinance as yf
 
 from src.data.loader import PriceBar
 
@@ -22,7 +21,7 @@ class YFinanceClient:
     """Thin wrapper around `yfinance` for easier testing."""
 
     def __init__(self, download_fn: Optional[DownloadFn] = None) -> None:
-        self._download = download_fn or yf.download
+        self._download = download_fn
         self._use_ticker_api = download_fn is None  # Use Ticker API for real downloads
 
     def fetch_daily_history(
@@ -38,7 +37,10 @@ class YFinanceClient:
         for attempt in range(max_retries):
             try:
                 if self._use_ticker_api:
-                    # Use Ticker API which is more reliable for large date ranges
+                    # Use Ticker API which is more reliable for large date ranges.
+                    # yfinance is imported here so that importing this module stays cheap.
+                    import yfinance as yf
+
                     ticker = yf.Ticker(symbol)
                     if start and end:
                         data = ticker.history(start=start.isoformat(), end=end.isoformat(), interval="1d", auto_adjust=False)
@@ -0,0 +1,276 @@
+"""Asynchronous order-execution gateway with a pluggable broker interface."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Protocol, Union
+
+from src.backtest.costs import CostModel
+from src.data.loader import PriceBar
+from src.portfolio.allocator import PositionPlan
+from src.signals.momentum import TradeAction
+
+
+class OrderStatus(str, Enum):
+    NEW = "NEW"
+    PARTIAL = "PARTIAL"
+    FILLED = "FILLED"
+    CANCELLED = "CANCELLED"
+    REJECTED = "REJECTED"
+
+
+TERMINAL_STATUSES = frozenset({OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.REJECTED})
+
+_TRANSITIONS = {
+    OrderStatus.NEW: {OrderStatus.PARTIAL, OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.REJECTED},
+    OrderStatus.PARTIAL: {OrderStatus.PARTIAL, OrderStatus.FILLED, OrderStatus.CANCELLED},
+}
+
+
+class InvalidTransition(RuntimeError):
+    """Raised when an order is moved to a status its current status does not allow."""
+
+
+@dataclass(frozen=True)
+class Fill:
+    order_id: str
+    symbol: str
+    quantity: int
+    price: float
+    timestamp: float
+
+
+@dataclass
+class Order:
+    """Mutable order state; only the gateway moves it between statuses."""
+
+    order_id: str
+    plan: PositionPlan
+    submitted_at: float
+    status: OrderStatus = OrderStatus.NEW
+    filled_quantity: int = 0
+    avg_price: float = 0.0
+    fills: List[Fill] = field(default_factory=list)
+    completed_at: Optional[float] = None
+    message: str = ""
+
+    @property
+    def symbol(self) -> str:
+        return self.plan.symbol
+
+    @property
+    def remaining(self) -> int:
+        return self.plan.quantity - self.filled_quantity
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Seconds from submission to the last fill (None until something fills)."""
+        return self.fills[-1].timestamp - self.submitted_at if self.fills else None
+
+    def transition(self, status: OrderStatus, message: str = "") -> None:
+        if status not in _TRANSITIONS.get(self.status, ()):
+            raise InvalidTransition(f"{self.order_id}: {self.status.value} -> {status.value}")
+        self.status = status
+        if message:
+            self.message = message
+        if status in TERMINAL_STATUSES:
+            self.completed_at = time.perf_counter()
+
+    def apply_fill(self, fill: Fill) -> None:
+        if fill.quantity <= 0 or fill.quantity > self.remaining:
+            raise ValueError(f"{self.order_id}: invalid fill quantity {fill.quantity} (remaining {self.remaining})")
+        notional = self.avg_price * self.filled_quantity + fill.price * fill.quantity
+        self.filled_quantity += fill.quantity
+        self.avg_price = notional / self.filled_quantity
+        self.fills.append(fill)
+        self.transition(OrderStatus.FILLED if self.remaining == 0 else OrderStatus.PARTIAL)
+
+
+class AsyncBroker(Protocol):
+    """Broker adapter: streams fills for an order until it is complete or the broker gives up.
+
+    Quantity left unfilled when the stream ends is cancelled by the gateway, so adapters
+    for live brokers (e.g. ib-insync trades) only need to translate their fill events.
+    """
+
+    def execute(self, order: Order) -> AsyncIterator[Fill]:
+        ...
+
+    async def cancel(self, order: Order) -> None:
+        ...
+
+
+FillCallback = Callable[[Order, Fill], Union[None, Awaitable[None]]]
+
+
+class SimulatedBroker:
+    """Simulated venue that fills orders from bar data.
+
+    Each order waits ``latency`` (plus uniform ``jitter``) seconds, then fills in up to
+    ``slices`` child fills spaced ``slice_interval`` seconds apart. Every slice may take at
+    most ``participation * bar.volume / slices`` shares, so large orders against thin bars
+    fill partially. Fill prices come from ``cost_model`` (spread plus square-root impact,
+    the same model backtests use) and are clipped to the bar's high/low range.
+    """
+
+    def __init__(
+        self,
+        bars: Optional[Mapping[str, PriceBar]] = None,
+        latency: float = 0.05,
+        jitter: float = 0.0,
+        slices: int = 4,
+        slice_interval: float = 0.0,
+        participation: float = 0.1,
+        cost_model: Optional[CostModel] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if slices < 1:
+            raise ValueError("slices must be at least 1")
+        self._bars: Dict[str, PriceBar] = dict(bars or {})
+        self.latency = latency
+        self.jitter = jitter
+        self.slices = slices
+        self.slice_interval = slice_interval
+        self.participation = participation
+        self.cost_model = cost_model or CostModel(spread_bps=10.0, impact_coefficient=0.1)
+        self._random = random.Random(seed)
+        self._logger = logging.getLogger("simulated-broker")
+
+    def set_bar(self, symbol: str, bar: PriceBar) -> None:
+        self._bars[symbol] = bar
+
+    def fill_price(self, order: Order, quantity: int, bar: PriceBar) -> float:
+        side = 1 if order.plan.action == TradeAction.BUY else -1
+        price = self.cost_model.fill_price(side, order.plan.target_price, quantity, bar.volume, bar.high - bar.low)
+        return min(max(price, bar.low), bar.high)
+
+    async def execute(self, order: Order) -> AsyncIterator[Fill]:
+        bar = self._bars.get(order.symbol)
+        if bar is None:
+            raise LookupError(f"no bar for {order.symbol}")
+        await asyncio.sleep(self.latency + self._random.uniform(0, self.jitter))
+
+        capacity = max(1, int(bar.volume * self.participation / self.slices))
+        remaining = order.remaining
+        for index in range(self.slices):
+            if remaining <= 0:
+                break
+            if index and self.slice_interval:
+                await asyncio.sleep(self.slice_interval)
+            quantity = min(remaining, capacity)
+            remaining -= quantity
+            yield Fill(order.order_id, order.symbol, quantity, self.fill_price(order, quantity, bar),
+                       time.perf_counter())
+
+    async def cancel(self, order: Order) -> None:
+        self._logger.info("Cancelling simulated order", extra={"order_id": order.order_id})
+
+
+class ExecutionGateway:
+    """Submits orders to an ``AsyncBroker`` concurrently and tracks their state.
+
+    Fill callbacks (plain or async functions taking ``(order, fill)``) run in fill order
+    for each order; an exception in a callback is logged and never changes the order.
+    Orders whose broker stream ends early or fails after a partial fill have their
+    remainder cancelled at the broker; broker errors reject orders that have not filled.
+    """
+
+    def __init__(self, broker: AsyncBroker, on_fill: Iterable[FillCallback] = ()) -> None:
+        self.broker = broker
+        self.orders: Dict[str, Order] = {}
+        self._callbacks: List[FillCallback] = list(on_fill)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._ids = itertools.count(1)
+        self._logger = logging.getLogger("execution-gateway")
+
+    def add_fill_callback(self, callback: FillCallback) -> None:
+        self._callbacks.append(callback)
+
+    async def submit(self, plan: PositionPlan) -> Order:
+        """Create an order and start executing it in the background."""
+        order = Order(f"GW-{next(self._ids)}-{plan.symbol}-{plan.action.value}", plan, time.perf_counter())
+        self.orders[order.order_id] = order
+        self._tasks[order.order_id] = asyncio.create_task(self._run(order))
+        return order
+
+    async def submit_many(self, plans: Iterable[PositionPlan]) -> List[Order]:
+        """Submit all plans at once and wait until every order is terminal."""
+        orders = [await self.submit(plan) for plan in plans]
+        await self.wait(orders)
+        return orders
+
+    async def wait(self, orders: Optional[Iterable[Order]] = None) -> None:
+        ids = [order.order_id for order in orders] if orders is not None else list(self._tasks)
+        tasks = [self._tasks[order_id] for order_id in ids if order_id in self._tasks]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def cancel(self, order_id: str) -> Order:
+        order = self.orders[order_id]
+        task = self._tasks.get(order_id)
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        if not order.done:
+            await self.broker.cancel(order)
+            order.transition(OrderStatus.CANCELLED, "Cancelled by request")
+        return order
+
+    async def _run(self, order: Order) -> None:
+        try:
+            async for fill in self.broker.execute(order):
+                order.apply_fill(fill)
+                await self._notify(order, fill)
+                if order.done:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._logger.warning("Order failed", extra={"order_id": order.order_id, "error": str(exc)})
+            if order.status == OrderStatus.NEW:
+                order.transition(OrderStatus.REJECTED, str(exc))
+            elif not order.done:
+                await self._cancel_remainder(order, str(exc))
+            return
+        if not order.done:
+            await self._cancel_remainder(order, f"Unfilled remainder {order.remaining}")
+
+    async def _notify(self, order: Order, fill: Fill) -> None:
+        """Run fill callbacks; a failing callback is logged and does not affect the order."""
+        for callback in self._callbacks:
+            try:
+                result = callback(order, fill)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                self._logger.exception("Fill callback failed", extra={"order_id": order.order_id})
+
+    async def _cancel_remainder(self, order: Order, message: str) -> None:
+        """Ask the broker to cancel what is left of a partially filled order, then mark it cancelled."""
+        try:
+            await self.broker.cancel(order)
+        except Exception as exc:
+            self._logger.warning("Broker cancel failed", extra={"order_id": order.order_id, "error": str(exc)})
+        order.transition(OrderStatus.CANCELLED, message)
+
+    def latency_stats(self) -> Dict[str, float]:
+        """Submission-to-last-fill latency (seconds) over orders that filled at least once."""
+        latencies = sorted(order.latency for order in self.orders.values() if order.latency is not None)
+        if not latencies:
+            return {"orders": 0}
+        return {
+            "orders": len(latencies),
+            "mean": sum(latencies) / len(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "max": latencies[-1],
+        }
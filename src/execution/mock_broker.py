@@ -5,7 +5,10 @@ import logging
 from dataclasses import dataclass
 from typing import Optional
 
+from src.backtest.costs import CostModel
+from src.data.loader import PriceBar
 from src.portfolio.allocator import PositionPlan
+from src.signals.momentum import TradeAction
 
 
 @dataclass(frozen=True)
@@ -15,13 +18,21 @@ class ExecutionReport:
     filled_quantity: int
     avg_price: float
     message: str
+    commission: float = 0.0
 
 
 class MockBroker:
-    def __init__(self) -> None:
+    """Fills every order in full, priced by ``cost_model`` when one is given.
+
+    Without a cost model orders fill at exactly ``target_price`` with no commission. With
+    one, the fill price includes spread (and market impact when ``bar`` is passed).
+    """
+
+    def __init__(self, cost_model: Optional[CostModel] = None) -> None:
         self._logger = logging.getLogger("mock-broker")
+        self.cost_model = cost_model
 
-    def send_order(self, plan: PositionPlan) -> ExecutionReport:
+    def send_order(self, plan: PositionPlan, bar: Optional[PriceBar] = None) -> ExecutionReport:
         order_id = f"MOCK-{plan.symbol}-{plan.action}-{plan.quantity}"
         self._logger.info(
             "Submitting mock order",
@@ -33,12 +44,20 @@ class MockBroker:
                 "rationale": plan.rationale,
             },
         )
+        price, commission = plan.target_price, 0.0
+        if self.cost_model is not None:
+            side = 1 if plan.action == TradeAction.BUY else -1
+            volume = bar.volume if bar else None
+            bar_range = bar.high - bar.low if bar else None
+            price = self.cost_model.fill_price(side, plan.target_price, plan.quantity, volume, bar_range)
+            commission = self.cost_model.commission.commission(plan.quantity * price, plan.quantity)
         return ExecutionReport(
             order_id=order_id,
             status="FILLED",
             filled_quantity=plan.quantity,
-            avg_price=plan.target_price,
+            avg_price=price,
             message="Simulated fill",
+            commission=commission,
         )
 
     def cancel_order(self, order_id: str) -> ExecutionReport:
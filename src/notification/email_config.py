@@ -37,6 +37,11 @@ class EmailConfig:
     # 多个发件账户配置 (按优先级顺序)
     accounts: List[EmailAccountConfig] = None
     
+    # 发件队列: 邮件先写入本地发件箱, 由后台线程发送, 策略流程不等待 SMTP
+    use_outbox: bool = True
+    outbox_path: str = None            # 默认项目根目录下的 email_outbox.db
+    outbox_flush_timeout: float = 60.0  # 进程退出前最多等待发送的秒数
+    
     def __post_init__(self):
         """初始化多账户配置"""
         if self.accounts is None:
@@ -0,0 +1,371 @@
+"""
+持久化发件队列
+
+EmailService 原先在策略流程中同步发送: 依次尝试每个账户, 每个账户重试 3 次,
+超时 60 秒、间隔 5 秒, SMTP 不稳定时每日检查会卡住数分钟。现在:
+1. 发送请求写入本地 SQLite 发件箱(email_outbox.db)后立即返回
+2. 后台线程取出到期的邮件发送, 每次按账户顺序故障转移(从上次成功的账户开始)
+3. 全部账户失败时按指数退避安排下次重试, 超过最大次数标记为 failed
+4. 进程退出前最多等待 flush_timeout 秒; 未发出的邮件留在发件箱, 下次运行(或
+   python -m src.notification.email_outbox)继续发送
+
+用法:
+    sender = OutboxSender(EmailOutbox(path), config)
+    sender.start()
+    sender.submit(subject, body)
+"""
+import argparse
+import atexit
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing, contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.notification.smtp_transport import SMTP_TIMEOUT, BatchStats, SMTPSessionPool
+from src.utils.sqlite_wal import enable_wal
+
+
+DEFAULT_OUTBOX_PATH = project_root / "email_outbox.db"
+
+# 发送中的邮件超过该时间(秒)未完成, 视为发送进程已退出, 重新发送
+CLAIM_LEASE = 600
+
+
+class EmailOutbox:
+    """
+    SQLite 发件箱
+
+    状态: pending(待发送) -> sending(发送中) -> sent / pending(退避后重试) / failed
+
+    Args:
+        path: SQLite 数据库文件
+    """
+
+    def __init__(self, path: Path = DEFAULT_OUTBOX_PATH):
+        self.path = Path(path)
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._ready:
+            return self._open()
+        with self._lock:
+            if self._ready:
+                return self._open()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = self._open()
+            try:
+                enable_wal(conn)    # 须在建表事务之前切换
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS outbox ("
+                        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                        "created_at TEXT NOT NULL, recipient TEXT NOT NULL, "
+                        "subject TEXT NOT NULL, body TEXT NOT NULL, "
+                        "status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0, "
+                        "next_attempt_at REAL NOT NULL, claimed_at REAL, "
+                        "sent_at TEXT, account TEXT, last_error TEXT)"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_due ON outbox (status, next_attempt_at)")
+            except Exception:
+                conn.close()
+                raise
+            self._ready = True
+            return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, recipient: str, subject: str, body: str) -> int:
+        """加入发件箱, 返回邮件编号"""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO outbox (created_at, recipient, subject, body, next_attempt_at) VALUES (?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), recipient, subject, body, time.time())
+            )
+            return cursor.lastrowid
+
+    def claim_due(self, now: Optional[float] = None, limit: int = 50) -> List[Dict]:
+        """
+        取出到期的邮件并标记为发送中(多个进程同时取出时, 每封邮件只会被一个进程取到)
+        """
+        now = time.time() if now is None else now
+        if not self.path.exists():
+            return []
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'sending' AND claimed_at < ?) ORDER BY id LIMIT ?",
+                (now, now - CLAIM_LEASE, limit)
+            ).fetchall()
+            claimed_at = time.time()
+            conn.executemany(
+                "UPDATE outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                [(claimed_at, row['id']) for row in rows]
+            )
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, message_id: int, account: str):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'sent', attempts = attempts + 1, account = ?, "
+                "sent_at = ?, last_error = NULL WHERE id = ?",
+                (account, datetime.now().isoformat(timespec='seconds'), message_id)
+            )
+
+    def mark_retry(self, message_id: int, error: str, next_attempt_at: float):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = attempts + 1, "
+                "next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (next_attempt_at, error, message_id)
+            )
+
+    def mark_failed(self, message_id: int, error: str):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, message_id)
+            )
+
+    def retry_now(self) -> int:
+        """忽略退避时间, 所有待发邮件立即到期"""
+        if not self.path.exists():
+            return 0
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                "UPDATE outbox SET next_attempt_at = ? WHERE status = 'pending'", (time.time(),)
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """各状态的邮件数"""
+        if not self.path.exists():
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def next_due_at(self) -> Optional[float]:
+        """最早的待发送时间, 没有待发送邮件时为 None"""
+        if not self.path.exists():
+            return None
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox WHERE status = 'pending'"
+            ).fetchone()
+        return row[0]
+
+    def get(self, message_id: int) -> Optional[Dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM outbox WHERE id = ?", (message_id,)).fetchone()
+        return dict(row) if row else None
+
+
+class OutboxSender:
+    """
+    发件箱的后台发送器
+
+    Args:
+        outbox: 发件箱
+        config: EmailConfig (收件人、账户列表)
+        send: 单次发送函数 send(account, recipient, subject, body, timeout);
+              默认每批使用一个 SMTPSessionPool, 每个账户只握手一次
+        base_delay: 首次重试等待(秒), 之后每次翻倍
+        max_delay: 最长重试等待(秒)
+        max_attempts: 最多尝试轮数(每轮依次尝试全部账户)
+        timeout: 单次 SMTP 超时(秒)
+        poll_interval: 后台线程空闲时检查发件箱的间隔(秒)
+    """
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        config,
+        send: Optional[Callable] = None,
+        base_delay: float = 30.0,
+        max_delay: float = 3600.0,
+        max_attempts: int = 8,
+        timeout: float = SMTP_TIMEOUT,
+        poll_interval: float = 60.0
+    ):
+        self.outbox = outbox
+        self.config = config
+        self.send = send
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._preferred = 0          # 上次发送成功的账户
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._busy = threading.Lock()
+        self._held = 0
+        self._thread: Optional[threading.Thread] = None
+        self.last_batch: Optional[BatchStats] = None
+
+    def submit(self, subject: str, body: str, recipient: Optional[str] = None) -> int:
+        """写入发件箱并唤醒后台线程, 立即返回邮件编号"""
+        message_id = self.outbox.enqueue(recipient or self.config.recipient_email, subject, body)
+        self._wake.set()
+        return message_id
+
+    @contextmanager
+    def hold(self):
+        """期间提交的邮件暂不发送, 退出时作为一批发送(共用 SMTP 会话)"""
+        self._held += 1
+        try:
+            yield self
+        finally:
+            self._held -= 1
+            self._wake.set()
+
+    def backoff(self, attempts: int) -> float:
+        """第 attempts 轮失败后的等待时间"""
+        return min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+
+    def _deliver(self, message: Dict, send: Callable) -> Optional[str]:
+        """按账户顺序故障转移发送一封邮件, 成功返回 None, 否则返回错误信息"""
+        accounts = self.config.accounts or []
+        errors = []
+        for offset in range(len(accounts)):
+            index = (self._preferred + offset) % len(accounts)
+            account = accounts[index]
+            try:
+                send(account, message['recipient'], message['subject'], message['body'], self.timeout)
+            except Exception as e:
+                errors.append(f"{account.name}: {type(e).__name__}: {e}")
+                continue
+            self._preferred = index
+            self.outbox.mark_sent(message['id'], account.name)
+            print(f"✅ 邮件已发送 (#{message['id']}, {account.name}): {message['subject']}")
+            return None
+        return "; ".join(errors) or "没有配置任何邮件账户"
+
+    def drain(self, now: Optional[float] = None) -> int:
+        """
+        发送全部到期邮件, 返回发送成功的数量
+
+        失败的邮件按退避时间推迟, 不会在同一次 drain 中再次尝试。
+        """
+        sent = 0
+        pool = SMTPSessionPool(self.timeout) if self.send is None else None
+        with self._busy, (pool or nullcontext()):
+            send = pool.send if pool is not None else self.send
+            while True:
+                messages = self.outbox.claim_due(now)
+                if not messages:
+                    break
+                for message in messages:
+                    error = self._deliver(message, send)
+                    if error is None:
+                        sent += 1
+                        continue
+                    attempts = message['attempts'] + 1
+                    if attempts >= self.max_attempts:
+                        self.outbox.mark_failed(message['id'], error)
+                        print(f"❌ 邮件发送失败, 已放弃 (#{message['id']}): {error}")
+                    else:
+                        delay = self.backoff(attempts)
+                        self.outbox.mark_retry(message['id'], error, time.time() + delay)
+                        print(f"⚠️ 邮件发送失败, {delay:.0f}秒后重试 (#{message['id']}): {error}")
+        if pool is not None and pool.stats.handshakes:
+            self.last_batch = pool.stats
+            print(f"📊 本批邮件: {pool.stats.summary()}")
+        return sent
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._held:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"⚠️ 发件队列处理出错: {type(e).__name__}: {e}")
+            next_due = self.outbox.next_due_at()
+            wait = self.poll_interval if next_due is None else max(0.0, min(self.poll_interval, next_due - time.time()))
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def start(self) -> 'OutboxSender':
+        """启动后台发送线程(已启动时不重复启动)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def flush(self, timeout: float) -> bool:
+        """等待到期邮件处理完毕, 返回是否已无到期邮件"""
+        deadline = time.monotonic() + timeout
+        self._wake.set()
+        while time.monotonic() < deadline:
+            next_due = self.outbox.next_due_at()
+            if (next_due is None or next_due > time.time()) and not self._busy.locked():
+                if not self.outbox.counts().get('sending'):
+                    return True
+            time.sleep(0.05)
+        return False
+
+    def stop(self, flush_timeout: float = 0.0):
+        """停止后台线程; flush_timeout > 0 时先等待到期邮件发出"""
+        if flush_timeout > 0 and self._thread is not None and self._thread.is_alive():
+            if not self.flush(flush_timeout):
+                pending = self.outbox.counts().get('pending', 0)
+                print(f"📮 发件箱仍有 {pending} 封邮件未发出, 下次运行时继续发送")
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(1.0, self.timeout))
+
+
+# 每个发件箱文件一个后台发送器
+_senders: Dict[Path, OutboxSender] = {}
+_senders_lock = threading.Lock()
+
+
+def shared_sender(config) -> OutboxSender:
+    """
+    config 对应发件箱的共享后台发送器(首次调用时启动, 进程退出前等待发送)
+    """
+    path = Path(getattr(config, 'outbox_path', None) or DEFAULT_OUTBOX_PATH).resolve()
+    with _senders_lock:
+        sender = _senders.get(path)
+        if sender is None:
+            sender = OutboxSender(EmailOutbox(path), config).start()
+            atexit.register(sender.stop, getattr(config, 'outbox_flush_timeout', 60.0))
+            _senders[path] = sender
+        return sender
+
+
+def main(argv: Optional[List[str]] = None):
+    from src.notification.email_config import email_config
+
+    parser = argparse.ArgumentParser(description="发送发件箱中的待发邮件")
+    parser.add_argument("--status", action="store_true", help="只显示发件箱状态")
+    parser.add_argument("--all", action="store_true", help="忽略退避时间, 立即重试全部待发邮件")
+    args = parser.parse_args(argv)
+
+    outbox = EmailOutbox(email_config.outbox_path or DEFAULT_OUTBOX_PATH)
+    if not args.status:
+        if args.all:
+            outbox.retry_now()
+        sent = OutboxSender(outbox, email_config).drain()
+        print(f"📧 本次发送 {sent} 封")
+    print(f"📮 发件箱: {outbox.counts() or '空'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,761 @@
+"""
+邮件正文模板
+
+原先四种正文各自用整段 f-string 写在 EmailService 里, 每种都带一份完整的样式表。
+这里样式表由共用的 body / .header / .content 规则拼成, 正文是带字段名的格式串;
+每个模板按动作颜色编译一次(样式表代入颜色后与正文拼成一个格式串)并在进程内缓存,
+渲染时只需用 str.format_map 填充字段。
+
+渲染结果与原 EmailService._build_*_email_body 逐字节一致(tests/golden/email)。
+
+用法:
+    html = render_signal(SignalContext('TSLA', 'BUY', 100, 250.0, 'MA金叉', '2025-11-14'))
+    html = render_summary(SummaryContext(strategy_type='日度策略', symbol='TSLA'))
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from string import Formatter, Template
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+
+BUY_COLOR = "#00AA00"
+SELL_COLOR = "#FF0000"
+
+
+def action_style(action: str) -> Tuple[str, str]:
+    """(中文动作, 颜色)"""
+    if action == "BUY":
+        return "买入", BUY_COLOR
+    return "卖出", SELL_COLOR
+
+
+# 样式表: 各模板共用 body / .header / .content 规则, $action_color 为信号颜色
+
+_BODY_RULE = """        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+"""
+
+_HEADER_RULE = Template("""        .header {
+            background: $header_background;
+            color: white;
+            padding: 20px;
+            border-radius: 10px 10px 0 0;
+            text-align: center;
+        }
+""")
+
+_CONTENT_RULE = """        .content {
+            background: #f9f9f9;
+            padding: 20px;
+            border: 1px solid #ddd;
+            border-radius: 0 0 10px 10px;
+        }
+"""
+
+
+def _stylesheet(header_background: str, rules: str, badge: str = "") -> Template:
+    header = _HEADER_RULE.substitute(header_background=header_background)
+    return Template(_BODY_RULE + header + badge + _CONTENT_RULE + rules)
+
+
+_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+"""
+
+_BODY_START = """    </style>
+</head>
+<body>"""
+
+
+class EmailTemplate:
+    """
+    预编译的邮件模板
+
+    正文是 str.format 风格的格式串, 字段名即渲染参数名。compile() 把代入颜色的样式表
+    (花括号已转义)和正文拼成一个格式串, 按动作颜色缓存其 format_map。
+
+    Args:
+        stylesheet: 样式表(string.Template, 可引用 $action_color), None 表示正文片段
+        body: <body> 之后的正文格式串
+    """
+
+    def __init__(self, stylesheet: Optional[Template], body: str):
+        self.stylesheet = stylesheet
+        self.body = body
+        self.fields = tuple(dict.fromkeys(name for _, name, _, _ in Formatter().parse(body) if name))
+        self._compiled: Dict[str, Callable[[Mapping[str, Any]], str]] = {}
+
+    def compile(self, action_color: str = "") -> Callable[[Mapping[str, Any]], str]:
+        """样式表代入颜色后与正文拼成格式串, 每种颜色只拼接一次"""
+        render = self._compiled.get(action_color)
+        if render is None:
+            source = self.body
+            if self.stylesheet is not None:
+                css = self.stylesheet.substitute(action_color=action_color)
+                source = _HEAD + css.replace("{", "{{").replace("}", "}}") + _BODY_START + source
+            render = source.format_map
+            self._compiled[action_color] = render
+        return render
+
+    def render(self, action_color: str = "", /, **values) -> str:
+        """填充正文字段, action_color 选择样式表的颜色"""
+        missing = [name for name in self.fields if name not in values]
+        if missing:
+            raise TypeError(f"缺少模板字段: {', '.join(missing)}")
+        return self.compile(action_color)(values)
+
+
+SIGNAL_TEMPLATE = EmailTemplate(
+    _stylesheet(
+        "linear-gradient(135deg, #667eea 0%, #764ba2 100%)",
+        """        .signal-box {
+            background: white;
+            padding: 20px;
+            border-left: 4px solid $action_color;
+            margin: 20px 0;
+            border-radius: 5px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .signal-item {
+            margin: 10px 0;
+            padding: 10px;
+            background: #f5f5f5;
+            border-radius: 5px;
+        }
+        .label {
+            font-weight: bold;
+            color: #555;
+            display: inline-block;
+            width: 120px;
+        }
+        .value {
+            color: #333;
+        }
+        .action-value {
+            color: $action_color;
+            font-size: 24px;
+            font-weight: bold;
+        }
+        .button {
+            display: inline-block;
+            padding: 15px 30px;
+            background: $action_color;
+            color: white;
+            text-decoration: none;
+            border-radius: 5px;
+            font-weight: bold;
+            margin: 20px 0;
+            text-align: center;
+        }
+        .footer {
+            margin-top: 30px;
+            padding-top: 20px;
+            border-top: 1px solid #ddd;
+            color: #666;
+            font-size: 12px;
+            text-align: center;
+        }
+        .warning {
+            background: #fff3cd;
+            border: 1px solid #ffc107;
+            padding: 15px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+""",
+        badge="""        .strategy-badge {
+            background: rgba(255,255,255,0.2);
+            padding: 5px 15px;
+            border-radius: 20px;
+            display: inline-block;
+            margin-top: 10px;
+            font-size: 14px;
+        }
+""",
+    ),
+    """
+    <div class="header">
+        <h1>🚨 交易信号提醒</h1>
+        <p>TSLA 策略检测到新信号</p>
+        <div class="strategy-badge">{strategy_name}</div>
+    </div>
+    
+    <div class="content">
+        <div class="signal-box">
+            <h2 style="margin-top: 0; color: {action_color};">📊 信号详情</h2>
+            
+            <div class="signal-item">
+                <span class="label">📅 信号日期:</span>
+                <span class="value">{signal_date}</span>
+            </div>
+            
+            <div class="signal-item">
+                <span class="label">📈 股票代码:</span>
+                <span class="value">{symbol}</span>
+            </div>
+            
+            <div class="signal-item">
+                <span class="label">⚡ 交易动作:</span>
+                <span class="action-value">{action_cn} ({action})</span>
+            </div>
+            
+            <div class="signal-item">
+                <span class="label">📦 建议数量:</span>
+                <span class="value" style="font-size: 18px; font-weight: bold;">{quantity:,} 股</span>
+            </div>
+            
+            <div class="signal-item">
+                <span class="label">💰 参考价格:</span>
+                <span class="value" style="font-size: 18px; font-weight: bold;">${price:,.2f}</span>
+            </div>
+            
+            <div class="signal-item">
+                <span class="label">💡 信号原因:</span>
+                <span class="value">{reason}</span>
+            </div>
+            
+            <div class="signal-item">
+                <span class="label">💵 预估总额:</span>
+                <span class="value" style="font-size: 18px; font-weight: bold; color: #FF6600;">
+                    ${total:,.2f}
+                </span>
+            </div>
+        </div>
+        
+        <div class="warning">
+            <strong>⚠️ 重要提示:</strong>
+            <ul style="margin: 10px 0;">
+                <li>请在美股交易时间内执行 (EST 9:30 AM - 4:00 PM)</li>
+                <li>确认账户有足够资金 (建议准备 +5% 缓冲)</li>
+                <li>建议使用市价单 (Market Order) 快速成交</li>
+                <li>执行后请记录订单号和实际成交价格</li>
+            </ul>
+        </div>
+        
+        <center>
+            <a href="https://www.firstrade.com" class="button">
+                🔗 登录 Firstrade 执行交易
+            </a>
+        </center>
+        
+        <div style="margin-top: 30px; padding: 15px; background: #e8f4f8; border-radius: 5px;">
+            <h3 style="margin-top: 0;">📋 执行步骤</h3>
+            <ol>
+                <li>登录 Firstrade 账户</li>
+                <li>进入 Trade → Stocks & Options</li>
+                <li>填写订单信息:
+                    <ul>
+                        <li>Symbol: {symbol}</li>
+                        <li>Action: {action_cn}</li>
+                        <li>Quantity: {quantity:,}</li>
+                        <li>Order Type: Market</li>
+                    </ul>
+                </li>
+                <li>确认并提交订单</li>
+                <li>记录订单号和成交价格</li>
+                <li>在 TRADE_EXECUTION_LOG.md 中记录</li>
+            </ol>
+        </div>
+    </div>
+    
+    <div class="footer">
+        <p>📅 发送时间: {sent_at}</p>
+        <p>🤖 {strategy_name} 自动提醒系统</p>
+    </div>
+</body>
+</html>
+        """,
+)
+
+ERROR_TEMPLATE = EmailTemplate(
+    _stylesheet("#dc3545", """        .error-box {
+            background: #fff3cd;
+            border: 1px solid #ffc107;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 5px;
+        }
+"""),
+    """
+    <div class="header">
+        <h1>⚠️ {strategy_type}检查失败</h1>
+    </div>
+    <div class="content">
+        <div class="error-box">
+            <h3>错误信息:</h3>
+            <p>{message}</p>
+        </div>
+        <p>建议: 手动检查日志获取详细错误信息</p>
+    </div>
+</body>
+</html>
+            """,
+)
+
+HAS_SIGNAL_TEMPLATE = EmailTemplate(
+    _stylesheet("linear-gradient(135deg, #667eea 0%, #764ba2 100%)", """        .highlight {
+            background: white;
+            padding: 20px;
+            border-left: 4px solid $action_color;
+            margin: 20px 0;
+            border-radius: 5px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        .button {
+            display: inline-block;
+            padding: 15px 30px;
+            background: $action_color;
+            color: white;
+            text-decoration: none;
+            border-radius: 5px;
+            font-weight: bold;
+            margin: 20px 0;
+        }
+        .strategy-box {
+            background: #fff8e1;
+            border: 2px solid #ffc107;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 8px;
+        }
+        .strategy-box h3 {
+            color: #ff6f00;
+            margin-top: 0;
+        }
+        .strategy-box ul {
+            margin: 10px 0;
+            padding-left: 20px;
+        }
+        .strategy-box li {
+            margin: 8px 0;
+        }
+        .rule-item {
+            background: white;
+            padding: 10px;
+            margin: 8px 0;
+            border-left: 3px solid #ffc107;
+            border-radius: 4px;
+        }
+"""),
+    """
+    <div class="header">
+        <h1>🚨 发现新信号!</h1>
+        <p>{symbol} {strategy_type}检查</p>
+    </div>
+    <div class="content">
+        <div class="highlight">
+            <h2 style="color: {action_color}; margin-top: 0;">检测到 {signal_count} 个新信号</h2>
+            <p><strong>最新信号:</strong></p>
+            <ul>
+                <li>动作: <strong style="color: {action_color};">{action_cn}</strong></li>
+                <li>数量: <strong>{quantity:,} 股</strong></li>
+                <li>日期: {date}</li>
+            </ul>
+        </div>
+        <center>
+            <a href="https://www.firstrade.com" class="button">
+                🔗 立即登录 Firstrade
+            </a>
+        </center>
+        
+        <div class="strategy-box">
+            <h3>📊 策略算法与规则说明</h3>
+            
+            <div class="rule-item">
+                <strong>💡 策略类型:</strong> 动量交易策略
+                <p style="margin: 5px 0 0 0;">基于短期和中期移动平均线的趋势跟踪系统,结合成交量确认,捕捉市场动量。</p>
+            </div>
+            
+            <div class="rule-item">
+                <strong>🔍 核心算法:</strong>
+                <ul style="margin: 5px 0;">
+                    <li><strong>MA5</strong> (5日移动平均线): 短期趋势指标</li>
+                    <li><strong>MA20</strong> (20日移动平均线): 中期趋势指标</li>
+                    <li><strong>成交量确认:</strong> 必须超过20日平均成交量的1.3倍</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>📈 买入信号规则:</strong>
+                <ul style="margin: 5px 0;">
+                    <li>MA5 > MA20 (短期均线上穿中期均线,金叉)</li>
+                    <li>当前价格 > MA5 (价格在短期均线之上)</li>
+                    <li>成交量 > 20日平均成交量 × 1.3 (放量确认)</li>
+                    <li>当前无持仓 (避免重复买入)</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>📉 卖出信号规则:</strong>
+                <ul style="margin: 5px 0;">
+                    <li>MA5 < MA20 (短期均线下穿中期均线,死叉)</li>
+                    <li>当前价格 < MA5 (价格跌破短期均线)</li>
+                    <li>成交量 > 20日平均成交量 × 1.3 (放量确认)</li>
+                    <li>当前有持仓 (才能卖出)</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>🛡️ 风险管理:</strong>
+                <ul style="margin: 5px 0;">
+                    <li><strong>仓位控制:</strong> 单次交易使用60%可用资金</li>
+                    <li><strong>止盈:</strong> 5% 获利自动卖出</li>
+                    <li><strong>止损:</strong> 2% 亏损自动卖出</li>
+                    <li><strong>风险收益比:</strong> 2.5:1 (符合资金管理原则)</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>⏰ 检查频率:</strong>
+                <ul style="margin: 5px 0;">
+                    <li>每周一至周五 21:00 (北京时间) 自动检查</li>
+                    <li>信号产生后,在下一个交易日开盘时执行</li>
+                    <li>节假日和非交易日自动跳过</li>
+                </ul>
+            </div>
+            
+            <p style="margin-top: 15px; padding: 12px; background: #ffebee; border-left: 4px solid #f44336; border-radius: 4px;">
+                <strong>⚠️ 重要提示:</strong> 本策略基于技术分析,不构成投资建议。市场有风险,投资需谨慎。建议结合基本面分析和市场环境综合判断。
+            </p>
+        </div>
+        
+        <p style="margin-top: 20px; padding: 15px; background: #fff3cd; border-radius: 5px;">
+            <strong>⚠️ 提醒:</strong> 请在美股交易时间内执行,并记录交易详情
+        </p>
+    </div>
+</body>
+</html>
+            """,
+)
+
+# 末尾的检查时间沿用原正文: 原实现这一段不是 f-string, 花括号原样输出
+NO_SIGNAL_TEMPLATE = EmailTemplate(
+    _stylesheet("linear-gradient(135deg, #28a745 0%, #20c997 100%)", """        .success-box {
+            background: #d4edda;
+            border: 1px solid #28a745;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 5px;
+            text-align: center;
+        }
+        .position-box {
+            background: white;
+            border: 2px solid #667eea;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 5px;
+        }
+        .strategy-box {
+            background: #fff8e1;
+            border: 2px solid #ffc107;
+            padding: 20px;
+            margin: 20px 0;
+            border-radius: 5px;
+        }
+        .strategy-box h3 {
+            color: #ff6f00;
+            margin-top: 0;
+            margin-bottom: 15px;
+        }
+        .strategy-box ul {
+            margin: 10px 0;
+            padding-left: 20px;
+        }
+        .strategy-box li {
+            margin: 8px 0;
+        }
+        .rule-item {
+            background: white;
+            padding: 10px;
+            margin: 8px 0;
+            border-left: 4px solid #ffc107;
+            border-radius: 3px;
+        }
+"""),
+    """
+    <div class="header">
+        <h1>✅ {strategy_type}检查完成</h1>
+        <p>{symbol} 策略运行正常</p>
+    </div>
+    <div class="content">
+        <div class="success-box">
+            <h2 style="color: #28a745; margin-top: 0;">📊 {symbol} 检查结果</h2>
+            <p style="font-size: 18px;"><strong>暂无新交易信号</strong></p>
+            <p>策略运行正常,继续持有当前仓位即可</p>
+        </div>
+        {position}
+        {info}
+        <div class="strategy-box">
+            <h3>📊 策略算法与规则说明</h3>
+            
+            <h4 style="color: #ff6f00; margin-top: 15px;">💡 策略类型: 动量交易策略</h4>
+            <p style="margin: 10px 0;">基于短期和中期移动平均线的动量突破策略,结合成交量确认和风险管理。</p>
+            
+            <h4 style="color: #ff6f00; margin-top: 15px;">🔍 核心算法</h4>
+            <div class="rule-item">
+                <strong>1. 趋势判断 (双均线系统)</strong>
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li><strong>MA5</strong> (5日均线): 短期价格动量指标</li>
+                    <li><strong>MA20</strong> (20日均线): 中期趋势方向指标</li>
+                    <li><strong>金叉</strong>: MA5上穿MA20 → 多头信号</li>
+                    <li><strong>死叉</strong>: MA5下穿MA20 → 空头信号</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>2. 成交量确认</strong>
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li>成交量需超过<strong>20日平均成交量的1.3倍</strong></li>
+                    <li>确保信号有足够的市场参与度和真实性</li>
+                    <li>过滤掉低成交量的虚假突破</li>
+                </ul>
+            </div>
+            
+            <h4 style="color: #ff6f00; margin-top: 15px;">📈 交易信号规则</h4>
+            <div class="rule-item">
+                <strong>🟢 买入信号 (BUY)</strong>
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li>MA5 > MA20 (短期均线在长期均线上方)</li>
+                    <li>当日收盘价 > MA5 (价格在短期均线上方)</li>
+                    <li>成交量 ≥ 1.3 × 平均成交量</li>
+                    <li>当前无持仓(空仓状态)</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>🔴 卖出信号 (SELL)</strong>
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li>MA5 < MA20 (短期均线在长期均线下方)</li>
+                    <li>当日收盘价 < MA5 (价格在短期均线下方)</li>
+                    <li>成交量 ≥ 1.3 × 平均成交量</li>
+                    <li>当前有持仓</li>
+                </ul>
+            </div>
+            
+            <h4 style="color: #ff6f00; margin-top: 15px;">🛡️ 风险管理</h4>
+            <div class="rule-item">
+                <strong>仓位管理</strong>
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li><strong>固定仓位比例</strong>: 每次交易使用账户资金的<strong>60%</strong></li>
+                    <li><strong>保留现金</strong>: 40%现金应对突发情况</li>
+                </ul>
+            </div>
+            
+            <div class="rule-item">
+                <strong>止盈止损</strong>
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li><strong>止盈</strong>: 盈利达到<strong>5%</strong>自动平仓</li>
+                    <li><strong>止损</strong>: 亏损达到<strong>2%</strong>自动平仓</li>
+                    <li><strong>风险收益比</strong>: 2.5:1 (高于行业标准的2:1)</li>
+                </ul>
+            </div>
+            
+            <h4 style="color: #ff6f00; margin-top: 15px;">⏰ 检查频率</h4>
+            <div class="rule-item">
+                <ul style="margin: 5px 0; padding-left: 20px;">
+                    <li><strong>检查时间</strong>: 每周一至周五晚上21:00</li>
+                    <li><strong>数据更新</strong>: 使用当日美股收盘后数据</li>
+                    <li><strong>信号生成</strong>: 基于最新1天的K线数据</li>
+                    <li><strong>执行时间</strong>: 次日美股交易时段(9:30-16:00 ET)</li>
+                </ul>
+            </div>
+            
+            <p style="margin-top: 15px; padding: 10px; background: #ffe082; border-radius: 5px;">
+                <strong>⚠️ 重要提示:</strong> 本策略为技术分析策略,仅供参考。实际交易请结合基本面分析、市场情绪、宏观经济等多方面因素综合判断。
+            </p>
+        </div>
+        
+        <p style="padding: 15px; background: #e7f3ff; border-radius: 5px;">
+            <strong>💡 提示:</strong> 无需任何操作,系统将继续自动检查
+        </p>
+        <p style="text-align: center; color: #666; margin-top: 30px;">
+            📅 检查时间: {{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}}
+        </p>
+    </div>
+</body>
+</html>
+            """,
+)
+
+POSITION_TEMPLATE = EmailTemplate(None, """
+        <div class="position-box">
+            <h2 style="color: #667eea; margin-top: 0;">📊 当前持仓</h2>
+            <table style="width: 100%; border-collapse: collapse;">
+                <tr style="background: #f0f0f0;">
+                    <td style="padding: 10px; border: 1px solid #ddd;"><strong>股票代码</strong></td>
+                    <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">{symbol}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; border: 1px solid #ddd;"><strong>持仓数量</strong></td>
+                    <td style="padding: 10px; border: 1px solid #ddd; text-align: right;"><strong>{quantity:,} 股</strong></td>
+                </tr>
+                <tr style="background: #f0f0f0;">
+                    <td style="padding: 10px; border: 1px solid #ddd;"><strong>平均成本</strong></td>
+                    <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">${avg_price:.2f}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; border: 1px solid #ddd;"><strong>当前价格</strong></td>
+                    <td style="padding: 10px; border: 1px solid #ddd; text-align: right;">${current_price:.2f}</td>
+                </tr>
+                <tr style="background: #f0f0f0;">
+                    <td style="padding: 10px; border: 1px solid #ddd;"><strong>市值</strong></td>
+                    <td style="padding: 10px; border: 1px solid #ddd; text-align: right;"><strong>${market_value:,.2f}</strong></td>
+                </tr>
+                <tr>
+                    <td style="padding: 10px; border: 1px solid #ddd;"><strong>浮动盈亏</strong></td>
+                    <td style="padding: 10px; border: 1px solid #ddd; text-align: right; color: {pnl_color};">
+                        <strong>{pnl_symbol}${abs_profit_loss:,.2f} ({pnl_symbol}{profit_loss_pct:.2f}%)</strong>
+                    </td>
+                </tr>
+            </table>
+        </div>
+                """)
+
+_EMPTY_POSITION_BLOCK = """
+        <div class="position-box">
+            <h2 style="color: #667eea; margin-top: 0;">📊 当前持仓</h2>
+            <p style="text-align: center; font-size: 18px; color: #666; padding: 30px 0;">
+                <strong>⚪ 空仓</strong><br>
+                <span style="font-size: 14px;">等待买入信号</span>
+            </p>
+        </div>
+                """
+
+INFO_TEMPLATE = EmailTemplate(None, """
+        <div style="background: #fff3cd; border: 2px solid #ffc107; padding: 20px; margin: 20px 0; border-radius: 5px;">
+            {message}
+        </div>
+        """)
+
+
+@dataclass
+class SignalContext:
+    """交易信号邮件"""
+    symbol: str
+    action: str
+    quantity: int
+    price: float
+    reason: str
+    signal_date: str
+    strategy_name: str = "TSLA策略"
+    sent_at: Optional[datetime] = None       # None 表示渲染时刻
+
+
+@dataclass
+class PositionContext:
+    """当前持仓"""
+    symbol: str = 'N/A'
+    quantity: int = 0
+    avg_price: float = 0
+    current_price: float = 0
+    market_value: float = 0
+    profit_loss: float = 0
+    profit_loss_pct: float = 0
+
+    @classmethod
+    def from_info(cls, info: Optional[dict]) -> Optional['PositionContext']:
+        """持仓字典 -> 上下文, 没有持仓时返回 None"""
+        if not info or info.get('quantity', 0) <= 0:
+            return None
+        return cls(
+            symbol=info.get('symbol', 'N/A'),
+            quantity=info.get('quantity', 0),
+            avg_price=info.get('avg_price', 0),
+            current_price=info.get('current_price', 0),
+            market_value=info.get('market_value', 0),
+            profit_loss=info.get('profit_loss', 0),
+            profit_loss_pct=info.get('profit_loss_pct', 0),
+        )
+
+
+@dataclass
+class SummaryContext:
+    """检查总结邮件"""
+    strategy_type: str = "周度策略"
+    symbol: str = "TSLA"
+    has_signal: bool = False
+    signal_count: int = 0
+    latest_signal: Optional[dict] = None
+    message: Optional[str] = None            # 错误信息或附加信息
+    is_error: bool = False
+    position: Optional[PositionContext] = None
+
+
+def render_signal(context: SignalContext) -> str:
+    """交易信号邮件正文"""
+    action_cn, action_color = action_style(context.action)
+    sent_at = context.sent_at or datetime.now()
+    return SIGNAL_TEMPLATE.render(
+        action_color,
+        symbol=context.symbol,
+        action=context.action,
+        action_cn=action_cn,
+        action_color=action_color,
+        quantity=context.quantity,
+        price=context.price,
+        total=context.quantity * context.price,
+        reason=context.reason,
+        signal_date=context.signal_date,
+        strategy_name=context.strategy_name,
+        sent_at=sent_at.strftime('%Y-%m-%d %H:%M:%S'),
+    )
+
+
+def render_position(position: Optional[PositionContext]) -> str:
+    """持仓表格, 空仓时为空仓提示"""
+    if position is None:
+        return _EMPTY_POSITION_BLOCK
+    gain = position.profit_loss >= 0
+    return POSITION_TEMPLATE.render(
+        symbol=position.symbol,
+        quantity=position.quantity,
+        avg_price=position.avg_price,
+        current_price=position.current_price,
+        market_value=position.market_value,
+        pnl_color=BUY_COLOR if gain else SELL_COLOR,
+        pnl_symbol="+" if gain else "",
+        abs_profit_loss=abs(position.profit_loss),
+        profit_loss_pct=position.profit_loss_pct,
+    )
+
+
+def render_summary(context: SummaryContext) -> str:
+    """检查总结邮件正文: 错误 / 有信号 / 无信号(含持仓)"""
+    if context.message and context.is_error:
+        return ERROR_TEMPLATE.render(strategy_type=context.strategy_type, message=context.message)
+
+    if context.has_signal and context.latest_signal:
+        signal = context.latest_signal
+        action_cn, action_color = action_style(signal.get('action', 'UNKNOWN'))
+        return HAS_SIGNAL_TEMPLATE.render(
+            action_color,
+            symbol=context.symbol,
+            strategy_type=context.strategy_type,
+            signal_count=context.signal_count,
+            action_cn=action_cn,
+            action_color=action_color,
+            quantity=signal.get('quantity', 0),
+            date=signal.get('date', 'N/A'),
+        )
+
+    position = context.position
+    info = ""
+    if context.message:
+        info = INFO_TEMPLATE.render(message=context.message.replace('\n', '<br>'))
+    return NO_SIGNAL_TEMPLATE.render(
+        # 有持仓时标题显示持仓的股票代码
+        symbol=position.symbol if position else context.symbol,
+        strategy_type=context.strategy_type,
+        position=render_position(position),
+        info=info,
+    )
@@ -0,0 +1,158 @@
+"""
+SMTP 发送
+
+send_once: 一次连接、登录、发送、断开
+SMTPSessionPool: 一批邮件内每个账户只握手(连接 + STARTTLS + 登录)一次, 之后复用会话
+
+均不重试; 重试和账户切换由调用方(发件队列/EmailService)负责。
+"""
+import smtplib
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from email.header import Header
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+
+# 单次发送的 SMTP 超时(秒)
+SMTP_TIMEOUT = 20
+
+
+def build_message(sender: str, recipient: str, subject: str, body: str) -> MIMEMultipart:
+    """HTML 邮件"""
+    message = MIMEMultipart('alternative')
+    message['From'] = sender
+    message['To'] = recipient
+    message['Subject'] = Header(subject, 'utf-8')
+    message.attach(MIMEText(body, 'html', 'utf-8'))
+    return message
+
+
+def connect(account, timeout: float = SMTP_TIMEOUT) -> smtplib.SMTP:
+    """连接并登录 SMTP 服务器(SSL 或 STARTTLS)"""
+    if account.use_ssl:
+        server = smtplib.SMTP_SSL(account.smtp_server, account.smtp_port, timeout=timeout)
+    else:
+        server = smtplib.SMTP(account.smtp_server, account.smtp_port, timeout=timeout)
+    try:
+        if not account.use_ssl and account.use_tls:
+            server.starttls()
+        server.login(account.sender_email, account.sender_password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def send_once(account, recipient: str, subject: str, body: str, timeout: float = SMTP_TIMEOUT):
+    """
+    用指定账户发送一封邮件, 失败时抛出 smtplib.SMTPException / OSError
+
+    Args:
+        account: EmailAccountConfig
+        recipient: 收件人
+        subject: 邮件主题
+        body: 邮件正文 (HTML格式)
+        timeout: SMTP 超时(秒)
+    """
+    server = connect(account, timeout)
+    try:
+        server.send_message(build_message(account.sender_email, recipient, subject, body))
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass  # 已发送成功, 忽略quit错误
+    finally:
+        server.close()
+
+
+@dataclass
+class BatchStats:
+    """一批邮件的发送统计"""
+    sent: int = 0
+    failed: int = 0
+    handshakes: int = 0
+    latencies: List[float] = field(default_factory=list)   # 每封邮件的发送耗时(含握手)
+    started: float = field(default_factory=time.perf_counter)
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        average = sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+        return (f"发送 {self.sent} 封, 失败 {self.failed} 次, SMTP 握手 {self.handshakes} 次, "
+                f"平均每封 {average:.2f}s, 总耗时 {elapsed:.2f}s")
+
+
+class SMTPSessionPool:
+    """
+    一批邮件共用的 SMTP 会话: 每个账户保持一个已登录的连接
+
+    send() 与 send_once 参数相同, 可直接替换; 复用的连接已被服务器断开时自动重连一次。
+    用完后调用 close() (或使用 with 语句) 断开全部连接。
+
+    Args:
+        timeout: SMTP 超时(秒)
+    """
+
+    def __init__(self, timeout: float = SMTP_TIMEOUT):
+        self.timeout = timeout
+        self.stats = BatchStats()
+        self._sessions: Dict[Tuple, smtplib.SMTP] = {}
+
+    @staticmethod
+    def _key(account) -> Tuple:
+        return (account.smtp_server, account.smtp_port, account.sender_email)
+
+    def _session(self, account, timeout: float) -> Tuple[smtplib.SMTP, bool]:
+        """(会话, 是否为复用的会话)"""
+        key = self._key(account)
+        server = self._sessions.get(key)
+        if server is not None:
+            return server, True
+        server = connect(account, timeout)
+        self.stats.handshakes += 1
+        self._sessions[key] = server
+        return server, False
+
+    def _drop(self, account):
+        server = self._sessions.pop(self._key(account), None)
+        if server is not None:
+            server.close()
+
+    def send(self, account, recipient: str, subject: str, body: str, timeout: float = None):
+        """用指定账户的会话发送一封邮件, 失败时抛出异常并断开该账户的会话"""
+        start = time.perf_counter()
+        message = build_message(account.sender_email, recipient, subject, body)
+        try:
+            server, reused = self._session(account, timeout or self.timeout)
+            try:
+                server.send_message(message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                if not reused:
+                    raise
+                # 空闲连接已被服务器关闭: 重新握手后再发一次
+                self._drop(account)
+                server, _ = self._session(account, timeout or self.timeout)
+                server.send_message(message)
+        except Exception:
+            self._drop(account)
+            self.stats.failed += 1
+            raise
+        self.stats.sent += 1
+        self.stats.latencies.append(time.perf_counter() - start)
+
+    def close(self):
+        for server in self._sessions.values():
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            finally:
+                server.close()
+        self._sessions.clear()
+
+    def __enter__(self) -> 'SMTPSessionPool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
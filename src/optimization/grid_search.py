@@ -7,7 +7,8 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from itertools import product
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass, asdict
 
@@ -15,9 +16,12 @@ from dataclasses import dataclass, asdict
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.data.loader import CSVPriceLoader
+from src.data.loader import CSVPriceLoader, PriceBar
+from src.data.feature_store import FeatureStore, SymbolFeatures
 from src.signals.momentum import MomentumSignalModel, TradeAction as SignalAction
 from src.portfolio.allocator import PositionAllocator, RiskBudget
+from src.backtest.costs import DEFAULT_COST_MODEL, CostModel, cost_sensitivity
+from src.backtest.engine import bar_liquidity
 from src.backtest.enhanced_engine import EnhancedBacktester, RiskConfig, TradeAction
 
 
@@ -51,6 +55,8 @@ class OptimizationResult:
     max_drawdown: float
     win_rate: float
     total_trades: int
+    cost_pct: float = 0.0       # 交易成本占初始资金比例
+    cost_pct_2x: float = 0.0    # 成本翻倍时的比例(不重跑回测)
     
     def to_dict(self) -> Dict:
         """转换为字典"""
@@ -62,6 +68,8 @@ class OptimizationResult:
             'max_drawdown': self.max_drawdown,
             'win_rate': self.win_rate,
             'total_trades': self.total_trades,
+            'cost_pct': self.cost_pct,
+            'cost_pct_2x': self.cost_pct_2x,
         })
         return result
 
@@ -69,10 +77,28 @@ class OptimizationResult:
 class ParameterOptimizer:
     """参数优化器"""
     
-    def __init__(self, price_data: pd.DataFrame, initial_cash: float = 100000.0):
+    def __init__(
+        self,
+        price_data: pd.DataFrame,
+        initial_cash: float = 100000.0,
+        symbol: str = "TSLA",
+        feature_store: FeatureStore = None,
+        cost_model: Optional[CostModel] = None
+    ):
         self.price_data = price_data
         self.initial_cash = initial_cash
+        self.symbol = symbol
         self.results: List[OptimizationResult] = []
+        # 各窗口的均线在所有参数组合间共享, 每个窗口只计算一次
+        self.feature_store = feature_store or FeatureStore()
+        self.features: SymbolFeatures = self.feature_store.for_frame(symbol, price_data)
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        # 成本敏感性按成交日查成交量和振幅
+        # 缺少成交量或最高/最低价列时与回测一样不计市场冲击
+        self._dates = pd.DatetimeIndex(pd.to_datetime(price_data['date']))
+        volumes, ranges = bar_liquidity(price_data)
+        self._volumes = None if None in volumes else np.asarray(volumes, dtype=np.float64)
+        self._ranges = None if None in ranges else np.asarray(ranges, dtype=np.float64)
     
     def grid_search(
         self,
@@ -111,17 +137,13 @@ class ParameterOptimizer:
         print(f"🔍 开始网格搜索: 共 {total} 个参数组合\n")
         
         # 转换价格数据为bars
-        from src.data.loader import PriceBar
+        data = self.price_data
         bars = [
-            PriceBar(
-                date=row['date'].date(),
-                open=row['open'],
-                high=row['high'],
-                low=row['low'],
-                close=row['close'],
-                volume=row['volume']
+            PriceBar(date=date.date(), open=o, high=h, low=l, close=c, volume=v)
+            for date, o, h, l, c, v in zip(
+                data['date'], data['open'].tolist(), data['high'].tolist(),
+                data['low'].tolist(), data['close'].tolist(), data['volume'].tolist()
             )
-            for _, row in self.price_data.iterrows()
         ]
         
         # 遍历所有组合
@@ -168,7 +190,7 @@ class ParameterOptimizer:
             long_window=params.long_window,
             threshold=params.threshold
         )
-        decisions = model.generate(bars)
+        decisions = model.generate(bars, self.features)
         filtered_decisions = model.filter_trading_slots(
             decisions, 
             max_trades_per_week=params.max_trades_per_week
@@ -176,7 +198,7 @@ class ParameterOptimizer:
         
         # 2. 转换信号
         allocator = PositionAllocator(
-            symbol="TSLA",
+            symbol=self.symbol,
             risk_budget=RiskBudget(capital=self.initial_cash)
         )
         
@@ -206,11 +228,21 @@ class ParameterOptimizer:
         backtester = EnhancedBacktester(
             initial_cash=self.initial_cash,
             commission_rate=0.001,
-            risk_config=risk_config
+            risk_config=risk_config,
+            cost_model=self.cost_model
         )
         
         metrics = backtester.run(self.price_data, signals)
         
+        # 成本 1x / 2x: 整批成交一次数组运算
+        fills = backtester.account.fills.view()
+        rows = self._dates.get_indexer(fills['date'])
+        costs = cost_sensitivity(
+            self.cost_model, fills['side'], fills['price'], fills['quantity'], (1.0, 2.0),
+            None if self._volumes is None else self._volumes[rows],
+            None if self._ranges is None else self._ranges[rows]
+        ) / self.initial_cash
+        
         # 4. 返回结果
         return OptimizationResult(
             params=params,
@@ -219,7 +251,9 @@ class ParameterOptimizer:
             sharpe_ratio=metrics.sharpe_ratio,
             max_drawdown=metrics.max_drawdown,
             win_rate=metrics.win_rate,
-            total_trades=metrics.total_trades
+            total_trades=metrics.total_trades,
+            cost_pct=float(costs[0]),
+            cost_pct_2x=float(costs[1])
         )
     
     def _results_to_dataframe(self) -> pd.DataFrame:
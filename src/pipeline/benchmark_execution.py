@@ -0,0 +1,82 @@
+"""
+异步下单网关基准
+
+用样本K线生成多只(虚拟)股票的动量信号, 经 PositionAllocator 定量后通过 ExecutionGateway
+并发提交给 SimulatedBroker(延迟、滑点、按成交量部分成交), 统计:
+1. 信号到最后一笔成交的延迟(均值 / p50 / p95)
+2. 每秒完成的订单数、各状态订单数和部分成交比例
+
+用法:
+    python -m src.pipeline.benchmark_execution --symbols 50 --latency 0.02 --jitter 0.03
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.loader import CSVPriceLoader
+from src.execution.gateway import ExecutionGateway, SimulatedBroker
+from src.portfolio.allocator import PositionAllocator, RiskBudget
+from src.signals.momentum import MomentumSignalModel, TradeAction
+
+
+def build_plans(bars: list, symbols: int, capital: float) -> list:
+    """每只股票取最后一个非 HOLD 信号, 生成下单计划"""
+    model = MomentumSignalModel(short_window=3, long_window=6, threshold=0.01)
+    decisions = [d for d in model.generate(bars) if d.action != TradeAction.HOLD]
+    plans = []
+    for i in range(symbols):
+        symbol = f"SYM{i:03d}"
+        allocator = PositionAllocator(symbol=symbol, risk_budget=RiskBudget(capital=capital))
+        plans.append(allocator.propose(decisions[i % len(decisions)]))
+    return plans
+
+
+async def run(plans: list, broker: SimulatedBroker):
+    fills = []
+    gateway = ExecutionGateway(broker, on_fill=[lambda order, fill: fills.append(fill)])
+    start = time.perf_counter()
+    orders = await gateway.submit_many(plans)
+    return gateway, orders, fills, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步下单网关基准")
+    parser.add_argument("--symbols", type=int, default=50, help="股票数量 (默认50)")
+    parser.add_argument("--capital", type=float, default=100_000, help="每只股票的资金 (默认10万)")
+    parser.add_argument("--latency", type=float, default=0.02, help="券商延迟(秒)")
+    parser.add_argument("--jitter", type=float, default=0.03, help="延迟随机抖动(秒)")
+    parser.add_argument("--slices", type=int, default=4, help="每笔订单最多拆分的成交笔数")
+    parser.add_argument("--participation", type=float, default=0.1,
+                        help="单根K线最大成交量占比, 调小可模拟部分成交")
+    args = parser.parse_args()
+
+    bars = CSVPriceLoader(project_root / "data" / "sample_tsla.csv").load()
+    plans = build_plans(bars, args.symbols, args.capital)
+    broker = SimulatedBroker(
+        {plan.symbol: bars[-1] for plan in plans}, latency=args.latency, jitter=args.jitter,
+        slices=args.slices, participation=args.participation, seed=7
+    )
+    gateway, orders, fills, elapsed = asyncio.run(run(plans, broker))
+
+    statuses = {}
+    for order in orders:
+        statuses[order.status.value] = statuses.get(order.status.value, 0) + 1
+    stats = gateway.latency_stats()
+    print("=" * 60)
+    print(f"📊 下单网关基准 ({len(orders)} 笔订单, {len(fills)} 笔成交)")
+    print("=" * 60)
+    print(f"  总耗时:   {elapsed:8.3f}s  {len(orders) / elapsed:>10,.0f} 订单/秒")
+    if stats["orders"]:
+        print(f"  延迟:     均值 {stats['mean'] * 1000:.1f}ms  p50 {stats['p50'] * 1000:.1f}ms  "
+              f"p95 {stats['p95'] * 1000:.1f}ms  最大 {stats['max'] * 1000:.1f}ms")
+    print("  订单状态: " + ", ".join(f"{name} {count}" for name, count in sorted(statuses.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
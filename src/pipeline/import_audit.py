@@ -0,0 +1,192 @@
+"""
+入口脚本导入耗时审计
+
+在独立的解释器中用 `python -X importtime` 导入各入口模块, 统计:
+1. 导入总耗时和进程启动到退出的耗时
+2. 自身耗时最多的模块、按顶层包汇总的耗时
+3. 是否导入了 yfinance / plotly / matplotlib / requests 等重量级依赖(pandas 自带的 pytz 不计)
+
+用法:
+    python -m src.pipeline.import_audit                                  # 审计全部入口
+    python -m src.pipeline.import_audit src.pipeline.run_daily_pipeline --top 20
+    python -m src.pipeline.import_audit --budget 1.0 \\
+        --run "-m src.pipeline.run_daily_pipeline --no-update --no-email --no-reports"
+"""
+import argparse
+import json
+import re
+import shlex
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+# 默认审计的入口模块
+ENTRY_POINTS = [
+    "src.pipeline.run_daily_pipeline",
+    "src.pipeline.run_daily_strategies",
+    "src.pipeline.run_daily_check_email",
+    "src.pipeline.run_daily_check_email_nvda",
+    "src.pipeline.run_daily_check_email_intc",
+    "src.pipeline.smart_daily_check",
+    "src.pipeline.run_reports",
+    "send_all_strategy_emails",
+]
+
+# 只在个别分支用到、应当延迟导入的依赖
+HEAVY_PACKAGES = ("yfinance", "plotly", "matplotlib", "scipy", "requests", "dotenv")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportEntry:
+    """一个模块的导入耗时(微秒)"""
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".")[0]
+
+
+@dataclass
+class ImportProfile:
+    """一个入口模块的导入情况"""
+    module: str
+    wall_seconds: float
+    entries: List[ImportEntry] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def import_seconds(self) -> float:
+        """入口模块自身的累计导入耗时"""
+        for entry in self.entries:
+            if entry.name == self.module:
+                return entry.cumulative_us / 1e6
+        return 0.0
+
+    def top(self, n: int = 10) -> List[ImportEntry]:
+        """自身耗时最多的 n 个模块"""
+        return sorted(self.entries, key=lambda entry: -entry.self_us)[:n]
+
+    def packages(self) -> Dict[str, float]:
+        """按顶层包汇总的自身耗时(秒), 从大到小"""
+        totals: Dict[str, int] = {}
+        for entry in self.entries:
+            totals[entry.package] = totals.get(entry.package, 0) + entry.self_us
+        return {name: us / 1e6 for name, us in sorted(totals.items(), key=lambda item: -item[1])}
+
+    def heavy(self) -> Dict[str, float]:
+        """已导入的重量级依赖及其耗时(秒)"""
+        packages = self.packages()
+        return {name: packages[name] for name in HEAVY_PACKAGES if name in packages}
+
+
+def parse_importtime(stderr: str) -> List[ImportEntry]:
+    """解析 -X importtime 的输出"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append(ImportEntry(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def audit(module: str, python: str = sys.executable) -> ImportProfile:
+    """在新解释器中导入 module 并统计耗时"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"退出码 {proc.returncode}"
+    return ImportProfile(module, wall, parse_importtime(proc.stderr), error)
+
+
+def time_command(args: Sequence[str], python: str = sys.executable) -> float:
+    """运行 python <args> 直到退出, 返回耗时(秒)"""
+    start = time.perf_counter()
+    subprocess.run([python, *args], cwd=project_root, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def print_profile(profile: ImportProfile, top: int = 10):
+    """打印一个入口模块的审计结果"""
+    print("=" * 80)
+    if profile.error:
+        print(f"❌ {profile.module}: {profile.error}")
+        return
+    print(f"📦 {profile.module}: 导入 {profile.import_seconds:.3f}s, 进程 {profile.wall_seconds:.3f}s, "
+          f"{len(profile.entries)} 个模块")
+    print("  按包汇总:")
+    for name, seconds in list(profile.packages().items())[:top]:
+        print(f"    {name:<28} {seconds * 1000:>8.1f} ms")
+    print("  自身耗时最多的模块:")
+    for entry in profile.top(top):
+        print(f"    {entry.name:<48} {entry.self_us / 1000:>8.1f} ms")
+    heavy = profile.heavy()
+    if heavy:
+        print("  ⚠️  重量级依赖: " + ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in heavy.items()))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="入口脚本导入耗时审计")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="入口模块, 默认全部")
+    parser.add_argument("--top", type=int, default=10, help="每项列出的模块数")
+    parser.add_argument("--run", help='同时计时一条完整命令, 例如 "-m src.pipeline.run_daily_pipeline --no-email"')
+    parser.add_argument("--budget", type=float, default=None, help="--run 命令的耗时上限(秒), 超出时退出码为 1")
+    parser.add_argument("--json", type=Path, help="把结果写入 JSON 文件")
+    args = parser.parse_args(argv)
+
+    profiles = [audit(module) for module in args.modules]
+    for profile in profiles:
+        print_profile(profile, args.top)
+
+    print("=" * 80)
+    print("📋 汇总 (导入耗时 / 重量级依赖):")
+    for profile in sorted(profiles, key=lambda p: -p.import_seconds):
+        heavy = ", ".join(profile.heavy()) or "-"
+        print(f"  {profile.module:<44} {profile.import_seconds:>7.3f}s  {heavy}")
+
+    status = 0
+    run_seconds = None
+    if args.run:
+        run_seconds = time_command(shlex.split(args.run))
+        over = args.budget is not None and run_seconds > args.budget
+        status = 1 if over else 0
+        budget = f" (上限 {args.budget:.2f}s)" if args.budget is not None else ""
+        print(f"{'❌' if over else '✅'} python {args.run}: {run_seconds:.3f}s{budget}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'profiles': {
+                    p.module: {
+                        'import_seconds': p.import_seconds,
+                        'wall_seconds': p.wall_seconds,
+                        'packages': p.packages(),
+                        'heavy': p.heavy(),
+                        'error': p.error,
+                    }
+                    for p in profiles
+                },
+                'run_seconds': run_seconds,
+            }, f, ensure_ascii=False, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
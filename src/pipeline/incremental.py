@@ -0,0 +1,226 @@
+"""
+日度策略断点续跑 (只回放新增K线)
+
+每次运行结束后把策略状态(持仓、入场价、现金、上次交易日)、
+已生成的信号和回测账户(净值缓冲区、成交)写入检查点。
+下次运行时:
+1. 检查点中已处理的K线与当前数据完全一致 -> 只推进新增K线
+2. 历史数据被修改/策略参数或成本模型变化/检查点损坏 -> 自动全量回放
+
+滚动窗口(动量、均量、均线)直接由K线序列计算, 因此无需单独保存;
+续跑结果与全量回放完全一致。
+"""
+import dataclasses
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import Backtester, BacktestAccount, TradeAction
+from src.data.loader import PriceBar
+
+
+CHECKPOINT_VERSION = 1
+
+
+def bars_to_array(bars: List[PriceBar]) -> np.ndarray:
+    """K线 -> (n, 6) 数组 [日期序号, open, high, low, close, volume]"""
+    return np.array(
+        [(b.date.toordinal(), b.open, b.high, b.low, b.close, b.volume) for b in bars],
+        dtype=np.float64
+    ).reshape(-1, 6)
+
+
+def bars_fingerprint(bar_array: np.ndarray, count: int) -> str:
+    """前 count 根K线的指纹"""
+    return hashlib.sha1(np.ascontiguousarray(bar_array[:count]).tobytes()).hexdigest()
+
+
+def _cost_model_params(cost_model) -> Optional[Dict]:
+    """成本模型 -> 可序列化的参数字典"""
+    return dataclasses.asdict(cost_model) if dataclasses.is_dataclass(cost_model) else None
+
+
+def strategy_params(strategy, account_cost_model=None) -> Dict:
+    """
+    策略的标量参数和成本模型(任一变化时检查点失效)
+
+    Args:
+        strategy: 策略
+        account_cost_model: 回测账户的成本模型(决定检查点中的成交价和现金)
+    """
+    params = {
+        key: value for key, value in sorted(vars(strategy).items())
+        if isinstance(value, (int, float, str, bool, type(None)))
+    }
+    params['cost_model'] = _cost_model_params(getattr(strategy, 'cost_model', None))
+    params['account_cost_model'] = _cost_model_params(account_cost_model)
+    return params
+
+
+def _dump_signal(signal: dict) -> dict:
+    data = dict(signal)
+    data['date'] = signal['date'].isoformat()
+    data['action'] = signal['action'].value
+    return data
+
+
+def _load_signal(data: dict) -> dict:
+    signal = dict(data)
+    signal['date'] = pd.Timestamp(data['date'])
+    signal['action'] = TradeAction(data['action'])
+    return signal
+
+
+def _dump_state(state: dict) -> dict:
+    data = dict(state)
+    if data.get('last_trade_date') is not None:
+        data['last_trade_date'] = data['last_trade_date'].isoformat()
+    return data
+
+
+def _load_state(data: dict) -> dict:
+    state = dict(data)
+    if state.get('last_trade_date') is not None:
+        state['last_trade_date'] = pd.Timestamp(state['last_trade_date'])
+    return state
+
+
+def bars_to_frame(bars: List[PriceBar]) -> pd.DataFrame:
+    """K线 -> 回测用 DataFrame"""
+    return pd.DataFrame([
+        {
+            'date': pd.Timestamp(bar.date),
+            'open': bar.open,
+            'high': bar.high,
+            'low': bar.low,
+            'close': bar.close,
+            'volume': bar.volume
+        }
+        for bar in bars
+    ])
+
+
+class IncrementalStrategyRunner:
+    """
+    日度策略断点续跑器
+
+    要求策略实现:
+        initial_state() -> dict
+        generate_signals(bars, state=None, start_idx=0) -> List[dict]
+    """
+
+    def __init__(self, strategy, checkpoint_path: Path):
+        self.strategy = strategy
+        self.checkpoint_path = Path(checkpoint_path)
+
+    def load_checkpoint(self) -> Optional[Dict]:
+        """读取检查点, 不存在或损坏时返回 None"""
+        if not self.checkpoint_path.exists():
+            return None
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _params(self, backtester: Backtester) -> Dict:
+        return strategy_params(self.strategy, backtester.account.cost_model)
+
+    def _is_valid(self, checkpoint: Optional[Dict], bar_array: np.ndarray, backtester: Backtester) -> bool:
+        """检查点是否可用于续跑"""
+        if not checkpoint or checkpoint.get('version') != CHECKPOINT_VERSION:
+            return False
+        if checkpoint.get('params') != self._params(backtester):
+            return False
+        processed = checkpoint.get('bars_processed', 0)
+        if processed <= 0 or processed > len(bar_array):
+            return False
+        return checkpoint.get('fingerprint') == bars_fingerprint(bar_array, processed)
+
+    def run(
+        self,
+        bars: List[PriceBar],
+        backtester: Backtester,
+        price_df: Optional[pd.DataFrame] = None
+    ) -> Dict:
+        """
+        生成信号并回测(可续跑时只处理新增K线)
+
+        Args:
+            bars: 全部K线
+            backtester: 新建的回测器(续跑时会恢复其账户)
+            price_df: 回测用价格 DataFrame, 默认由 bars 生成
+
+        Returns:
+            {
+                'signals': 全部信号,
+                'new_signals': 本次新增信号,
+                'metrics': 回测指标,
+                'backtester': 回测器,
+                'mode': 'incremental' 或 'full',
+                'new_bars': 本次处理的K线数
+            }
+        """
+        bar_array = bars_to_array(bars)
+        checkpoint = self.load_checkpoint()
+        if price_df is None:
+            price_df = bars_to_frame(bars)
+
+        if self._is_valid(checkpoint, bar_array, backtester):
+            start_idx = checkpoint['bars_processed']
+            state = _load_state(checkpoint['state'])
+            signals = [_load_signal(s) for s in checkpoint['signals']]
+            new_signals = self.strategy.generate_signals(bars, state=state, start_idx=start_idx)
+
+            cost_model = backtester.account.cost_model   # 与检查点参数中的成本模型一致
+            backtester.account = BacktestAccount.from_state(checkpoint['account'])
+            backtester.account.cost_model = cost_model
+            metrics = backtester.advance(
+                price_df,
+                [(s['date'], s['action'], s['quantity']) for s in new_signals]
+            )
+            mode = 'incremental'
+        else:
+            start_idx = 0
+            state = self.strategy.initial_state()
+            signals = []
+            new_signals = self.strategy.generate_signals(bars, state=state)
+            metrics = backtester.run(
+                price_df,
+                [(s['date'], s['action'], s['quantity']) for s in new_signals]
+            )
+            mode = 'full'
+
+        signals = signals + new_signals
+        self._save_checkpoint(bar_array, state, signals, backtester)
+
+        return {
+            'signals': signals,
+            'new_signals': new_signals,
+            'metrics': metrics,
+            'backtester': backtester,
+            'mode': mode,
+            'new_bars': len(bars) - start_idx
+        }
+
+    def _save_checkpoint(self, bar_array: np.ndarray, state: dict, signals: List[dict],
+                         backtester: Backtester):
+        """原子写入检查点"""
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'params': self._params(backtester),
+            'bars_processed': len(bar_array),
+            'fingerprint': bars_fingerprint(bar_array, len(bar_array)),
+            'state': _dump_state(state),
+            'signals': [_dump_signal(s) for s in signals],
+            'account': backtester.account.to_state(),
+        }
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        tmp_path.replace(self.checkpoint_path)
@@ -1,19 +1,37 @@
 """
 策略执行日志记录器
 自动记录每日策略执行情况，便于每周回顾分析
+
+按 run_daily_strategies 的股票配置(SymbolConfig)读取信号、K线并写入各自的日志文件,
+新增股票只需在配置中加一行。
+
+用法:
+    python -m src.pipeline.log_strategy_execution               # 全部已配置股票
+    python -m src.pipeline.log_strategy_execution NVDA          # 指定股票
+    python -m src.pipeline.log_strategy_execution --config symbols.json
 """
+import argparse
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Optional, Sequence
 import pandas as pd
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.analysis.execution_journal import ExecutionJournal, make_log_record
+from src.pipeline.run_daily_strategies import DEFAULT_CONFIGS, SymbolConfig, load_configs, select_configs
+
 
-def read_latest_signal():
+def strategy_label(symbol: str) -> str:
+    """日志中的策略类型(TSLA 沿用原来的"日度策略")"""
+    return "日度策略" if symbol == "TSLA" else f"{symbol}日度策略"
+
+
+def read_latest_signal(config: SymbolConfig):
     """读取最新信号"""
-    signal_file = project_root / "backtest_results" / "daily" / "signals_daily.csv"
+    signal_file = config.resolved_results_dir() / "signals_daily.csv"
     
     if not signal_file.exists():
         return None
@@ -34,9 +52,9 @@ def read_latest_signal():
     }
 
 
-def read_latest_price():
+def read_latest_price(config: SymbolConfig):
     """读取最新价格数据"""
-    data_file = project_root / "data" / "sample_tsla.csv"
+    data_file = config.resolved_data_path()
     
     if not data_file.exists():
         return None
@@ -57,9 +75,9 @@ def read_latest_price():
     }
 
 
-def count_recent_signals(days=7):
+def count_recent_signals(config: SymbolConfig, days=7):
     """统计最近N天的信号数量"""
-    signal_file = project_root / "backtest_results" / "daily" / "signals_daily.csv"
+    signal_file = config.resolved_results_dir() / "signals_daily.csv"
     
     if not signal_file.exists():
         return 0
@@ -75,16 +93,20 @@ def count_recent_signals(days=7):
     return len(recent)
 
 
-def generate_daily_log_entry(strategy_type="日度策略"):
-    """生成每日日志条目"""
+def collect_log_data(config: SymbolConfig):
+    """读取日志所需数据: (最新信号, 最新价格, 近7天信号数)"""
+    return read_latest_signal(config), read_latest_price(config), count_recent_signals(config, 7)
+
+
+def generate_daily_log_entry(config: SymbolConfig, strategy_type=None, data=None):
+    """生成每日日志条目(data 为 collect_log_data() 的结果, 默认现读)"""
     now = datetime.now()
+    strategy_type = strategy_type or strategy_label(config.symbol)
     weekday_cn = ["一", "二", "三", "四", "五", "六", "日"]
     weekday = weekday_cn[now.weekday()]
     
     # 读取数据
-    latest_signal = read_latest_signal()
-    latest_price = read_latest_price()
-    recent_signal_count = count_recent_signals(7)
+    latest_signal, latest_price, recent_signal_count = data or collect_log_data(config)
     
     # 格式化各项数据
     data_update_status = "✅ 成功" if latest_price else "❌ 失败"
@@ -142,7 +164,7 @@ def generate_daily_log_entry(strategy_type="日度策略"):
 - 数据来源: (请手动填写: Yahoo Finance / Alpha Vantage / Twelve Data)
 
 **市场状态**:
-- TSLA最新收盘: {close_price}
+- {config.symbol}最新收盘: {close_price}
 - 价格变动: {price_change}
 - 成交量: {volume}
 - 5日平均成交量: {avg_volume}
@@ -175,13 +197,16 @@ def generate_daily_log_entry(strategy_type="日度策略"):
     return log_entry
 
 
-def append_to_log(entry):
+def append_to_log(config: SymbolConfig, entry):
     """追加日志到文件"""
-    log_file = project_root / "STRATEGY_EXECUTION_LOG.md"
+    log_file = config.resolved_log_path()
     
     if not log_file.exists():
-        print("❌ 日志文件不存在，请先创建")
-        return False
+        # 创建新的日志文件
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, 'w', encoding='utf-8') as f:
+            f.write(f"# {config.symbol} 策略执行日志\n\n")
+            f.write("本文件记录每日策略执行情况，用于每周回顾和分析策略表现。\n\n")
     
     # 读取现有内容
     with open(log_file, 'r', encoding='utf-8') as f:
@@ -203,19 +228,26 @@ def append_to_log(entry):
         f.write(new_content)
     
     print(f"✅ 日志已记录到: {log_file}")
-    return True
 
 
-def main():
-    """主函数"""
+def append_log_record(config: SymbolConfig, record):
+    """追加结构化记录到 Markdown 日志旁的 STRATEGY_EXECUTION_LOG.jsonl"""
+    journal = ExecutionJournal.beside(config.resolved_log_path())
+    journal.append(record)
+    print(f"✅ 结构化记录已追加到: {journal.path}")
+
+
+def log_symbol(config: SymbolConfig):
+    """记录单只股票的执行日志(Markdown + 结构化记录)"""
     print("=" * 70)
-    print("📊 策略执行日志记录器")
+    print(f"📊 {config.symbol} 策略执行日志记录器")
     print("=" * 70)
     print()
     
     # 生成日志条目
     print("正在生成日志条目...")
-    entry = generate_daily_log_entry()
+    data = collect_log_data(config)
+    entry = generate_daily_log_entry(config, data=data)
     
     print("\n生成的日志内容:")
     print("-" * 70)
@@ -225,21 +257,31 @@ def main():
     
     # 追加到日志文件
     print("正在保存到日志文件...")
-    if append_to_log(entry):
-        print()
-        print("=" * 70)
-        print("✅ 日志记录完成!")
-        print("=" * 70)
-        print()
-        print("💡 提示:")
-        print("  - 请查看并完善日志中的手动填写项")
-        print("  - 每周日进行一次完整回顾")
-        print("  - 分析策略准确性和改进方向")
-        print()
-    else:
-        print()
-        print("❌ 日志记录失败")
-        print()
+    append_to_log(config, entry)
+    append_log_record(config, make_log_record(config.symbol, strategy_label(config.symbol), *data))
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="策略执行日志记录器")
+    parser.add_argument("symbols", nargs="*", help="股票代码, 默认全部已配置股票")
+    parser.add_argument("--config", type=Path, help="JSON 股票配置文件(同 run_daily_strategies)")
+    args = parser.parse_args(argv)
+    
+    configs = load_configs(args.config) if args.config else DEFAULT_CONFIGS
+    for config in select_configs(configs, [symbol.upper() for symbol in args.symbols]):
+        log_symbol(config)
+    
+    print()
+    print("=" * 70)
+    print("✅ 日志记录完成!")
+    print("=" * 70)
+    print()
+    print("💡 提示:")
+    print("  - 请查看并完善日志中的手动填写项")
+    print("  - 每周日进行一次完整回顾")
+    print("  - 分析策略准确性和改进方向")
+    print()
 
 
 if __name__ == "__main__":
@@ -12,11 +12,9 @@ sys.path.insert(0, str(project_root))
 from src.data.loader import CSVPriceLoader
 from src.pipeline.run_daily_strategy import DailyTradingStrategy
 from src.notification.email_service import EmailService
-from src.utils.real_portfolio import RealPortfolioManager
-from src.utils.fundamentals_manager import FundamentalsManager
-from src.utils.news_manager import NewsManager
-from src.utils.market_environment_manager import MarketEnvironmentManager
-from src.utils.realtime_quotes_manager import RealtimeQuotesManager
+from src.analysis.trade_ledger import current_position
+from src.utils.real_portfolio import shared_portfolio
+# 基本面/新闻/市场环境/实时报价依赖 requests 等网络库, 在各步骤的 try 块内导入
 
 
 def check_for_new_signals() -> dict:
@@ -95,8 +93,7 @@ def get_real_position(symbol: str, current_price: float = None) -> dict:
         dict: 持仓信息
     """
     try:
-        manager = RealPortfolioManager()
-        return manager.get_position(symbol, current_price)
+        return shared_portfolio().position(symbol, current_price)
     except Exception as e:
         print(f"⚠️  无法读取真实持仓: {e}")
         print(f"   返回空仓位信息")
@@ -121,72 +118,12 @@ def get_current_position(bars: list) -> dict:
     Returns:
         dict: 持仓信息 {symbol, quantity, avg_price, current_price, market_value, profit_loss, profit_loss_pct}
     """
-    trades_file = project_root / "backtest_results" / "daily" / "trades_daily.csv"
-    
-    if not trades_file.exists():
-        return {
-            'symbol': 'TSLA',
-            'quantity': 0,
-            'avg_price': 0,
-            'current_price': bars[-1].close if bars else 0,
-            'market_value': 0,
-            'profit_loss': 0,
-            'profit_loss_pct': 0
-        }
-    
-    # 读取交易记录
-    trades_df = pd.read_csv(trades_file)
-    
-    if trades_df.empty:
-        return {
-            'symbol': 'TSLA',
-            'quantity': 0,
-            'avg_price': 0,
-            'current_price': bars[-1].close if bars else 0,
-            'market_value': 0,
-            'profit_loss': 0,
-            'profit_loss_pct': 0
-        }
-    
-    # 获取当前价格
     current_price = bars[-1].close if bars else 0
     
-    # 计算当前持仓
-    quantity = 0
-    total_cost = 0
-    
-    for _, trade in trades_df.iterrows():
-        if trade['action'] == 'BUY':
-            quantity += trade['quantity']
-            total_cost += trade['total']
-        elif trade['action'] == 'SELL':
-            if quantity > 0:
-                # 按比例减少成本
-                sell_ratio = trade['quantity'] / quantity
-                total_cost *= (1 - sell_ratio)
-                quantity -= trade['quantity']
-    
-    # 计算持仓信息
-    if quantity > 0:
-        avg_price = total_cost / quantity
-        market_value = quantity * current_price
-        profit_loss = market_value - total_cost
-        profit_loss_pct = (profit_loss / total_cost) * 100 if total_cost > 0 else 0
-    else:
-        avg_price = 0
-        market_value = 0
-        profit_loss = 0
-        profit_loss_pct = 0
+    trades_file = project_root / "backtest_results" / "daily" / "trades_daily.csv"
     
-    return {
-        'symbol': 'TSLA',
-        'quantity': int(quantity),
-        'avg_price': avg_price,
-        'current_price': current_price,
-        'market_value': market_value,
-        'profit_loss': profit_loss,
-        'profit_loss_pct': profit_loss_pct
-    }
+    # 成交账本: 只回放上次之后新增的成交, 按先进先出计算持仓成本
+    return current_position(trades_file, 'TSLA', current_price)
 
 
 def run_daily_check_with_email():
@@ -211,6 +148,7 @@ def run_daily_check_with_email():
         # 先获取盘中实时价格
         print("[步骤 -1/6] 💹 获取盘中实时报价...")
         try:
+            from src.utils.realtime_quotes_manager import RealtimeQuotesManager
             quotes_mgr = RealtimeQuotesManager()
             realtime_quote = quotes_mgr.get_realtime_quote('TSLA')
             
@@ -228,6 +166,7 @@ def run_daily_check_with_email():
         
         print("[步骤 0/6] 🌍 市场环境综合分析...")
         try:
+            from src.utils.market_environment_manager import MarketEnvironmentManager
             env_mgr = MarketEnvironmentManager()
             market_env = env_mgr.get_comprehensive_analysis('TSLA')
             
@@ -248,6 +187,7 @@ def run_daily_check_with_email():
         
         print("[步骤 1/6] 📊 获取基本面数据...")
         try:
+            from src.utils.fundamentals_manager import FundamentalsManager
             fundamentals_mgr = FundamentalsManager()
             health = fundamentals_mgr.calculate_financial_health('TSLA')
             print(f"✓ 财务健康评分: {health['score']}/100 (等级: {health['grade']})")
@@ -263,6 +203,7 @@ def run_daily_check_with_email():
         
         print("[步骤 2/6] 📰 获取新闻情绪数据...")
         try:
+            from src.utils.news_manager import NewsManager
             news_mgr = NewsManager()
             news_summary = news_mgr.get_news_summary('TSLA', days=7)
             sentiment = news_summary['sentiment']
@@ -298,7 +239,7 @@ def run_daily_check_with_email():
             stop_loss=0.02
         )
         
-        results = strategy.run_backtest(bars)
+        results = strategy.run_backtest(bars, incremental=True)
         print()
         
         print("[步骤 5/6] 🔍 检查新交易信号 (最近1天)...")
@@ -13,11 +13,9 @@ sys.path.insert(0, str(project_root))
 from src.data.loader import CSVPriceLoader
 from src.pipeline.run_daily_strategy_intc import DailyTradingStrategyINTC
 from src.notification.email_service import EmailService
-from src.utils.real_portfolio import RealPortfolioManager
-from src.utils.fundamentals_manager import FundamentalsManager
-from src.utils.news_manager import NewsManager
-from src.utils.market_environment_manager import MarketEnvironmentManager
-from src.utils.realtime_quotes_manager import RealtimeQuotesManager
+from src.analysis.trade_ledger import current_position
+from src.utils.real_portfolio import shared_portfolio
+# 基本面/新闻/市场环境/实时报价依赖 requests 等网络库, 在各步骤的 try 块内导入
 
 
 def check_for_new_signals() -> dict:
@@ -82,8 +80,7 @@ def get_real_position(symbol: str, current_price: float = None) -> dict:
         dict: 持仓信息
     """
     try:
-        manager = RealPortfolioManager()
-        return manager.get_position(symbol, current_price)
+        return shared_portfolio().position(symbol, current_price)
     except Exception as e:
         print(f"⚠️  无法读取真实持仓: {e}")
         print(f"   返回空仓位信息")
@@ -108,67 +105,12 @@ def get_current_position(bars: list) -> dict:
     Returns:
         dict: 持仓信息
     """
-    trades_file = project_root / "INTC" / "backtest_results" / "daily" / "trades_daily.csv"
-    
-    if not trades_file.exists():
-        return {
-            'symbol': 'INTC',
-            'quantity': 0,
-            'avg_price': 0,
-            'current_price': bars[-1].close if bars else 0,
-            'market_value': 0,
-            'profit_loss': 0,
-            'profit_loss_pct': 0
-        }
-    
-    trades_df = pd.read_csv(trades_file)
-    
-    if trades_df.empty:
-        return {
-            'symbol': 'INTC',
-            'quantity': 0,
-            'avg_price': 0,
-            'current_price': bars[-1].close if bars else 0,
-            'market_value': 0,
-            'profit_loss': 0,
-            'profit_loss_pct': 0
-        }
-    
     current_price = bars[-1].close if bars else 0
     
-    quantity = 0
-    total_cost = 0
-    
-    for _, trade in trades_df.iterrows():
-        if trade['action'] == 'BUY':
-            quantity += trade['quantity']
-            total_cost += trade['total']
-        elif trade['action'] == 'SELL':
-            if quantity > 0:
-                sell_ratio = trade['quantity'] / quantity
-                total_cost *= (1 - sell_ratio)
-                quantity -= trade['quantity']
-    
-    if quantity > 0:
-        avg_price = total_cost / quantity
-        market_value = quantity * current_price
-        profit_loss = market_value - total_cost
-        profit_loss_pct = (profit_loss / total_cost) * 100 if total_cost > 0 else 0
-    else:
-        avg_price = 0
-        market_value = 0
-        profit_loss = 0
-        profit_loss_pct = 0
+    trades_file = project_root / "INTC" / "backtest_results" / "daily" / "trades_daily.csv"
     
-    return {
-        'symbol': 'INTC',
-        'quantity': int(quantity),
-        'avg_price': avg_price,
-        'current_price': current_price,
-        'market_value': market_value,
-        'profit_loss': profit_loss,
-        'profit_loss_pct': profit_loss_pct
-    }
+    # 成交账本: 只回放上次之后新增的成交, 按先进先出计算持仓成本
+    return current_position(trades_file, 'INTC', current_price)
 
 
 def run_daily_check_with_email():
@@ -193,6 +135,7 @@ def run_daily_check_with_email():
         # 先获取盘中实时价格
         print("[步骤 -1/6] 💹 获取盘中实时报价...")
         try:
+            from src.utils.realtime_quotes_manager import RealtimeQuotesManager
             quotes_mgr = RealtimeQuotesManager()
             realtime_quote = quotes_mgr.get_realtime_quote('INTC')
             
@@ -216,6 +159,7 @@ def run_daily_check_with_email():
         print()
         
         try:
+            from src.utils.market_environment_manager import MarketEnvironmentManager
             market_env_mgr = MarketEnvironmentManager()
             market_env = market_env_mgr.get_comprehensive_analysis('INTC')
             
@@ -236,6 +180,7 @@ def run_daily_check_with_email():
         
         print("[步骤 1/6] 📊 获取基本面数据...")
         try:
+            from src.utils.fundamentals_manager import FundamentalsManager
             fundamentals_mgr = FundamentalsManager()
             health = fundamentals_mgr.calculate_financial_health('INTC')
             print(f"✓ 财务健康评分: {health['score']}/100 (等级: {health['grade']})")
@@ -251,6 +196,7 @@ def run_daily_check_with_email():
         
         print("[步骤 2/6] 📰 获取新闻情绪数据...")
         try:
+            from src.utils.news_manager import NewsManager
             news_mgr = NewsManager()
             news_summary = news_mgr.get_news_summary('INTC', days=7)
             sentiment = news_summary['sentiment']
@@ -286,7 +232,7 @@ def run_daily_check_with_email():
             stop_loss=0.02
         )
         
-        results = strategy.run_backtest(bars)
+        results = strategy.run_backtest(bars, incremental=True)
         print()
         
         print("[步骤 5/6] 🔍 检查新交易信号 (最近1天)...")
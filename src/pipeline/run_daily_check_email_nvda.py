@@ -12,11 +12,9 @@ sys.path.insert(0, str(project_root))
 from src.data.loader import CSVPriceLoader
 from src.pipeline.run_daily_strategy_nvda import DailyTradingStrategyNVDA
 from src.notification.email_service import EmailService
-from src.utils.fundamentals_manager import FundamentalsManager
-from src.utils.real_portfolio import RealPortfolioManager
-from src.utils.news_manager import NewsManager
-from src.utils.market_environment_manager import MarketEnvironmentManager
-from src.utils.realtime_quotes_manager import RealtimeQuotesManager
+from src.analysis.trade_ledger import current_position
+from src.utils.real_portfolio import shared_portfolio
+# 基本面/新闻/市场环境/实时报价依赖 requests 等网络库, 在各步骤的 try 块内导入
 
 
 def check_for_new_signals() -> dict:
@@ -81,8 +79,7 @@ def get_real_position(symbol: str, current_price: float = None) -> dict:
         dict: 持仓信息
     """
     try:
-        manager = RealPortfolioManager()
-        return manager.get_position(symbol, current_price)
+        return shared_portfolio().position(symbol, current_price)
     except Exception as e:
         print(f"⚠️  无法读取真实持仓: {e}")
         print(f"   返回空仓位信息")
@@ -113,63 +110,8 @@ def get_current_position(bars: list, realtime_price: float = None) -> dict:
     
     trades_file = project_root / "NVDA" / "backtest_results" / "daily" / "trades_daily.csv"
     
-    if not trades_file.exists():
-        return {
-            'symbol': 'NVDA',
-            'quantity': 0,
-            'avg_price': 0,
-            'current_price': current_price,
-            'market_value': 0,
-            'profit_loss': 0,
-            'profit_loss_pct': 0
-        }
-    
-    trades_df = pd.read_csv(trades_file)
-    
-    if trades_df.empty:
-        return {
-            'symbol': 'NVDA',
-            'quantity': 0,
-            'avg_price': 0,
-            'current_price': current_price,
-            'market_value': 0,
-            'profit_loss': 0,
-            'profit_loss_pct': 0
-        }
-    
-    quantity = 0
-    total_cost = 0
-    
-    for _, trade in trades_df.iterrows():
-        if trade['action'] == 'BUY':
-            quantity += trade['quantity']
-            total_cost += trade['total']
-        elif trade['action'] == 'SELL':
-            if quantity > 0:
-                sell_ratio = trade['quantity'] / quantity
-                total_cost *= (1 - sell_ratio)
-                quantity -= trade['quantity']
-    
-    if quantity > 0:
-        avg_price = total_cost / quantity
-        market_value = quantity * current_price
-        profit_loss = market_value - total_cost
-        profit_loss_pct = (profit_loss / total_cost) * 100 if total_cost > 0 else 0
-    else:
-        avg_price = 0
-        market_value = 0
-        profit_loss = 0
-        profit_loss_pct = 0
-    
-    return {
-        'symbol': 'NVDA',
-        'quantity': int(quantity),
-        'avg_price': avg_price,
-        'current_price': current_price,
-        'market_value': market_value,
-        'profit_loss': profit_loss,
-        'profit_loss_pct': profit_loss_pct
-    }
+    # 成交账本: 只回放上次之后新增的成交, 按先进先出计算持仓成本
+    return current_position(trades_file, 'NVDA', current_price)
 
 
 def run_daily_check_with_email():
@@ -194,6 +136,7 @@ def run_daily_check_with_email():
         # 先获取盘中实时价格
         print("[步骤 -1/6] 💹 获取盘中实时报价...")
         try:
+            from src.utils.realtime_quotes_manager import RealtimeQuotesManager
             quotes_mgr = RealtimeQuotesManager()
             realtime_quote = quotes_mgr.get_realtime_quote('NVDA')
             
@@ -211,6 +154,7 @@ def run_daily_check_with_email():
         
         print("[步骤 0/6] 🌍 市场环境综合分析...")
         try:
+            from src.utils.market_environment_manager import MarketEnvironmentManager
             env_mgr = MarketEnvironmentManager()
             market_env = env_mgr.get_comprehensive_analysis('NVDA')
             
@@ -231,6 +175,7 @@ def run_daily_check_with_email():
         
         print("[步骤 1/6] 📊 获取基本面数据...")
         try:
+            from src.utils.fundamentals_manager import FundamentalsManager
             fundamentals_mgr = FundamentalsManager()
             health = fundamentals_mgr.calculate_financial_health('NVDA')
             print(f"✓ 财务健康评分: {health['score']}/100 (等级: {health['grade']})")
@@ -246,6 +191,7 @@ def run_daily_check_with_email():
         
         print("[步骤 2/6] 📰 获取新闻情绪数据...")
         try:
+            from src.utils.news_manager import NewsManager
             news_mgr = NewsManager()
             news_summary = news_mgr.get_news_summary('NVDA', days=7)
             sentiment = news_summary['sentiment']
@@ -281,7 +227,7 @@ def run_daily_check_with_email():
             stop_loss=0.04         # 放宽止损空间 (2% -> 4%)
         )
         
-        results = strategy.run_backtest(bars)
+        results = strategy.run_backtest(bars, incremental=True)
         print()
         
         print("[步骤 5/6] 🔍 检查新交易信号 (最近1天)...")
@@ -0,0 +1,475 @@
+"""
+每日流程编排器
+
+原先的每日流程分散在多个 .bat 脚本里(run_all_daily_strategies / smart_daily_check /
+log_strategy / send_all_emails / generate_all_reports), 每一步都启动新的解释器,
+重新导入 pandas / yfinance / plotly 并重新读取同样的 CSV。这里在一个进程内按依赖图
+运行整条流程:
+
+    update:<代码> → signals → positions ─┬→ emails
+                                         └→ sizing → logs/position_targets.json
+                            → log:<代码> ───→ reports
+
+1. K线只读一次(MultiSymbolRunner 的缓存), 信号、持仓、日志、邮件都使用内存中的结果;
+   持仓文件只读一次、批量更新价格后写回一次(PortfolioService)
+2. 互不依赖的步骤在线程池中并行运行(各股票的数据更新和日志, 邮件与报告)
+3. 记录每一步的耗时, 打印汇总并追加到 logs/daily_pipeline.jsonl
+4. sizing 按波动率目标计算各股票的目标股数, 连同当前持仓和需调整的股数写入
+   logs/position_targets.json
+5. 不依赖图形界面和 Windows 路径, 可在 Linux 上用 cron 或 --at 定时运行
+
+用法:
+    python -m src.pipeline.run_daily_pipeline                     # 立即运行一次
+    python -m src.pipeline.run_daily_pipeline TSLA NVDA --no-update
+    python -m src.pipeline.run_daily_pipeline --at 22:40          # 每天 22:40 运行(schedule)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import pandas as pd
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analysis.execution_journal import make_log_record
+from src.pipeline.run_daily_strategies import (
+    DEFAULT_CONFIGS, MultiSymbolRunner, SymbolConfig, SymbolRunResult, load_configs, select_configs
+)
+from src.utils.real_portfolio import PortfolioService, empty_position
+
+# 数据更新(yfinance)、邮件、日志和报告的依赖在对应步骤内导入, 关闭的步骤不付导入开销
+
+
+DEFAULT_TIMINGS_PATH = project_root / "logs" / "daily_pipeline.jsonl"
+DEFAULT_TARGETS_PATH = project_root / "logs" / "position_targets.json"
+
+@dataclass(frozen=True)
+class Step:
+    """流程中的一步: func(context) 的返回值记入 StepResult.value"""
+    name: str
+    func: Callable[['DailyContext'], Any]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    """单步运行结果"""
+    step: Step
+    status: str                            # done / failed / skipped
+    seconds: float = 0.0
+    value: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class DailyContext:
+    """各步骤共享的内存数据"""
+    configs: Dict[str, SymbolConfig]
+    runner: MultiSymbolRunner
+    now: datetime = field(default_factory=datetime.now)
+    email_service: Optional[Any] = None        # 默认 EmailService()
+    portfolio_path: Optional[Path] = None
+    runs: Dict[str, SymbolRunResult] = field(default_factory=dict)
+    positions: Dict[str, dict] = field(default_factory=dict)
+    capital: Optional[float] = None                # 账户总值(持仓市值 + 现金)
+    targets: Dict[str, int] = field(default_factory=dict)
+    targets_path: Optional[Path] = None            # 目标股数写入的文件, None 表示不写
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.configs)
+
+    def bars(self, symbol: str) -> list:
+        return self.runner.load_bars(self.configs[symbol].resolved_data_path())
+
+
+def run_steps(steps: Sequence[Step], context: DailyContext, max_workers: int = 4) -> Dict[str, StepResult]:
+    """
+    按依赖顺序运行步骤: 依赖都已完成的步骤提交到线程池; 依赖失败的步骤标记为 skipped
+
+    Returns:
+        {步骤名: StepResult}
+    """
+    steps = {step.name: step for step in steps}
+    missing = sorted({dep for step in steps.values() for dep in step.deps} - set(steps))
+    if missing:
+        raise ValueError(f"步骤依赖无法满足: {missing}")
+
+    results: Dict[str, StepResult] = {}
+    pending = dict(steps)
+    running = {}  # future -> (step, 开始时间)
+
+    def timed(step: Step):
+        start = time.perf_counter()
+        return step.func(context), time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for name, step in list(pending.items()):
+                if any(dep not in results for dep in step.deps):
+                    continue
+                del pending[name]
+                if any(results[dep].status != "done" for dep in step.deps):
+                    results[name] = StepResult(step, "skipped", error="依赖步骤失败")
+                    continue
+                running[pool.submit(timed, step)] = (step, time.perf_counter())
+
+            if not running:
+                if pending:
+                    raise ValueError(f"步骤依赖存在环: {sorted(pending)}")
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step, start = running.pop(future)
+                try:
+                    value, seconds = future.result()
+                    results[step.name] = StepResult(step, "done", seconds, value)
+                except Exception as e:
+                    results[step.name] = StepResult(step, "failed", time.perf_counter() - start, error=str(e))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# 步骤
+# ---------------------------------------------------------------------------
+
+def update_step(symbol: str) -> Callable[[DailyContext], str]:
+    def update(context: DailyContext) -> str:
+        from src.pipeline.update_data_incremental import UpToDate, update_symbol
+
+        try:
+            result = update_symbol(symbol, context.configs[symbol].resolved_data_path())
+        except UpToDate as e:
+            return f"已是最新 ({e})"
+        return f"{result.rows_written} 行, 至 {result.max_date}"
+    return update
+
+
+def signals_step(context: DailyContext) -> Dict[str, int]:
+    """运行全部股票的日度策略(共享K线和特征缓存)"""
+    context.runs.update(context.runner.run(context.symbols))
+    failed = [run.symbol for run in context.runs.values() if not run.success]
+    if len(failed) == len(context.runs):
+        raise RuntimeError(f"全部股票运行失败: {', '.join(failed)}")
+    return {symbol: len(run.signals) for symbol, run in context.runs.items()}
+
+
+def _symbol_run(context: DailyContext, symbol: str) -> SymbolRunResult:
+    run = context.runs[symbol]
+    if not run.success:
+        raise RuntimeError(f"{symbol} 策略运行失败: {run.error}")
+    return run
+
+
+def positions_step(context: DailyContext) -> str:
+    """读取一次持仓文件, 用各股票最新收盘价批量更新并写回一次"""
+    prices = {symbol: context.bars(symbol)[-1].close for symbol, run in context.runs.items() if run.success}
+    try:
+        portfolio = PortfolioService(context.portfolio_path)
+    except FileNotFoundError:
+        context.positions.update({symbol: empty_position(symbol, price) for symbol, price in prices.items()})
+        return "没有持仓文件"
+    portfolio.update_prices(prices)
+    context.positions.update({symbol: portfolio.position(symbol, price) for symbol, price in prices.items()})
+    portfolio.save()
+    snapshot = portfolio.snapshot()
+    context.capital = snapshot.total_value
+    return f"市值 {snapshot.market_value:,.2f}, 浮动盈亏 {snapshot.profit_loss:+,.2f} ({snapshot.profit_loss_pct:+.2f}%)"
+
+
+def sizing_step(context: DailyContext) -> str:
+    """由内存中的K线估计协方差, 按账户总值计算各股票的波动率目标股数并写入目标文件"""
+    from src.portfolio.sizing import VolatilityTargetSizer
+
+    if not context.capital:
+        return "没有账户总值, 跳过"
+    history = {symbol: context.bars(symbol) for symbol, run in context.runs.items() if run.success}
+    sizer = VolatilityTargetSizer(list(history))
+    sizer.fit(history)
+    if not sizer.ready:
+        return "K线不足, 跳过"
+    context.targets = sizer.target_positions(context.capital)
+    if context.targets_path is not None:
+        write_targets(context, sizer.target_weights(), context.targets_path)
+    return ", ".join(f"{symbol} {quantity} 股" for symbol, quantity in context.targets.items())
+
+
+def write_targets(context: DailyContext, weights: Dict[str, float], path: Path):
+    """目标股数、当前持仓和需调整的股数(原子写入), 供下单或人工调仓使用"""
+    targets = {}
+    for symbol, target in context.targets.items():
+        held = int(context.positions.get(symbol, {}).get('quantity', 0))
+        targets[symbol] = {
+            'weight': round(weights[symbol], 4),
+            'target_quantity': target,
+            'current_quantity': held,
+            'delta': target - held,
+        }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'date': context.now.isoformat(timespec='seconds'),
+            'capital': round(context.capital, 2),
+            'targets': targets,
+        }, f, indent=2, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+def log_data(signals: List[dict], bars: list, now: datetime, days: int = 7):
+    """
+    由内存中的信号和K线生成日志数据, 与各日志脚本的 collect_log_data() 结构相同
+
+    Returns:
+        (最新信号, 最新价格, 近 days 天信号数)
+    """
+    latest_signal = None
+    if signals:
+        latest = signals[-1]
+        latest_signal = {
+            'date': pd.Timestamp(latest['date']).strftime('%Y-%m-%d'),
+            'action': str(latest['action']),
+            'quantity': int(latest['quantity']),
+            'price': float(latest['price']),
+            'reason': str(latest['reason'])
+        }
+
+    latest_price = None
+    if bars:
+        latest = bars[-1]
+        prev_5 = bars[-6:-1] if len(bars) >= 6 else bars[:-1]
+        latest_price = {
+            'date': str(latest.date),
+            'close': float(latest.close),
+            'volume': int(latest.volume),
+            'avg_volume_5d': int(sum(bar.volume for bar in prev_5) / len(prev_5)) if prev_5 else 0,
+            'price_change': float((latest.close - prev_5[-1].close) / prev_5[-1].close * 100) if prev_5 else 0
+        }
+
+    cutoff = now - timedelta(days=days)
+    recent_count = sum(pd.Timestamp(signal['date']) >= cutoff for signal in signals)
+    return latest_signal, latest_price, int(recent_count)
+
+
+def log_step(symbol: str) -> Callable[[DailyContext], str]:
+    def log(context: DailyContext) -> str:
+        from src.pipeline import log_strategy_execution as strategy_log
+        from src.pipeline.smart_daily_check import record_execution_result, summarize_run
+
+        run = _symbol_run(context, symbol)
+        record_execution_result(symbol, summarize_run(run))
+        config = context.configs[symbol]
+        data = log_data(run.signals, context.bars(symbol), context.now)
+        strategy_type = strategy_log.strategy_label(symbol)
+        strategy_log.append_to_log(config, strategy_log.generate_daily_log_entry(config, strategy_type, data=data))
+        strategy_log.append_log_record(config, make_log_record(symbol, strategy_type, *data, now=context.now))
+        return "执行记录 + 日志"
+    return log
+
+
+def latest_email_signal(signals: List[dict], now: datetime) -> Tuple[int, Optional[dict]]:
+    """最近1天的信号数和最新一条(与 run_daily_check_email 的判定相同)"""
+    cutoff = now - timedelta(days=1)
+    recent = [signal for signal in signals if pd.Timestamp(signal['date']) >= cutoff]
+    if not recent:
+        return 0, None
+    latest = recent[-1]
+    action = str(latest['action']).upper()
+    return len(recent), {
+        'date': pd.Timestamp(latest['date']).strftime('%Y-%m-%d'),
+        'action': 'BUY' if 'BUY' in action else 'SELL' if 'SELL' in action else action,
+        'quantity': int(latest['quantity']),
+        'reason': str(latest['reason']),
+        'price': float(latest['price'])
+    }
+
+
+def email_step(context: DailyContext) -> Dict[str, bool]:
+    """每只股票一封信号提醒或每日总结, 一批发送共用 SMTP 会话"""
+    from src.notification.email_service import EmailService
+
+    service = context.email_service or EmailService()
+    sent = {}
+    with service.batch():
+        for symbol in context.symbols:
+            run = context.runs.get(symbol)
+            if run is None or not run.success:
+                sent[symbol] = service.send_daily_summary(
+                    has_signal=False, error_message=run.error if run else "未运行", symbol=symbol
+                )
+                continue
+            count, latest = latest_email_signal(run.signals, context.now)
+            if latest:
+                sent[symbol] = service.send_signal_alert(
+                    symbol=symbol,
+                    action=latest['action'],
+                    quantity=latest['quantity'],
+                    price=context.bars(symbol)[-1].close,
+                    reason=latest['reason'],
+                    signal_date=latest['date'],
+                    strategy_name=f"{symbol}日度策略"
+                )
+            else:
+                sent[symbol] = service.send_daily_summary(
+                    has_signal=False, position_info=context.positions.get(symbol), symbol=symbol
+                )
+    return sent
+
+
+def reports_step(context: DailyContext) -> Dict[str, int]:
+    """周报、月报和策略对比(输入哈希缓存)"""
+    from src.pipeline.run_reports import ReportOrchestrator, build_tasks
+
+    # 在本进程内顺序运行: 其他步骤的线程仍在运行时不宜 fork 进程池
+    orchestrator = ReportOrchestrator(context.symbols, max_workers=0, today=context.now)
+    results = orchestrator.run(build_tasks(context.symbols))
+    counts: Dict[str, int] = {}
+    for result in results.values():
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return counts
+
+
+def build_steps(
+    symbols: Sequence[str],
+    update: bool = True,
+    logs: bool = True,
+    emails: bool = True,
+    reports: bool = True
+) -> List[Step]:
+    """构建每日流程的依赖图, 关闭的步骤从图中去掉"""
+    steps = []
+    if update:
+        steps.extend(Step(f"update:{symbol}", update_step(symbol)) for symbol in symbols)
+    steps.append(Step("signals", signals_step, tuple(step.name for step in steps)))
+    steps.append(Step("positions", positions_step, ("signals",)))
+    steps.append(Step("sizing", sizing_step, ("positions",)))
+    log_steps = [Step(f"log:{symbol}", log_step(symbol), ("signals",)) for symbol in symbols] if logs else []
+    steps.extend(log_steps)
+    if emails:
+        steps.append(Step("emails", email_step, ("signals", "positions")))
+    if reports:
+        steps.append(Step("reports", reports_step, ("signals", *(step.name for step in log_steps))))
+    return steps
+
+
+def print_summary(results: Dict[str, StepResult], elapsed: float):
+    """打印每一步的状态和耗时"""
+    icons = {"done": "✅", "failed": "❌", "skipped": "⏭️ "}
+    print("=" * 80)
+    print(f"⏱️  每日流程耗时 (总耗时 {elapsed:.2f}s):")
+    for name, result in results.items():
+        line = f"  {icons[result.status]} {name:<20} {result.seconds:>7.2f}s"
+        if result.error:
+            line += f"  {result.error}"
+        elif result.value is not None:
+            line += f"  {result.value}"
+        print(line)
+    print("=" * 80)
+
+
+def record_timings(results: Dict[str, StepResult], elapsed: float, path: Path = DEFAULT_TIMINGS_PATH):
+    """追加一行本次运行的各步耗时"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'elapsed': round(elapsed, 3),
+        'steps': {
+            name: {'status': result.status, 'seconds': round(result.seconds, 3), 'error': result.error}
+            for name, result in results.items()
+        },
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run_pipeline(
+    symbols: Optional[Sequence[str]] = None,
+    configs: Sequence[SymbolConfig] = DEFAULT_CONFIGS,
+    max_workers: int = 4,
+    timings_path: Optional[Path] = DEFAULT_TIMINGS_PATH,
+    targets_path: Optional[Path] = DEFAULT_TARGETS_PATH,
+    **options
+) -> Dict[str, StepResult]:
+    """
+    运行一次每日流程
+
+    Args:
+        symbols: 股票代码, 默认 configs 中的全部股票
+        configs: 股票配置
+        max_workers: 并行线程数
+        timings_path: 耗时记录文件, None 表示不记录
+        targets_path: 目标股数文件, None 表示不写
+        **options: build_steps 的 update / logs / emails / reports 开关
+    """
+    selected = select_configs(configs, symbols)
+    symbols = [config.symbol for config in selected]
+    context = DailyContext(
+        configs={config.symbol: config for config in selected},
+        runner=MultiSymbolRunner(selected),
+        targets_path=targets_path,
+    )
+    print("=" * 80)
+    print(f"📊 每日流程: {', '.join(symbols)} ({context.now.strftime('%Y-%m-%d %H:%M:%S')})")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    results = run_steps(build_steps(symbols, **options), context, max_workers)
+    elapsed = time.perf_counter() - start
+    print_summary(results, elapsed)
+    if timings_path is not None:
+        record_timings(results, elapsed, timings_path)
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="单进程每日流程: 数据 → 信号 → 持仓 → 日志 → 邮件 → 报告")
+    parser.add_argument("symbols", nargs="*", help="股票代码, 默认全部已配置股票")
+    parser.add_argument("--config", type=Path, help="JSON 股票配置文件(同 run_daily_strategies)")
+    parser.add_argument("--at", metavar="HH:MM", help="每天在该时间运行(本地时间), 不指定则立即运行一次")
+    parser.add_argument("--workers", type=int, default=4, help="并行线程数")
+    parser.add_argument("--no-update", action="store_true", help="不更新行情数据")
+    parser.add_argument("--no-log", action="store_true", help="不写执行记录和日志")
+    parser.add_argument("--no-email", action="store_true", help="不发送邮件")
+    parser.add_argument("--no-reports", action="store_true", help="不生成报告")
+    args = parser.parse_args(argv)
+
+    def job():
+        return run_pipeline(
+            [symbol.upper() for symbol in args.symbols] or None,
+            configs=load_configs(args.config) if args.config else DEFAULT_CONFIGS,
+            max_workers=args.workers,
+            update=not args.no_update,
+            logs=not args.no_log,
+            emails=not args.no_email,
+            reports=not args.no_reports,
+        )
+
+    if not args.at:
+        return job()
+
+    import schedule
+
+    schedule.every().day.at(args.at).do(job)
+    print(f"⏰ 每天 {args.at} 运行每日流程 (Ctrl+C 退出)")
+    try:
+        while True:
+            schedule.run_pending()
+            time.sleep(30)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
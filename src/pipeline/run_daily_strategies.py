@@ -0,0 +1,298 @@
+"""
+多股票日度策略运行器
+
+在同一进程内按配置运行多只股票的日度策略:
+1. 每只股票一行配置(策略类型 + 参数), 新增股票只需加一行
+2. 共享已导入的模块、已加载的K线和特征缓存, 不再为每只股票启动新解释器
+3. 各股票并行运行(线程池), 输出按股票分段打印, 互不交错
+4. 结果仍写入原有的 backtest_results/daily 目录结构
+
+用法:
+    python -m src.pipeline.run_daily_strategies                  # 全部股票
+    python -m src.pipeline.run_daily_strategies TSLA NVDA        # 指定股票
+    python -m src.pipeline.run_daily_strategies --config symbols.json --full
+
+配置文件为 JSON 列表, 每项形如:
+    {"symbol": "AMD", "strategy": "momentum", "params": {"volume_threshold": 1.2}}
+"""
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.loader import CSVPriceLoader, PriceBar
+from src.pipeline.run_daily_strategy import (
+    DailyTradingStrategy, default_data_path, default_log_path, default_results_dir
+)
+from src.pipeline.run_daily_strategy_nvda import DailyTradingStrategyNVDA
+
+
+# 策略类型 -> 策略类
+STRATEGY_TYPES = {
+    'momentum': DailyTradingStrategy,          # 动量 + 成交量 + 趋势
+    'momentum_rsi': DailyTradingStrategyNVDA,  # 额外 RSI 过滤 / ATR 止损
+}
+
+
+@dataclass
+class SymbolConfig:
+    """单只股票的运行配置"""
+    symbol: str
+    strategy: str = 'momentum'
+    params: Dict[str, Any] = field(default_factory=dict)
+    data_path: Optional[Path] = None      # 默认 default_data_path(symbol)
+    results_dir: Optional[Path] = None    # 默认 default_results_dir(symbol)
+    log_path: Optional[Path] = None       # 默认 default_log_path(symbol)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SymbolConfig':
+        return cls(
+            symbol=data['symbol'],
+            strategy=data.get('strategy', 'momentum'),
+            params=dict(data.get('params', {})),
+            data_path=Path(data['data_path']) if data.get('data_path') else None,
+            results_dir=Path(data['results_dir']) if data.get('results_dir') else None,
+            log_path=Path(data['log_path']) if data.get('log_path') else None,
+        )
+
+    def resolved_data_path(self) -> Path:
+        return self.data_path or default_data_path(self.symbol)
+
+    def resolved_results_dir(self) -> Path:
+        return self.results_dir or default_results_dir(self.symbol)
+
+    def resolved_log_path(self) -> Path:
+        return self.log_path or default_log_path(self.symbol)
+
+    def build_strategy(self):
+        strategy_cls = STRATEGY_TYPES[self.strategy]
+        return strategy_cls(
+            symbol=self.symbol,
+            results_dir=self.resolved_results_dir(),
+            **self.params
+        )
+
+
+DEFAULT_CONFIGS = [
+    SymbolConfig('TSLA', 'momentum', {
+        'initial_cash': 100000.0, 'position_pct': 0.6, 'momentum_window': 5,
+        'trend_window': 20, 'volume_threshold': 1.3, 'profit_target': 0.05, 'stop_loss': 0.02,
+    }),
+    SymbolConfig('NVDA', 'momentum_rsi', {
+        'initial_cash': 100000.0, 'position_pct': 0.6, 'momentum_window': 5,
+        'trend_window': 20, 'volume_threshold': 1.2, 'profit_target': 0.08, 'stop_loss': 0.04,
+        'use_atr_stop': False,  # 回测显示固定止损效果更好
+        'atr_multiplier': 3.0,
+    }),
+    SymbolConfig('INTC', 'momentum', {
+        'initial_cash': 100000.0, 'position_pct': 0.6, 'momentum_window': 5,
+        'trend_window': 20, 'volume_threshold': 1.3, 'profit_target': 0.05, 'stop_loss': 0.02,
+    }),
+]
+
+
+def load_configs(path: Path) -> List[SymbolConfig]:
+    """从 JSON 文件读取配置"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [SymbolConfig.from_dict(item) for item in json.load(f)]
+
+
+def select_configs(
+    configs: Sequence[SymbolConfig],
+    symbols: Optional[Sequence[str]] = None
+) -> List[SymbolConfig]:
+    """按股票代码挑选配置(默认全部), 未配置的股票抛出 KeyError"""
+    by_symbol = {config.symbol: config for config in configs}
+    symbols = list(symbols) if symbols else list(by_symbol)
+    unknown = [symbol for symbol in symbols if symbol not in by_symbol]
+    if unknown:
+        raise KeyError(f"未配置的股票: {', '.join(unknown)}")
+    return [by_symbol[symbol] for symbol in symbols]
+
+
+@dataclass
+class SymbolRunResult:
+    """单只股票的运行结果"""
+    symbol: str
+    success: bool
+    seconds: float
+    output: str = ""
+    results: Optional[Dict] = None    # run_backtest 的返回值
+    error: Optional[str] = None
+
+    @property
+    def signals(self) -> List[dict]:
+        return self.results['signals'] if self.results else []
+
+
+class _ThreadOutput(io.TextIOBase):
+    """按线程分流的 stdout: 工作线程写入各自的缓冲区, 其他线程照常输出"""
+
+    def __init__(self, target):
+        self.target = target
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.target).write(text)
+
+    def flush(self):
+        self.target.flush()
+
+    def capture(self, buffer: Optional[io.StringIO]):
+        self.local.buffer = buffer
+
+
+class MultiSymbolRunner:
+    """
+    多股票日度策略运行器
+
+    Args:
+        configs: 每只股票的配置
+        incremental: 是否断点续跑(见 IncrementalStrategyRunner)
+        max_workers: 并行线程数, 默认每只股票一个
+    """
+
+    def __init__(
+        self,
+        configs: Sequence[SymbolConfig],
+        incremental: bool = True,
+        max_workers: Optional[int] = None
+    ):
+        self.configs = {config.symbol: config for config in configs}
+        self.incremental = incremental
+        self.max_workers = max_workers
+        self._bars: Dict[Path, List[PriceBar]] = {}
+        self._lock = threading.Lock()
+
+    def load_bars(self, path: Path) -> List[PriceBar]:
+        """加载K线(同一文件只读一次)"""
+        path = Path(path)
+        with self._lock:
+            bars = self._bars.get(path)
+        if bars is None:
+            bars = list(CSVPriceLoader(path).load())
+            with self._lock:
+                bars = self._bars.setdefault(path, bars)
+        return bars
+
+    def run_symbol(self, config: SymbolConfig) -> SymbolRunResult:
+        """运行一只股票"""
+        start = time.perf_counter()
+        try:
+            data_path = config.resolved_data_path()
+            if not data_path.exists():
+                raise FileNotFoundError(f"数据文件不存在: {data_path}")
+            bars = self.load_bars(data_path)
+            print(f"📂 已加载 {config.symbol} {len(bars)} 条历史数据 "
+                  f"({bars[0].date} 至 {bars[-1].date})")
+            print()
+            results = config.build_strategy().run_backtest(bars, incremental=self.incremental)
+            return SymbolRunResult(config.symbol, True, time.perf_counter() - start, results=results)
+        except Exception as e:
+            print(f"❌ {config.symbol} 运行失败: {e}")
+            return SymbolRunResult(config.symbol, False, time.perf_counter() - start, error=str(e))
+
+    def _run_captured(self, config: SymbolConfig, output: _ThreadOutput) -> SymbolRunResult:
+        buffer = io.StringIO()
+        output.capture(buffer)
+        try:
+            result = self.run_symbol(config)
+        finally:
+            output.capture(None)
+        result.output = buffer.getvalue()
+        return result
+
+    def run(self, symbols: Optional[Sequence[str]] = None) -> Dict[str, SymbolRunResult]:
+        """
+        并行运行多只股票
+
+        Returns:
+            {股票代码: SymbolRunResult}, 顺序与 symbols 一致
+        """
+        symbols = list(symbols) if symbols else list(self.configs)
+        unknown = [symbol for symbol in symbols if symbol not in self.configs]
+        if unknown:
+            raise KeyError(f"未配置的股票: {', '.join(unknown)}")
+
+        output = _ThreadOutput(sys.stdout)
+        previous, sys.stdout = sys.stdout, output
+        try:
+            workers = self.max_workers or len(symbols)
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                futures = [
+                    pool.submit(self._run_captured, self.configs[symbol], output)
+                    for symbol in symbols
+                ]
+                # 按配置顺序整段打印各股票的输出
+                results = {}
+                for future in futures:
+                    result = future.result()
+                    previous.write(result.output)
+                    previous.flush()
+                    results[result.symbol] = result
+        finally:
+            sys.stdout = previous
+        return results
+
+
+def print_summary(results: Dict[str, SymbolRunResult]):
+    """打印各股票的运行汇总"""
+    print("=" * 60)
+    print("📋 多股票日度策略汇总")
+    print("=" * 60)
+    for result in results.values():
+        if result.success:
+            metrics = result.results['metrics']
+            print(f"  ✅ {result.symbol:<6} 信号 {len(result.signals):>3}  "
+                  f"收益 {metrics.total_return:>8.2%}  夏普 {metrics.sharpe_ratio:>6.2f}  "
+                  f"耗时 {result.seconds:.2f}s")
+        else:
+            print(f"  ❌ {result.symbol:<6} {result.error}")
+    print()
+
+
+def run_configured(
+    symbols: Optional[Sequence[str]] = None,
+    configs: Optional[Sequence[SymbolConfig]] = None,
+    incremental: bool = True,
+    max_workers: Optional[int] = None
+) -> Dict[str, SymbolRunResult]:
+    """按配置运行指定股票(默认 DEFAULT_CONFIGS 中的全部股票)"""
+    runner = MultiSymbolRunner(configs or DEFAULT_CONFIGS, incremental, max_workers)
+    return runner.run(symbols)
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="多股票日度策略运行器")
+    parser.add_argument("symbols", nargs="*", help="股票代码, 默认运行全部已配置股票")
+    parser.add_argument("--config", type=Path, help="JSON 配置文件, 默认使用内置配置")
+    parser.add_argument("--full", action="store_true", help="全量回放, 不使用断点续跑")
+    parser.add_argument("--workers", type=int, default=None, help="并行线程数")
+    args = parser.parse_args(argv)
+
+    configs = load_configs(args.config) if args.config else DEFAULT_CONFIGS
+    start = time.perf_counter()
+    results = run_configured(
+        [symbol.upper() for symbol in args.symbols] or None,
+        configs=configs,
+        incremental=not args.full,
+        max_workers=args.workers
+    )
+    print_summary(results)
+    print(f"⏱️  总耗时: {time.perf_counter() - start:.2f}s")
+    return results
+
+
+if __name__ == "__main__":
+    main()
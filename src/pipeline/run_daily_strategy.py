@@ -10,7 +10,7 @@
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
@@ -18,7 +18,32 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.data.loader import CSVPriceLoader, PriceBar
+from src.backtest.costs import DEFAULT_COST_MODEL, CostModel
 from src.backtest.engine import Backtester, TradeAction
+from src.data.feature_store import SymbolFeatures, get_feature_store
+from src.pipeline.incremental import IncrementalStrategyRunner
+from src.signals.streaming import StreamingDailyStrategy
+
+
+def default_data_path(symbol: str) -> Path:
+    """日线数据路径: TSLA 在 data/ 下, 其他股票在 <代码>/data/ 下"""
+    if symbol == "TSLA":
+        return project_root / "data" / "sample_tsla.csv"
+    return project_root / symbol / "data" / f"sample_{symbol.lower()}.csv"
+
+
+def default_results_dir(symbol: str) -> Path:
+    """日度回测结果目录: TSLA 在 backtest_results/ 下, 其他股票在 <代码>/backtest_results/ 下"""
+    if symbol == "TSLA":
+        return project_root / "backtest_results" / "daily"
+    return project_root / symbol / "backtest_results" / "daily"
+
+
+def default_log_path(symbol: str) -> Path:
+    """策略执行日志: TSLA 在项目根目录下, 其他股票在 <代码>/ 下"""
+    if symbol == "TSLA":
+        return project_root / "STRATEGY_EXECUTION_LOG.md"
+    return project_root / symbol / "STRATEGY_EXECUTION_LOG.md"
 
 
 class DailyTradingStrategy:
@@ -32,7 +57,10 @@ class DailyTradingStrategy:
         trend_window: int = 20,      # 20日趋势过滤
         volume_threshold: float = 1.3,  # 成交量阈值(相对平均)
         profit_target: float = 0.05,    # 止盈5%
-        stop_loss: float = 0.02         # 止损2%
+        stop_loss: float = 0.02,        # 止损2%
+        symbol: str = "TSLA",
+        results_dir: Optional[Path] = None,  # 默认按 default_results_dir(symbol)
+        cost_model: Optional[CostModel] = None  # 交易成本, 默认 0.1% 佣金
     ):
         self.initial_cash = initial_cash
         self.position_pct = position_pct
@@ -41,8 +69,16 @@ class DailyTradingStrategy:
         self.volume_threshold = volume_threshold
         self.profit_target = profit_target
         self.stop_loss = stop_loss
+        self.symbol = symbol
+        self.results_dir = Path(results_dir) if results_dir is not None else None
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
     
-    def calculate_momentum(self, bars: List[PriceBar], current_idx: int) -> float:
+    def calculate_momentum(
+        self,
+        bars: List[PriceBar],
+        current_idx: int,
+        features: SymbolFeatures = None
+    ) -> float:
         """
         计算短期动量
         
@@ -53,13 +89,16 @@ class DailyTradingStrategy:
             return 0.0
         
         # 计算价格变化率
-        current_price = bars[current_idx].close
-        prev_price = bars[current_idx - self.momentum_window].close
-        
-        momentum = (current_price - prev_price) / prev_price
-        return momentum
+        if features is None:
+            features = self.features(bars)
+        return float(features.momentum(self.momentum_window)[current_idx])
     
-    def check_volume_surge(self, bars: List[PriceBar], current_idx: int) -> bool:
+    def check_volume_surge(
+        self,
+        bars: List[PriceBar],
+        current_idx: int,
+        features: SymbolFeatures = None
+    ) -> bool:
         """
         检查成交量是否放大
         
@@ -70,7 +109,9 @@ class DailyTradingStrategy:
             return False
         
         # 计算20日平均成交量
-        avg_volume = np.mean([bars[i].volume for i in range(current_idx - 20, current_idx)])
+        if features is None:
+            features = self.features(bars)
+        avg_volume = features.prior_mean(20)[current_idx]
         
         # 今日成交量
         current_volume = bars[current_idx].volume
@@ -78,7 +119,12 @@ class DailyTradingStrategy:
         # 成交量是否超过平均的threshold倍
         return current_volume > avg_volume * self.volume_threshold
     
-    def is_in_uptrend(self, bars: List[PriceBar], current_idx: int) -> bool:
+    def is_in_uptrend(
+        self,
+        bars: List[PriceBar],
+        current_idx: int,
+        features: SymbolFeatures = None
+    ) -> bool:
         """
         判断是否处于上升趋势
         
@@ -89,16 +135,20 @@ class DailyTradingStrategy:
             return False
         
         # 计算移动平均
-        recent_closes = [bars[i].close for i in range(
-            current_idx - self.trend_window + 1, 
-            current_idx + 1
-        )]
-        ma = np.mean(recent_closes)
+        if features is None:
+            features = self.features(bars)
+        ma = features.sma(self.trend_window)[current_idx]
         
         # 当前价格在均线上方
         return bars[current_idx].close > ma
     
-    def should_buy(self, bars: List[PriceBar], current_idx: int, has_position: bool) -> bool:
+    def should_buy(
+        self,
+        bars: List[PriceBar],
+        current_idx: int,
+        has_position: bool,
+        features: SymbolFeatures = None
+    ) -> bool:
         """
         判断是否应该买入
         
@@ -115,14 +165,14 @@ class DailyTradingStrategy:
             return False
         
         # 趋势过滤
-        if not self.is_in_uptrend(bars, current_idx):
+        if not self.is_in_uptrend(bars, current_idx, features):
             return False
         
         # 计算动量
-        momentum = self.calculate_momentum(bars, current_idx)
+        momentum = self.calculate_momentum(bars, current_idx, features)
         
         # 检查成交量
-        volume_surge = self.check_volume_surge(bars, current_idx)
+        volume_surge = self.check_volume_surge(bars, current_idx, features)
         
         # 买入条件: 上升趋势 + 正动量 > 3% + 成交量放大
         return momentum > 0.03 and volume_surge
@@ -132,7 +182,8 @@ class DailyTradingStrategy:
         bars: List[PriceBar], 
         current_idx: int, 
         has_position: bool,
-        entry_price: float = None
+        entry_price: float = None,
+        features: SymbolFeatures = None
     ) -> Tuple[bool, str]:
         """
         判断是否应该卖出
@@ -164,13 +215,40 @@ class DailyTradingStrategy:
                 return True, f"止损 (亏损{pnl_pct:.2%})"
         
         # 动量转负
-        momentum = self.calculate_momentum(bars, current_idx)
+        momentum = self.calculate_momentum(bars, current_idx, features)
         if momentum < -0.02:
             return True, f"动量转负 ({momentum:.2%})"
         
         return False, ""
     
-    def generate_signals(self, bars: List[PriceBar]) -> List[dict]:
+    def features(self, bars: List[PriceBar]) -> SymbolFeatures:
+        """共享特征缓存中这组K线的特征(均线、动量、均量)"""
+        return get_feature_store().for_bars(self.symbol, bars)
+    
+    def stream(self) -> StreamingDailyStrategy:
+        """
+        创建同参数的流式策略对象(逐K线 on_bar, O(1) 滚动指标)
+        
+        可先用历史K线 warm_up, 再对盘中实时K线调用 peek/on_bar,
+        信号与 generate_signals 完全一致。
+        """
+        return StreamingDailyStrategy.from_strategy(self)
+    
+    def initial_state(self) -> dict:
+        """信号生成的初始状态(现金、持仓、入场价、上次交易日)"""
+        return {
+            'cash': self.initial_cash,
+            'position': 0,
+            'entry_price': None,
+            'last_trade_date': None
+        }
+    
+    def generate_signals(
+        self,
+        bars: List[PriceBar],
+        state: dict = None,
+        start_idx: int = 0
+    ) -> List[dict]:
         """
         生成交易信号
         
@@ -183,12 +261,18 @@ class DailyTradingStrategy:
             [{date, action, quantity, reason}, ...]
         """
         signals = []
-        current_cash = self.initial_cash
-        current_position = 0
-        entry_price = None
-        last_trade_date = None
-        
-        for idx, bar in enumerate(bars):
+        if state is None:
+            state = self.initial_state()
+        current_cash = state['cash']
+        current_position = state['position']
+        entry_price = state['entry_price']
+        last_trade_date = state['last_trade_date']
+        
+        # 均线、动量、均量从共享特征缓存读取(每个数组只计算一次)
+        features = self.features(bars)
+        
+        for idx in range(start_idx, len(bars)):
+            bar = bars[idx]
             current_date = pd.Timestamp(bar.date)
             
             # 确保每天最多1次交易
@@ -199,7 +283,7 @@ class DailyTradingStrategy:
             
             # 检查卖出条件
             if has_position:
-                should_sell, reason = self.should_sell(bars, idx, has_position, entry_price)
+                should_sell, reason = self.should_sell(bars, idx, has_position, entry_price, features)
                 
                 if should_sell:
                     signals.append({
@@ -211,15 +295,14 @@ class DailyTradingStrategy:
                     })
                     
                     # 更新状态
-                    proceeds = current_position * bar.close * 0.999
-                    current_cash += proceeds
+                    current_cash += self.cost_model.sell_cash(current_position, bar.close)
                     current_position = 0
                     entry_price = None
                     last_trade_date = current_date
                     continue
             
             # 检查买入条件
-            if self.should_buy(bars, idx, has_position):
+            if self.should_buy(bars, idx, has_position, features):
                 # 计算买入数量
                 position_value = current_cash * self.position_pct
                 quantity = int(position_value / bar.close)
@@ -229,27 +312,41 @@ class DailyTradingStrategy:
                         'date': current_date,
                         'action': TradeAction.BUY,
                         'quantity': quantity,
-                        'reason': f"动量突破 + 成交量放大 (动量={self.calculate_momentum(bars, idx):.2%})",
+                        'reason': f"动量突破 + 成交量放大 (动量={self.calculate_momentum(bars, idx, features):.2%})",
                         'price': bar.close
                     })
                     
                     # 更新状态
-                    cost = quantity * bar.close * 1.001
-                    current_cash -= cost
+                    current_cash -= self.cost_model.buy_cash(quantity, bar.close)
                     current_position = quantity
                     entry_price = bar.close
                     last_trade_date = current_date
         
+        # 保存状态, 供断点续跑
+        state.update(
+            cash=current_cash,
+            position=current_position,
+            entry_price=entry_price,
+            last_trade_date=last_trade_date
+        )
+        
         return signals
     
-    def run_backtest(self, bars: List[PriceBar]) -> dict:
-        """运行回测"""
+    def run_backtest(self, bars: List[PriceBar], incremental: bool = False) -> dict:
+        """
+        运行回测
+        
+        Args:
+            bars: 历史K线
+            incremental: 是否断点续跑(只推进新增K线, 结果与全量回放一致)
+        """
         print("=" * 60)
-        print("📊 日内交易策略回测 (每天1次)")
+        print(f"📊 {self.symbol} 日内交易策略回测 (每天1次)")
         print("=" * 60)
         print()
         
         print("⚙️  策略配置:")
+        print(f"  股票代码: {self.symbol}")
         print(f"  仓位比例: {self.position_pct:.0%}")
         print(f"  动量窗口: {self.momentum_window}日")
         print(f"  趋势窗口: {self.trend_window}日")
@@ -272,9 +369,26 @@ class DailyTradingStrategy:
             for bar in bars
         ])
         
-        # 生成信号
+        backtester = Backtester(
+            initial_cash=self.initial_cash,
+            commission_rate=0.001,
+            risk_free_rate=0.02,
+            cost_model=self.cost_model
+        )
+        
+        # 生成信号并回测
         print("🎯 生成交易信号...")
-        signals = self.generate_signals(bars)
+        if incremental:
+            runner = IncrementalStrategyRunner(self, self._results_dir() / "checkpoint_daily.json")
+            run_result = runner.run(bars, backtester, price_df)
+            signals = run_result['signals']
+            metrics = run_result['metrics']
+            mode = "增量续跑" if run_result['mode'] == 'incremental' else "全量回放"
+            print(f"✓ {mode}: 处理 {run_result['new_bars']} 根K线, 新增 {len(run_result['new_signals'])} 个信号")
+        else:
+            signals = self.generate_signals(bars)
+            signal_list = [(s['date'], s['action'], s['quantity']) for s in signals]
+            metrics = backtester.run(price_df, signal_list)
         
         buy_signals = sum(1 for s in signals if s['action'] == TradeAction.BUY)
         sell_signals = sum(1 for s in signals if s['action'] == TradeAction.SELL)
@@ -284,21 +398,6 @@ class DailyTradingStrategy:
         print(f"  - SELL 信号: {sell_signals}")
         print()
         
-        # 转换信号格式
-        signal_list = [(s['date'], s['action'], s['quantity']) for s in signals]
-        
-        # 运行回测
-        print("🚀 开始回测...")
-        print("-" * 60)
-        
-        backtester = Backtester(
-            initial_cash=self.initial_cash,
-            commission_rate=0.001,
-            risk_free_rate=0.02
-        )
-        
-        metrics = backtester.run(price_df, signal_list)
-        
         print("-" * 60)
         print("✓ 回测完成!")
         print()
@@ -318,7 +417,7 @@ class DailyTradingStrategy:
     def _print_results(self, metrics, backtester, bars, signals):
         """打印回测结果"""
         print("=" * 60)
-        print("📈 回测性能报告")
+        print(f"📈 {self.symbol} 回测性能报告")
         print("=" * 60)
         print()
         
@@ -365,11 +464,17 @@ class DailyTradingStrategy:
         print(f"  绝对收益:     ${final_equity - self.initial_cash:>10,.2f}")
         print()
     
+    def _results_dir(self) -> Path:
+        """回测结果目录"""
+        if self.results_dir is not None:
+            return self.results_dir
+        return default_results_dir(self.symbol)
+    
     def _save_results(self, metrics, backtester, signals, bars):
         """保存回测结果"""
         print("💾 保存结果...")
         
-        results_dir = project_root / "backtest_results" / "daily"
+        results_dir = self._results_dir()
         results_dir.mkdir(parents=True, exist_ok=True)
         
         # 保存资产净值曲线
@@ -396,17 +501,18 @@ class DailyTradingStrategy:
         summary_path = results_dir / "summary_daily.txt"
         with open(summary_path, 'w', encoding='utf-8') as f:
             f.write("=" * 60 + "\n")
-            f.write("日内交易策略回测报告 (每天1次)\n")
+            f.write(f"{self.symbol} 日内交易策略回测报告 (每天1次)\n")
             f.write("=" * 60 + "\n\n")
             f.write(f"回测日期: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"股票代码: {self.symbol}\n")
             f.write(f"数据范围: {bars[0].date} 至 {bars[-1].date}\n")
             f.write(f"总交易日: {len(bars)}\n\n")
             
             f.write("策略特点:\n")
-            f.write("  1. 短期动量: 3日动量指标\n")
+            f.write(f"  1. 短期动量: {self.momentum_window}日动量指标\n")
             f.write("  2. 成交量确认: 放量突破\n")
             f.write("  3. 日内交易: 每天最多1次\n")
-            f.write("  4. 快速止盈止损: 3% / 1.5%\n\n")
+            f.write(f"  4. 快速止盈止损: {self.profit_target:.1%} / {self.stop_loss:.1%}\n\n")
             
             f.write("配置参数:\n")
             f.write(f"  仓位比例: {self.position_pct:.0%}\n")
@@ -421,35 +527,15 @@ class DailyTradingStrategy:
         print()
         
         print("=" * 60)
-        print("✅ 日内交易策略回测完成!")
+        print(f"✅ {self.symbol} 日内交易策略回测完成!")
         print("=" * 60)
 
 
 def main():
-    """主函数"""
-    # 加载数据
-    print("📂 加载历史数据...")
-    data_path = project_root / "data" / "sample_tsla.csv"
-    loader = CSVPriceLoader(data_path)
-    bars = list(loader.load())
-    print(f"✓ 已加载 {len(bars)} 条历史数据")
-    print(f"  日期范围: {bars[0].date} 至 {bars[-1].date}")
-    print()
-    
-    # 创建并运行日内交易策略
-    strategy = DailyTradingStrategy(
-        initial_cash=100000.0,
-        position_pct=0.6,
-        momentum_window=5,
-        trend_window=20,
-        volume_threshold=1.3,
-        profit_target=0.05,
-        stop_loss=0.02
-    )
-    
-    results = strategy.run_backtest(bars)
+    """主函数: 运行 TSLA 日度策略(参数见 run_daily_strategies.DEFAULT_CONFIGS)"""
+    from src.pipeline.run_daily_strategies import run_configured
     
-    return results
+    return run_configured(["TSLA"])["TSLA"].results
 
 
 if __name__ == "__main__":
@@ -17,7 +17,10 @@ sys.path.insert(0, str(project_root))
 
 from src.data.loader import CSVPriceLoader, PriceBar
 from src.signals.momentum import MomentumSignalModel, TradeAction as SignalAction
+from src.backtest.costs import DEFAULT_COST_MODEL, CostModel
 from src.backtest.engine import Backtester, TradeAction
+from src.data.feature_store import SymbolFeatures, get_feature_store
+from src.portfolio.sizing import SizingConfig, VolatilityTargetSizer, rolling_target_weights
 import pandas as pd
 import numpy as np
 
@@ -25,19 +28,30 @@ import numpy as np
 class ImprovedStrategy:
     """改进策略 - 趋势跟踪 + 动态仓位"""
     
+    symbol = "TSLA"
+    
     def __init__(
         self,
         initial_cash: float = 100000.0,
         max_position_pct: float = 0.6,  # 提高到60%
         trend_filter_window: int = 50,   # 50日趋势线
-        position_scaling: bool = True     # 启用仓位缩放
+        position_scaling: bool = True,    # 启用仓位缩放
+        cost_model: CostModel = None,     # 交易成本, 默认 0.1% 佣金
+        sizing: SizingConfig = None       # 设置后按波动率目标计算仓位, 取代信号强度缩放
     ):
         self.initial_cash = initial_cash
         self.max_position_pct = max_position_pct
         self.trend_filter_window = trend_filter_window
         self.position_scaling = position_scaling
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        self.sizing = sizing
     
-    def has_uptrend(self, bars: List[PriceBar], current_idx: int) -> bool:
+    def has_uptrend(
+        self,
+        bars: List[PriceBar],
+        current_idx: int,
+        features: SymbolFeatures = None
+    ) -> bool:
         """
         判断是否处于上升趋势
         
@@ -46,22 +60,17 @@ class ImprovedStrategy:
         if current_idx < self.trend_filter_window:
             return False
         
-        # 计算50日均线
-        recent_closes = [bars[i].close for i in range(
-            current_idx - self.trend_filter_window + 1, 
-            current_idx + 1
-        )]
-        ma50 = np.mean(recent_closes)
+        # 50日均线(共享特征缓存, 整列只计算一次)
+        if features is None:
+            features = get_feature_store().for_bars(self.symbol, bars)
+        ma = features.sma(self.trend_filter_window)
+        ma50 = ma[current_idx]
         
-        # 计算前一天的50日均线
+        # 前一天的50日均线
         if current_idx < self.trend_filter_window + 1:
             return bars[current_idx].close > ma50
         
-        prev_closes = [bars[i].close for i in range(
-            current_idx - self.trend_filter_window, 
-            current_idx
-        )]
-        prev_ma50 = np.mean(prev_closes)
+        prev_ma50 = ma[current_idx - 1]
         
         current_price = bars[current_idx].close
         
@@ -72,13 +81,19 @@ class ImprovedStrategy:
         self, 
         signal_score: float, 
         current_price: float,
-        current_cash: float
+        current_cash: float,
+        target_weight: float = None
     ) -> int:
         """
         根据信号强度计算仓位大小
         
-        信号越强,仓位越大 (但不超过最大限制)
+        信号越强,仓位越大 (但不超过最大限制);
+        给出 target_weight(波动率目标仓位)时按其计算, 同样不超过最大仓位
         """
+        if target_weight is not None:
+            position_value = current_cash * min(target_weight, self.max_position_pct)
+            return int(position_value / current_price)
+        
         if not self.position_scaling:
             # 固定仓位
             position_value = current_cash * self.max_position_pct
@@ -105,12 +120,19 @@ class ImprovedStrategy:
             threshold=0.25    # 稍高的阈值,减少噪音
         )
         
-        decisions = model.generate(bars)
+        features = get_feature_store().for_bars(self.symbol, bars)
+        decisions = model.generate(bars, features)
         filtered_decisions = model.filter_trading_slots(
             decisions, 
             max_trades_per_week=2
         )
         
+        # 波动率目标仓位: 逐日推进协方差估计, 与回测看到的数据一致
+        target_weights = {}
+        if self.sizing is not None:
+            sizer = VolatilityTargetSizer([self.symbol], self.sizing)
+            target_weights = rolling_target_weights(sizer, {self.symbol: bars})[self.symbol].to_dict()
+        
         # 2. 应用趋势过滤和仓位计算
         signals = []
         current_cash = self.initial_cash
@@ -129,14 +151,15 @@ class ImprovedStrategy:
             # 买入信号
             if decision.action == SignalAction.BUY:
                 # 趋势过滤: 只在上升趋势买入
-                if not self.has_uptrend(bars, current_idx):
+                if not self.has_uptrend(bars, current_idx, features):
                     continue
                 
                 # 计算仓位
                 quantity = self.calculate_position_size(
                     decision.score,
                     decision.bar.close,
-                    current_cash
+                    current_cash,
+                    target_weights.get(decision.bar.date)
                 )
                 
                 if quantity > 0:
@@ -148,8 +171,7 @@ class ImprovedStrategy:
                     })
                     
                     # 更新模拟状态
-                    cost = quantity * decision.bar.close * 1.001  # 含佣金
-                    current_cash -= cost
+                    current_cash -= self.cost_model.buy_cash(quantity, decision.bar.close)
                     current_position += quantity
             
             # 卖出信号
@@ -166,8 +188,7 @@ class ImprovedStrategy:
                     })
                     
                     # 更新模拟状态
-                    proceeds = sell_quantity * decision.bar.close * 0.999  # 扣佣金
-                    current_cash += proceeds
+                    current_cash += self.cost_model.sell_cash(sell_quantity, decision.bar.close)
                     current_position = 0
         
         return signals
@@ -221,7 +242,8 @@ class ImprovedStrategy:
         backtester = Backtester(
             initial_cash=self.initial_cash,
             commission_rate=0.001,
-            risk_free_rate=0.02
+            risk_free_rate=0.02,
+            cost_model=self.cost_model
         )
         
         metrics = backtester.run(price_df, signal_list)
@@ -0,0 +1,385 @@
+"""
+并行报告编排器
+
+原先 generate_all_reports.bat 依次运行 strategy_analyzer.py 和 strategy_scorer.py,
+每只股票、每种策略、每种报告顺序生成, 同一份回测结果被反复读取。编排器:
+1. 把报告拆成 (股票, 策略, 报告类型) 任务, 按依赖关系组成 DAG
+   (对比报告依赖全部评分任务, 其余任务互相独立)
+2. 独立任务在进程池中并行运行, 耗时随 CPU 核数而不是股票数增长
+3. 中间结果(周报/月报文本、评分)按输入哈希缓存: 回测结果文件和执行记录未变化时
+   直接复用, 不再读取数据
+4. 结束时打印每个任务的耗时和缓存命中情况
+
+用法:
+    python -m src.pipeline.run_reports                       # 全部股票的周报、月报、对比报告
+    python -m src.pipeline.run_reports TSLA NVDA --html      # 指定股票, 并生成 HTML 报告
+    python -m src.pipeline.run_reports --period week --workers 4 --no-cache
+"""
+import argparse
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.analysis.strategy_analyzer import StrategyAnalyzer
+from src.analysis.strategy_scorer import StrategyScorer
+
+
+DEFAULT_SYMBOLS = ["TSLA", "NVDA", "INTC"]
+STRATEGY_TYPES = ("daily", "weekly")
+
+# 报告缓存版本, 报告格式或评分规则改动后递增使旧缓存失效
+REPORT_CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = project_root / ".report_cache" / "reports"
+
+
+@dataclass(frozen=True)
+class ReportTask:
+    """DAG 中的一个报告任务"""
+    task_id: str
+    kind: str                              # weekly / monthly / score / comparison / html
+    symbol: Optional[str] = None
+    strategy_type: Optional[str] = None
+    period: Optional[str] = None           # week / month (score / comparison)
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskResult:
+    """任务结果与耗时"""
+    task: ReportTask
+    status: str                            # done / cached / failed / skipped
+    seconds: float = 0.0
+    value: Any = None
+    error: Optional[str] = None
+
+
+def build_tasks(
+    symbols: Sequence[str],
+    periods: Sequence[str] = ("month",),
+    reports: bool = True,
+    html: bool = False
+) -> Dict[str, ReportTask]:
+    """
+    构建任务 DAG
+
+    Args:
+        symbols: 股票代码
+        periods: 对比评分的评估周期
+        reports: 是否生成各股票的周报和月报
+        html: 是否生成 HTML 报告
+    """
+    tasks = []
+    if reports:
+        for symbol in symbols:
+            tasks.append(ReportTask(f"weekly:{symbol}", "weekly", symbol))
+            tasks.append(ReportTask(f"monthly:{symbol}", "monthly", symbol))
+    for period in periods:
+        scores = [
+            ReportTask(f"score:{symbol}:{strategy_type}:{period}", "score", symbol, strategy_type, period)
+            for symbol in symbols
+            for strategy_type in STRATEGY_TYPES
+        ]
+        tasks.extend(scores)
+        tasks.append(ReportTask(
+            f"comparison:{period}", "comparison", period=period,
+            deps=tuple(task.task_id for task in scores)
+        ))
+    if html:
+        tasks.append(ReportTask("html", "html"))
+    return {task.task_id: task for task in tasks}
+
+
+def _week_start(today: datetime) -> str:
+    return (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d')
+
+
+def _period_id(task: ReportTask, today: datetime) -> str:
+    """任务覆盖的时间段, 作为缓存键的一部分"""
+    if task.kind == "weekly" or task.period == "week":
+        return _week_start(today)
+    return today.strftime('%Y-%m')
+
+
+def _builtin(value):
+    """numpy 标量 -> Python 内置类型, 使结果可写入 JSON 缓存"""
+    if isinstance(value, dict):
+        return {key: _builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_builtin(item) for item in value]
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def run_report_task(task: ReportTask, data_dir: Optional[Path], today: datetime) -> Any:
+    """
+    在工作进程中运行一个任务(对比报告除外)
+
+    Returns:
+        weekly/monthly: {"file": 报告路径, "text": 报告内容}
+        score: StrategyScorer.score_analysis 的结果
+        html: 报告路径
+    """
+    if task.kind == "html":
+        from src.visualization.html_report_generator import HTMLReportGenerator
+        output = HTMLReportGenerator().generate_html_report(
+            light=True, cache_dir=project_root / ".report_cache"
+        )
+        return str(output)
+
+    scorer = StrategyScorer([task.symbol], {task.symbol: data_dir} if data_dir else None)
+    analyzer = scorer.analyzers[task.symbol]
+    if task.kind == "weekly":
+        start = _week_start(today)
+        end = (datetime.strptime(start, '%Y-%m-%d') + timedelta(days=6)).strftime('%Y-%m-%d')
+        text = analyzer.generate_weekly_report(start, save_to_file=False)
+        report_file = analyzer.report_file("weekly", f"{start} ~ {end}")
+    elif task.kind == "monthly":
+        text = analyzer.generate_monthly_report(today.year, today.month, save_to_file=False)
+        report_file = analyzer.report_file("monthly", f"{today.year}年{today.month}月")
+    elif task.kind == "score":
+        if task.period == "week":
+            analysis = analyzer.analyze_week(_week_start(today))
+        else:
+            analysis = analyzer.analyze_month(today.year, today.month)
+        return _builtin(scorer.score_analysis(
+            task.symbol, task.strategy_type, task.period, analysis[f"{task.strategy_type}_strategy"]
+        ))
+    else:
+        raise ValueError(f"未知任务类型: {task.kind}")
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return {"file": str(report_file), "text": text}
+
+
+class ArtifactCache:
+    """
+    按 (任务编号, 输入哈希) 缓存任务结果, 每个任务一个 JSON 文件
+
+    Args:
+        cache_dir: 缓存目录
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, task_id: str) -> Path:
+        return self.cache_dir / f"{task_id.replace(':', '_')}.json"
+
+    def get(self, task_id: str, key: str) -> Tuple[bool, Any]:
+        """(是否命中, 缓存的结果)"""
+        path = self._path(task_id)
+        if not path.exists():
+            return False, None
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('key') != key:
+            return False, None
+        return True, cached['value']
+
+    def put(self, task_id: str, key: str, value: Any):
+        path = self._path(task_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'value': value}, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+
+class ReportOrchestrator:
+    """
+    报告任务调度器
+
+    Args:
+        symbols: 股票代码
+        data_dirs: {股票代码: 数据目录}, 未指定的使用 StrategyAnalyzer 默认目录
+        cache_dir: 中间结果缓存目录, None 表示不缓存
+        max_workers: 进程数, 默认 CPU 核数; 0 表示在当前进程内顺序运行
+        today: 报告基准日期, 默认当前时间
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str] = DEFAULT_SYMBOLS,
+        data_dirs: Optional[Dict[str, Path]] = None,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        max_workers: Optional[int] = None,
+        today: Optional[datetime] = None
+    ):
+        self.symbols = list(symbols)
+        self.data_dirs = dict(data_dirs or {})
+        self.cache = ArtifactCache(cache_dir) if cache_dir is not None else None
+        self.max_workers = max_workers
+        self.today = today or datetime.now()
+
+    def _input_files(self, symbol: str) -> List[Path]:
+        analyzer = StrategyAnalyzer(symbol, self.data_dirs.get(symbol))
+        files = [
+            analyzer.results_file(kind, strategy_type)
+            for strategy_type in STRATEGY_TYPES
+            for kind in ("signals", "trades")
+        ]
+        return files + [analyzer.execution_store.path]
+
+    def input_key(self, task: ReportTask) -> Optional[str]:
+        """
+        任务输入的哈希: 任务参数、时间段和输入文件的 (大小, 修改时间);
+        HTML 报告有自己的图表缓存, 对比报告只依赖评分结果, 二者不缓存
+        """
+        if task.kind in ("html", "comparison"):
+            return None
+        stats = []
+        for path in self._input_files(task.symbol):
+            stat = path.stat() if path.exists() else None
+            stats.append([str(path), stat.st_size if stat else None, stat.st_mtime_ns if stat else None])
+        payload = [REPORT_CACHE_VERSION, task.task_id, _period_id(task, self.today), stats]
+        return hashlib.sha1(json.dumps(payload).encode()).hexdigest()[:16]
+
+    def _run_comparison(self, task: ReportTask, results: Dict[str, TaskResult]) -> str:
+        scorer = StrategyScorer(self.symbols, self.data_dirs)
+        scores = [results[dep].value for dep in task.deps]
+        scorer.generate_comparison_report(task.period, save_to_file=True, score_results=scores)
+        return task.period
+
+    def _finish(self, task: ReportTask, key: Optional[str], value: Any, seconds: float) -> TaskResult:
+        if self.cache is not None and key is not None:
+            self.cache.put(task.task_id, key, value)
+        return TaskResult(task, "done", seconds, value)
+
+    def _restore(self, task: ReportTask, value: Any):
+        """缓存命中时补写缺失的报告文件"""
+        if task.kind in ("weekly", "monthly"):
+            report_file = Path(value['file'])
+            if not report_file.exists():
+                report_file.parent.mkdir(parents=True, exist_ok=True)
+                report_file.write_text(value['text'], encoding='utf-8')
+
+    def run(self, tasks: Dict[str, ReportTask]) -> Dict[str, TaskResult]:
+        """
+        按依赖顺序运行全部任务: 依赖已完成的任务先查缓存, 未命中的提交到进程池;
+        依赖失败的任务标记为 skipped
+        """
+        results: Dict[str, TaskResult] = {}
+        pending = dict(tasks)
+        running = {}  # future -> (task, key, 提交时间)
+        pool = ProcessPoolExecutor(max_workers=self.max_workers) if self.max_workers != 0 else None
+        try:
+            while pending or running:
+                for task_id, task in list(pending.items()):
+                    if any(dep not in results for dep in task.deps):
+                        continue
+                    del pending[task_id]
+                    if any(results[dep].status not in ("done", "cached") for dep in task.deps):
+                        results[task_id] = TaskResult(task, "skipped", error="依赖任务失败")
+                        continue
+
+                    start = time.perf_counter()
+                    key = self.input_key(task)
+                    if self.cache is not None and key is not None:
+                        hit, value = self.cache.get(task_id, key)
+                        if hit:
+                            self._restore(task, value)
+                            results[task_id] = TaskResult(task, "cached", time.perf_counter() - start, value)
+                            continue
+
+                    if task.kind == "comparison" or pool is None:
+                        try:
+                            if task.kind == "comparison":
+                                value = self._run_comparison(task, results)
+                            else:
+                                value = run_report_task(task, self.data_dirs.get(task.symbol), self.today)
+                            results[task_id] = self._finish(task, key, value, time.perf_counter() - start)
+                        except Exception as e:
+                            results[task_id] = TaskResult(task, "failed", time.perf_counter() - start, error=str(e))
+                        continue
+
+                    future = pool.submit(run_report_task, task, self.data_dirs.get(task.symbol), self.today)
+                    running[future] = (task, key, start)
+
+                if not running:
+                    if pending and not any(
+                        all(dep in results for dep in task.deps) for task in pending.values()
+                    ):
+                        missing = sorted({dep for task in pending.values() for dep in task.deps} - set(tasks))
+                        raise ValueError(f"任务依赖无法满足: {missing}")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, key, start = running.pop(future)
+                    seconds = time.perf_counter() - start
+                    try:
+                        results[task.task_id] = self._finish(task, key, future.result(), seconds)
+                    except Exception as e:
+                        results[task.task_id] = TaskResult(task, "failed", seconds, error=str(e))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return results
+
+
+def print_summary(results: Dict[str, TaskResult], elapsed: float):
+    """打印每个任务的状态和耗时"""
+    icons = {"done": "✅", "cached": "♻️ ", "failed": "❌", "skipped": "⏭️ "}
+    print("=" * 80)
+    print(f"⏱️  报告任务耗时 (总耗时 {elapsed:.2f}s):")
+    for task_id, result in sorted(results.items(), key=lambda item: -item[1].seconds):
+        line = f"  {icons[result.status]} {task_id:<32} {result.seconds:>7.3f}s  {result.status}"
+        if result.error:
+            line += f"  {result.error}"
+        print(line)
+    counts = {status: sum(r.status == status for r in results.values()) for status in icons}
+    print(f"完成 {counts['done']} / 缓存 {counts['cached']} / 失败 {counts['failed']} / 跳过 {counts['skipped']}")
+    print("=" * 80)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, TaskResult]:
+    parser = argparse.ArgumentParser(description="并行生成策略分析报告")
+    parser.add_argument("symbols", nargs="*", default=DEFAULT_SYMBOLS, help="股票代码")
+    parser.add_argument("--period", choices=["week", "month", "both"], default="month",
+                        help="策略对比评分的评估周期")
+    parser.add_argument("--reports-only", action="store_true",
+                        help="只生成各股票的周报和月报(不做策略对比评分)")
+    parser.add_argument("--weekly-only", action="store_true", help="只生成周报")
+    parser.add_argument("--html", action="store_true", help="同时生成 HTML 报告")
+    parser.add_argument("--workers", type=int, default=None, help="进程数, 0 表示不使用进程池")
+    parser.add_argument("--no-cache", action="store_true", help="不使用中间结果缓存")
+    args = parser.parse_args(argv)
+
+    periods = ("week", "month") if args.period == "both" else (args.period,)
+    reports_only = args.reports_only or args.weekly_only
+    tasks = build_tasks(args.symbols, periods=() if reports_only else periods, html=args.html)
+    if args.weekly_only:
+        tasks = {task_id: task for task_id, task in tasks.items() if task.kind == "weekly"}
+
+    print("=" * 80)
+    print(f"📊 生成策略分析报告: {', '.join(args.symbols)} ({len(tasks)} 个任务)")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    orchestrator = ReportOrchestrator(
+        args.symbols,
+        cache_dir=None if args.no_cache else DEFAULT_CACHE_DIR,
+        max_workers=args.workers
+    )
+    results = orchestrator.run(tasks)
+    for result in results.values():
+        if result.task.kind in ("weekly", "monthly") and result.value:
+            print(f"✅ {result.value['file']}")
+    print_summary(results, time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+全市场扫描 - 日度动量策略
+
+在本地K线库(每只股票一个 CSV)上对全部股票同时计算日度策略的买卖条件,
+输出今日候选股票排名。计算在 (股票 × 交易日) 二维数组上批量完成,
+没有逐股票的 Python 循环, 数百只股票数秒内完成。
+
+用法:
+    python -m src.pipeline.run_universe_scan                          # data/daily/*_daily.csv
+    python -m src.pipeline.run_universe_scan --store data/sp500 --top 30
+    python -m src.pipeline.run_universe_scan --holdings TSLA=430.5 NVDA=180
+    python -m src.pipeline.run_universe_scan --synthetic 500          # 随机数据测速
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.pipeline.run_daily_strategy import DailyTradingStrategy
+from src.signals.scanner import ScanConfig, UniversePanel, load_bar_store, scan
+
+
+def synthetic_universe(n_symbols: int, n_bars: int = 2520, seed: int = 0) -> UniversePanel:
+    """随机游走组成的测试股票池"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0.0005, 0.02, (n_symbols, n_bars)), axis=1)
+    volume = rng.integers(1_000_000, 5_000_000, (n_symbols, n_bars)).astype(np.float64)
+    dates = np.datetime64('2015-01-02') + np.arange(n_bars)
+    frame = pd.DataFrame({
+        'symbol': np.repeat([f"SYM{i:03d}" for i in range(n_symbols)], n_bars),
+        'date': np.tile(dates, n_symbols),
+        'close': close.ravel(),
+        'volume': volume.ravel(),
+    })
+    return UniversePanel.from_long_frame(frame)
+
+
+def parse_holdings(items: Sequence[str]) -> Dict[str, float]:
+    """解析 SYMBOL=入场价 形式的持仓"""
+    holdings = {}
+    for item in items:
+        symbol, _, price = item.partition('=')
+        holdings[symbol.upper()] = float(price)
+    return holdings
+
+
+def main(argv: Optional[List[str]] = None) -> pd.DataFrame:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="日度动量策略全市场扫描")
+    parser.add_argument("--store", type=Path, default=project_root / "data" / "daily",
+                        help="K线库目录(每只股票一个 CSV)")
+    parser.add_argument("--pattern", default="*_daily.csv", help="K线文件名模式")
+    parser.add_argument("--lookback", type=int, default=260, help="每只股票读取的最近K线数")
+    parser.add_argument("--top", type=int, default=20, help="显示前 N 个候选")
+    parser.add_argument("--holdings", nargs="*", default=[], help="持仓, 形如 TSLA=430.5")
+    parser.add_argument("--volume-threshold", type=float, default=None, help="成交量阈值(默认同日度策略)")
+    parser.add_argument("--output", type=Path, default=None, help="候选列表另存为 CSV")
+    parser.add_argument("--synthetic", type=int, default=0, help="使用 N 只随机股票测速")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("🔭 日度动量策略 - 全市场扫描")
+    print("=" * 70)
+
+    overrides = {}
+    if args.volume_threshold is not None:
+        overrides['volume_threshold'] = args.volume_threshold
+    config = ScanConfig.from_strategy(DailyTradingStrategy(), **overrides)
+
+    start = time.perf_counter()
+    if args.synthetic:
+        panel = synthetic_universe(args.synthetic)
+    else:
+        panel = load_bar_store(args.store, args.pattern, args.lookback)
+    loaded = time.perf_counter()
+
+    candidates = scan(panel, config, holdings=parse_holdings(args.holdings))
+    scanned = time.perf_counter()
+
+    symbols, bars = panel.shape
+    print(f"📂 股票数: {symbols}, 每只最多 {bars} 根K线")
+    print(f"⏱️  加载 {loaded - start:.2f}s, 扫描 {scanned - loaded:.3f}s")
+    print()
+
+    if candidates.empty:
+        print("今日无候选信号")
+    else:
+        shown = candidates.head(args.top)
+        print(f"🏆 今日候选 (前 {len(shown)}/{len(candidates)}):")
+        print("-" * 70)
+        for rank, row in enumerate(shown.itertuples(index=False), 1):
+            extra = f"盈亏 {row.pnl_pct:+.2%}" if row.action == "SELL" else f"量比 {row.volume_ratio:.2f}"
+            print(f"  #{rank:<3} {row.symbol:<8} {row.action:<4} ${row.close:>9.2f}  "
+                  f"动量 {row.momentum:+.2%}  均线偏离 {row.trend_gap:+.2%}  {extra}  {row.reason}")
+
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        candidates.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n💾 候选列表已保存到: {args.output}")
+
+    return candidates
+
+
+if __name__ == "__main__":
+    main()
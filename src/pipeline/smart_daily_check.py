@@ -5,99 +5,84 @@
 1. 运行每日策略
 2. 自动记录执行结果
 3. 发送邮件通知
+
+股票列表和策略参数来自 run_daily_strategies 的配置(默认 DEFAULT_CONFIGS):
+    python -m src.pipeline.smart_daily_check                     # 全部已配置股票
+    python -m src.pipeline.smart_daily_check TSLA NVDA
+    python -m src.pipeline.smart_daily_check --config symbols.json
 """
+import argparse
 import sys
-import subprocess
 from pathlib import Path
 from datetime import datetime
+from typing import List, Optional, Sequence
 import pandas as pd
 
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from analysis.strategy_analyzer import StrategyAnalyzer
-from notification.email_service import EmailService
+from src.analysis.strategy_analyzer import StrategyAnalyzer
+from src.notification.email_service import EmailService
+from src.pipeline.run_daily_strategies import (
+    DEFAULT_CONFIGS, SymbolConfig, SymbolRunResult, load_configs, run_configured, select_configs
+)
 
 
-def run_daily_strategy(symbol: str) -> dict:
+def summarize_run(run: SymbolRunResult) -> dict:
     """
-    运行每日策略
+    把运行结果整理为执行记录
     
     Args:
-        symbol: 股票代码
+        run: 多股票运行器中单只股票的结果
         
     Returns:
         执行结果字典
     """
-    print(f"\n{'=' * 80}")
-    print(f"📈 运行 {symbol} 每日策略")
-    print(f"{'=' * 80}")
-    
-    # 确定工作目录
-    if symbol == "TSLA":
-        work_dir = project_root
-    else:
-        work_dir = project_root / symbol
+    result_data = {
+        "symbol": run.symbol,
+        "timestamp": datetime.now().isoformat(),
+        "success": run.success,
+        "signals_count": 0,
+        "new_signals_count": 0,
+        "latest_signal_date": None,
+        "latest_signal_action": None,
+        "latest_signal_price": None,
+        "error": run.error
+    }
+    
+    signals = run.signals
+    if run.success and signals:
+        result_data["signals_count"] = len(signals)
+        latest = signals[-1]
+        signal_date = pd.Timestamp(latest['date']).date()
+        result_data["latest_signal_date"] = str(signal_date)
+        result_data["latest_signal_action"] = latest['action'].value
+        result_data["latest_signal_price"] = float(latest['price'])
+        
+        # 检查是否是新信号 (今天的)
+        if signal_date == datetime.now().date():
+            result_data["new_signals_count"] = 1
     
-    # 运行策略脚本
-    script_path = work_dir / "src" / "pipeline" / "daily_strategy.py"
+    return result_data
+
+
+def run_daily_strategies(configs: Sequence[SymbolConfig]) -> List[dict]:
+    """
+    在同一进程内并行运行各股票的每日策略
     
-    try:
-        # 运行策略
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=str(work_dir),
-            capture_output=True,
-            text=True,
-            encoding='utf-8'
-        )
-        
-        success = result.returncode == 0
-        output = result.stdout if success else result.stderr
-        
-        print(output)
-        
-        # 读取结果
-        signals_file = work_dir / "backtest_results" / "daily" / "signals_daily.csv"
-        
-        result_data = {
-            "symbol": symbol,
-            "timestamp": datetime.now().isoformat(),
-            "success": success,
-            "signals_count": 0,
-            "new_signals_count": 0,
-            "latest_signal_date": None,
-            "latest_signal_action": None,
-            "latest_signal_price": None,
-            "error": None if success else output
-        }
-        
-        if success and signals_file.exists():
-            signals_df = pd.read_csv(signals_file)
-            result_data["signals_count"] = len(signals_df)
-            
-            if len(signals_df) > 0:
-                latest = signals_df.iloc[-1]
-                result_data["latest_signal_date"] = str(latest['date'])
-                result_data["latest_signal_action"] = latest['action']
-                result_data["latest_signal_price"] = float(latest['price'])
-                
-                # 检查是否是新信号 (今天的)
-                signal_date = pd.to_datetime(latest['date']).date()
-                today = datetime.now().date()
-                if signal_date == today:
-                    result_data["new_signals_count"] = 1
-        
-        return result_data
+    Args:
+        configs: 股票配置列表
         
-    except Exception as e:
-        print(f"❌ 运行失败: {e}")
-        return {
-            "symbol": symbol,
-            "timestamp": datetime.now().isoformat(),
-            "success": False,
-            "error": str(e)
-        }
+    Returns:
+        每只股票的执行结果字典
+    """
+    symbols = [config.symbol for config in configs]
+    print(f"\n{'=' * 80}")
+    print(f"📈 运行每日策略: {', '.join(symbols)}")
+    print(f"{'=' * 80}")
+    
+    runs = run_configured(symbols, configs=configs)
+    return [summarize_run(runs[symbol]) for symbol in symbols]
 
 
 def record_execution_result(symbol: str, result: dict):
@@ -190,25 +175,28 @@ def send_daily_summary(results: list):
         print(f"\n❌ 邮件发送失败: {e}")
 
 
-def main():
+def main(argv: Optional[Sequence[str]] = None):
     """主函数"""
+    parser = argparse.ArgumentParser(description="智能每日策略检查")
+    parser.add_argument("symbols", nargs="*", help="股票代码, 默认全部已配置股票")
+    parser.add_argument("--config", type=Path, help="JSON 股票配置文件(同 run_daily_strategies)")
+    args = parser.parse_args(argv)
+    
+    configs = load_configs(args.config) if args.config else DEFAULT_CONFIGS
+    selected = select_configs(configs, [symbol.upper() for symbol in args.symbols])
+    
     print("=" * 80)
     print("📊 智能每日策略检查系统")
     print("=" * 80)
     print(f"执行时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    symbols = ["TSLA", "NVDA", "INTC"]
-    results = []
+    results = run_daily_strategies(selected)
     
-    # 运行所有股票的策略
-    for symbol in symbols:
-        result = run_daily_strategy(symbol)
-        results.append(result)
-        
-        # 记录执行结果
+    # 记录执行结果
+    for result in results:
         if result.get('success'):
-            record_execution_result(symbol, result)
+            record_execution_result(result['symbol'], result)
     
     # 发送汇总邮件
     print(f"\n{'=' * 80}")
@@ -24,22 +24,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="更新股票数据 (增量更新)")
-    parser.add_argument("symbol", help="股票代码")
-    parser.add_argument("--days", type=int, default=30, help="更新最近N天的数据 (默认30天)")
-    parser.add_argument("--output", help="输出文件路径")
-    
-    args = parser.parse_args()
-    
-    # 设置输出路径
-    if args.output:
-        output_path = Path(args.output)
-    else:
-        output_path = project_root / "data" / f"sample_{args.symbol.lower()}.csv"
-    
+class UpToDate(Exception):
+    """数据已是最新, 无需更新"""
+
+
+def update_symbol(symbol: str, output_path: Path, days: int = 30, client: YFinanceClient = None):
+    """
+    增量更新一只股票的日线 CSV
+
+    Args:
+        symbol: 股票代码
+        output_path: CSV 路径
+        days: 没有现有数据时下载最近N天
+        client: 数据源, 默认 YFinanceClient()
+
+    Returns:
+        IngestionResult
+
+    Raises:
+        UpToDate: 最新数据不早于昨天
+    """
     # 默认起始日期
-    start_date = datetime.now().date() - timedelta(days=args.days)
+    start_date = datetime.now().date() - timedelta(days=days)
     
     # 检查现有数据
     if output_path.exists():
@@ -54,33 +60,48 @@ def main():
                 
                 if days_since <= 1:
                     logger.info("数据已是最新,无需更新")
-                    print(f"✓ 数据已是最新 (最后更新: {last_date})")
-                    return
+                    raise UpToDate(str(last_date))
                 
                 # 只更新缺失的天数
                 start_date = last_date - timedelta(days=5)  # 多取5天避免遗漏
                 logger.info(f"将从 {start_date} 开始增量更新")
+        except UpToDate:
+            raise
         except Exception as e:
             logger.warning(f"无法读取现有数据: {e}")
     else:
         logger.info("首次下载,获取最近30天数据")
     
+    logger.info(f"正在更新 {symbol} 数据...")
+    ingestor = DailyBarIngestor(
+        client=client or YFinanceClient(),
+        output_path=output_path
+    )
+    return ingestor.run(
+        symbol=symbol,
+        start=start_date,
+        end=None,
+        period=None
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="更新股票数据 (增量更新)")
+    parser.add_argument("symbol", help="股票代码")
+    parser.add_argument("--days", type=int, default=30, help="更新最近N天的数据 (默认30天)")
+    parser.add_argument("--output", help="输出文件路径")
+    
+    args = parser.parse_args()
+    
+    # 设置输出路径
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_path = project_root / "data" / f"sample_{args.symbol.lower()}.csv"
+    
     # 执行数据更新
     try:
-        logger.info(f"正在更新 {args.symbol} 数据...")
-        
-        client = YFinanceClient()
-        ingestor = DailyBarIngestor(
-            client=client,
-            output_path=output_path
-        )
-        
-        result = ingestor.run(
-            symbol=args.symbol,
-            start=start_date,
-            end=None,
-            period=None
-        )
+        result = update_symbol(args.symbol, output_path, args.days)
         
         if result:
             logger.info(f"✓ 数据更新成功: {output_path}")
@@ -89,7 +110,9 @@ def main():
             logger.warning("数据更新返回空结果")
             print("⚠️ 数据更新失败,请稍后重试")
             sys.exit(1)
-            
+    
+    except UpToDate as e:
+        print(f"✓ 数据已是最新 (最后更新: {e})")
     except Exception as e:
         logger.error(f"数据更新失败: {e}")
         print(f"⚠️ 数据更新失败: {e}")
@@ -4,68 +4,32 @@
 """
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
-import re
+from datetime import datetime
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.analysis.execution_journal import ExecutionJournal, parse_log_entries
 
-def parse_log_entries(content, days=7):
-    """解析日志条目"""
-    entries = []
-    
-    # 匹配日志条目
-    pattern = r'### (\d{4}-\d{2}-\d{2}) \(周.*?\)\n(.*?)(?=\n### \d{4}-\d{2}-\d{2}|\n## 📝 记录模板|$)'
-    matches = re.findall(pattern, content, re.DOTALL)
-    
-    cutoff = datetime.now() - timedelta(days=days)
+
+def load_recent_entries(log_file, days=7):
+    """
+    从结构化日志(STRATEGY_EXECUTION_LOG.jsonl)读取最近N天的条目
     
-    for date_str, entry_content in matches:
-        entry_date = datetime.strptime(date_str, '%Y-%m-%d')
-        
-        if entry_date >= cutoff:
-            # 解析关键信息
-            entry = {
-                'date': date_str,
-                'datetime': entry_date,
-                'content': entry_content
-            }
-            
-            # 提取市场数据
-            close_match = re.search(r'TSLA最新收盘:\s*\$?([\d.]+)', entry_content)
-            if close_match:
-                entry['close'] = float(close_match.group(1))
-            
-            # 提取信号信息
-            signal_date_match = re.search(r'最新信号日期:\s*(\d{4}-\d{2}-\d{2}|无历史信号)', entry_content)
-            if signal_date_match:
-                entry['signal_date'] = signal_date_match.group(1)
-            
-            signal_action_match = re.search(r'信号类型:\s*(\w+|N/A)', entry_content)
-            if signal_action_match:
-                entry['signal_action'] = signal_action_match.group(1)
-            
-            signal_price_match = re.search(r'信号价格:\s*\$?([\d.]+)', entry_content)
-            if signal_price_match:
-                entry['signal_price'] = float(signal_price_match.group(1))
-            
-            # 提取近7天信号数
-            signal_count_match = re.search(r'近7天信号数:\s*(\d+)', entry_content)
-            if signal_count_match:
-                entry['signal_count_7d'] = int(signal_count_match.group(1))
-            
-            # 提取价差
-            price_gap_match = re.search(r'价差:\s*\$?([\d.-]+)\s*\(([\d.+-]+)%\)', entry_content)
-            if price_gap_match:
-                entry['price_gap'] = float(price_gap_match.group(1))
-                entry['price_gap_pct'] = float(price_gap_match.group(2))
-            
-            entries.append(entry)
+    只从文件末尾读取所需天数, 与日志总长度无关。结构化日志尚未建立时,
+    先把 Markdown 日志中的历史条目导入一次(日度脚本首次追加时也会导入)。
+    """
+    journal = ExecutionJournal.beside(log_file)
     
-    # 按日期排序
-    entries.sort(key=lambda x: x['datetime'])
+    imported = journal.import_markdown()
+    if imported:
+        print(f"✅ 已从 Markdown 日志导入 {imported} 条历史记录到: {journal.path}")
     
+    entries = []
+    for record in journal.last_days(days):
+        entry = dict(record)
+        entry['datetime'] = datetime.strptime(record['date'], '%Y-%m-%d')
+        entries.append(entry)
     return entries
 
 
@@ -250,18 +214,13 @@ def main():
     
     log_file = project_root / "STRATEGY_EXECUTION_LOG.md"
     
-    if not log_file.exists():
+    if not log_file.exists() and not ExecutionJournal.beside(log_file).exists():
         print("❌ 日志文件不存在，请先执行日度策略")
         return
     
-    # 读取日志文件
-    print("正在读取策略执行日志...")
-    with open(log_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # 解析最近7天的条目
+    # 从结构化日志读取最近7天的条目
     print("正在分析最近7天的执行记录...")
-    entries = parse_log_entries(content, days=7)
+    entries = load_recent_entries(log_file, days=7)
     
     if not entries:
         print("⚠️ 未找到最近7天的执行记录")
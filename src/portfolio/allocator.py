@@ -28,7 +28,18 @@ class PositionAllocator:
         self.symbol = symbol
         self.risk_budget = risk_budget
 
-    def propose(self, decision: SignalDecision, price: Optional[float] = None) -> Optional[PositionPlan]:
+    def propose(
+        self,
+        decision: SignalDecision,
+        price: Optional[float] = None,
+        target_quantity: Optional[int] = None,
+    ) -> Optional[PositionPlan]:
+        """Size a decision.
+
+        ``target_quantity`` (e.g. from ``VolatilityTargetSizer.target_positions``) replaces
+        the fixed risk-budget sizing; it is capped by the max allocation and a target of
+        zero shares yields no plan instead of a forced single share.
+        """
         if decision.action == TradeAction.HOLD:
             return None
 
@@ -38,9 +49,14 @@ class PositionAllocator:
 
         max_position_value = self.risk_budget.capital * self.risk_budget.max_allocation_pct
         risk_per_trade_value = self.risk_budget.capital * self.risk_budget.risk_per_trade_pct
-        # Simplified sizing: ensure notional stays within max allocation and risk per trade.
-        raw_quantity = int(min(max_position_value, risk_per_trade_value * 4) // reference_price)
-        quantity = max(raw_quantity, 1)  # ensure at least one share
+        if target_quantity is not None:
+            quantity = min(int(target_quantity), int(max_position_value // reference_price))
+            if quantity <= 0:
+                return None
+        else:
+            # Simplified sizing: ensure notional stays within max allocation and risk per trade.
+            raw_quantity = int(min(max_position_value, risk_per_trade_value * 4) // reference_price)
+            quantity = max(raw_quantity, 1)  # ensure at least one share
 
         return PositionPlan(
             symbol=self.symbol,
@@ -0,0 +1,254 @@
+"""Volatility-targeted position sizing across a symbol universe."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.loader import PriceBar
+from src.utils.technical_indicators import ATRUpdater
+
+TRADING_DAYS = 252
+
+
+class EWMACovariance:
+    """Exponentially weighted (zero-mean) covariance of daily returns.
+
+    ``update_closes`` advances one day in O(n^2) for n symbols; ``fit`` applies a whole
+    block of history in one matrix product and leaves the estimator in the same state
+    as the equivalent sequence of daily updates. Missing prices count as a zero return.
+    """
+
+    def __init__(self, symbols: Sequence[str], halflife: float = 20.0, min_periods: int = 20) -> None:
+        if halflife <= 0:
+            raise ValueError("halflife must be positive")
+        self.symbols: List[str] = list(symbols)
+        self.halflife = halflife
+        self.min_periods = min_periods
+        self.decay = 0.5 ** (1.0 / halflife)
+        n = len(self.symbols)
+        self._weighted = np.zeros((n, n))
+        self._weight = 0.0
+        self._last_close = np.full(n, np.nan)
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.min_periods
+
+    def _advance(self, closes: np.ndarray) -> np.ndarray:
+        """Returns for a (days x symbols) block; gaps carry the last close forward."""
+        first = bool(np.isnan(self._last_close).all())
+        filled = pd.DataFrame(np.vstack([self._last_close, closes])).ffill().to_numpy()
+        returns = closes / filled[:-1] - 1.0
+        returns[~np.isfinite(returns)] = 0.0
+        self._last_close = filled[-1]
+        return returns[1:] if first else returns   # the very first day has no previous close
+
+    def update_returns(self, returns: np.ndarray) -> None:
+        returns = np.nan_to_num(np.asarray(returns, dtype=np.float64))
+        self._weighted = self.decay * self._weighted + (1 - self.decay) * np.outer(returns, returns)
+        self._weight = self.decay * self._weight + (1 - self.decay)
+        self.count += 1
+
+    def update_closes(self, closes: Sequence[float]) -> None:
+        """Advance one day with the closes for every symbol (NaN if missing)."""
+        returns = self._advance(np.asarray(closes, dtype=np.float64)[None, :])
+        if len(returns):
+            self.update_returns(returns[0])
+
+    def fit(self, closes: np.ndarray) -> None:
+        """Apply a (days x symbols) block of closes in one vectorized step."""
+        closes = np.asarray(closes, dtype=np.float64)
+        if closes.size == 0:
+            return
+        returns = self._advance(closes)
+        t = returns.shape[0]
+        if t == 0:
+            return
+        weights = (1 - self.decay) * self.decay ** np.arange(t - 1, -1, -1)
+        self._weighted = self.decay ** t * self._weighted + (returns * weights[:, None]).T @ returns
+        self._weight = self.decay ** t * self._weight + weights.sum()
+        self.count += t
+
+    def covariance(self) -> np.ndarray:
+        """Annualized covariance matrix."""
+        if self._weight == 0.0:
+            return np.zeros_like(self._weighted)
+        return self._weighted / self._weight * TRADING_DAYS
+
+    def volatilities(self) -> np.ndarray:
+        return np.sqrt(np.diag(self.covariance()))
+
+    def correlation(self) -> np.ndarray:
+        vols = self.volatilities()
+        scale = np.outer(vols, vols)
+        corr = np.divide(self.covariance(), scale, out=np.zeros_like(scale), where=scale > 0)
+        np.fill_diagonal(corr, 1.0)
+        return corr
+
+    def to_state(self) -> Dict:
+        return {
+            "symbols": self.symbols,
+            "halflife": self.halflife,
+            "min_periods": self.min_periods,
+            "weighted": self._weighted.tolist(),
+            "weight": self._weight,
+            "last_close": [None if math.isnan(x) else x for x in self._last_close],
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "EWMACovariance":
+        estimator = cls(state["symbols"], state["halflife"], state["min_periods"])
+        estimator._weighted = np.asarray(state["weighted"], dtype=np.float64).reshape(len(estimator.symbols), -1)
+        estimator._weight = state["weight"]
+        estimator._last_close = np.array([np.nan if x is None else x for x in state["last_close"]], dtype=np.float64)
+        estimator.count = state["count"]
+        return estimator
+
+
+@dataclass(frozen=True)
+class SizingConfig:
+    target_vol: float = 0.15          # annualized portfolio volatility target
+    method: str = "realized"          # "realized" (EWMA) or "atr" per-symbol volatility
+    halflife: float = 20.0            # EWMA halflife in days
+    min_periods: int = 20
+    atr_period: int = 14
+    max_weight: float = 0.2           # per-symbol cap, same role as RiskBudget.max_allocation_pct
+    max_gross: float = 1.0            # cap on the sum of weights (no leverage by default)
+    correlation_penalty: float = 1.0  # 0 disables the correlation-aware haircut
+    min_vol: float = 0.01             # floor so near-constant series do not dominate
+
+    def __post_init__(self) -> None:
+        if self.method not in ("realized", "atr"):
+            raise ValueError(f"unknown volatility method: {self.method}")
+
+
+class VolatilityTargetSizer:
+    """Computes target weights and share counts for all symbols at once.
+
+    Each symbol starts at inverse volatility, is scaled down by
+    ``1 + correlation_penalty * sum(positive correlations with the others)`` so
+    correlated names share a risk budget, and the whole book is then scaled so its
+    ex-ante volatility ``sqrt(w' C w)`` hits ``target_vol`` before the per-symbol and
+    gross caps are applied. Feed it one bar per symbol per day (``update``) in live
+    runs, or warm it up from history with ``fit``.
+    """
+
+    def __init__(self, symbols: Sequence[str], config: Optional[SizingConfig] = None) -> None:
+        self.config = config or SizingConfig()
+        self.symbols: List[str] = list(symbols)
+        self.covariance = EWMACovariance(self.symbols, self.config.halflife, self.config.min_periods)
+        self._atr = {symbol: ATRUpdater(self.config.atr_period) for symbol in self.symbols}
+        self._last_close = {symbol: float("nan") for symbol in self.symbols}
+
+    @property
+    def ready(self) -> bool:
+        return self.covariance.ready
+
+    def update(self, bars: Mapping[str, PriceBar]) -> None:
+        """Advance one trading day; symbols without a bar keep their last close."""
+        closes = [bars[symbol].close if symbol in bars else np.nan for symbol in self.symbols]
+        self.covariance.update_closes(closes)
+        for symbol, bar in bars.items():
+            if symbol in self._atr:
+                self._atr[symbol].update(bar.high, bar.low, bar.close)
+                self._last_close[symbol] = bar.close
+
+    def fit(self, history: Mapping[str, Sequence[PriceBar]]) -> None:
+        """Warm up from per-symbol bar histories, aligned on date."""
+        frames = {
+            symbol: pd.Series([bar.close for bar in bars], index=[bar.date for bar in bars])
+            for symbol, bars in history.items() if symbol in self._atr and bars
+        }
+        closes = pd.DataFrame(frames).reindex(columns=self.symbols).sort_index()
+        self.covariance.fit(closes.to_numpy())
+        for symbol, bars in history.items():
+            if symbol in self._atr and bars:
+                self._atr[symbol].compute(
+                    [bar.high for bar in bars], [bar.low for bar in bars], [bar.close for bar in bars]
+                )
+                self._last_close[symbol] = bars[-1].close
+
+    def volatilities(self) -> np.ndarray:
+        """Annualized per-symbol volatility used for sizing."""
+        if self.config.method == "atr":
+            vols = np.array([
+                self._atr[symbol].value / self._last_close[symbol] * math.sqrt(TRADING_DAYS)
+                for symbol in self.symbols
+            ])
+            vols = np.where(np.isfinite(vols), vols, self.covariance.volatilities())
+        else:
+            vols = self.covariance.volatilities()
+        return np.maximum(vols, self.config.min_vol)
+
+    def weights(self) -> np.ndarray:
+        config = self.config
+        vols = self.volatilities()
+        corr = self.covariance.correlation()
+
+        raw = 1.0 / vols
+        if config.correlation_penalty:
+            crowding = np.clip(corr, 0.0, None).sum(axis=1) - 1.0
+            raw = raw / (1.0 + config.correlation_penalty * crowding)
+        weights = raw / raw.sum()
+
+        portfolio_vol = math.sqrt(float(weights @ (np.outer(vols, vols) * corr) @ weights))
+        if portfolio_vol > 0:
+            weights = weights * config.target_vol / portfolio_vol
+        weights = np.minimum(weights, config.max_weight)
+        gross = weights.sum()
+        if gross > config.max_gross:
+            weights = weights * config.max_gross / gross
+        return weights
+
+    def target_weights(self) -> Dict[str, float]:
+        return dict(zip(self.symbols, self.weights().tolist()))
+
+    def target_positions(self, capital: float, prices: Optional[Mapping[str, float]] = None) -> Dict[str, int]:
+        """Whole-share targets; prices default to the last close seen by the sizer."""
+        prices = prices or self._last_close
+        targets = {}
+        for symbol, weight in zip(self.symbols, self.weights()):
+            price = prices.get(symbol, float("nan"))
+            targets[symbol] = int(capital * weight // price) if price and price > 0 else 0
+        return targets
+
+    def to_state(self) -> Dict:
+        return {
+            "symbols": self.symbols,
+            "covariance": self.covariance.to_state(),
+            "atr": {symbol: updater.to_state() for symbol, updater in self._atr.items()},
+            "last_close": {s: None if math.isnan(c) else c for s, c in self._last_close.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict, config: Optional[SizingConfig] = None) -> "VolatilityTargetSizer":
+        sizer = cls(state["symbols"], config)
+        sizer.covariance = EWMACovariance.from_state(state["covariance"])
+        sizer._atr = {symbol: ATRUpdater.from_state(s) for symbol, s in state["atr"].items()}
+        sizer._last_close = {s: float("nan") if c is None else c for s, c in state["last_close"].items()}
+        return sizer
+
+
+def rolling_target_weights(
+    sizer: VolatilityTargetSizer, history: Mapping[str, Sequence[PriceBar]]
+) -> pd.DataFrame:
+    """Replay history day by day (as a backtest would see it) and record target weights.
+
+    Rows before the covariance estimate is ready are omitted.
+    """
+    by_date: Dict = {}
+    for symbol, bars in history.items():
+        for bar in bars:
+            by_date.setdefault(bar.date, {})[symbol] = bar
+    rows = {}
+    for date in sorted(by_date):
+        sizer.update(by_date[date])
+        if sizer.ready:
+            rows[date] = sizer.weights()
+    return pd.DataFrame.from_dict(rows, orient="index", columns=sizer.symbols)
@@ -3,8 +3,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Iterable, List, Sequence
+from typing import Iterable, List, Optional, Sequence
 
+import numpy as np
+
+from src.data.feature_store import SymbolFeatures, rolling_mean
 from src.data.loader import PriceBar
 
 
@@ -39,16 +42,28 @@ class MomentumSignalModel:
         self.long_window = long_window
         self.threshold = threshold
 
-    def generate(self, bars: Sequence[PriceBar]) -> List[SignalDecision]:
-        closes = [bar.close for bar in bars]
+    def generate(self, bars: Sequence[PriceBar], features: Optional[SymbolFeatures] = None) -> List[SignalDecision]:
+        """Score every bar.
+
+        ``features`` may be a cached feature set for the same bars (see
+        ``src.data.feature_store``); the moving averages are then read from the cache
+        instead of being recomputed.
+        """
+        if features is not None:
+            short_ma = features.sma(self.short_window)
+            long_ma = features.sma(self.long_window)
+        else:
+            closes = np.array([bar.close for bar in bars], dtype=np.float64)
+            short_ma = rolling_mean(closes, self.short_window)
+            long_ma = rolling_mean(closes, self.long_window)
         decisions: List[SignalDecision] = []
 
         for idx, bar in enumerate(bars):
             if idx + 1 < self.long_window:
                 decisions.append(SignalDecision(bar=bar, action=TradeAction.HOLD, score=0.0, reason="warmup"))
                 continue
-            short_avg = _moving_average(closes[: idx + 1], self.short_window)
-            long_avg = _moving_average(closes[: idx + 1], self.long_window)
+            short_avg = float(short_ma[idx])
+            long_avg = float(long_ma[idx])
             momentum = (short_avg - long_avg) / long_avg if long_avg else 0.0
 
             if momentum > self.threshold:
@@ -89,13 +104,6 @@ class MomentumSignalModel:
         return sorted(reduced, key=lambda d: d.bar.date)
 
 
-def _moving_average(series: Sequence[float], window: int) -> float:
-    if len(series) < window:
-        return sum(series) / len(series)
-    window_slice = series[-window:]
-    return sum(window_slice) / window
-
-
 def _select_top_n(decisions: Sequence[SignalDecision], n: int) -> List[SignalDecision]:
     sorted_decisions = sorted(decisions, key=lambda d: abs(d.score), reverse=True)
     selected = [d for d in sorted_decisions if d.action != TradeAction.HOLD][:n]
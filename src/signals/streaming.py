@@ -0,0 +1,392 @@
+"""Event-driven, bar-by-bar version of the daily momentum strategy.
+
+``StreamingDailyStrategy`` reproduces ``DailyTradingStrategy.generate_signals`` but
+consumes one bar at a time through ``on_bar``. Momentum, average volume and the
+trend moving average are maintained with O(1) rolling accumulators, so the same
+object can replay years of history for a backtest and then keep running on live
+bars. ``peek`` evaluates a tentative (intraday) bar without committing it.
+``StreamingMomentumRSIStrategy`` does the same for the NVDA variant, feeding the
+incremental RSI/ATR updaters instead of recomputing the indicators over history.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from src.backtest.costs import DEFAULT_COST_MODEL, CostModel
+from src.backtest.engine import TradeAction
+from src.data.loader import PriceBar
+from src.utils.technical_indicators import ATRUpdater, RSIUpdater
+
+
+class RollingWindow:
+    """Fixed-size ring buffer with an O(1) running sum.
+
+    The running sum is recomputed exactly once per full cycle so floating-point
+    drift stays bounded no matter how many values are pushed.
+    """
+
+    __slots__ = ("size", "_values", "_head", "_count", "_sum", "_pushes")
+
+    def __init__(self, size: int) -> None:
+        if size <= 0:
+            raise ValueError("window size must be positive")
+        self.size = size
+        self._values: List[float] = [0.0] * size
+        self._head = 0  # index of the oldest value once full
+        self._count = 0
+        self._sum = 0.0
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def full(self) -> bool:
+        return self._count == self.size
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def oldest(self) -> float:
+        """Value that the next push will evict (the oldest one once full)."""
+        return self._values[self._head] if self.full else self._values[0]
+
+    def push(self, value: float) -> None:
+        if self.full:
+            self._sum += value - self._values[self._head]
+            self._values[self._head] = value
+            self._head = (self._head + 1) % self.size
+        else:
+            self._values[self._count] = value
+            self._count += 1
+            self._sum += value
+        self._pushes += 1
+        if self._pushes % self.size == 0:
+            self._sum = math.fsum(self._values[: self._count])
+
+    def to_state(self) -> Dict:
+        ordered = self._values[self._head:] + self._values[: self._head] if self.full else self._values[: self._count]
+        return {"size": self.size, "values": list(ordered)}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "RollingWindow":
+        window = cls(state["size"])
+        for value in state["values"]:
+            window.push(value)
+        return window
+
+
+@dataclass(frozen=True)
+class Signal:
+    date: dt.date
+    action: TradeAction
+    quantity: int
+    reason: str
+    price: float
+
+    def to_dict(self) -> Dict:
+        """Same layout as the dicts returned by ``DailyTradingStrategy.generate_signals``."""
+        return {
+            "date": pd.Timestamp(self.date),
+            "action": self.action,
+            "quantity": self.quantity,
+            "reason": self.reason,
+            "price": self.price,
+        }
+
+
+class StreamingDailyStrategy:
+    """Daily momentum strategy driven one bar at a time.
+
+    Buy when price is above the trend moving average, momentum exceeds
+    ``buy_momentum`` and volume surges above its ``volume_lookback`` average.
+    Sell on profit target, stop loss or momentum falling below ``exit_momentum``.
+    At most one trade per calendar day.
+    """
+
+    def __init__(
+        self,
+        initial_cash: float = 100000.0,
+        position_pct: float = 0.6,
+        momentum_window: int = 5,
+        trend_window: int = 20,
+        volume_threshold: float = 1.3,
+        profit_target: float = 0.05,
+        stop_loss: float = 0.02,
+        buy_momentum: float = 0.03,
+        exit_momentum: float = -0.02,
+        volume_lookback: int = 20,
+        cost_model: Optional[CostModel] = None,
+    ) -> None:
+        self.initial_cash = initial_cash
+        self.position_pct = position_pct
+        self.momentum_window = momentum_window
+        self.trend_window = trend_window
+        self.volume_threshold = volume_threshold
+        self.profit_target = profit_target
+        self.stop_loss = stop_loss
+        self.buy_momentum = buy_momentum
+        self.exit_momentum = exit_momentum
+        self.volume_lookback = volume_lookback
+        self.cost_model = cost_model or DEFAULT_COST_MODEL
+        self.reset()
+
+    @classmethod
+    def from_strategy(cls, strategy, **overrides) -> "StreamingDailyStrategy":
+        """Build from a ``DailyTradingStrategy`` instance, copying its parameters."""
+        params = dict(
+            initial_cash=strategy.initial_cash,
+            position_pct=strategy.position_pct,
+            momentum_window=strategy.momentum_window,
+            trend_window=strategy.trend_window,
+            volume_threshold=strategy.volume_threshold,
+            profit_target=strategy.profit_target,
+            stop_loss=strategy.stop_loss,
+            cost_model=strategy.cost_model,
+        )
+        params.update(overrides)
+        return cls(**params)
+
+    def reset(self) -> None:
+        self.bars_seen = 0
+        self.cash = self.initial_cash
+        self.position = 0
+        self.entry_price: Optional[float] = None
+        self.last_trade_date: Optional[dt.date] = None
+        self._momentum_closes = RollingWindow(self.momentum_window)
+        self._trend_closes = RollingWindow(self.trend_window)
+        self._volumes = RollingWindow(self.volume_lookback)
+
+    # ------------------------------------------------------------------ events
+    def on_bar(self, bar: PriceBar) -> Optional[Signal]:
+        """Consume a completed bar and return the signal it triggers, if any."""
+        signal = self._evaluate(bar)
+        if signal is not None:
+            self._apply(signal)
+        self._momentum_closes.push(bar.close)
+        self._trend_closes.push(bar.close)
+        self._volumes.push(bar.volume)
+        self.bars_seen += 1
+        return signal
+
+    def peek(self, bar: PriceBar) -> Optional[Signal]:
+        """Evaluate a tentative bar (e.g. a live intraday snapshot) without committing it."""
+        return self._evaluate(bar)
+
+    def warm_up(self, bars: Iterable[PriceBar]) -> List[Signal]:
+        """Feed historical bars, returning every signal produced."""
+        signals = []
+        for bar in bars:
+            signal = self.on_bar(bar)
+            if signal is not None:
+                signals.append(signal)
+        return signals
+
+    def run(self, bars: Iterable[PriceBar]) -> List[Dict]:
+        """Replay bars from a fresh state; output matches ``generate_signals``."""
+        self.reset()
+        return [signal.to_dict() for signal in self.warm_up(bars)]
+
+    # --------------------------------------------------------------- features
+    def momentum(self, close: float) -> float:
+        if self.bars_seen < self.momentum_window:
+            return 0.0
+        reference = self._momentum_closes.oldest()
+        return (close - reference) / reference
+
+    def volume_surge(self, volume: float) -> bool:
+        if self.bars_seen < self.volume_lookback:
+            return False
+        avg_volume = self._volumes.sum / self.volume_lookback
+        return volume > avg_volume * self.volume_threshold
+
+    def in_uptrend(self, close: float) -> bool:
+        if self.bars_seen < self.trend_window:
+            return False
+        window = self._trend_closes
+        moving_average = (window.sum - window.oldest() + close) / self.trend_window
+        return close > moving_average
+
+    # ---------------------------------------------------------------- helpers
+    def _evaluate(self, bar: PriceBar) -> Optional[Signal]:
+        if self.last_trade_date is not None and bar.date == self.last_trade_date:
+            return None
+
+        close = bar.close
+        momentum = self.momentum(close)
+
+        if self.position > 0:
+            if self.entry_price:
+                reason = self._exit_reason(close)
+                if reason:
+                    return self._sell(bar, reason)
+            if momentum < self.exit_momentum:
+                return self._sell(bar, f"动量转负 ({momentum:.2%})")
+            return None
+
+        if (
+            self.in_uptrend(close)
+            and momentum > self.buy_momentum
+            and self.volume_surge(bar.volume)
+            and self._entry_allowed()
+        ):
+            quantity = int(self.cash * self.position_pct / close)
+            if quantity > 0:
+                return Signal(
+                    date=bar.date,
+                    action=TradeAction.BUY,
+                    quantity=quantity,
+                    reason=self._entry_reason(momentum),
+                    price=close,
+                )
+        return None
+
+    def _exit_reason(self, close: float) -> str:
+        """Profit-target / stop-loss exit reason for the open position ('' to hold)."""
+        pnl_pct = (close - self.entry_price) / self.entry_price
+        if pnl_pct > self.profit_target:
+            return f"止盈 (盈利{pnl_pct:.2%})"
+        if pnl_pct < -self.stop_loss:
+            return f"止损 (亏损{pnl_pct:.2%})"
+        return ""
+
+    def _entry_allowed(self) -> bool:
+        """Extra entry filter on top of trend, momentum and volume."""
+        return True
+
+    def _entry_reason(self, momentum: float) -> str:
+        return f"动量突破 + 成交量放大 (动量={momentum:.2%})"
+
+    def _sell(self, bar: PriceBar, reason: str) -> Signal:
+        return Signal(date=bar.date, action=TradeAction.SELL, quantity=self.position, reason=reason, price=bar.close)
+
+    def _apply(self, signal: Signal) -> None:
+        if signal.action == TradeAction.SELL:
+            self.cash += self.cost_model.sell_cash(self.position, signal.price)
+            self.position = 0
+            self.entry_price = None
+        else:
+            self.cash -= self.cost_model.buy_cash(signal.quantity, signal.price)
+            self.position = signal.quantity
+            self.entry_price = signal.price
+        self.last_trade_date = signal.date
+
+    # ------------------------------------------------------------ persistence
+    def to_state(self) -> Dict:
+        """JSON-serializable snapshot, including the rolling windows."""
+        return {
+            "bars_seen": self.bars_seen,
+            "cash": self.cash,
+            "position": self.position,
+            "entry_price": self.entry_price,
+            "last_trade_date": self.last_trade_date.isoformat() if self.last_trade_date else None,
+            "momentum_closes": self._momentum_closes.to_state(),
+            "trend_closes": self._trend_closes.to_state(),
+            "volumes": self._volumes.to_state(),
+        }
+
+    def load_state(self, state: Dict) -> None:
+        self.bars_seen = state["bars_seen"]
+        self.cash = state["cash"]
+        self.position = state["position"]
+        self.entry_price = state["entry_price"]
+        last = state["last_trade_date"]
+        self.last_trade_date = dt.date.fromisoformat(last) if last else None
+        self._momentum_closes = RollingWindow.from_state(state["momentum_closes"])
+        self._trend_closes = RollingWindow.from_state(state["trend_closes"])
+        self._volumes = RollingWindow.from_state(state["volumes"])
+
+
+class StreamingMomentumRSIStrategy(StreamingDailyStrategy):
+    """Momentum strategy with an RSI overbought filter and an optional ATR stop.
+
+    Streaming counterpart of ``DailyTradingStrategyNVDA.generate_signals``. RSI and
+    ATR include the bar being evaluated, exactly like the batch indicator columns;
+    ``peek`` advances throwaway copies of the updaters so it stays side-effect free.
+    """
+
+    def __init__(
+        self,
+        *args,
+        rsi_period: int = 14,
+        rsi_overbought: float = 70.0,
+        use_atr_stop: bool = False,
+        atr_period: int = 14,
+        atr_multiplier: float = 3.0,
+        **kwargs,
+    ) -> None:
+        self.rsi_period = rsi_period
+        self.rsi_overbought = rsi_overbought
+        self.use_atr_stop = use_atr_stop
+        self.atr_period = atr_period
+        self.atr_multiplier = atr_multiplier
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def from_strategy(cls, strategy, **overrides) -> "StreamingMomentumRSIStrategy":
+        """Build from a ``DailyTradingStrategyNVDA`` instance, copying its parameters."""
+        params = dict(
+            buy_momentum=0.02,
+            exit_momentum=-0.04,
+            use_atr_stop=strategy.use_atr_stop,
+            atr_period=strategy.atr_period,
+            atr_multiplier=strategy.atr_multiplier,
+        )
+        params.update(overrides)
+        return super().from_strategy(strategy, **params)
+
+    def reset(self) -> None:
+        super().reset()
+        self._rsi = RSIUpdater(self.rsi_period)
+        self._atr = ATRUpdater(self.atr_period)
+        self.rsi = float("nan")
+        self.atr = float("nan")
+
+    def on_bar(self, bar: PriceBar) -> Optional[Signal]:
+        self.rsi = self._rsi.update(bar.close)
+        self.atr = self._atr.update(bar.high, bar.low, bar.close)
+        return super().on_bar(bar)
+
+    def peek(self, bar: PriceBar) -> Optional[Signal]:
+        committed = self.rsi, self.atr
+        self.rsi = RSIUpdater.from_state(self._rsi.to_state()).update(bar.close)
+        self.atr = ATRUpdater.from_state(self._atr.to_state()).update(bar.high, bar.low, bar.close)
+        try:
+            return super().peek(bar)
+        finally:
+            self.rsi, self.atr = committed
+
+    def _exit_reason(self, close: float) -> str:
+        pnl_pct = (close - self.entry_price) / self.entry_price
+        if self.use_atr_stop:
+            if close < self.entry_price - self.atr * self.atr_multiplier:
+                return f"ATR动态止损 (ATR={self.atr:.2f})"
+        elif pnl_pct < -self.stop_loss:
+            return f"止损 (亏损{pnl_pct:.2%})"
+        if pnl_pct > self.profit_target:
+            return f"止盈 (盈利{pnl_pct:.2%})"
+        return ""
+
+    def _entry_allowed(self) -> bool:
+        return not self.rsi > self.rsi_overbought   # NaN (warm-up) does not block entry
+
+    def _entry_reason(self, momentum: float) -> str:
+        return f"动量突破 + RSI({self.rsi:.1f})适中 (ATR={self.atr:.2f})"
+
+    def to_state(self) -> Dict:
+        state = super().to_state()
+        state.update(rsi=self._rsi.to_state(), atr=self._atr.to_state())
+        return state
+
+    def load_state(self, state: Dict) -> None:
+        super().load_state(state)
+        self._rsi = RSIUpdater.from_state(state["rsi"])
+        self._atr = ATRUpdater.from_state(state["atr"])
+        self.rsi = self._rsi.value
+        self.atr = self._atr.value
@@ -1,12 +1,19 @@
 """
 真实持仓管理工具
 从配置文件读取Firstrade账户的真实持仓信息
+
+- RealPortfolioManager: 逐次读写配置文件, 用于手动维护
+- PortfolioService: 一次读取, 批量更新价格(向量化), 一次原子写回, 用于多股票的每日流程
 """
 import json
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 import sys
 
+import numpy as np
+
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
@@ -58,15 +65,7 @@ class RealPortfolioManager:
         
         if symbol not in positions:
             # 没有持仓
-            return {
-                'symbol': symbol,
-                'quantity': 0,
-                'avg_price': 0,
-                'current_price': current_price or 0,
-                'market_value': 0,
-                'profit_loss': 0,
-                'profit_loss_pct': 0
-            }
+            return empty_position(symbol, current_price)
         
         position = positions[symbol]
         quantity = position.get('quantity', 0)
@@ -102,18 +101,10 @@ class RealPortfolioManager:
         Returns:
             Dict[str, dict]: 所有持仓信息
         """
-        portfolio = self.load_portfolio()
-        positions = portfolio.get('positions', {})
-        
-        result = {}
-        for symbol, position_data in positions.items():
-            current_price = None
-            if prices and symbol in prices:
-                current_price = prices[symbol]
-            
-            result[symbol] = self.get_position(symbol, current_price)
-        
-        return result
+        # 只读一次文件
+        service = PortfolioService(self.config_path)
+        prices = prices or {}
+        return {symbol: service.position(symbol, prices.get(symbol)) for symbol in service.symbols}
     
     def update_position(
         self, 
@@ -131,46 +122,13 @@ class RealPortfolioManager:
             avg_price: 平均成本
             current_price: 当前价格
         """
-        portfolio = self.load_portfolio()
+        service = PortfolioService(self.config_path)
+        service.update_position(symbol, quantity, avg_price, current_price)
+        service.save()
         
-        if symbol not in portfolio['positions']:
-            portfolio['positions'][symbol] = {
-                'symbol': symbol,
-                'quantity': 0,
-                'avg_price': 0,
-                'current_price': 0,
-                'market_value': 0,
-                'cost_basis': 0,
-                'unrealized_pnl': 0,
-                'unrealized_pnl_pct': 0
-            }
-        
-        position = portfolio['positions'][symbol]
-        
-        # 更新字段
-        if quantity is not None:
-            position['quantity'] = quantity
-        if avg_price is not None:
-            position['avg_price'] = avg_price
-        if current_price is not None:
-            position['current_price'] = current_price
-        
-        # 重新计算
+        position = service.record(symbol)
         qty = position['quantity']
         avg = position['avg_price']
-        cur = position['current_price']
-        
-        position['market_value'] = qty * cur
-        position['cost_basis'] = qty * avg
-        position['unrealized_pnl'] = position['market_value'] - position['cost_basis']
-        position['unrealized_pnl_pct'] = (
-            (position['unrealized_pnl'] / position['cost_basis'] * 100) 
-            if position['cost_basis'] > 0 else 0
-        )
-        
-        # 保存
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(portfolio, f, indent=2, ensure_ascii=False)
         
         print(f"✅ 已更新 {symbol} 持仓信息")
         print(f"   持仓: {qty} 股 @ ${avg:.2f}")
@@ -188,6 +146,247 @@ class RealPortfolioManager:
         return portfolio.get('account', {})
 
 
+def empty_position(symbol: str, current_price: float = None) -> dict:
+    """没有持仓时的持仓信息"""
+    return {
+        'symbol': symbol,
+        'quantity': 0,
+        'avg_price': 0,
+        'current_price': current_price or 0,
+        'market_value': 0,
+        'profit_loss': 0,
+        'profit_loss_pct': 0
+    }
+
+
+@dataclass
+class PortfolioSnapshot:
+    """全部持仓的汇总敞口和盈亏"""
+    market_value: float
+    cost_basis: float
+    profit_loss: float
+    profit_loss_pct: float
+    cash: float
+    weights: Dict[str, float] = field(default_factory=dict)   # 各股票市值占(市值+现金)的百分比
+
+    @property
+    def total_value(self) -> float:
+        return self.market_value + self.cash
+
+
+class PortfolioService:
+    """
+    内存中的持仓服务
+
+    构造时读取一次配置文件, 持仓数量、成本、现价保存在 numpy 数组中;
+    update_prices() 一次性重算全部持仓, save() 只在有修改时原子写回一次。
+
+    用法:
+        with PortfolioService() as portfolio:
+            portfolio.update_prices({'NVDA': 180.0, 'TSLA': 400.0})
+            info = portfolio.position('NVDA')
+        # 退出时写回一次
+    """
+
+    def __init__(self, config_path: Optional[Path] = None):
+        self.config_path = Path(config_path) if config_path else project_root / "config" / "real_portfolio.json"
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """重新读取配置文件, 丢弃未保存的修改"""
+        self.mtime_ns = self._file_mtime()
+        self._portfolio = RealPortfolioManager(self.config_path).load_portfolio()
+        positions = self._portfolio.setdefault('positions', {})
+        self.symbols: List[str] = list(positions)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._quantity = np.array([positions[s].get('quantity', 0) for s in self.symbols], dtype=float)
+        self._avg_price = np.array([positions[s].get('avg_price', 0) for s in self.symbols], dtype=float)
+        self._current_price = np.array(
+            [positions[s].get('current_price', positions[s].get('avg_price', 0)) for s in self.symbols], dtype=float
+        )
+        self.dirty = False
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> bool:
+        """
+        配置文件在上次读取/写回之后被修改(例如手动编辑)时重新读取
+
+        Returns:
+            bool: 是否重新读取(未保存的修改会被丢弃)
+        """
+        if self._file_mtime() == self.mtime_ns:
+            return False
+        self.reload()
+        return True
+
+    def __enter__(self) -> 'PortfolioService':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save()
+
+    def _info(self, i: int, current_price: float) -> dict:
+        quantity = self._quantity[i]
+        avg_price = float(self._avg_price[i])
+        market_value = quantity * current_price
+        cost_basis = quantity * avg_price
+        profit_loss = market_value - cost_basis
+        return {
+            'symbol': self.symbols[i],
+            'quantity': int(quantity),
+            'avg_price': avg_price,
+            'current_price': current_price,
+            'market_value': float(market_value),
+            'profit_loss': float(profit_loss),
+            'profit_loss_pct': float(profit_loss / cost_basis * 100) if cost_basis > 0 else 0
+        }
+
+    def position(self, symbol: str, current_price: float = None) -> dict:
+        """与 RealPortfolioManager.get_position 结构相同, 不读文件"""
+        i = self._index.get(symbol)
+        if i is None:
+            return empty_position(symbol, current_price)
+        if current_price is None:
+            current_price = float(self._current_price[i])
+        return self._info(i, current_price)
+
+    def record(self, symbol: str) -> dict:
+        """配置文件中该股票的持仓记录(含市值、未实现盈亏等写回字段)的副本"""
+        return dict(self._portfolio['positions'][symbol])
+
+    def positions(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, dict]:
+        """多只股票的持仓信息(按当前内存价格), 默认全部"""
+        return {symbol: self.position(symbol) for symbol in (self.symbols if symbols is None else symbols)}
+
+    def update_prices(self, prices: Dict[str, float]) -> int:
+        """
+        批量更新现价并重算全部持仓
+
+        Args:
+            prices: {symbol: price}, 不在持仓中的代码忽略
+
+        Returns:
+            int: 更新的持仓数
+        """
+        known = [(self._index[symbol], price) for symbol, price in prices.items() if symbol in self._index]
+        if not known:
+            return 0
+        index, values = zip(*known)
+        with self._lock:
+            self._current_price[list(index)] = values
+            self._recalculate()
+        return len(known)
+
+    def update_position(self, symbol: str, quantity: int = None, avg_price: float = None,
+                        current_price: float = None):
+        """修改一只股票的持仓(只改内存, save() 时写回)"""
+        with self._lock:
+            if symbol not in self._index:
+                self._portfolio['positions'][symbol] = {'symbol': symbol}
+                self._index[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+                self._quantity = np.append(self._quantity, 0.0)
+                self._avg_price = np.append(self._avg_price, 0.0)
+                self._current_price = np.append(self._current_price, 0.0)
+            i = self._index[symbol]
+            if quantity is not None:
+                self._quantity[i] = quantity
+            if avg_price is not None:
+                self._avg_price[i] = avg_price
+            if current_price is not None:
+                self._current_price[i] = current_price
+            self._recalculate()
+
+    def _recalculate(self):
+        """向量化重算市值和盈亏, 写入配置字典"""
+        market_value = self._quantity * self._current_price
+        cost_basis = self._quantity * self._avg_price
+        pnl = market_value - cost_basis
+        pnl_pct = np.divide(pnl * 100, cost_basis, out=np.zeros_like(pnl), where=cost_basis > 0)
+        positions = self._portfolio['positions']
+        for i, symbol in enumerate(self.symbols):
+            positions[symbol].update({
+                'quantity': int(self._quantity[i]),
+                'avg_price': float(self._avg_price[i]),
+                'current_price': float(self._current_price[i]),
+                'market_value': round(float(market_value[i]), 2),
+                'cost_basis': round(float(cost_basis[i]), 2),
+                'unrealized_pnl': round(float(pnl[i]), 2),
+                'unrealized_pnl_pct': round(float(pnl_pct[i]), 2),
+            })
+        self.dirty = True
+
+    def snapshot(self) -> PortfolioSnapshot:
+        """汇总敞口和盈亏"""
+        market_value = self._quantity * self._current_price
+        cost_basis = float((self._quantity * self._avg_price).sum())
+        total_market = float(market_value.sum())
+        profit_loss = total_market - cost_basis
+        cash = float(self._portfolio.get('account', {}).get('cash', 0) or 0)
+        total = total_market + cash
+        weights = {
+            symbol: float(market_value[i] / total * 100) if total > 0 else 0.0
+            for i, symbol in enumerate(self.symbols)
+        }
+        return PortfolioSnapshot(
+            market_value=total_market,
+            cost_basis=cost_basis,
+            profit_loss=profit_loss,
+            profit_loss_pct=profit_loss / cost_basis * 100 if cost_basis > 0 else 0.0,
+            cash=cash,
+            weights=weights,
+        )
+
+    def get_account_summary(self) -> dict:
+        return self._portfolio.get('account', {})
+
+    def save(self) -> bool:
+        """
+        有修改时原子写回配置文件(先写临时文件再替换)
+
+        Returns:
+            bool: 是否写入
+        """
+        with self._lock:
+            if not self.dirty:
+                return False
+            tmp_path = self.config_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._portfolio, f, indent=2, ensure_ascii=False)
+            tmp_path.replace(self.config_path)
+            self.mtime_ns = self._file_mtime()
+            self.dirty = False
+            return True
+
+
+_shared: Dict[Path, PortfolioService] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_portfolio(config_path: Optional[Path] = None) -> PortfolioService:
+    """
+    同一进程内按文件路径共享的 PortfolioService
+
+    文件未变化时不重复读取; 文件修改时间变化(例如手动编辑)后下次获取时重新读取,
+    长时间运行的调度进程不会一直使用旧持仓。
+    """
+    path = Path(config_path) if config_path else project_root / "config" / "real_portfolio.json"
+    with _shared_lock:
+        service = _shared.get(path)
+        if service is None:
+            service = _shared[path] = PortfolioService(path)
+        else:
+            service.refresh()
+        return service
+
+
 if __name__ == "__main__":
     # 测试代码
     print("=" * 60)
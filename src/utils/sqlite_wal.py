@@ -0,0 +1,30 @@
+"""
+SQLite WAL 模式
+
+切换到 WAL 需要独占数据库, 不能放在事务里执行, 也不走 busy_timeout:
+多个进程/线程首次同时打开同一个数据库时, 切换会直接报 "database is locked"。
+WAL 设置会保存在数据库文件中, 这里在首次连接时重试到成功为止。
+"""
+import sqlite3
+import time
+
+RETRY_INTERVAL = 0.05
+
+
+def enable_wal(conn: sqlite3.Connection, timeout: float = 30.0):
+    """
+    把数据库切换到 WAL 模式(已是 WAL 时立即返回)
+
+    Args:
+        conn: 不在事务中的连接
+        timeout: 数据库一直被占用时最多重试的秒数
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            return
+        except sqlite3.OperationalError as exc:
+            if "locked" not in str(exc) or time.monotonic() >= deadline:
+                raise
+            time.sleep(RETRY_INTERVAL)
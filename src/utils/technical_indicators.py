@@ -1,7 +1,20 @@
 """
 技术指标计算库
 提供 RSI, ATR, MACD, Bollinger Bands 等常用指标计算
+
+- TechnicalIndicators: 基于 pandas 的整列计算
+- RSIUpdater / MACDUpdater / ATRUpdater / BollingerUpdater: 带状态的增量计算器
+  * update() / value: 推进一根K线或读取最新值, O(1)
+  * compute(): pandas/NumPy 整列批量推进一段序列, 结果与逐根 update() 逐位相同
+  * to_state() / from_state(): 可 JSON 序列化的状态, 日度任务只需推进新增K线
+- IndicatorEngine: 组合多个增量计算器, 统一推进和保存状态
+
+RSI/MACD 与 pandas ewm 的递推完全一致; ATR/布林带按 period 分块保存块内累加量,
+窗口值由上一块后段与当前块前段合并得到, 与 pandas rolling 的差异仅为浮点舍入误差。
 """
+import math
+from typing import Dict, List, Optional, Tuple
+
 import pandas as pd
 import numpy as np
 
@@ -41,12 +54,13 @@ class TechnicalIndicators:
         计算平均真实波幅 (ATR)
         用于衡量波动率和设置动态止损
         """
+        prev_close = close.shift()
         high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
+        high_close = np.abs(high - prev_close)
+        low_close = np.abs(low - prev_close)
         
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
+        # fmax 忽略 NaN: 首根K线没有前收盘价, 真实波幅即为 high - low
+        true_range = np.fmax(high_low, np.fmax(high_close, low_close))
         
         atr = true_range.rolling(window=period).mean()
         
@@ -73,3 +87,561 @@ class TechnicalIndicators:
         lower = ma - (std * std_dev)
         
         return upper, ma, lower
+
+
+def _ewm_step(weighted: float, old_wt: float, value: float, beta: float, new_wt: float) -> float:
+    """pandas ewm 的单步递推(adjust=True 时 new_wt=1, 否则 new_wt=alpha)"""
+    if weighted != value:
+        weighted = (old_wt * beta * weighted + new_wt * value) / (old_wt * beta + new_wt)
+    return weighted
+
+
+def _ewm_weight(weight: float, beta: float, steps: int) -> float:
+    """adjust=True 时推进 steps 步后的权重(到达浮点不动点后提前结束)"""
+    for _ in range(steps):
+        next_weight = weight * beta + 1.0
+        if next_weight == weight:
+            break
+        weight = next_weight
+    return weight
+
+
+def _ema_series(values: np.ndarray, alpha: float, start: Optional[float]) -> np.ndarray:
+    """
+    adjust=False 的 EMA, start 为已有的 EMA 值(None 表示从首值开始)
+
+    pandas ewm 的首个输出即首个输入, 把已有 EMA 接在序列前面即可从该状态继续递推。
+    """
+    if start is not None:
+        values = np.concatenate([[start], values])
+    ema = pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return ema[1:] if start is not None else ema
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    """由平均涨跌幅计算 RSI (与 pandas 的 inf/NaN 行为一致)"""
+    if avg_loss == 0.0:
+        return 100.0 if avg_gain > 0.0 else float('nan')
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _rsi_values(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """_rsi_value 的数组版本"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    flat = np.where(avg_gain > 0.0, 100.0, np.nan)
+    return np.where(avg_loss == 0.0, flat, rsi)
+
+
+def _blocks(values: np.ndarray, filled: int, period: int) -> np.ndarray:
+    """
+    把新数据接在当前块(已有 filled 个)之后, 按全局位置排成 (块数, period) 矩阵
+
+    第 0 行前 filled 个位置和末行的空位为 NaN(不输出)。
+    """
+    total = filled + values.size
+    grid = np.full(-(-total // period) * period, np.nan)
+    grid[filled:total] = values
+    return grid.reshape(-1, period)
+
+
+def _suffix_welford(blocks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """各块第 o 个位置之后(不含)元素的 Welford 均值与平方离差和, 从块尾向前累加"""
+    rows, period = blocks.shape
+    means = np.zeros((rows, period))
+    m2s = np.zeros((rows, period))
+    mean = np.zeros(rows)
+    m2 = np.zeros(rows)
+    for o in range(period - 2, -1, -1):
+        value = blocks[:, o + 1]
+        delta = value - mean
+        mean = mean + delta / (period - 1 - o)
+        m2 = m2 + delta * (value - mean)
+        means[:, o] = mean
+        m2s[:, o] = m2
+    return means, m2s
+
+
+class RSIUpdater:
+    """Wilder RSI, 等价于 TechnicalIndicators.calculate_rsi"""
+
+    kind = 'rsi'
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.weight = 0.0
+        self.count = 0
+
+    @property
+    def value(self) -> float:
+        if self.count < self.period:
+            return float('nan')
+        return _rsi_value(self.avg_gain, self.avg_loss)
+
+    def update(self, close: float) -> float:
+        """推进一根K线, 返回最新 RSI(样本不足时为 NaN)"""
+        if self.prev_close is None:
+            gain = loss = 0.0
+        else:
+            delta = close - self.prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+        if self.count == 0:
+            self.avg_gain, self.avg_loss, self.weight = gain, loss, 1.0
+        else:
+            beta = 1.0 - 1.0 / self.period
+            self.avg_gain = _ewm_step(self.avg_gain, self.weight, gain, beta, 1.0)
+            self.avg_loss = _ewm_step(self.avg_loss, self.weight, loss, beta, 1.0)
+            self.weight = self.weight * beta + 1.0
+        self.prev_close = close
+        self.count += 1
+        return self.value
+
+    def compute(self, close: np.ndarray) -> np.ndarray:
+        """
+        批量推进一段收盘价
+
+        从头计算时用 pandas ewm 整列递推; 续跑时 ewm 无法从已有权重继续,
+        逐根推进新增K线(日度任务通常只有一两根)。
+        """
+        close = np.asarray(close, dtype=np.float64)
+        if close.size == 0:
+            return np.empty(0)
+        if self.count:
+            return np.array([self.update(value) for value in close.tolist()])
+
+        delta = np.diff(close, prepend=close[0] if self.prev_close is None else self.prev_close)
+        gains = np.where(delta > 0, delta, 0.0)
+        losses = np.where(delta < 0, -delta, 0.0)
+        avg_gain = pd.Series(gains).ewm(com=self.period - 1, adjust=True).mean().to_numpy()
+        avg_loss = pd.Series(losses).ewm(com=self.period - 1, adjust=True).mean().to_numpy()
+
+        out = _rsi_values(avg_gain, avg_loss)
+        out[:self.period - 1] = np.nan
+        self.avg_gain, self.avg_loss = float(avg_gain[-1]), float(avg_loss[-1])
+        self.weight = _ewm_weight(1.0, 1.0 - 1.0 / self.period, close.size - 1)
+        self.count = close.size
+        self.prev_close = float(close[-1])
+        return out
+
+    def to_state(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'period': self.period,
+            'prev_close': self.prev_close,
+            'avg_gain': self.avg_gain,
+            'avg_loss': self.avg_loss,
+            'weight': self.weight,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'RSIUpdater':
+        updater = cls(state['period'])
+        updater.prev_close = state['prev_close']
+        updater.avg_gain = state['avg_gain']
+        updater.avg_loss = state['avg_loss']
+        updater.weight = state['weight']
+        updater.count = state['count']
+        return updater
+
+
+class MACDUpdater:
+    """EMA MACD, 等价于 TechnicalIndicators.calculate_macd"""
+
+    kind = 'macd'
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.fast_ema: Optional[float] = None
+        self.slow_ema: Optional[float] = None
+        self.signal_ema: Optional[float] = None
+
+    def _alpha(self, span: int) -> float:
+        return 2.0 / (span + 1.0)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """推进一根K线, 返回 (macd, signal, histogram)"""
+        if self.fast_ema is None:
+            self.fast_ema = self.slow_ema = close
+        else:
+            alpha = self._alpha(self.fast)
+            self.fast_ema = _ewm_step(self.fast_ema, 1.0, close, 1.0 - alpha, alpha)
+            alpha = self._alpha(self.slow)
+            self.slow_ema = _ewm_step(self.slow_ema, 1.0, close, 1.0 - alpha, alpha)
+        macd = self.fast_ema - self.slow_ema
+        if self.signal_ema is None:
+            self.signal_ema = macd
+        else:
+            alpha = self._alpha(self.signal)
+            self.signal_ema = _ewm_step(self.signal_ema, 1.0, macd, 1.0 - alpha, alpha)
+        return macd, self.signal_ema, macd - self.signal_ema
+
+    def compute(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """批量推进一段收盘价, 返回 (macd, signal, histogram)"""
+        close = np.asarray(close, dtype=np.float64)
+        if close.size == 0:
+            return np.empty(0), np.empty(0), np.empty(0)
+        fast = _ema_series(close, self._alpha(self.fast), self.fast_ema)
+        slow = _ema_series(close, self._alpha(self.slow), self.slow_ema)
+        macd = fast - slow
+        signal = _ema_series(macd, self._alpha(self.signal), self.signal_ema)
+        self.fast_ema = float(fast[-1])
+        self.slow_ema = float(slow[-1])
+        self.signal_ema = float(signal[-1])
+        return macd, signal, macd - signal
+
+    def to_state(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'fast': self.fast,
+            'slow': self.slow,
+            'signal': self.signal,
+            'fast_ema': self.fast_ema,
+            'slow_ema': self.slow_ema,
+            'signal_ema': self.signal_ema,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'MACDUpdater':
+        updater = cls(state['fast'], state['slow'], state['signal'])
+        updater.fast_ema = state['fast_ema']
+        updater.slow_ema = state['slow_ema']
+        updater.signal_ema = state['signal_ema']
+        return updater
+
+
+class ATRUpdater:
+    """
+    真实波幅的滚动均值, 等价于 TechnicalIndicators.calculate_atr
+
+    K线按全局位置每 period 根分为一块, 只保存上一块和当前块内的前缀和;
+    窗口和 = 上一块后段之和 + 当前块前段之和, 数值量级不随历史累积。
+    """
+
+    kind = 'atr'
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.count = 0
+        self.previous: List[float] = []    # 上一块的前缀和(尚无完整块时为空)
+        self.current: List[float] = []     # 当前块的前缀和
+
+    @property
+    def value(self) -> float:
+        if self.count < self.period:
+            return float('nan')
+        o = len(self.current) - 1
+        head = (self.previous[-1] - self.previous[o]) if self.previous else 0.0
+        return (head + self.current[o]) / self.period
+
+    def _push(self, true_range: float):
+        if len(self.current) == self.period:
+            self.previous, self.current = self.current, []
+        self.current.append(self.current[-1] + true_range if self.current else true_range)
+        self.count += 1
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """推进一根K线, 返回最新 ATR(样本不足时为 NaN)"""
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self._push(true_range)
+        self.prev_close = close
+        return self.value
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """批量推进一段K线(各块的前缀和按行 cumsum, 与逐根 update 逐位相同)"""
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+        n = close.size
+        if n == 0:
+            return np.empty(0)
+        prev_close = np.empty(n)
+        prev_close[0] = np.nan if self.prev_close is None else self.prev_close
+        prev_close[1:] = close[:-1]
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+        if len(self.current) == self.period:
+            self.previous, self.current = self.current, []
+        filled = len(self.current)
+        grid = _blocks(true_range, filled, self.period)
+        if filled:
+            grid[0, :filled] = 0.0
+            grid[0, filled - 1] = self.current[-1]   # 从当前块的前缀和继续累加
+        prefix = np.cumsum(grid, axis=1)
+        prefix[0, :filled] = self.current
+        first = np.asarray(self.previous) if self.previous else np.zeros(self.period)
+        previous = np.vstack([first, prefix[:-1]])
+        sums = (previous[:, -1:] - previous) + prefix
+
+        out = sums.ravel()[filled:filled + n] / self.period
+        out[self.count + np.arange(1, n + 1) < self.period] = np.nan
+        last = (filled + n - 1) // self.period
+        self.current = prefix[last, :filled + n - last * self.period].tolist()
+        if last:
+            self.previous = prefix[last - 1].tolist()
+        self.count += n
+        self.prev_close = float(close[-1])
+        return out
+
+    def to_state(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'period': self.period,
+            'prev_close': self.prev_close,
+            'count': self.count,
+            'previous': list(self.previous),
+            'current': list(self.current),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'ATRUpdater':
+        updater = cls(state['period'])
+        updater.prev_close = state['prev_close']
+        if 'ranges' in state:
+            # 旧格式保存的是窗口内的真实波幅
+            for true_range in state['ranges']:
+                updater._push(true_range)
+        else:
+            updater.count = state['count']
+            updater.previous = list(state['previous'])
+            updater.current = list(state['current'])
+        return updater
+
+
+class BollingerUpdater:
+    """
+    布林带, 等价于 TechnicalIndicators.calculate_bollinger_bands
+
+    与 ATRUpdater 相同按 period 分块: 当前块用 Welford 累加均值和平方离差和,
+    上一块在结束时算好各位置之后的后缀统计量, 两段合并即为窗口的均值和方差。
+    """
+
+    kind = 'bollinger'
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.count = 0
+        self.block: List[float] = []          # 当前块的收盘价
+        self.mean = 0.0                       # 当前块的 Welford 统计量
+        self.m2 = 0.0
+        self.suffix_mean: List[float] = []    # 上一块的后缀统计量(尚无完整块时为空)
+        self.suffix_m2: List[float] = []
+
+    def _bands(self, mean_a, m2_a, mean_b, m2_b, size_b):
+        """合并上一块后段(a)与当前块前段(b), 返回 (upper, middle, lower); 标量和数组通用"""
+        size_a = self.period - size_b
+        delta = mean_b - mean_a
+        mean = mean_a + delta * size_b / self.period
+        m2 = m2_a + m2_b + delta * delta * size_a * size_b / self.period
+        if isinstance(m2, float):
+            std = math.sqrt(max(m2, 0.0) / (self.period - 1)) if self.period > 1 else float('nan')
+        elif self.period > 1:
+            std = np.sqrt(np.maximum(m2, 0.0) / (self.period - 1))
+        else:
+            std = np.full_like(mean, np.nan)
+        return mean + std * self.std_dev, mean, mean - std * self.std_dev
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        """(upper, middle, lower)"""
+        if self.count < self.period:
+            nan = float('nan')
+            return nan, nan, nan
+        o = len(self.block) - 1
+        mean_a, m2_a = (self.suffix_mean[o], self.suffix_m2[o]) if self.suffix_mean else (0.0, 0.0)
+        return self._bands(mean_a, m2_a, self.mean, self.m2, o + 1)
+
+    def _rotate(self):
+        """当前块已满: 算好它的后缀统计量(与 _suffix_welford 相同的递推), 开始新块"""
+        self.suffix_mean = [0.0] * self.period
+        self.suffix_m2 = [0.0] * self.period
+        mean = m2 = 0.0
+        for o in range(self.period - 2, -1, -1):
+            value = self.block[o + 1]
+            delta = value - mean
+            mean = mean + delta / (self.period - 1 - o)
+            m2 = m2 + delta * (value - mean)
+            self.suffix_mean[o] = mean
+            self.suffix_m2[o] = m2
+        self.block, self.mean, self.m2 = [], 0.0, 0.0
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """推进一根K线, 返回 (upper, middle, lower)"""
+        if len(self.block) == self.period:
+            self._rotate()
+        self.block.append(close)
+        delta = close - self.mean
+        self.mean += delta / len(self.block)
+        self.m2 += delta * (close - self.mean)
+        self.count += 1
+        return self.value
+
+    def compute(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """批量推进一段收盘价, 返回 (upper, middle, lower)(按块位置逐列累加, 与逐根 update 逐位相同)"""
+        close = np.asarray(close, dtype=np.float64)
+        n = close.size
+        if n == 0:
+            return np.empty(0), np.empty(0), np.empty(0)
+        if len(self.block) == self.period:
+            self._rotate()
+        filled = len(self.block)
+        grid = _blocks(close, filled, self.period)
+        grid[0, :filled] = self.block
+
+        # 各块的前缀 Welford 统计量, 第 0 行从当前块已有的统计量继续
+        rows = grid.shape[0]
+        means = np.zeros_like(grid)
+        m2s = np.zeros_like(grid)
+        mean = np.zeros(rows)
+        m2 = np.zeros(rows)
+        mean[0], m2[0] = self.mean, self.m2
+        active = np.ones(rows, dtype=bool)
+        for j in range(self.period):
+            active[0] = j >= filled
+            value = grid[:, j]
+            delta = value - mean
+            mean = np.where(active, mean + delta / (j + 1), mean)
+            m2 = np.where(active, m2 + delta * (value - mean), m2)
+            means[:, j] = mean
+            m2s[:, j] = m2
+
+        # 每行的上一块: 第 0 行为已保存的后缀统计量, 其余行为上一行
+        suffix_mean, suffix_m2 = _suffix_welford(grid[:-1])
+        first_mean = np.asarray(self.suffix_mean) if self.suffix_mean else np.zeros(self.period)
+        first_m2 = np.asarray(self.suffix_m2) if self.suffix_m2 else np.zeros(self.period)
+        suffix_mean = np.vstack([first_mean, suffix_mean])
+        suffix_m2 = np.vstack([first_m2, suffix_m2])
+
+        bands = self._bands(suffix_mean, suffix_m2, means, m2s, np.arange(1, self.period + 1))
+        invalid = self.count + np.arange(1, n + 1) < self.period
+        upper, middle, lower = (band.ravel()[filled:filled + n] for band in bands)
+        for band in (upper, middle, lower):
+            band[invalid] = np.nan
+
+        last = rows - 1
+        size = filled + n - last * self.period
+        self.block = grid[last, :size].tolist()
+        self.mean, self.m2 = float(means[last, size - 1]), float(m2s[last, size - 1])
+        if last:
+            self.suffix_mean, self.suffix_m2 = suffix_mean[last].tolist(), suffix_m2[last].tolist()
+        self.count += n
+        return upper, middle, lower
+
+    def to_state(self) -> Dict:
+        return {
+            'kind': self.kind,
+            'period': self.period,
+            'std_dev': self.std_dev,
+            'count': self.count,
+            'block': list(self.block),
+            'mean': self.mean,
+            'm2': self.m2,
+            'suffix_mean': list(self.suffix_mean),
+            'suffix_m2': list(self.suffix_m2),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'BollingerUpdater':
+        updater = cls(state['period'], state['std_dev'])
+        if 'closes' in state:
+            # 旧格式保存的是窗口内的收盘价
+            for close in state['closes']:
+                updater.update(close)
+        else:
+            updater.count = state['count']
+            updater.block = list(state['block'])
+            updater.mean = state['mean']
+            updater.m2 = state['m2']
+            updater.suffix_mean = list(state['suffix_mean'])
+            updater.suffix_m2 = list(state['suffix_m2'])
+        return updater
+
+
+UPDATER_TYPES = {
+    cls.kind: cls for cls in (RSIUpdater, MACDUpdater, ATRUpdater, BollingerUpdater)
+}
+
+
+class IndicatorEngine:
+    """
+    增量指标引擎
+
+    用法:
+        engine = IndicatorEngine({'rsi': RSIUpdater(14), 'atr': ATRUpdater(14)})
+        columns = engine.compute(high, low, close)     # 历史数据批量计算
+        state = engine.to_state()                      # 保存状态(JSON)
+        engine = IndicatorEngine.from_state(state)     # 次日恢复
+        values = engine.update(high, low, close)       # 只推进新K线
+
+    多输出指标(MACD/布林带)的列名为 "<名称>_<输出>", 如 macd_signal, bb_upper。
+    """
+
+    OUTPUTS = {
+        'rsi': ('',),
+        'atr': ('',),
+        'macd': ('', '_signal', '_hist'),
+        'bollinger': ('_upper', '_middle', '_lower'),
+    }
+
+    def __init__(self, updaters: Dict[str, object]):
+        self.updaters = dict(updaters)
+
+    @classmethod
+    def default(cls) -> 'IndicatorEngine':
+        """RSI(14)、ATR(14)、MACD(12,26,9)、布林带(20,2)"""
+        return cls({
+            'rsi': RSIUpdater(),
+            'atr': ATRUpdater(),
+            'macd': MACDUpdater(),
+            'bb': BollingerUpdater(),
+        })
+
+    @staticmethod
+    def _inputs(updater, high, low, close) -> tuple:
+        """ATR 需要高低收, 其余指标只用收盘价"""
+        return (high, low, close) if updater.kind == 'atr' else (close,)
+
+    def _collect(self, name: str, kind: str, result, columns: Dict):
+        outputs = self.OUTPUTS[kind]
+        if len(outputs) == 1:
+            columns[name] = result
+        else:
+            for suffix, value in zip(outputs, result):
+                columns[name + suffix] = value
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """推进一根K线, 返回各列最新值"""
+        values: Dict[str, float] = {}
+        for name, updater in self.updaters.items():
+            result = updater.update(*self._inputs(updater, high, low, close))
+            self._collect(name, updater.kind, result, values)
+        return values
+
+    def compute(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+        """批量推进一段K线, 返回各列数组(与逐根 update 结果相同)"""
+        columns: Dict[str, np.ndarray] = {}
+        for name, updater in self.updaters.items():
+            result = updater.compute(*self._inputs(updater, high, low, close))
+            self._collect(name, updater.kind, result, columns)
+        return columns
+
+    def to_state(self) -> Dict:
+        return {name: updater.to_state() for name, updater in self.updaters.items()}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'IndicatorEngine':
+        return cls({
+            name: UPDATER_TYPES[data['kind']].from_state(data)
+            for name, data in state.items()
+        })
@@ -18,8 +18,18 @@ import sys
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root.parent))
 
 from analysis.strategy_analyzer import StrategyAnalyzer
+from src.backtest.robustness import analyze_backtest
+from src.visualization.report_data import ReportData, StageTimer
+from src.visualization.light_report import (
+    PLOTLY_CDN, ChartCache, compact_figure, frame_fingerprint, plotly_bundle, render_charts
+)
+
+
+# 图表缓存版本, 图表样式改动后递增使旧缓存失效
+CHART_CACHE_VERSION = 1
 
 
 class HTMLReportGenerator:
@@ -35,11 +45,25 @@ class HTMLReportGenerator:
             "NVDA": "#76B900",  # 英伟达绿
             "INTC": "#0071C5"   # 英特尔蓝
         }
+        
+        # 所有图表共享的数据模型(首次使用时并行加载)和阶段计时
+        self.timer = StageTimer()
+        self._data = None
+    
+    @property
+    def data(self) -> ReportData:
+        """报告数据模型"""
+        if self._data is None:
+            self._data = ReportData.from_analyzers(self.analyzers, timer=self.timer)
+        return self._data
+    
+    def reload(self):
+        """丢弃已加载的数据, 下次使用时重新读取"""
+        self._data = None
     
     def generate_equity_curve_chart(self, symbol: str, strategy_type: str = "daily") -> go.Figure:
         """生成资金曲线图"""
-        analyzer = self.analyzers[symbol]
-        trades = analyzer.load_trades(strategy_type)
+        trades = self.data.trades_for(symbol, strategy_type)
         
         if len(trades) == 0:
             return None
@@ -79,20 +103,15 @@ class HTMLReportGenerator:
         signal_data = []
         
         for symbol in self.symbols:
-            analyzer = self.analyzers[symbol]
-            
             for strategy_type in ["daily", "weekly"]:
-                signals = analyzer.load_signals(strategy_type)
+                stats = self.data.stats(symbol, strategy_type)
                 
-                if len(signals) > 0:
-                    buy_count = len(signals[signals['action'] == 'BUY'])
-                    sell_count = len(signals[signals['action'] == 'SELL'])
-                    
+                if stats['signals'] > 0:
                     signal_data.append({
                         'symbol': symbol,
                         'strategy': strategy_type,
-                        'BUY': buy_count,
-                        'SELL': sell_count
+                        'BUY': stats['buy_signals'],
+                        'SELL': stats['sell_signals']
                     })
         
         if not signal_data:
@@ -151,17 +170,14 @@ class HTMLReportGenerator:
         win_rate_data = []
         
         for symbol in self.symbols:
-            analyzer = self.analyzers[symbol]
-            
             for strategy_type in ["daily", "weekly"]:
-                trades = analyzer.load_trades(strategy_type)
+                stats = self.data.stats(symbol, strategy_type)
                 
-                if len(trades) > 0:
-                    win_rate = (len(trades[trades['profit'] > 0]) / len(trades) * 100)
+                if stats['trades'] > 0:
                     win_rate_data.append({
                         'symbol': symbol,
                         'strategy': strategy_type,
-                        'win_rate': win_rate
+                        'win_rate': stats['win_rate']
                     })
         
         if not win_rate_data:
@@ -217,20 +233,15 @@ class HTMLReportGenerator:
         profit_data = []
         
         for symbol in self.symbols:
-            analyzer = self.analyzers[symbol]
-            
             for strategy_type in ["daily", "weekly"]:
-                trades = analyzer.load_trades(strategy_type)
+                stats = self.data.stats(symbol, strategy_type)
                 
-                if len(trades) > 0:
-                    total_profit = trades['profit'].sum()
-                    avg_profit = trades['profit'].mean()
-                    
+                if stats['trades'] > 0:
                     profit_data.append({
                         'symbol': symbol,
                         'strategy': strategy_type,
-                        'total_profit': total_profit,
-                        'avg_profit': avg_profit
+                        'total_profit': stats['total_profit'],
+                        'avg_profit': stats['avg_profit']
                     })
         
         if not profit_data:
@@ -310,8 +321,7 @@ class HTMLReportGenerator:
     
     def generate_trade_distribution_chart(self, symbol: str, strategy_type: str = "daily") -> go.Figure:
         """生成交易盈亏分布图"""
-        analyzer = self.analyzers[symbol]
-        trades = analyzer.load_trades(strategy_type)
+        trades = self.data.trades_for(symbol, strategy_type)
         
         if len(trades) == 0:
             return None
@@ -371,18 +381,22 @@ class HTMLReportGenerator:
         """生成月度表现对比"""
         monthly_data = []
         
+        # 本月统计(口径同 StrategyAnalyzer.analyze_month)
+        today = datetime.now()
+        start_date = datetime(today.year, today.month, 1)
+        if today.month == 12:
+            end_date = datetime(today.year + 1, 1, 1) - timedelta(days=1)
+        else:
+            end_date = datetime(today.year, today.month + 1, 1) - timedelta(days=1)
+        month = self.data.period_summary(start_date, end_date)
+        
         for symbol in self.symbols:
-            analyzer = self.analyzers[symbol]
-            
-            # 获取月度分析数据
-            analysis = analyzer.analyze_month()
-            
             monthly_data.append({
                 'symbol': symbol,
-                'daily_win_rate': analysis['daily_strategy']['win_rate'],
-                'weekly_win_rate': analysis['weekly_strategy']['win_rate'],
-                'daily_profit': analysis['daily_strategy']['total_profit'],
-                'weekly_profit': analysis['weekly_strategy']['total_profit']
+                'daily_win_rate': month.loc[(symbol, 'daily'), 'win_rate'],
+                'weekly_win_rate': month.loc[(symbol, 'weekly'), 'win_rate'],
+                'daily_profit': month.loc[(symbol, 'daily'), 'total_profit'],
+                'weekly_profit': month.loc[(symbol, 'weekly'), 'total_profit']
             })
         
         df = pd.DataFrame(monthly_data)
@@ -426,8 +440,104 @@ class HTMLReportGenerator:
         
         return fig
     
-    def generate_html_report(self, output_file: str = None):
-        """生成完整的HTML报告"""
+    def generate_robustness_chart(
+        self,
+        symbol: str,
+        strategy_type: str = "daily",
+        n_paths: int = 10000
+    ) -> go.Figure:
+        """生成 Monte Carlo 稳健性分布图 (最大回撤 / CAGR / 夏普)"""
+        equity_df = self.data.equity[(symbol, strategy_type)]
+        if equity_df is None or len(equity_df) < 3:
+            return None
+        trades_df = self.data.fills[(symbol, strategy_type)]
+        if trades_df is not None and 'action' not in trades_df.columns:
+            trades_df = None  # 逐笔平仓格式, 没有成交明细
+        
+        results = analyze_backtest(equity_df, trades_df, n_paths=n_paths, seed=42)
+        
+        titles = {
+            'max_drawdown': '最大回撤 (%)',
+            'cagr': '年化收益率 CAGR (%)',
+            'sharpe': '夏普比率'
+        }
+        fig = make_subplots(rows=1, cols=3, subplot_titles=list(titles.values()))
+        method_names = {'bootstrap': '块自助法', 'permutation': '交易顺序置换'}
+        method_colors = {'bootstrap': self.colors[symbol], 'permutation': '#636EFA'}
+        
+        for col, metric in enumerate(titles, start=1):
+            scale = 1 if metric == 'sharpe' else 100
+            for method, result in results.items():
+                fig.add_trace(go.Histogram(
+                    x=getattr(result, metric) * scale,
+                    name=method_names[method],
+                    marker_color=method_colors[method],
+                    opacity=0.6,
+                    nbinsx=50,
+                    legendgroup=method,
+                    showlegend=(col == 1)
+                ), row=1, col=col)
+            
+            lo, hi = results['bootstrap'].confidence_interval(metric)
+            for bound in (lo, hi):
+                fig.add_vline(x=bound * scale, line_dash='dash', line_color='gray', row=1, col=col)
+        
+        fig.update_layout(
+            title=f'{symbol} - {strategy_type.upper()}策略稳健性分析 ({n_paths}条路径, 虚线为95%置信区间)',
+            barmode='overlay',
+            template='plotly_white',
+            height=400
+        )
+        
+        return fig
+    
+    def _chart_specs(self) -> list:
+        """
+        报告中的全部图表: [(分区, 图表编号, 进度说明, 计时阶段, 输入数据, 生成函数), ...]
+        
+        输入数据用于增量模式下判断图表是否需要重新生成。
+        """
+        data = self.data
+        month = datetime.now().strftime('%Y-%m')
+        specs = [
+            ("main", "signal_dist", "信号分布图", "图表: 信号分布",
+             (data.summary,), self.generate_signal_distribution_chart),
+            ("main", "win_rate", "胜率对比图", "图表: 胜率对比",
+             (data.summary,), self.generate_win_rate_chart),
+            ("main", "profit", "盈亏对比图", "图表: 盈亏对比",
+             (data.summary,), self.generate_profit_comparison_chart),
+            ("main", "monthly", "月度表现雷达图", "图表: 月度雷达",
+             (data.signals, data.trades, month), self.generate_monthly_performance_chart),
+        ]
+        for symbol in self.symbols:
+            trades = data.trades_for(symbol, "daily")
+            specs.append(("main", f"{symbol}_equity", f"{symbol} 资金曲线图", "图表: 资金曲线",
+                          (trades,), lambda symbol=symbol: self.generate_equity_curve_chart(symbol, "daily")))
+            specs.append(("main", f"{symbol}_trades", f"{symbol} 交易分布图", "图表: 交易分布",
+                          (trades,), lambda symbol=symbol: self.generate_trade_distribution_chart(symbol, "daily")))
+        for symbol in self.symbols:
+            key = (symbol, "daily")
+            specs.append(("robustness", f"{symbol}_robustness", f"{symbol} 稳健性分析", "图表: 稳健性分析",
+                          (data.equity[key], data.fills[key]),
+                          lambda symbol=symbol: self.generate_robustness_chart(symbol, "daily")))
+        return specs
+    
+    def generate_html_report(
+        self,
+        output_file: str = None,
+        light: bool = False,
+        local_plotly: bool = False,
+        cache_dir: Path = None
+    ):
+        """
+        生成完整的HTML报告
+        
+        Args:
+            output_file: 输出文件, 默认带时间戳
+            light: 轻量模式(共享模板、降采样、紧凑序列化, 见 light_report)
+            local_plotly: 轻量模式下引用报告目录 assets/ 中的本地 Plotly 脚本, 而非 CDN
+            cache_dir: 轻量模式下的图表缓存目录, 指定后只重新生成输入数据有变化的图表
+        """
         
         if output_file is None:
             output_file = project_root / f"strategy_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
@@ -435,60 +545,71 @@ class HTMLReportGenerator:
             output_file = Path(output_file)
         
         print("=" * 80)
-        print("📊 生成策略分析HTML报告")
+        print(f"📊 生成策略分析HTML报告{' (轻量模式)' if light else ''}")
         print("=" * 80)
         print()
         
+        # 一次性并行加载全部数据, 之后各图表只读取内存中的共享表
+        self.timer = StageTimer()
+        self.reload()
+        print("📂 加载数据...")
+        data = self.data
+        print(f"  - {len(data.signals)} 条信号, {len(data.trades)} 笔交易")
+        print()
+        
         # 生成各种图表
         print("📈 生成图表...")
         
-        charts = []
-        
-        # 1. 信号分布
-        print("  - 信号分布图")
-        charts.append(("signal_dist", self.generate_signal_distribution_chart()))
-        
-        # 2. 胜率对比
-        print("  - 胜率对比图")
-        charts.append(("win_rate", self.generate_win_rate_chart()))
-        
-        # 3. 盈亏对比
-        print("  - 盈亏对比图")
-        charts.append(("profit", self.generate_profit_comparison_chart()))
-        
-        # 4. 月度表现雷达图
-        print("  - 月度表现雷达图")
-        charts.append(("monthly", self.generate_monthly_performance_chart()))
-        
-        # 5. 每个股票的资金曲线和交易分布
-        for symbol in self.symbols:
-            print(f"  - {symbol} 资金曲线图")
-            equity_fig = self.generate_equity_curve_chart(symbol, "daily")
-            if equity_fig:
-                charts.append((f"{symbol}_equity", equity_fig))
-            
-            print(f"  - {symbol} 交易分布图")
-            trade_fig = self.generate_trade_distribution_chart(symbol, "daily")
-            if trade_fig:
-                charts.append((f"{symbol}_trades", trade_fig))
+        cache = ChartCache(cache_dir) if light and cache_dir is not None else None
+        charts = {"main": [], "robustness": []}
+        for section, chart_id, label, stage_name, inputs, build in self._chart_specs():
+            print(f"  - {label}")
+            with self.timer.stage(stage_name):
+                if not light:
+                    chart = build()
+                elif cache is not None:
+                    key = frame_fingerprint(CHART_CACHE_VERSION, *inputs)
+                    chart = cache.get_or_build(chart_id, key, lambda build=build: compact_figure(build()))
+                else:
+                    chart = compact_figure(build())
+            if chart is not None:
+                charts[section].append((chart_id, chart))
+        if cache is not None:
+            print(f"  ♻️  图表缓存: 复用 {cache.hits} 个, 重新生成 {cache.misses} 个")
+        
+        # 轻量模式: 图表替换为占位 div, 由页面末尾的一段脚本统一绘制
+        plotly_src, script = "https://cdn.plot.ly/plotly-latest.min.js", ""
+        if light:
+            with self.timer.stage("压缩序列化"):
+                divs, script = render_charts(charts["main"] + charts["robustness"])
+                for section in charts:
+                    charts[section] = [(chart_id, divs[chart_id]) for chart_id, _ in charts[section]]
+                plotly_src = plotly_bundle(output_file.parent) if local_plotly else PLOTLY_CDN
         
         # 获取统计数据
         print("\n📊 收集统计数据...")
-        stats = self._collect_statistics()
+        with self.timer.stage("统计汇总"):
+            stats = self._collect_statistics()
         
         # 构建HTML
         print("\n🔨 构建HTML页面...")
-        html_content = self._build_html(charts, stats)
+        with self.timer.stage("构建HTML"):
+            html_content = self._build_html(
+                charts["main"], stats, charts["robustness"], plotly_src=plotly_src, script=script
+            )
         
         # 保存文件
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with self.timer.stage("写入文件"):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(html_content)
         
         print()
         print("=" * 80)
-        print(f"✅ HTML报告已生成: {output_file}")
+        print(f"✅ HTML报告已生成: {output_file} ({len(html_content.encode('utf-8')) / 1024:.0f} KB)")
         print("=" * 80)
         print()
+        self.timer.print_summary()
+        print()
         print("💡 提示: 在浏览器中打开查看交互式图表")
         
         return output_file
@@ -508,60 +629,52 @@ class HTMLReportGenerator:
         win_rates = []
         
         for symbol in self.symbols:
-            analyzer = self.analyzers[symbol]
-            
-            daily_signals = analyzer.load_signals("daily")
-            weekly_signals = analyzer.load_signals("weekly")
-            daily_trades = analyzer.load_trades("daily")
-            weekly_trades = analyzer.load_trades("weekly")
-            
-            daily_win_rate = 0
-            if len(daily_trades) > 0:
-                daily_win_rate = len(daily_trades[daily_trades['profit'] > 0]) / len(daily_trades) * 100
-                win_rates.append(daily_win_rate)
-            
-            weekly_win_rate = 0
-            if len(weekly_trades) > 0:
-                weekly_win_rate = len(weekly_trades[weekly_trades['profit'] > 0]) / len(weekly_trades) * 100
-                win_rates.append(weekly_win_rate)
+            stats['symbols'][symbol] = {}
             
-            stats['symbols'][symbol] = {
-                'daily': {
-                    'signals': len(daily_signals),
-                    'trades': len(daily_trades),
-                    'profit': daily_trades['profit'].sum() if len(daily_trades) > 0 else 0,
-                    'win_rate': daily_win_rate
-                },
-                'weekly': {
-                    'signals': len(weekly_signals),
-                    'trades': len(weekly_trades),
-                    'profit': weekly_trades['profit'].sum() if len(weekly_trades) > 0 else 0,
-                    'win_rate': weekly_win_rate
+            for strategy_type in ["daily", "weekly"]:
+                summary = self.data.stats(symbol, strategy_type)
+                
+                if summary['trades'] > 0:
+                    win_rates.append(summary['win_rate'])
+                
+                stats['symbols'][symbol][strategy_type] = {
+                    'signals': summary['signals'],
+                    'trades': summary['trades'],
+                    'profit': summary['total_profit'],
+                    'win_rate': summary['win_rate']
                 }
-            }
-            
-            stats['overall']['total_signals'] += len(daily_signals) + len(weekly_signals)
-            stats['overall']['total_trades'] += len(daily_trades) + len(weekly_trades)
-            stats['overall']['total_profit'] += stats['symbols'][symbol]['daily']['profit'] + stats['symbols'][symbol]['weekly']['profit']
+                
+                stats['overall']['total_signals'] += summary['signals']
+                stats['overall']['total_trades'] += summary['trades']
+                stats['overall']['total_profit'] += summary['total_profit']
         
         if win_rates:
             stats['overall']['avg_win_rate'] = sum(win_rates) / len(win_rates)
         
         return stats
     
-    def _build_html(self, charts: list, stats: dict) -> str:
-        """构建HTML内容"""
+    def _build_html(
+        self,
+        charts: list,
+        stats: dict,
+        robustness_charts: list = None,
+        plotly_src: str = "https://cdn.plot.ly/plotly-latest.min.js",
+        script: str = ""
+    ) -> str:
+        """
+        构建HTML内容
+        
+        charts / robustness_charts 中的图表可以是 go.Figure, 也可以是已渲染的 HTML 片段
+        (轻量模式的占位 div, 此时 script 为绘制全部图表的脚本)。
+        """
+        
+        def to_html(chart_id, fig):
+            if isinstance(fig, str):
+                return fig
+            return fig.to_html(full_html=False, include_plotlyjs=False, div_id=chart_id)
         
         # 转换图表为HTML
-        chart_htmls = []
-        for chart_id, fig in charts:
-            if fig is not None:
-                chart_html = fig.to_html(
-                    full_html=False,
-                    include_plotlyjs=False,
-                    div_id=chart_id
-                )
-                chart_htmls.append(chart_html)
+        chart_htmls = [to_html(chart_id, fig) for chart_id, fig in charts if fig is not None]
         
         # 构建完整HTML
         html = f"""
@@ -571,7 +684,7 @@ class HTMLReportGenerator:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>策略分析报告 - {datetime.now().strftime('%Y年%m月%d日')}</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="{plotly_src}"></script>
     <style>
         * {{
             margin: 0;
@@ -850,6 +963,16 @@ class HTMLReportGenerator:
 """
             chart_index += 2
         
+        # 稳健性分析
+        if robustness_charts:
+            robustness_htmls = [to_html(chart_id, fig) for chart_id, fig in robustness_charts]
+            html += f"""
+        <div class="chart-section">
+            <h2>🎲 稳健性分析 (Monte Carlo)</h2>
+            {''.join(robustness_htmls)}
+        </div>
+"""
+        
         # Footer
         html += f"""
         <!-- Footer -->
@@ -860,6 +983,7 @@ class HTMLReportGenerator:
             <p>报告生成: 自动化分析系统</p>
         </div>
     </div>
+{script}
 </body>
 </html>
 """
@@ -869,8 +993,25 @@ class HTMLReportGenerator:
 
 def main():
     """主函数"""
+    import argparse
+    parser = argparse.ArgumentParser(description="生成策略分析HTML报告")
+    parser.add_argument("--output", type=Path, default=None, help="输出文件")
+    parser.add_argument("--light", action="store_true", help="轻量模式: 体积小, 适合邮件和手机")
+    parser.add_argument("--local-plotly", action="store_true", help="轻量模式下使用本地 Plotly 脚本")
+    parser.add_argument("--incremental", action="store_true", help="轻量模式下只重新生成输入有变化的图表")
+    parser.add_argument("--no-open", action="store_true", help="生成后不打开浏览器")
+    args = parser.parse_args()
+    
     generator = HTMLReportGenerator()
-    report_file = generator.generate_html_report()
+    report_file = generator.generate_html_report(
+        args.output,
+        light=args.light or args.local_plotly or args.incremental,
+        local_plotly=args.local_plotly,
+        cache_dir=project_root.parent / ".report_cache" if args.incremental else None
+    )
+    
+    if args.no_open:
+        return report_file
     
     # 自动在浏览器中打开
     import webbrowser
@@ -0,0 +1,227 @@
+"""
+轻量 HTML 报告渲染
+
+fig.to_html() 为每个图表单独嵌入完整的布局模板和全部原始数据, 资金曲线的每个日期
+都是 "2010-06-29T00:00:00.000000000" 这样的长字符串, Monte Carlo 直方图则把上万个
+样本原样写进页面。轻量模式下:
+1. 页面只引用一份 Plotly 脚本(固定版本的 CDN 或报告旁的本地文件)
+2. 相同的布局模板只写一次, 各图表按编号引用
+3. 长折线按区间保留最大/最小值降采样, 直方图在生成时预先分箱为柱状图
+4. 日期去掉零点时间, 浮点数组以 float32 二进制(base64)序列化
+5. ChartCache 按输入数据的哈希缓存压缩后的图表, 输入未变的图表不再重新生成
+
+用法:
+    compact = compact_figure(fig)
+    divs, script = render_charts([("equity", compact)])
+"""
+import base64
+import hashlib
+import json
+import re
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+
+# 折线默认最多保留的点数
+MAX_POINTS = 500
+
+PLOTLY_CDN = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+_MIDNIGHT = re.compile(r"T00:00:00(\.0*)?$")
+
+
+def plotly_bundle(directory: Path) -> str:
+    """
+    在报告目录下写入本地 Plotly 脚本(已存在则复用), 返回相对路径
+
+    多份报告共享同一个文件, 离线也能打开。
+    """
+    name = f"plotly-{get_plotlyjs_version()}.min.js"
+    path = Path(directory) / "assets" / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(get_plotlyjs(), encoding='utf-8')
+    return f"assets/{name}"
+
+
+def downsample_indices(y: np.ndarray, max_points: int = MAX_POINTS) -> np.ndarray:
+    """
+    折线降采样: 分成 max_points/2 个区间, 每个区间保留最大值和最小值所在的点
+
+    保留首尾点和每个区间的极值, 回撤、尖峰等形状不会被抹掉。
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = max(1, max_points // 2)
+    width = -(-n // buckets)
+    values = np.asarray(y, dtype=np.float64)
+    padded = np.full(buckets * width, np.nan)
+    padded[:n] = values
+    rows = padded.reshape(buckets, width)
+    valid = ~np.isnan(rows).all(axis=1)
+    offsets = np.arange(buckets)[valid] * width
+    filled = np.where(np.isnan(rows[valid]), np.nanmean(values), rows[valid])
+    keep = np.concatenate([
+        [0, n - 1],
+        offsets + filled.argmin(axis=1),
+        offsets + filled.argmax(axis=1),
+    ])
+    return np.unique(np.clip(keep, 0, n - 1))
+
+
+def _prebin_histogram(trace: go.Histogram) -> go.Bar:
+    """直方图 -> 已分箱的柱状图(只传输各箱计数)"""
+    values = np.asarray(trace.x, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=trace.nbinsx or 50)
+    props = trace.to_plotly_json()
+    keep = {
+        name: props[name]
+        for name in ('name', 'marker', 'opacity', 'legendgroup', 'showlegend', 'xaxis', 'yaxis')
+        if name in props
+    }
+    return go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), **keep)
+
+
+def _shrink(value):
+    """递归压缩 to_dict() 的结果"""
+    if isinstance(value, dict):
+        if value.get('dtype') == 'f8' and 'bdata' in value:
+            data = np.frombuffer(base64.b64decode(value['bdata']), dtype=np.float64)
+            return {**value, 'dtype': 'f4', 'bdata': base64.b64encode(data.astype(np.float32).tobytes()).decode()}
+        return {key: _shrink(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_shrink(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return _shrink(value.tolist())
+    if isinstance(value, str):
+        return _MIDNIGHT.sub("", value)
+    if isinstance(value, date):
+        return _MIDNIGHT.sub("", value.isoformat())
+    if isinstance(value, np.datetime64):
+        return _MIDNIGHT.sub("", str(value))
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def compact_figure(fig: Optional[go.Figure], max_points: int = MAX_POINTS) -> Optional[Dict]:
+    """
+    压缩图表: 折线降采样、直方图预分箱、模板与数据分离
+
+    Returns:
+        {'data': [...], 'layout': {...}, 'template': {...}}, fig 为 None 时返回 None
+    """
+    if fig is None:
+        return None
+    traces = []
+    for trace in fig.data:
+        if isinstance(trace, go.Histogram) and trace.x is not None and trace.y is None:
+            trace = _prebin_histogram(trace)
+        elif (isinstance(trace, go.Scatter) and trace.x is not None and trace.y is not None
+              and 'lines' in (trace.mode or 'lines') and len(trace.y) > max_points):
+            index = downsample_indices(trace.y, max_points)
+            trace = go.Scatter(trace).update(x=np.asarray(trace.x)[index], y=np.asarray(trace.y)[index])
+        traces.append(trace)
+    light = go.Figure(data=traces, layout=fig.layout)
+    spec = light.to_dict()
+    layout = spec.get('layout', {})
+    template = layout.pop('template', None)
+    return {'data': _shrink(spec.get('data', [])), 'layout': _shrink(layout), 'template': template}
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def render_charts(charts: Sequence[Tuple[str, Optional[Dict]]]) -> Tuple[Dict[str, str], str]:
+    """
+    渲染压缩后的图表
+
+    Args:
+        charts: [(chart_id, compact_figure(...)), ...], None 的图表跳过
+
+    Returns:
+        ({chart_id: 占位 div}, 统一绘制全部图表的 <script>)
+    """
+    templates: List[str] = []
+    figures = []
+    divs = {}
+    for chart_id, compact in charts:
+        if compact is None:
+            continue
+        template = _dumps(compact['template'] or {})
+        if template not in templates:
+            templates.append(template)
+        height = compact['layout'].get('height') or 450
+        divs[chart_id] = (f'<div id="{chart_id}" class="plotly-graph-div" '
+                          f'style="height:{height}px; width:100%;"></div>')
+        figures.append(
+            f'{{"id":"{chart_id}","t":{templates.index(template)},'
+            f'"d":{_dumps(compact["data"])},"l":{_dumps(compact["layout"])}}}'
+        )
+    script = (
+        "<script>\n(function () {\n"
+        f"var T = [{','.join(templates)}];\n"
+        f"var F = [\n{(',' + chr(10)).join(figures)}\n];\n"
+        "F.forEach(function (f) { f.l.template = T[f.t]; "
+        "Plotly.newPlot(f.id, f.d, f.l, {responsive: true}); });\n"
+        "})();\n</script>"
+    )
+    return divs, script
+
+
+def frame_fingerprint(*items) -> str:
+    """输入数据的哈希(DataFrame 按内容, 其他对象按 repr)"""
+    digest = hashlib.sha1()
+    for item in items:
+        if isinstance(item, pd.DataFrame):
+            digest.update(",".join(map(str, item.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(item, index=False).to_numpy().tobytes())
+        elif item is None:
+            digest.update(b"<none>")
+        else:
+            digest.update(repr(item).encode())
+    return digest.hexdigest()[:16]
+
+
+class ChartCache:
+    """
+    按 (图表编号, 输入哈希) 缓存压缩后的图表
+
+    Args:
+        cache_dir: 缓存目录, 每个图表一个 JSON 文件
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, chart_id: str) -> Path:
+        return self.cache_dir / f"{chart_id}.json"
+
+    def get_or_build(self, chart_id: str, key: str, build: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """输入哈希与缓存一致时直接返回缓存, 否则调用 build() 生成并写入缓存"""
+        path = self._path(chart_id)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                self.hits += 1
+                return cached['figure']
+        self.misses += 1
+        figure = build()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'figure': figure}, f, ensure_ascii=False, separators=(',', ':'))
+        tmp_path.replace(path)
+        return figure
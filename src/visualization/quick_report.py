@@ -6,8 +6,14 @@ import plotly.graph_objects as go
 from datetime import datetime
 from pathlib import Path
 import webbrowser
+import sys
 
-def generate_report():
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.visualization.light_report import PLOTLY_CDN, compact_figure, render_charts
+
+def generate_report(light: bool = False):
+    """生成报告; light=True 时使用轻量模式(见 light_report), 文件小一个数量级"""
     # 读取数据
     base_dir = Path("k:/QT/backtest_results/daily")
     
@@ -110,6 +116,15 @@ def generate_report():
         </tr>
         """
     
+    # 图表HTML: 轻量模式下为占位 div, 由页面末尾的脚本统一绘制
+    plotly_src, script = "https://cdn.plot.ly/plotly-latest.min.js", ""
+    if light:
+        divs, script = render_charts([(f"chart{i}", compact_figure(fig)) for i, fig in enumerate((fig1, fig2, fig3), 1)])
+        chart_htmls = list(divs.values())
+        plotly_src = PLOTLY_CDN
+    else:
+        chart_htmls = [fig.to_html(full_html=False, include_plotlyjs=False) for fig in (fig1, fig2, fig3)]
+    
     # 生成HTML
     html = f"""
 <!DOCTYPE html>
@@ -118,7 +133,7 @@ def generate_report():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>TSLA策略分析报告</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="{plotly_src}"></script>
     <style>
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
         body {{ 
@@ -254,15 +269,15 @@ def generate_report():
         </div>
         
         <div class="chart">
-            {fig1.to_html(full_html=False, include_plotlyjs=False)}
+            {chart_htmls[0]}
         </div>
         
         <div class="chart">
-            {fig2.to_html(full_html=False, include_plotlyjs=False)}
+            {chart_htmls[1]}
         </div>
         
         <div class="chart">
-            {fig3.to_html(full_html=False, include_plotlyjs=False)}
+            {chart_htmls[2]}
         </div>
         
         <div class="signals-table">
@@ -283,6 +298,7 @@ def generate_report():
             </table>
         </div>
     </div>
+    {script}
 </body>
 </html>
 """
@@ -300,4 +316,4 @@ def generate_report():
     return output
 
 if __name__ == "__main__":
-    generate_report()
+    generate_report(light="--light" in sys.argv)
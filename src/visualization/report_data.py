@@ -0,0 +1,175 @@
+"""
+HTML 报告的数据模型
+
+HTMLReportGenerator 的每个图表和统计都从同一个 ReportData 读取:
+1. 所有股票 × 策略类型的信号、交易、资金曲线文件并行读取, 每个文件只读一次
+2. 信号和交易合并为共享表 (带 symbol / strategy 列), 汇总统计用一次 groupby 算出
+3. 记录各阶段耗时, 报告生成结束时打印耗时明细
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.strategy_analyzer import parse_signals, parse_trades
+
+
+STRATEGY_TYPES = ("daily", "weekly")
+
+# 文件种类 -> 文件名前缀
+FILE_KINDS = ("signals", "trades", "equity_curve")
+
+
+class StageTimer:
+    """按阶段累计耗时"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def print_summary(self, title: str = "耗时明细"):
+        total = sum(self.timings.values())
+        print(f"⏱️  {title} (合计 {total:.2f}s):")
+        for name, seconds in self.timings.items():
+            share = seconds / total if total > 0 else 0.0
+            print(f"  - {name:<24} {seconds:>7.3f}s  {share:>6.1%}")
+
+
+def _read_csv(path: Path) -> Optional[pd.DataFrame]:
+    return pd.read_csv(path) if path.exists() else None
+
+
+class ReportData:
+    """
+    报告所需的全部数据(一次加载, 所有图表共享)
+
+    Args:
+        results_dirs: {股票代码: {策略类型: 回测结果目录}}
+        strategy_types: 策略类型
+        max_workers: 并行读取线程数
+        timer: 共享的阶段计时器
+    """
+
+    def __init__(
+        self,
+        results_dirs: Dict[str, Dict[str, Path]],
+        strategy_types: Sequence[str] = STRATEGY_TYPES,
+        max_workers: Optional[int] = None,
+        timer: Optional[StageTimer] = None
+    ):
+        self.symbols = list(results_dirs)
+        self.strategy_types = tuple(strategy_types)
+        self.results_dirs = results_dirs
+        self.max_workers = max_workers
+        self.timer = timer or StageTimer()
+        self.load()
+
+    @classmethod
+    def from_analyzers(cls, analyzers: Dict, **kwargs) -> 'ReportData':
+        """按 StrategyAnalyzer 的结果目录加载"""
+        results_dirs = {
+            symbol: {"daily": analyzer.daily_results_dir, "weekly": analyzer.weekly_results_dir}
+            for symbol, analyzer in analyzers.items()
+        }
+        return cls(results_dirs, **kwargs)
+
+    def _path(self, symbol: str, strategy_type: str, kind: str) -> Path:
+        return Path(self.results_dirs[symbol][strategy_type]) / f"{kind}_{strategy_type}.csv"
+
+    def load(self):
+        """并行读取全部文件并构建共享表"""
+        keys = [
+            (symbol, strategy_type, kind)
+            for symbol in self.symbols
+            for strategy_type in self.strategy_types
+            for kind in FILE_KINDS
+        ]
+        with self.timer.stage("读取数据"):
+            workers = self.max_workers or min(16, len(keys)) or 1
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                frames = dict(zip(keys, pool.map(lambda key: _read_csv(self._path(*key)), keys)))
+
+        with self.timer.stage("整理数据"):
+            self.fills: Dict[Tuple[str, str], pd.DataFrame] = {}
+            self.equity: Dict[Tuple[str, str], pd.DataFrame] = {}
+            signals, trades = [], []
+            for symbol in self.symbols:
+                for strategy_type in self.strategy_types:
+                    key = (symbol, strategy_type)
+                    raw_signals = frames[(symbol, strategy_type, "signals")]
+                    raw_trades = frames[(symbol, strategy_type, "trades")]
+                    self.equity[key] = frames[(symbol, strategy_type, "equity_curve")]
+                    self.fills[key] = raw_trades
+                    tag = dict(symbol=symbol, strategy=strategy_type)
+                    signals.append(parse_signals(
+                        raw_signals if raw_signals is not None else pd.DataFrame()).assign(**tag))
+                    trades.append(parse_trades(
+                        raw_trades if raw_trades is not None else pd.DataFrame()).assign(**tag))
+            self.signals = pd.concat(signals, ignore_index=True)
+            self.trades = pd.concat(trades, ignore_index=True)
+            self._signal_groups = {key: frame for key, frame in self.signals.groupby(['symbol', 'strategy'])}
+            self._trade_groups = {key: frame for key, frame in self.trades.groupby(['symbol', 'strategy'])}
+            self.summary = self._summarize(self.signals, self.trades)
+
+    def _summarize(self, signals: pd.DataFrame, trades: pd.DataFrame) -> pd.DataFrame:
+        """每个 (股票, 策略类型) 的信号与交易统计"""
+        index = pd.MultiIndex.from_product([self.symbols, self.strategy_types], names=['symbol', 'strategy'])
+        keys = ['symbol', 'strategy']
+        signal_counts = signals.groupby(keys).agg(
+            signals=('action', 'size'),
+            buy_signals=('action', lambda a: int((a == 'BUY').sum())),
+            sell_signals=('action', lambda a: int((a == 'SELL').sum())),
+        )
+        profit = trades.assign(win=trades['profit'] > 0, loss=trades['profit'] < 0)
+        trade_stats = profit.groupby(keys).agg(
+            trades=('profit', 'size'),
+            profitable_trades=('win', 'sum'),
+            losing_trades=('loss', 'sum'),
+            total_profit=('profit', 'sum'),
+            avg_profit=('profit', 'mean'),
+            max_profit=('profit', 'max'),
+            max_loss=('profit', 'min'),
+        )
+        summary = signal_counts.join(trade_stats, how='outer').reindex(index).fillna(0)
+        count_columns = ['signals', 'buy_signals', 'sell_signals', 'trades', 'profitable_trades', 'losing_trades']
+        summary[count_columns] = summary[count_columns].astype(int)
+        summary['win_rate'] = np.where(
+            summary['trades'] > 0,
+            summary['profitable_trades'] / summary['trades'].where(summary['trades'] > 0, 1) * 100,
+            0.0
+        )
+        return summary
+
+    def signals_for(self, symbol: str, strategy_type: str) -> pd.DataFrame:
+        """某股票某策略的信号(按日期排序)"""
+        return self._signal_groups.get((symbol, strategy_type), self.signals.iloc[:0])
+
+    def trades_for(self, symbol: str, strategy_type: str) -> pd.DataFrame:
+        """某股票某策略的逐笔平仓记录(按入场日期排序)"""
+        return self._trade_groups.get((symbol, strategy_type), self.trades.iloc[:0])
+
+    def stats(self, symbol: str, strategy_type: str) -> Dict:
+        """某股票某策略的汇总统计"""
+        return self.summary.loc[(symbol, strategy_type)].to_dict()
+
+    def period_summary(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """入场日期在 [start_date, end_date] 内的统计, 口径同 StrategyAnalyzer.analyze_month"""
+        in_range = lambda frame, column: frame[(frame[column] >= start_date) & (frame[column] <= end_date)]
+        return self._summarize(in_range(self.signals, 'date'), in_range(self.trades, 'entry_date'))
+
+    def items(self) -> Iterable[Tuple[str, str]]:
+        for symbol in self.symbols:
+            for strategy_type in self.strategy_types:
+                yield symbol, strategy_type
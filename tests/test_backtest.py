@@ -115,6 +115,48 @@ class TestBacktestAccount(unittest.TestCase):
         self.assertAlmostEqual(total_equity, expected, places=2)
 
 
+class TestAccountBuffers(unittest.TestCase):
+    """测试预分配缓冲区与成交日志"""
+    
+    def test_equity_buffer_grows_beyond_reserve(self):
+        """超过预分配容量时自动扩容"""
+        account = BacktestAccount(initial_cash=1000.0)
+        account.reserve(2)
+        for i in range(5):
+            account.record_equity(datetime(2020, 1, 1) + timedelta(days=i), 1000.0 + i)
+        
+        self.assertEqual(len(account.equity_curve), 5)
+        self.assertEqual(account.equity_curve[-1][1], 1004.0)
+    
+    def test_fill_log_records_trades(self):
+        """成交同时写入结构化成交日志"""
+        account = BacktestAccount(initial_cash=100000.0)
+        account.execute_trade(
+            Trade(datetime(2020, 1, 1), TradeAction.BUY, "TSLA", 10, 100.0), 100.0
+        )
+        account.execute_trade(
+            Trade(datetime(2020, 1, 2), TradeAction.SELL, "TSLA", 10, 110.0), 110.0
+        )
+        
+        fills = account.fills.view("TSLA")
+        self.assertEqual(len(fills), 2)
+        self.assertListEqual(fills['side'].tolist(), [1, -1])
+        self.assertAlmostEqual(fills['commission'][0], account.trades[0].commission)
+    
+    def test_reset_reuses_buffers(self):
+        """reset 后恢复初始状态并复用内存"""
+        account = BacktestAccount(initial_cash=1000.0)
+        account.reserve(10)
+        account.record_equity(datetime(2020, 1, 1), 1000.0)
+        buffer = account.equity_buffer.equity
+        
+        account.reset()
+        
+        self.assertEqual(len(account.equity_curve), 0)
+        self.assertEqual(account.cash, 1000.0)
+        self.assertIs(account.equity_buffer.equity, buffer)
+
+
 class TestBacktester(unittest.TestCase):
     """测试回测引擎"""
     
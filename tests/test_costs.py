@@ -0,0 +1,85 @@
+"""
+交易成本模型单元测试
+"""
+import datetime as dt
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.costs import DEFAULT_COST_MODEL, CommissionSchedule, CostModel, cost_sensitivity
+from src.backtest.engine import Backtester, TradeAction
+from src.data.loader import PriceBar
+from src.execution.mock_broker import MockBroker
+from src.portfolio.allocator import PositionPlan
+from src.signals.momentum import TradeAction as SignalAction
+
+
+class TestCostModel(unittest.TestCase):
+    """测试佣金、价差、冲击和借券费"""
+
+    def test_default_matches_flat_commission(self):
+        self.assertAlmostEqual(DEFAULT_COST_MODEL.buy_cash(100, 50.0), 100 * 50.0 * 1.001)
+        self.assertAlmostEqual(DEFAULT_COST_MODEL.sell_cash(100, 50.0), 100 * 50.0 * 0.999)
+        self.assertEqual(DEFAULT_COST_MODEL.fill_price(1, 50.0, 100), 50.0)
+
+    def test_commission_schedule(self):
+        schedule = CommissionSchedule(rate=0.0, per_share=0.005, minimum=1.0, max_rate=0.01)
+        fees = schedule.commissions([1000.0, 100_000.0, 10.0, 0.0], [10, 1000, 100, 0])
+        np.testing.assert_allclose(fees, [1.0, 5.0, 0.1, 0.0])
+
+    def test_spread_and_impact(self):
+        model = CostModel(spread_bps=20.0, impact_coefficient=0.5)
+        prices = model.fill_prices([1, -1], [100.0, 100.0], [100, 2500], volumes=[10_000, 10_000],
+                                   ranges=[4.0, 4.0])
+        # 半个价差 10bp + 0.5 * 4% * sqrt(参与率)
+        np.testing.assert_allclose(prices, [100.0 * (1 + 0.001 + 0.002), 100.0 * (1 - 0.001 - 0.01)])
+        self.assertAlmostEqual(model.fill_price(1, 100.0, 100, 10_000, 4.0), prices[0])
+        self.assertAlmostEqual(model.fill_price(1, 100.0, 100), 100.1)   # 没有成交量时只计价差
+
+    def test_sensitivity(self):
+        model = CostModel(commission=CommissionSchedule(rate=0.0), spread_bps=10.0)
+        totals = cost_sensitivity(model, [1, -1], [100.0, 110.0], [10, 10], [0.0, 1.0, 2.0])
+        self.assertEqual(totals[0], 0.0)
+        self.assertAlmostEqual(totals[2], 2 * totals[1])
+
+
+class TestCostModelIntegration(unittest.TestCase):
+    """测试回测账户和模拟券商使用成本模型"""
+
+    def setUp(self):
+        self.prices = pd.DataFrame({
+            'date': pd.date_range('2025-01-01', periods=3),
+            'close': [100.0, 110.0, 120.0],
+            'high': [101.0, 111.0, 121.0],
+            'low': [99.0, 109.0, 119.0],
+            'volume': [10_000, 10_000, 10_000],
+        })
+        dates = self.prices['date']
+        self.signals = [(dates[0], TradeAction.BUY, 100), (dates[2], TradeAction.SELL, 100)]
+
+    def test_backtester(self):
+        flat = Backtester(initial_cash=100_000)
+        flat.run(self.prices, self.signals)
+        model = Backtester(initial_cash=100_000, cost_model=CostModel.flat(0.001))
+        model.run(self.prices, self.signals)
+        self.assertEqual(flat.account.cash, model.account.cash)
+
+        costly = Backtester(initial_cash=100_000, cost_model=CostModel(spread_bps=20.0, impact_coefficient=0.5))
+        costly.run(self.prices, self.signals)
+        buy, sell = costly.account.trades
+        self.assertGreater(buy.price, 100.0)
+        self.assertLess(sell.price, 120.0)
+        self.assertLess(costly.account.cash, flat.account.cash)
+
+    def test_mock_broker(self):
+        plan = PositionPlan(symbol='TSLA', quantity=100, action=SignalAction.SELL, rationale='r', target_price=100.0)
+        bar = PriceBar(date=dt.date(2025, 1, 1), open=100.0, high=102.0, low=98.0, close=100.0, volume=10_000)
+        self.assertEqual(MockBroker().send_order(plan).avg_price, 100.0)
+        report = MockBroker(CostModel(spread_bps=20.0)).send_order(plan, bar)
+        self.assertAlmostEqual(report.avg_price, 99.9)
+        self.assertAlmostEqual(report.commission, 100 * 99.9 * 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
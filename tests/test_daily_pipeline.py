@@ -0,0 +1,222 @@
+"""
+每日流程编排器单元测试
+"""
+import json
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.pipeline.run_daily_pipeline import (
+    DailyContext, Step, build_steps, email_step, latest_email_signal, log_data,
+    positions_step, run_steps, signals_step, sizing_step
+)
+from src.pipeline import log_strategy_execution as strategy_log
+from src.pipeline.run_daily_strategies import MultiSymbolRunner, SymbolConfig, select_configs
+from src.backtest.engine import TradeAction
+from tests.test_incremental import make_bars
+
+
+class RecordingEmailService:
+    """只记录调用的邮件服务"""
+
+    def __init__(self):
+        self.calls = []
+
+    def batch(self):
+        return nullcontext()
+
+    def send_signal_alert(self, **kwargs):
+        self.calls.append(('signal', kwargs))
+        return True
+
+    def send_daily_summary(self, **kwargs):
+        self.calls.append(('summary', kwargs))
+        return True
+
+
+class TestRunSteps(unittest.TestCase):
+    """测试依赖图调度"""
+
+    def setUp(self):
+        self.context = DailyContext(configs={}, runner=MultiSymbolRunner([]))
+
+    def test_dependencies_and_concurrency(self):
+        order = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def record(name, sync=False):
+            def func(context):
+                if sync:
+                    barrier.wait()  # 两个独立步骤必须同时运行才能通过
+                order.append(name)
+                return name
+            return func
+
+        steps = [
+            Step("a", record("a")),
+            Step("b", record("b", sync=True), ("a",)),
+            Step("c", record("c", sync=True), ("a",)),
+            Step("d", record("d"), ("b", "c")),
+        ]
+        results = run_steps(steps, self.context, max_workers=4)
+
+        self.assertEqual(order[0], "a")
+        self.assertEqual(order[-1], "d")
+        self.assertTrue(all(result.status == "done" for result in results.values()))
+        self.assertEqual(results["d"].value, "d")
+
+    def test_failure_skips_dependants(self):
+        def fail(context):
+            raise RuntimeError("boom")
+
+        def slow(context):
+            time.sleep(0.05)
+            return 1
+
+        results = run_steps([
+            Step("fail", fail),
+            Step("after", slow, ("fail",)),
+            Step("other", slow),
+        ], self.context)
+
+        self.assertEqual(results["fail"].status, "failed")
+        self.assertEqual(results["fail"].error, "boom")
+        self.assertEqual(results["after"].status, "skipped")
+        self.assertEqual(results["other"].status, "done")
+        self.assertGreaterEqual(results["other"].seconds, 0.05)
+
+    def test_missing_dependency(self):
+        with self.assertRaises(ValueError):
+            run_steps([Step("a", lambda context: None, ("nope",))], self.context)
+
+    def test_build_steps(self):
+        names = [step.name for step in build_steps(["AAA", "BBB"])]
+        self.assertEqual(names[:3], ["update:AAA", "update:BBB", "signals"])
+        self.assertIn("reports", names)
+
+        steps = {step.name: step for step in build_steps(["AAA"], update=False, logs=False, reports=False)}
+        self.assertEqual(steps["signals"].deps, ())
+        self.assertEqual(set(steps), {"signals", "positions", "sizing", "emails"})
+        self.assertEqual(steps["emails"].deps, ("signals", "positions"))
+
+
+class TestDailySteps(unittest.TestCase):
+    """测试信号、持仓、邮件步骤共享内存数据"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        bars = make_bars(200, seed=4)
+        self.data_path = self.root / "bars.csv"
+        pd.DataFrame([vars(bar) for bar in bars]).to_csv(self.data_path, index=False)
+        self.portfolio_path = self.root / "portfolio.json"
+        self.portfolio_path.write_text(json.dumps({'positions': {'AAA': {'quantity': 10, 'avg_price': 1.0}}}))
+
+        configs = [
+            SymbolConfig(symbol, 'momentum', {'volume_threshold': 1.2}, data_path=self.data_path,
+                         results_dir=self.root / symbol, log_path=self.root / symbol / "LOG.md")
+            for symbol in ("AAA", "BBB")
+        ]
+        self.email = RecordingEmailService()
+        self.context = DailyContext(
+            configs={config.symbol: config for config in configs},
+            runner=MultiSymbolRunner(configs, incremental=False),
+            now=datetime(2030, 1, 1),
+            email_service=self.email,
+            portfolio_path=self.portfolio_path,
+            targets_path=self.root / "position_targets.json",
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pipeline_shares_bars(self):
+        steps = [
+            Step("signals", signals_step),
+            Step("positions", positions_step, ("signals",)),
+            Step("emails", email_step, ("signals", "positions")),
+            Step("sizing", sizing_step, ("positions",)),
+        ]
+        results = run_steps(steps, self.context)
+
+        self.assertTrue(all(result.status == "done" for result in results.values()), results)
+        self.assertEqual(len(self.context.runner._bars), 1)   # 同一文件只读一次
+        self.assertEqual(self.context.positions["AAA"]["quantity"], 10)
+        self.assertEqual(self.context.positions["BBB"]["quantity"], 0)
+        self.assertEqual([kind for kind, _ in self.email.calls], ["summary", "summary"])
+        self.assertEqual(self.email.calls[0][1]["position_info"], self.context.positions["AAA"])
+
+        self.assertEqual(set(self.context.targets), {"AAA", "BBB"})
+        self.assertGreater(self.context.capital, 0)
+        targets = json.loads(self.context.targets_path.read_text(encoding='utf-8'))['targets']
+        self.assertEqual(targets["AAA"]["target_quantity"], self.context.targets["AAA"])
+        self.assertEqual(targets["AAA"]["current_quantity"], 10)
+        self.assertEqual(targets["AAA"]["delta"], self.context.targets["AAA"] - 10)
+
+        # 持仓文件写回一次, 现价为最新收盘价
+        saved = json.loads(self.portfolio_path.read_text())['positions']['AAA']
+        self.assertEqual(saved['current_price'], self.context.positions["AAA"]['current_price'])
+
+    def test_strategy_log_follows_symbol_config(self):
+        """日志脚本按配置读取信号和K线, 与流程中由内存结果生成的日志数据一致"""
+        run_steps([Step("signals", signals_step)], self.context)
+        config = self.context.configs["BBB"]
+
+        latest_signal, latest_price, _ = strategy_log.collect_log_data(config)
+        expected_signal, expected_price, _ = log_data(
+            self.context.runs["BBB"].signals, self.context.bars("BBB"), datetime.now()
+        )
+        self.assertEqual(latest_signal['date'], expected_signal['date'])
+        self.assertAlmostEqual(latest_price['close'], expected_price['close'])
+
+        strategy_log.log_symbol(config)
+        text = config.resolved_log_path().read_text(encoding='utf-8')
+        self.assertIn("策略类型: BBB日度策略", text)
+        self.assertIn("BBB最新收盘", text)
+        self.assertEqual(len(strategy_log.ExecutionJournal.beside(config.resolved_log_path()).last_days(1)), 1)
+        self.assertFalse((self.root / "AAA" / "LOG.md").exists())
+
+    def test_select_configs(self):
+        configs = list(self.context.configs.values())
+        self.assertEqual([c.symbol for c in select_configs(configs)], ["AAA", "BBB"])
+        self.assertEqual([c.symbol for c in select_configs(configs, ["BBB"])], ["BBB"])
+        with self.assertRaises(KeyError):
+            select_configs(configs, ["ZZZ"])
+
+
+class TestSignalHelpers(unittest.TestCase):
+    """测试由内存结果生成日志和邮件数据"""
+
+    def setUp(self):
+        self.bars = make_bars(10, seed=1)
+        self.signals = [
+            {'date': pd.Timestamp('2025-11-03'), 'action': TradeAction.BUY, 'quantity': 100,
+             'price': 10.0, 'reason': 'r1'},
+            {'date': pd.Timestamp('2025-11-13'), 'action': TradeAction.SELL, 'quantity': 100,
+             'price': 12.5, 'reason': 'r2'},
+        ]
+
+    def test_log_data(self):
+        latest_signal, latest_price, recent = log_data(self.signals, self.bars, datetime(2025, 11, 14))
+
+        self.assertEqual(latest_signal['date'], '2025-11-13')
+        self.assertEqual(latest_signal['action'], 'TradeAction.SELL')
+        self.assertEqual(latest_price['close'], self.bars[-1].close)
+        self.assertEqual(latest_price['avg_volume_5d'], int(sum(b.volume for b in self.bars[-6:-1]) / 5))
+        self.assertEqual(recent, 1)
+
+    def test_latest_email_signal(self):
+        count, latest = latest_email_signal(self.signals, datetime(2025, 11, 13, 20))
+        self.assertEqual(count, 1)
+        self.assertEqual(latest['action'], 'SELL')
+        self.assertEqual(latest_email_signal(self.signals, datetime(2025, 11, 20)), (0, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+多股票日度策略运行器单元测试
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.pipeline.run_daily_strategies import MultiSymbolRunner, SymbolConfig
+from src.pipeline.run_daily_strategy import DailyTradingStrategy
+from src.pipeline.run_daily_strategy_nvda import DailyTradingStrategyNVDA
+from tests.test_incremental import make_bars
+
+
+class TestMultiSymbolRunner(unittest.TestCase):
+    """测试多股票并行运行"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.bars = make_bars(200, seed=4)
+        self.data_path = self.root / "bars.csv"
+        pd.DataFrame([vars(bar) for bar in self.bars]).to_csv(self.data_path, index=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _config(self, symbol, strategy='momentum'):
+        return SymbolConfig(
+            symbol, strategy, {'volume_threshold': 1.2},
+            data_path=self.data_path, results_dir=self.root / symbol
+        )
+
+    def test_runs_symbols_in_parallel(self):
+        runner = MultiSymbolRunner(
+            [self._config('AAA'), self._config('BBB', 'momentum_rsi')], incremental=False
+        )
+        results = runner.run()
+
+        self.assertEqual(list(results), ['AAA', 'BBB'])
+        self.assertTrue(all(result.success for result in results.values()))
+        self.assertEqual(
+            results['AAA'].signals,
+            DailyTradingStrategy(volume_threshold=1.2).generate_signals(self.bars)
+        )
+        self.assertEqual(
+            results['BBB'].signals,
+            DailyTradingStrategyNVDA(volume_threshold=1.2).generate_signals(self.bars)
+        )
+        self.assertIn('AAA 日内交易策略回测', results['AAA'].output)
+        self.assertNotIn('BBB', results['AAA'].output)
+        self.assertTrue((self.root / 'BBB' / 'signals_daily.csv').exists())
+        self.assertEqual(len(runner._bars), 1)
+
+    def test_missing_data_is_reported(self):
+        config = SymbolConfig('CCC', data_path=self.root / 'missing.csv', results_dir=self.root / 'CCC')
+        result = MultiSymbolRunner([config]).run()['CCC']
+        self.assertFalse(result.success)
+        self.assertIn('missing.csv', result.error)
+
+    def test_unknown_symbol(self):
+        with self.assertRaises(KeyError):
+            MultiSymbolRunner([self._config('AAA')]).run(['ZZZ'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+持久化发件队列单元测试(使用本地 SMTP 测试服务器)
+"""
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from pathlib import Path
+
+from src.notification.email_config import EmailAccountConfig, EmailConfig
+from src.notification.email_outbox import EmailOutbox, OutboxSender
+from src.notification.email_service import EmailService, build_digest
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    最小 SMTP 服务器: 支持 EHLO / AUTH PLAIN / MAIL / RCPT / DATA / QUIT
+
+    fail_next: 之后 N 次 MAIL 命令返回 451 (模拟服务器不稳定)
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.messages = []
+        self.logins = 0
+        self.fail_next = 0
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def account(self, name: str = "local") -> EmailAccountConfig:
+        return EmailAccountConfig(name, f"{name}@example.com", "secret", "127.0.0.1", self.port, False, False)
+
+    def subjects(self):
+        return [str(make_header(decode_header(m['Subject']))) for m in self.messages]
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        self.reply("220 localhost ESMTP")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250 AUTH PLAIN\r\n")
+            elif command == "AUTH":
+                with server.lock:
+                    server.logins += 1
+                self.reply("235 OK")
+            elif command == "MAIL":
+                with server.lock:
+                    failing = server.fail_next > 0
+                    server.fail_next -= failing
+                self.reply("451 try again later" if failing else "250 OK")
+            elif command in ("RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                data = b""
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data += chunk
+                with server.lock:
+                    server.messages.append(message_from_bytes(data))
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 not implemented")
+
+
+class TestEmailOutbox(unittest.TestCase):
+    """测试发件箱持久化、故障转移与退避"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "email_outbox.db"
+        self.smtp = LocalSMTPServer()
+        # 第一个账户指向不存在的端口, 需切换到第二个账户
+        dead = EmailAccountConfig("dead", "dead@example.com", "x", "127.0.0.1", 1, False, False)
+        self.config = EmailConfig(recipient_email="me@example.com", accounts=[dead, self.smtp.account()])
+
+    def tearDown(self):
+        self.smtp.close()
+        self.temp_dir.cleanup()
+
+    def test_failover_and_restart(self):
+        # 进程 1: 只写入发件箱
+        outbox = EmailOutbox(self.path)
+        OutboxSender(outbox, self.config).submit("测试 1", "<p>1</p>")
+        OutboxSender(outbox, self.config).submit("测试 2", "<p>2</p>")
+        self.assertEqual(outbox.counts(), {'pending': 2})
+
+        # 进程 2: 重新打开发件箱并发送
+        sender = OutboxSender(EmailOutbox(self.path), self.config, timeout=2)
+        self.assertEqual(sender.drain(), 2)
+        self.assertEqual(self.smtp.subjects(), ["测试 1", "测试 2"])
+        self.assertEqual(EmailOutbox(self.path).get(1)['account'], "local")
+        self.assertEqual(sender.drain(), 0)
+
+    def test_backoff(self):
+        self.smtp.fail_next = 1
+        config = EmailConfig(recipient_email="me@example.com", accounts=[self.smtp.account()])
+        sender = OutboxSender(EmailOutbox(self.path), config, base_delay=10, max_attempts=3, timeout=2)
+        message_id = sender.submit("重试", "<p>r</p>")
+        start = time.time()
+        self.assertEqual(sender.drain(), 0)
+        record = sender.outbox.get(message_id)
+        self.assertEqual((record['status'], record['attempts']), ('pending', 1))
+        self.assertGreaterEqual(record['next_attempt_at'], start + 10)
+        self.assertEqual(sender.backoff(3), 40)
+        # 退避期内不重试; 到期后发送成功
+        self.assertEqual(sender.drain(), 0)
+        self.assertEqual(sender.outbox.retry_now(), 1)
+        self.assertEqual(sender.drain(), 1)
+        self.assertEqual(sender.outbox.get(message_id)['status'], 'sent')
+
+    def test_service_returns_immediately(self):
+        self.smtp.fail_next = 0
+        sender = OutboxSender(EmailOutbox(self.path), self.config, timeout=2, poll_interval=0.1)
+        service = EmailService(self.config, outbox=sender.start())
+        self.assertTrue(service.send_signal_alert("TSLA", "BUY", 100, 250.0, "测试", "2025-11-15"))
+        self.assertTrue(sender.flush(timeout=10))
+        sender.stop()
+        self.assertEqual(len(self.smtp.messages), 1)
+        self.assertIn("TSLA", self.smtp.subjects()[0])
+
+
+class TestBatchSending(unittest.TestCase):
+    """测试会话复用与汇总邮件"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.smtp = LocalSMTPServer()
+        self.config = EmailConfig(recipient_email="me@example.com", accounts=[self.smtp.account()],
+                                  use_outbox=False)
+
+    def tearDown(self):
+        self.smtp.close()
+        self.temp_dir.cleanup()
+
+    def test_outbox_batch_reuses_session(self):
+        sender = OutboxSender(EmailOutbox(Path(self.temp_dir.name) / "outbox.db"), self.config, timeout=2)
+        for symbol in ("TSLA", "NVDA", "INTC"):
+            sender.submit(f"[{symbol}策略] 日度检查", f"<p>{symbol}</p>")
+        self.assertEqual(sender.drain(), 3)
+        self.assertEqual(self.smtp.logins, 1)
+        self.assertEqual((sender.last_batch.sent, sender.last_batch.handshakes), (3, 1))
+
+    def test_sync_batch_and_digest(self):
+        service = EmailService(self.config)
+        with service.batch():
+            for symbol in ("TSLA", "NVDA"):
+                service.send_daily_summary(False, symbol=symbol)
+        self.assertEqual((len(self.smtp.messages), self.smtp.logins), (2, 1))
+
+        with service.batch(digest=True, title="汇总"):
+            for symbol in ("TSLA", "NVDA", "INTC"):
+                service.send_daily_summary(False, symbol=symbol)
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertEqual(self.smtp.subjects()[-1], "汇总 (3封)")
+
+    def test_build_digest(self):
+        page = '<html><head><style>.a {{}}</style></head><body><p>{}</p></body></html>'
+        html = build_digest([("一", page.format("x")), ("二", page.format("y"))], "汇总")
+        self.assertEqual(html.count("<style>"), 1)
+        self.assertEqual(html.count("<body>"), 1)
+        self.assertIn("<p>x</p>", html)
+        self.assertIn("2. 二", html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+邮件正文模板单元测试
+
+tests/golden/email 下的文件由模板化之前的 f-string 实现生成(发送时间固定为
+2025-11-14 16:30:05), 模板渲染必须与之逐字节一致。
+"""
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from src.notification.email_config import EmailConfig
+from src.notification.email_service import EmailService
+from src.notification.email_templates import (
+    SIGNAL_TEMPLATE, EmailTemplate, SignalContext, SummaryContext, render_signal, render_summary
+)
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "email"
+SENT_AT = datetime(2025, 11, 14, 16, 30, 5)
+
+GAIN = {'symbol': 'NVDA', 'quantity': 1200, 'avg_price': 120.5, 'current_price': 135.25,
+        'market_value': 162300.0, 'profit_loss': 17700.0, 'profit_loss_pct': 12.24}
+LOSS = {'symbol': 'TSLA', 'quantity': 50, 'avg_price': 260.0, 'current_price': 240.0,
+        'market_value': 12000.0, 'profit_loss': -1000.0, 'profit_loss_pct': -7.69}
+
+
+def golden(name: str) -> str:
+    with open(GOLDEN_DIR / f"{name}.html", 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+class TestEmailTemplates(unittest.TestCase):
+    """模板渲染与原正文一致"""
+
+    def setUp(self):
+        self.service = EmailService(EmailConfig(use_outbox=False))
+
+    def test_signal_golden(self):
+        buy = render_signal(SignalContext('TSLA', 'BUY', 1500, 245.678, 'MA5上穿MA20', '2025-11-14',
+                                          sent_at=SENT_AT))
+        sell = render_signal(SignalContext('AAPL', 'SELL', 80, 1234.5, '止损', '2025-11-13',
+                                           'AAPL日度策略', sent_at=SENT_AT))
+        self.assertEqual(buy, golden("signal_buy"))
+        self.assertEqual(sell, golden("signal_sell"))
+
+    def test_summary_golden(self):
+        build = self.service._build_summary_email_body
+        cases = {
+            'summary_error': build(False, 0, None, '数据下载失败: timeout', '日度策略', None, 'TSLA'),
+            'summary_signal': build(True, 2, {'action': 'SELL', 'quantity': 3000, 'date': '2025-11-14'},
+                                    None, '周度策略', None, 'NVDA'),
+            'summary_position_gain': build(False, 0, None, '基本面快照\nPE: 35.2\nPB: 12.1', '日度策略', GAIN, 'TSLA'),
+            'summary_position_loss': build(False, 0, None, None, '周度策略', LOSS, 'TSLA'),
+            'summary_empty': build(False, 0, None, None, '日度策略', {'quantity': 0}, 'AMD'),
+        }
+        for name, html in cases.items():
+            with self.subTest(name=name):
+                self.assertEqual(html, golden(name))
+
+    def test_service_signal_body(self):
+        html = self.service._build_signal_email_body('TSLA', 'BUY', 1500, 245.678, 'MA5上穿MA20', '2025-11-14')
+        expected = golden("signal_buy").split("📅 发送时间: ")[0]
+        self.assertTrue(html.startswith(expected))
+
+    def test_stylesheet_compiled_once(self):
+        first = SIGNAL_TEMPLATE.compile("#00AA00")
+        self.assertIs(SIGNAL_TEMPLATE.compile("#00AA00"), first)
+        self.assertIsNot(SIGNAL_TEMPLATE.compile("#FF0000"), first)
+        sell = render_signal(SignalContext('TSLA', 'SELL', 1, 1.0, 'r', '2025-11-14', sent_at=SENT_AT))
+        self.assertIn("border-left: 4px solid #FF0000;", sell)
+
+    def test_field_names_need_not_be_identifiers(self):
+        template = EmailTemplate(None, "<p>{user-name}: {total:,.2f}</p>")
+        self.assertEqual(template.render(**{'user-name': 'TSLA', 'total': 1234.5}), "<p>TSLA: 1,234.50</p>")
+        with self.assertRaises(TypeError):
+            template.render(total=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
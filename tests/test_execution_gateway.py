@@ -0,0 +1,128 @@
+"""
+异步下单网关单元测试
+"""
+import asyncio
+import datetime as dt
+import unittest
+
+from src.data.loader import PriceBar
+from src.execution.gateway import (
+    ExecutionGateway, Fill, InvalidTransition, Order, OrderStatus, SimulatedBroker
+)
+from src.portfolio.allocator import PositionPlan
+from src.signals.momentum import TradeAction
+
+BAR = PriceBar(date=dt.date(2025, 11, 14), open=100.0, high=102.0, low=98.0, close=100.0, volume=10_000)
+
+
+def plan(symbol: str, quantity: int, action: TradeAction = TradeAction.BUY) -> PositionPlan:
+    return PositionPlan(symbol=symbol, quantity=quantity, action=action, rationale="test", target_price=100.0)
+
+
+class FailingBroker:
+    """第一笔成交后报错的券商"""
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def execute(self, order):
+        yield Fill(order.order_id, order.symbol, 1, 100.0, 0.0)
+        raise ConnectionError("disconnected")
+
+    async def cancel(self, order):
+        self.cancelled.append(order.order_id)
+
+
+class SteadyBroker(FailingBroker):
+    """分两笔全部成交的券商"""
+
+    async def execute(self, order):
+        for quantity in (order.remaining // 2, order.remaining - order.remaining // 2):
+            yield Fill(order.order_id, order.symbol, quantity, 100.0, 0.0)
+
+
+class TestOrderState(unittest.TestCase):
+    """测试订单状态机"""
+
+    def test_transitions(self):
+        order = Order("1", plan("AAA", 10), 0.0)
+        order.apply_fill(Fill("1", "AAA", 4, 10.0, 1.0))
+        self.assertEqual(order.status, OrderStatus.PARTIAL)
+        order.apply_fill(Fill("1", "AAA", 6, 20.0, 2.0))
+        self.assertEqual(order.status, OrderStatus.FILLED)
+        self.assertAlmostEqual(order.avg_price, 16.0)
+        self.assertEqual(order.latency, 2.0)
+        with self.assertRaises(InvalidTransition):
+            order.transition(OrderStatus.CANCELLED)
+        with self.assertRaises(ValueError):
+            Order("2", plan("AAA", 1), 0.0).apply_fill(Fill("2", "AAA", 2, 1.0, 0.0))
+
+
+class TestExecutionGateway(unittest.TestCase):
+    """测试并发提交、部分成交、撤单和回调"""
+
+    def test_concurrent_fills_and_callbacks(self):
+        seen = []
+
+        async def on_fill(order, fill):
+            seen.append((order.symbol, fill.quantity))
+
+        async def scenario():
+            broker = SimulatedBroker({"AAA": BAR, "BBB": BAR}, latency=0.05, slices=2, participation=0.1)
+            gateway = ExecutionGateway(broker, on_fill=[on_fill])
+            orders = await gateway.submit_many([plan("AAA", 300), plan("BBB", 3000, TradeAction.SELL)])
+            return gateway, orders
+
+        gateway, (buy, sell) = asyncio.run(scenario())
+
+        # 两笔订单的延迟重叠: 都已提交后才有第一笔成交
+        self.assertLess(max(buy.submitted_at, sell.submitted_at),
+                        min(buy.fills[0].timestamp, sell.fills[0].timestamp))
+        self.assertEqual(buy.status, OrderStatus.FILLED)
+        self.assertEqual([fill.quantity for fill in buy.fills], [300])
+        self.assertTrue(BAR.close < buy.avg_price <= BAR.high)
+        # 每笔最多 10000 * 0.1 / 2 = 500 股, 剩余撤销
+        self.assertEqual(sell.status, OrderStatus.CANCELLED)
+        self.assertEqual(sell.filled_quantity, 1000)
+        self.assertTrue(BAR.low <= sell.avg_price < BAR.close)
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(gateway.latency_stats()["orders"], 2)
+
+    def test_cancel_and_failures(self):
+        async def scenario():
+            gateway = ExecutionGateway(SimulatedBroker({"AAA": BAR}, latency=1.0))
+            pending = await gateway.submit(plan("AAA", 10))
+            missing = await gateway.submit(plan("ZZZ", 10))
+            await asyncio.sleep(0)
+            await gateway.cancel(pending.order_id)
+            failing = ExecutionGateway(FailingBroker())
+            partial = await failing.submit(plan("AAA", 10))
+            await failing.wait()
+            await gateway.wait()
+            return pending, missing, partial, failing.broker
+
+        pending, missing, partial, broker = asyncio.run(scenario())
+        self.assertEqual(pending.status, OrderStatus.CANCELLED)
+        self.assertEqual(missing.status, OrderStatus.REJECTED)
+        self.assertEqual(partial.status, OrderStatus.CANCELLED)
+        self.assertEqual(partial.filled_quantity, 1)
+        self.assertEqual(partial.message, "disconnected")
+        self.assertEqual(broker.cancelled, [partial.order_id])     # 剩余部分在券商处撤销
+
+    def test_callback_error_does_not_cancel_order(self):
+        def broken(order, fill):
+            raise RuntimeError("callback bug")
+
+        async def scenario():
+            gateway = ExecutionGateway(SteadyBroker(), on_fill=[broken])
+            return await gateway.submit_many([plan("AAA", 10)]), gateway.broker
+
+        with self.assertLogs("execution-gateway", level="ERROR"):
+            (order,), broker = asyncio.run(scenario())
+        self.assertEqual(order.status, OrderStatus.FILLED)
+        self.assertEqual(order.filled_quantity, 10)
+        self.assertEqual(broker.cancelled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
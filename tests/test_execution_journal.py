@@ -0,0 +1,124 @@
+"""
+结构化策略执行日志单元测试
+"""
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.analysis.execution_journal import ExecutionJournal, make_log_record
+from src.pipeline.weekly_strategy_review import load_recent_entries, parse_log_entries
+
+
+class TestExecutionJournal(unittest.TestCase):
+    """测试按时间索引的 JSON Lines 日志"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        # 小块读取, 覆盖跨块拼接的情况
+        self.journal = ExecutionJournal(self.root / "STRATEGY_EXECUTION_LOG.jsonl", block_size=64)
+        self.start = datetime(2025, 1, 1)
+        for i in range(60):
+            self.journal.append({"date": (self.start + timedelta(days=i)).strftime('%Y-%m-%d'),
+                                 "close": 100.0 + i, "signal_reason": "动量突破"})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_last_days(self):
+        now = self.start + timedelta(days=59, hours=20)
+        records = self.journal.last_days(7, now=now)
+        self.assertEqual([r["close"] for r in records], [153.0, 154.0, 155.0, 156.0, 157.0, 158.0, 159.0])
+        self.assertEqual(len(self.journal.last_days(1000, now=now)), 60)
+        self.assertEqual(ExecutionJournal(self.root / "missing.jsonl").last_days(7), [])
+
+    def test_make_log_record(self):
+        record = make_log_record(
+            "TSLA", "日度策略",
+            {'date': '2025-11-10', 'action': 'BUY', 'quantity': 100, 'price': 400.0, 'reason': '动量突破'},
+            {'date': '2025-11-14', 'close': 420.0, 'volume': 1000, 'avg_volume_5d': 900, 'price_change': 1.5},
+            2, now=datetime(2025, 11, 14, 22, 3)
+        )
+        self.assertEqual(record["date"], "2025-11-14")
+        self.assertEqual(record["time"], "22:03")
+        self.assertAlmostEqual(record["price_gap"], 20.0)
+        self.assertAlmostEqual(record["price_gap_pct"], 5.0)
+        self.assertEqual(make_log_record("TSLA", "日度策略", None, None, 0)["signal_date"], "无历史信号")
+
+    def test_no_signal_record_matches_markdown(self):
+        """无信号时的记录字段与解析 Markdown 日志得到的一致"""
+        content = """### 2025-11-14 (周五)
+
+**信号情况**:
+- 最新信号日期: 无历史信号
+- 信号类型: N/A
+- 信号价格: N/A
+"""
+        parsed = parse_log_entries(content, days=None)[0]
+        record = make_log_record("TSLA", "日度策略", None, None, 0)
+        for key in ('signal_date', 'signal_action'):
+            self.assertEqual(record[key], parsed[key])
+
+
+class TestWeeklyReviewEntries(unittest.TestCase):
+    """测试周回顾从结构化日志读取, 并从 Markdown 导入历史"""
+
+    @staticmethod
+    def markdown_entry(day: datetime, close: float) -> str:
+        return f"""
+### {day.strftime('%Y-%m-%d')} (周一)
+
+**市场状态**:
+- TSLA最新收盘: ${close:.2f}
+
+**信号情况**:
+- 最新信号日期: 2025-10-24
+- 信号类型: BUY
+- 信号价格: $433.72
+- 近7天信号数: 1
+
+**回顾分析**:
+- 价差: $-31.73 (-7.32%)
+
+---
+"""
+
+    def test_backfill_matches_markdown(self):
+        content = "# 📊 策略执行日志\n" + self.markdown_entry(datetime.now(), 401.99) + "\n## 📝 记录模板\n"
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "STRATEGY_EXECUTION_LOG.md"
+            log_file.write_text(content, encoding='utf-8')
+            entries = load_recent_entries(log_file, days=7)
+            self.assertTrue(ExecutionJournal.beside(log_file).exists())
+
+        expected = parse_log_entries(content, days=7)
+        self.assertEqual(len(entries), 1)
+        for key in ('date', 'close', 'signal_date', 'signal_action', 'signal_price',
+                    'signal_count_7d', 'price_gap', 'price_gap_pct'):
+            self.assertEqual(entries[0][key], expected[0][key])
+
+    def test_daily_append_then_weekly_read_keeps_history(self):
+        """日度脚本先写 Markdown 再首次追加结构化记录, 周回顾仍能读到之前的历史"""
+        now = datetime.now()
+        history = [now - timedelta(days=3), now - timedelta(days=1)]
+        content = "# 📊 策略执行日志\n" + "".join(
+            self.markdown_entry(day, 400.0 + i) for i, day in enumerate(history)
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_file = Path(temp_dir) / "STRATEGY_EXECUTION_LOG.md"
+            # 本次运行: 先把今天的条目写进 Markdown, 再追加结构化记录
+            log_file.write_text(content + self.markdown_entry(now, 410.0), encoding='utf-8')
+            ExecutionJournal.beside(log_file).append(make_log_record(
+                "TSLA", "日度策略", None,
+                {'date': now.strftime('%Y-%m-%d'), 'close': 410.0, 'volume': 1000,
+                 'avg_volume_5d': 900, 'price_change': 1.0},
+                0, now=now
+            ))
+            entries = load_recent_entries(log_file, days=7)
+
+        self.assertEqual([entry['close'] for entry in entries], [400.0, 401.0, 410.0])
+        self.assertEqual(entries[-1]['signal_action'], 'N/A')
+
+if __name__ == '__main__':
+    unittest.main()
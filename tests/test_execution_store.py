@@ -0,0 +1,144 @@
+"""
+执行记录存储与策略分析器单元测试
+"""
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.analysis.execution_store import ExecutionRecordStore
+from src.analysis.strategy_analyzer import StrategyAnalyzer
+
+
+class TestExecutionRecordStore(unittest.TestCase):
+    """测试只追加的执行记录表"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.store = ExecutionRecordStore(self.root / "records.db", "TSLA")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_range_query_by_day_and_type(self):
+        for day, strategy_type in [("2025-11-03", "daily"), ("2025-11-05", "weekly"),
+                                   ("2025-11-07", "daily"), ("2025-11-12", "daily")]:
+            self.store.append({"timestamp": f"{day}T16:30:00", "strategy_type": strategy_type,
+                               "signals_count": 10, "new_signals_count": 1})
+
+        records = self.store.query("2025-11-03", "2025-11-09", strategy_type="daily")
+        self.assertEqual([r["timestamp"][:10] for r in records], ["2025-11-03", "2025-11-07"])
+        self.assertEqual(len(self.store.query("2025-11-03", "2025-11-09")), 3)
+        self.assertEqual(self.store.summarize("2025-11-01", "2025-11-30", "daily")["new_signals"], 3)
+        self.assertEqual(len(self.store), 4)
+
+    def test_concurrent_appends_are_not_lost(self):
+        def worker(n):
+            for i in range(20):
+                self.store.append({"strategy_type": "daily", "signals_count": n * 100 + i})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.store), 80)
+
+    def test_concurrent_first_use_from_separate_instances(self):
+        """多个实例同时首次打开同一个新数据库(WAL 切换竞争)也不丢记录"""
+        path = self.root / "fresh.db"
+
+        def worker(n):
+            store = ExecutionRecordStore(path, "TSLA")
+            for i in range(5):
+                store.append({"strategy_type": "daily", "signals_count": n * 100 + i})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(ExecutionRecordStore(path, "TSLA")), 40)
+
+    def test_imports_legacy_json_once(self):
+        legacy = self.root / "strategy_execution_records.json"
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({"symbol": "TSLA", "executions": [
+                {"timestamp": "2025-11-10T09:00:00", "strategy_type": "daily", "signals_count": 5}
+            ]}, f)
+        store = ExecutionRecordStore(self.root / "migrated.db", "TSLA", legacy_json=legacy)
+        store.append({"strategy_type": "daily"})
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store.query(end="2025-11-10")[0]["signals_count"], 5)
+
+    def test_reads_legacy_json_before_first_append(self):
+        """升级后尚未追加新记录时, 读取也能看到旧 JSON 中的记录"""
+        legacy = self.root / "strategy_execution_records.json"
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({"symbol": "TSLA", "executions": [
+                {"timestamp": "2025-11-10T09:00:00", "strategy_type": "daily", "new_signals_count": 2}
+            ]}, f)
+        store = ExecutionRecordStore(self.root / "upgraded.db", "TSLA", legacy_json=legacy)
+        self.assertEqual(store.summarize()["runs"], 1)
+        self.assertEqual(store.summarize()["new_signals"], 2)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.query(strategy_type="daily")[0]["timestamp"], "2025-11-10T09:00:00")
+        store.append({"strategy_type": "daily"})
+        self.assertEqual(len(store), 2)
+
+    def test_missing_store_is_empty(self):
+        self.assertEqual(self.store.query(), [])
+        self.assertEqual(self.store.summarize()["runs"], 0)
+        self.assertFalse(self.store.path.exists())
+
+
+class TestStrategyAnalyzerRanges(unittest.TestCase):
+    """测试周度/月度分析的日期范围查询"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for strategy_type in ("daily", "weekly"):
+            results_dir = self.root / "backtest_results" / strategy_type
+            results_dir.mkdir(parents=True)
+            pd.DataFrame({
+                "date": ["2025-10-31", "2025-11-03", "2025-11-05", "2025-11-10"],
+                "action": ["BUY", "SELL", "BUY", "SELL"],
+            }).to_csv(results_dir / f"signals_{strategy_type}.csv", index=False)
+            pd.DataFrame({
+                "entry_date": ["2025-10-31", "2025-11-05"],
+                "exit_date": ["2025-11-03", "2025-11-10"],
+                "profit": [120.0, -40.0],
+            }).to_csv(results_dir / f"trades_{strategy_type}.csv", index=False)
+        self.analyzer = StrategyAnalyzer("TEST", data_dir=self.root)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_week_and_month(self):
+        self.analyzer.record_execution("daily", 4, 1)
+        week = self.analyzer.analyze_week("2025-11-03")
+        self.assertEqual(week["daily_strategy"]["signals_count"], 2)
+        self.assertEqual(week["daily_strategy"]["sell_signals"], 1)
+        self.assertEqual(week["weekly_strategy"]["trades_count"], 1)
+        self.assertEqual(week["daily_strategy"]["total_profit"], -40.0)
+
+        month = self.analyzer.analyze_month(2025, 11)
+        self.assertEqual(month["daily_strategy"]["signals_count"], 3)
+        self.assertEqual(month["daily_strategy"]["losing_trades"], 1)
+        self.assertEqual(month["executions"]["daily"]["runs"], 0)
+
+    def test_reloads_changed_files(self):
+        self.assertEqual(self.analyzer.analyze_month(2025, 11)["daily_strategy"]["signals_count"], 3)
+        path = self.root / "backtest_results" / "daily" / "signals_daily.csv"
+        pd.DataFrame({"date": ["2025-11-20"], "action": ["BUY"]}).to_csv(path, index=False)
+        self.analyzer._frames[path] = (0, self.analyzer._frames[path][1])
+        self.assertEqual(self.analyzer.analyze_month(2025, 11)["daily_strategy"]["signals_count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
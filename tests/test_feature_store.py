@@ -0,0 +1,58 @@
+"""
+特征缓存单元测试
+"""
+import dataclasses
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.data.feature_store import FeatureStore, bars_to_columns
+from tests.test_incremental import make_bars
+
+
+class TestFeatureStore(unittest.TestCase):
+    """测试特征缓存"""
+
+    def setUp(self):
+        self.bars = make_bars(120)
+        self.store = FeatureStore()
+
+    def test_matches_window_mean(self):
+        features = self.store.for_bars("TSLA", self.bars)
+        closes = [bar.close for bar in self.bars]
+        volumes = [bar.volume for bar in self.bars]
+        self.assertEqual(features.sma(20)[50], np.mean(closes[31:51]))
+        self.assertEqual(features.prior_mean(20)[50], np.mean(volumes[30:50]))
+        self.assertEqual(features.momentum(5)[50], (closes[50] - closes[45]) / closes[45])
+        self.assertTrue(np.isnan(features.sma(20)[18]))
+
+    def test_computed_once_and_read_only(self):
+        features = self.store.for_bars("TSLA", self.bars)
+        first = features.sma(10)
+        self.assertIs(self.store.for_bars("TSLA", list(self.bars)), features)
+        self.assertIs(features.sma(10), first)
+        self.assertEqual((features.misses, features.hits), (1, 1))
+        with self.assertRaises(ValueError):
+            first[0] = 1.0
+
+    def test_data_change_creates_new_version(self):
+        features = self.store.for_bars("TSLA", self.bars)
+        changed = list(self.bars)
+        changed[-1] = dataclasses.replace(changed[-1], close=changed[-1].close + 1)
+        updated = self.store.for_bars("TSLA", changed)
+        self.assertNotEqual(updated.version, features.version)
+        self.assertEqual(len(self.store.versions("TSLA")), 2)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            expected = FeatureStore(Path(cache_dir)).for_bars("TSLA", self.bars).sma(20)
+            features = FeatureStore(Path(cache_dir)).for_columns("TSLA", bars_to_columns(self.bars))
+            loaded = features.sma(20)
+            self.assertEqual((features.misses, features.hits), (0, 1))
+            np.testing.assert_array_equal(loaded, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
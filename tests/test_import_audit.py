@@ -0,0 +1,43 @@
+"""
+入口脚本导入耗时审计单元测试
+"""
+import unittest
+
+from src.pipeline.import_audit import ImportProfile, audit, parse_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      3000 |       3500 |     yfinance.base
+import time:      1000 |       4500 |   yfinance
+import time:       200 |       4820 | src.pipeline.demo
+"""
+
+
+class TestParseImporttime(unittest.TestCase):
+    """测试 -X importtime 输出解析"""
+
+    def test_parse(self):
+        entries = parse_importtime(SAMPLE)
+        self.assertEqual([entry.name for entry in entries], ["_io", "yfinance.base", "yfinance", "src.pipeline.demo"])
+        self.assertEqual(entries[1].depth, 2)
+        self.assertEqual(entries[1].package, "yfinance")
+
+        profile = ImportProfile("src.pipeline.demo", 0.1, entries)
+        self.assertAlmostEqual(profile.import_seconds, 0.00482)
+        self.assertEqual(profile.top(1)[0].name, "yfinance.base")
+        self.assertAlmostEqual(profile.heavy()["yfinance"], 0.004)
+
+
+class TestLazyImports(unittest.TestCase):
+    """入口模块不应在导入时加载重量级依赖"""
+
+    def test_pipeline_entry_points(self):
+        for module in ("src.pipeline.run_daily_pipeline", "src.pipeline.run_daily_check_email"):
+            with self.subTest(module=module):
+                profile = audit(module)
+                self.assertIsNone(profile.error)
+                self.assertEqual(profile.heavy(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+断点续跑单元测试
+"""
+import dataclasses
+import datetime as dt
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.backtest.costs import CostModel
+from src.backtest.engine import Backtester
+from src.data.loader import PriceBar
+from src.pipeline.incremental import IncrementalStrategyRunner, bars_to_frame
+from src.pipeline.run_daily_strategy import DailyTradingStrategy
+
+
+def make_bars(n: int = 160, seed: int = 5):
+    """随机游走K线, 带随机放量"""
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0.002, 0.03, n))
+    volumes = rng.integers(800_000, 1_200_000, n) * np.where(rng.random(n) < 0.2, 2, 1)
+    start = dt.date(2024, 1, 1)
+    return [
+        PriceBar(
+            date=start + dt.timedelta(days=i),
+            open=float(c), high=float(c) * 1.01, low=float(c) * 0.99,
+            close=float(c), volume=int(v)
+        )
+        for i, (c, v) in enumerate(zip(closes, volumes))
+    ]
+
+
+class TestIncrementalRunner(unittest.TestCase):
+    """测试续跑结果与全量回放一致"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint = Path(self.temp_dir.name) / "checkpoint.json"
+        self.bars = make_bars()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _runner(self):
+        return IncrementalStrategyRunner(DailyTradingStrategy(volume_threshold=1.2), self.checkpoint)
+
+    def test_incremental_matches_full_replay(self):
+        strategy = DailyTradingStrategy(volume_threshold=1.2)
+        full_signals = strategy.generate_signals(self.bars)
+        backtester = Backtester()
+        full_metrics = backtester.run(
+            bars_to_frame(self.bars),
+            [(s['date'], s['action'], s['quantity']) for s in full_signals]
+        )
+        self.assertGreater(len(full_signals), 0)
+
+        self.assertEqual(self._runner().run(self.bars[:100], Backtester())['mode'], 'full')
+        for cut in (130, 131, len(self.bars)):
+            result = self._runner().run(self.bars[:cut], Backtester())
+            self.assertEqual(result['mode'], 'incremental')
+
+        self.assertEqual(result['signals'], full_signals)
+        self.assertEqual(result['metrics'], full_metrics)
+        np.testing.assert_array_equal(
+            result['backtester'].get_equity_curve()['equity'].values,
+            backtester.get_equity_curve()['equity'].values
+        )
+
+    def test_history_change_forces_full_replay(self):
+        self._runner().run(self.bars[:100], Backtester())
+        changed = list(self.bars)
+        changed[10] = dataclasses.replace(changed[10], close=changed[10].close + 1)
+
+        result = self._runner().run(changed, Backtester())
+
+        self.assertEqual(result['mode'], 'full')
+        self.assertEqual(result['new_bars'], len(changed))
+
+    def test_cost_model_change_forces_full_replay(self):
+        """成本模型变化后不能沿用检查点中按旧成本计算的现金和成交"""
+        self._runner().run(self.bars[:100], Backtester())
+
+        costly = CostModel.flat(0.005)
+        strategy = DailyTradingStrategy(volume_threshold=1.2, cost_model=costly)
+        runner = IncrementalStrategyRunner(strategy, self.checkpoint)
+        result = runner.run(self.bars, Backtester(cost_model=costly))
+        self.assertEqual(result['mode'], 'full')
+
+        full_signals = strategy.generate_signals(self.bars)
+        backtester = Backtester(cost_model=costly)
+        full_metrics = backtester.run(
+            bars_to_frame(self.bars),
+            [(s['date'], s['action'], s['quantity']) for s in full_signals]
+        )
+        self.assertEqual(result['signals'], full_signals)
+        self.assertEqual(result['metrics'], full_metrics)
+
+        again = IncrementalStrategyRunner(DailyTradingStrategy(volume_threshold=1.2, cost_model=costly),
+                                          self.checkpoint).run(self.bars, Backtester(cost_model=costly))
+        self.assertEqual(again['mode'], 'incremental')
+        self.assertEqual(self._runner().run(self.bars, Backtester())['mode'], 'full')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+增量技术指标单元测试
+"""
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.engine import Backtester
+from src.pipeline.incremental import IncrementalStrategyRunner
+from src.pipeline.run_daily_strategy_nvda import DailyTradingStrategyNVDA
+from src.utils.technical_indicators import ATRUpdater, BollingerUpdater, IndicatorEngine, TechnicalIndicators
+from tests.test_incremental import make_bars
+
+
+def make_prices(n: int = 400, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, n))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    return high, low, close
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    """测试批量路径、增量路径与 pandas 实现一致"""
+
+    def setUp(self):
+        self.high, self.low, self.close = make_prices()
+        self.batch = IndicatorEngine.default().compute(self.high, self.low, self.close)
+
+    def test_incremental_matches_batch(self):
+        engine = IndicatorEngine.default()
+        rows = [engine.update(h, l, c) for h, l, c in zip(self.high, self.low, self.close)]
+        for name, values in self.batch.items():
+            np.testing.assert_array_equal(np.array([row[name] for row in rows]), values)
+
+    def test_resume_from_serialized_state(self):
+        engine = IndicatorEngine.default()
+        head = engine.compute(self.high[:150], self.low[:150], self.close[:150])
+        engine = IndicatorEngine.from_state(json.loads(json.dumps(engine.to_state())))
+        tail = engine.compute(self.high[150:], self.low[150:], self.close[150:])
+        for name, values in self.batch.items():
+            np.testing.assert_array_equal(np.concatenate([head[name], tail[name]]), values)
+
+    def test_matches_pandas(self):
+        high, low, close = pd.Series(self.high), pd.Series(self.low), pd.Series(self.close)
+        np.testing.assert_allclose(self.batch['rsi'], TechnicalIndicators.calculate_rsi(close))
+        np.testing.assert_allclose(self.batch['atr'], TechnicalIndicators.calculate_atr(high, low, close))
+        for values, name in zip(TechnicalIndicators.calculate_macd(close), ('macd', 'macd_signal', 'macd_hist')):
+            np.testing.assert_allclose(self.batch[name], values)
+        for values, name in zip(TechnicalIndicators.calculate_bollinger_bands(close),
+                                ('bb_upper', 'bb_middle', 'bb_lower')):
+            np.testing.assert_allclose(self.batch[name], values, rtol=1e-10)
+
+    def test_long_history_precision(self):
+        """价格跨越多个数量级时, 分块累加的窗口值仍与逐窗口直接计算一致"""
+        high, low, close = make_prices(20000, seed=1)
+        self.assertLess(close.min() / close.max(), 1e-3)
+        batch = IndicatorEngine.default().compute(high, low, close)
+
+        prev_close = np.concatenate([[np.nan], close[:-1]])
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        windows = np.lib.stride_tricks.sliding_window_view(true_range, 14)
+        np.testing.assert_allclose(batch['atr'][13:], windows.mean(axis=1), rtol=1e-12)
+        windows = np.lib.stride_tricks.sliding_window_view(close, 20)
+        np.testing.assert_allclose(batch['bb_middle'][19:], windows.mean(axis=1), rtol=1e-12)
+        np.testing.assert_allclose((batch['bb_upper'] - batch['bb_middle'])[19:] / 2,
+                                   windows.std(axis=1, ddof=1), rtol=1e-9)
+
+    def test_loads_legacy_window_state(self):
+        """旧格式状态(保存窗口内的原始值)仍可续跑"""
+        prev_close = np.concatenate([[np.nan], self.close[:-1]])
+        true_range = np.fmax(self.high - self.low,
+                             np.fmax(np.abs(self.high - prev_close), np.abs(self.low - prev_close)))
+        atr = ATRUpdater.from_state({
+            'kind': 'atr', 'period': 14, 'prev_close': float(self.close[149]),
+            'ranges': true_range[136:150].tolist(),
+        })
+        bollinger = BollingerUpdater.from_state({
+            'kind': 'bollinger', 'period': 20, 'std_dev': 2, 'closes': self.close[130:150].tolist(),
+        })
+        np.testing.assert_allclose(atr.compute(self.high[150:], self.low[150:], self.close[150:]),
+                                   self.batch['atr'][150:])
+        for values, name in zip(bollinger.compute(self.close[150:]), ('bb_upper', 'bb_middle', 'bb_lower')):
+            np.testing.assert_allclose(values, self.batch[name][150:])
+
+
+class TestNVDAIndicatorResume(unittest.TestCase):
+    """测试 NVDA 策略续跑时只推进新增K线的指标"""
+
+    def test_resume_matches_full_replay(self):
+        bars = make_bars(200, seed=8)
+        strategy = DailyTradingStrategyNVDA(use_atr_stop=True)
+        expected = strategy.generate_signals(bars)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            checkpoint = Path(temp_dir) / "checkpoint.json"
+            IncrementalStrategyRunner(strategy, checkpoint).run(bars[:120], Backtester())
+            result = IncrementalStrategyRunner(strategy, checkpoint).run(bars, Backtester())
+
+        self.assertEqual(result['mode'], 'incremental')
+        self.assertEqual(result['signals'], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
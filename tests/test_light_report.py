@@ -0,0 +1,68 @@
+"""
+轻量 HTML 报告渲染单元测试
+"""
+import json
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from src.visualization.light_report import (
+    ChartCache, compact_figure, downsample_indices, frame_fingerprint, render_charts
+)
+
+
+class TestCompactFigure(unittest.TestCase):
+    """测试降采样与预分箱"""
+
+    def test_downsample_keeps_extremes(self):
+        y = np.sin(np.linspace(0, 20, 5000))
+        y[1234] = 5.0
+        y[4321] = -5.0
+        index = downsample_indices(y, max_points=100)
+        self.assertLessEqual(len(index), 102)
+        for position in (0, 1234, 4321, 4999):
+            self.assertIn(position, index)
+        np.testing.assert_array_equal(downsample_indices(y[:50], 100), np.arange(50))
+
+    def test_compact_figure(self):
+        dates = pd.date_range('2020-01-01', periods=2000)
+        fig = go.Figure([
+            go.Scatter(x=dates, y=np.arange(2000.0), mode='lines', name='equity'),
+            go.Histogram(x=np.random.default_rng(0).normal(size=10000), nbinsx=30, name='mc'),
+        ])
+        compact = compact_figure(fig, max_points=200)
+        line, bars = compact['data']
+        self.assertLessEqual(len(line['x']), 202)
+        self.assertEqual(line['x'][0], '2020-01-01')
+        self.assertEqual(bars['type'], 'bar')
+        self.assertIsNone(compact_figure(None))
+
+    def test_render_shares_template(self):
+        compact = compact_figure(go.Figure(go.Scatter(x=[1, 2], y=[3, 4])))
+        divs, script = render_charts([("a", compact), ("b", compact), ("c", None)])
+        self.assertEqual(list(divs), ["a", "b"])
+        self.assertEqual(script.count(json.dumps(compact['template'], separators=(',', ':'))[:40]), 1)
+
+
+class TestChartCache(unittest.TestCase):
+    """测试按输入哈希缓存图表"""
+
+    def test_hit_and_miss(self):
+        frame = pd.DataFrame({'a': [1, 2, 3]})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ChartCache(temp_dir)
+            build = lambda: {'data': [1], 'layout': {}, 'template': None}
+            key = frame_fingerprint(frame, 'daily')
+            cache.get_or_build('equity', key, build)
+            self.assertEqual(cache.get_or_build('equity', key, build), build())
+            changed = frame_fingerprint(frame.assign(a=[1, 2, 4]), 'daily')
+            self.assertNotEqual(changed, key)
+            cache.get_or_build('equity', changed, build)
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+绩效指标内核单元测试
+"""
+import unittest
+import numpy as np
+import pandas as pd
+
+from src.backtest.metrics import (
+    compute_performance, match_fifo, max_drawdown, rolling_sharpe,
+    sharpe_ratio, simple_returns, SIDE_BUY, SIDE_SELL
+)
+
+
+class TestFifoMatching(unittest.TestCase):
+    """测试FIFO配对"""
+
+    def test_scaled_in_position(self):
+        """分批建仓后一次平仓, 应按两个批次分别计算成本"""
+        pnls = match_fifo(
+            sides=np.array([SIDE_BUY, SIDE_BUY, SIDE_SELL]),
+            quantities=np.array([10.0, 10.0, 20.0]),
+            prices=np.array([100.0, 110.0, 120.0]),
+            commissions=np.zeros(3)
+        )
+        self.assertEqual(len(pnls), 1)
+        self.assertAlmostEqual(pnls[0], 20 * 10 + 10 * 10)
+
+    def test_partial_exit_consumes_oldest_lot(self):
+        """部分平仓先消耗最早的批次, 佣金按数量分摊"""
+        pnls = match_fifo(
+            sides=np.array([SIDE_BUY, SIDE_BUY, SIDE_SELL, SIDE_SELL]),
+            quantities=np.array([10.0, 10.0, 5.0, 15.0]),
+            prices=np.array([100.0, 110.0, 120.0, 130.0]),
+            commissions=np.array([10.0, 10.0, 0.0, 0.0])
+        )
+        self.assertAlmostEqual(pnls[0], 5 * 20 - 5.0)
+        self.assertAlmostEqual(pnls[1], 5 * 30 + 10 * 20 - 5.0 - 10.0)
+
+    def test_symbols_matched_separately(self):
+        """不同股票代码分别配对"""
+        pnls = match_fifo(
+            sides=np.array([SIDE_BUY, SIDE_BUY, SIDE_SELL]),
+            quantities=np.array([10.0, 10.0, 10.0]),
+            prices=np.array([100.0, 50.0, 60.0]),
+            commissions=np.zeros(3),
+            symbols=["TSLA", "NVDA", "NVDA"]
+        )
+        self.assertAlmostEqual(pnls[0], 100.0)
+
+
+class TestRiskMetrics(unittest.TestCase):
+    """测试风险指标与 pandas 实现一致"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.equity = 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 300))
+
+    def test_max_drawdown(self):
+        series = pd.Series(self.equity)
+        expected = abs(((series - series.cummax()) / series.cummax()).min())
+        self.assertAlmostEqual(max_drawdown(self.equity), expected)
+
+    def test_sharpe_matches_pandas(self):
+        returns = pd.Series(self.equity).pct_change().dropna()
+        expected = np.sqrt(252) * (returns - 0.02 / 252).mean() / returns.std()
+        self.assertAlmostEqual(sharpe_ratio(simple_returns(self.equity)), expected)
+
+    def test_rolling_sharpe_matches_pandas(self):
+        returns = simple_returns(self.equity)
+        series = pd.Series(returns)
+        roll = series.rolling(20)
+        expected = np.sqrt(252) * (roll.mean() - 0.02 / 252) / roll.std()
+        result = rolling_sharpe(returns, window=20)
+        self.assertTrue(np.isnan(result[:19]).all())
+        np.testing.assert_allclose(result[19:], expected.values[19:], rtol=1e-6)
+
+    def test_compute_performance_without_trades(self):
+        stats = compute_performance(np.full(10, 1000.0), initial_cash=1000.0, years=1.0)
+        self.assertEqual(stats.total_return, 0.0)
+        self.assertEqual(stats.total_trades, 0)
+        self.assertEqual(stats.sharpe_ratio, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+持仓服务单元测试
+"""
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.utils.real_portfolio import PortfolioService, RealPortfolioManager, shared_portfolio
+
+PORTFOLIO = {
+    'account': {'broker': 'Firstrade', 'cash': 1000.0},
+    'positions': {
+        'NVDA': {'symbol': 'NVDA', 'quantity': 100, 'avg_price': 150.0, 'current_price': 150.0, 'notes': '保留'},
+        'TSLA': {'symbol': 'TSLA', 'quantity': 10, 'avg_price': 400.0},
+    },
+}
+
+
+class TestPortfolioService(unittest.TestCase):
+    """测试一次读取、批量更新、一次写回"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "real_portfolio.json"
+        self.path.write_text(json.dumps(PORTFOLIO), encoding='utf-8')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_matches_manager(self):
+        service = PortfolioService(self.path)
+        manager = RealPortfolioManager(self.path)
+        for symbol, price in (('NVDA', 180.0), ('TSLA', None), ('AMD', 90.0)):
+            with self.subTest(symbol=symbol):
+                self.assertEqual(service.position(symbol, price), manager.get_position(symbol, price))
+
+    def test_batch_update_single_write(self):
+        reader = RealPortfolioManager(self.path).load_portfolio
+        with mock.patch.object(RealPortfolioManager, 'load_portfolio', wraps=reader) as load:
+            with PortfolioService(self.path) as portfolio:
+                self.assertEqual(portfolio.update_prices({'NVDA': 180.0, 'TSLA': 380.0, 'AMD': 1.0}), 2)
+                nvda = portfolio.position('NVDA')
+                snapshot = portfolio.snapshot()
+                self.assertFalse(self.path.with_suffix('.tmp').exists())
+            self.assertEqual(load.call_count, 1)
+
+        self.assertEqual(nvda['profit_loss'], 3000.0)
+        self.assertAlmostEqual(nvda['profit_loss_pct'], 20.0)
+        self.assertEqual(snapshot.market_value, 18000.0 + 3800.0)
+        self.assertEqual(snapshot.profit_loss, 3000.0 - 200.0)
+        self.assertEqual(snapshot.total_value, 22800.0)
+        self.assertAlmostEqual(sum(snapshot.weights.values()) + 1000.0 / 22800.0 * 100, 100.0)
+
+        saved = json.loads(self.path.read_text(encoding='utf-8'))
+        self.assertEqual(saved['positions']['NVDA']['unrealized_pnl'], 3000.0)
+        self.assertEqual(saved['positions']['NVDA']['notes'], '保留')
+        self.assertEqual(saved['positions']['TSLA']['market_value'], 3800.0)
+
+    def test_save_only_when_dirty(self):
+        portfolio = PortfolioService(self.path)
+        self.assertFalse(portfolio.save())
+        portfolio.update_position('AMD', quantity=5, avg_price=100.0, current_price=110.0)
+        self.assertTrue(portfolio.save())
+        self.assertFalse(portfolio.save())
+        self.assertEqual(RealPortfolioManager(self.path).get_position('AMD')['profit_loss'], 50.0)
+        self.assertEqual(portfolio.record('AMD')['unrealized_pnl'], 50.0)
+        self.assertFalse(portfolio.refresh())      # 自己写回不算外部修改
+
+    def test_shared_portfolio_reloads_after_edit(self):
+        """手动编辑配置文件后, 共享服务下次获取时重新读取"""
+        first = shared_portfolio(self.path)
+        self.assertIs(shared_portfolio(self.path), first)
+        self.assertEqual(first.position('NVDA')['quantity'], 100)
+
+        edited = json.loads(self.path.read_text(encoding='utf-8'))
+        edited['positions']['NVDA']['quantity'] = 250
+        self.path.write_text(json.dumps(edited), encoding='utf-8')
+        os.utime(self.path, ns=(first.mtime_ns + 1_000_000, first.mtime_ns + 1_000_000))
+
+        self.assertEqual(shared_portfolio(self.path).position('NVDA')['quantity'], 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+HTML 报告数据模型单元测试
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.analysis.strategy_analyzer import round_trips_from_fills
+from src.backtest.robustness import pnls_from_trades
+from src.visualization.report_data import ReportData
+
+
+FILLS = pd.DataFrame({
+    'date': ['2025-09-11', '2025-09-12', '2025-10-01', '2025-10-03', '2025-10-08'],
+    'action': ['BUY', 'SELL', 'BUY', 'BUY', 'SELL'],
+    'symbol': ['AAA'] * 5,
+    'quantity': [100, 100, 50, 50, 100],
+    'price': [10.0, 11.0, 12.0, 13.0, 12.0],
+    'commission': [1.0, 1.1, 0.6, 0.65, 1.2],
+})
+
+
+class TestRoundTrips(unittest.TestCase):
+    """测试成交记录 -> 逐笔平仓"""
+
+    def test_fifo_round_trips(self):
+        trips = round_trips_from_fills(FILLS)
+        self.assertEqual(len(trips), 2)
+        self.assertEqual(trips['entry_date'].dt.strftime('%Y-%m-%d').tolist(), ['2025-09-11', '2025-10-01'])
+        self.assertAlmostEqual(trips['entry_price'].iloc[1], 12.5)
+        self.assertEqual(trips['profit'].tolist(), pnls_from_trades(FILLS).tolist())
+
+
+class TestReportData(unittest.TestCase):
+    """测试一次加载、共享统计"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        daily = root / "AAA" / "daily"
+        daily.mkdir(parents=True)
+        pd.DataFrame({
+            'date': FILLS['date'],
+            'action': ['TradeAction.' + action for action in FILLS['action']],
+            'quantity': FILLS['quantity'],
+            'reason': ['r'] * 5,
+            'price': FILLS['price'],
+        }).to_csv(daily / "signals_daily.csv", index=False)
+        FILLS.to_csv(daily / "trades_daily.csv", index=False)
+        self.data = ReportData({
+            'AAA': {'daily': daily, 'weekly': root / "AAA" / "weekly"},
+            'BBB': {'daily': root / "BBB" / "daily", 'weekly': root / "BBB" / "weekly"},
+        })
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_summary(self):
+        stats = self.data.stats('AAA', 'daily')
+        self.assertEqual(stats['signals'], 5)
+        self.assertEqual(stats['buy_signals'], 3)
+        self.assertEqual(stats['trades'], 2)
+        self.assertEqual(stats['profitable_trades'], 1)
+        self.assertAlmostEqual(stats['win_rate'], 50.0)
+        self.assertAlmostEqual(stats['total_profit'], pnls_from_trades(FILLS).sum())
+        self.assertEqual(self.data.stats('BBB', 'weekly')['trades'], 0)
+        self.assertIn('读取数据', self.data.timer.timings)
+
+    def test_views_and_periods(self):
+        self.assertEqual(len(self.data.trades_for('AAA', 'daily')), 2)
+        self.assertTrue(self.data.signals_for('BBB', 'daily').empty)
+        october = self.data.period_summary(pd.Timestamp('2025-10-01'), pd.Timestamp('2025-10-31'))
+        self.assertEqual(october.loc[('AAA', 'daily'), 'trades'], 1)
+        self.assertEqual(october.loc[('AAA', 'daily'), 'signals'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
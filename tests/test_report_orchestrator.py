@@ -0,0 +1,89 @@
+"""
+并行报告编排器单元测试
+"""
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from src.pipeline.run_reports import ReportOrchestrator, build_tasks
+
+
+def write_results(data_dir: Path, profit_scale: float = 1.0):
+    """写入一组日度/周度回测结果"""
+    for strategy_type in ("daily", "weekly"):
+        results_dir = data_dir / "backtest_results" / strategy_type
+        results_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame({
+            'date': ['2025-11-03', '2025-11-05'],
+            'action': ['TradeAction.BUY', 'TradeAction.SELL'],
+            'quantity': [100, 100],
+            'reason': ['r', 'r'],
+            'price': [10.0, 10.0 + profit_scale],
+        }).to_csv(results_dir / f"signals_{strategy_type}.csv", index=False)
+        pd.DataFrame({
+            'date': ['2025-11-03', '2025-11-05'],
+            'action': ['BUY', 'SELL'],
+            'symbol': ['AAA', 'AAA'],
+            'quantity': [100, 100],
+            'price': [10.0, 10.0 + profit_scale],
+            'commission': [0.0, 0.0],
+        }).to_csv(results_dir / f"trades_{strategy_type}.csv", index=False)
+
+
+class TestReportOrchestrator(unittest.TestCase):
+    """测试任务 DAG、进程池运行和按输入哈希缓存"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.data_dirs = {symbol: root / symbol for symbol in ("AAA", "BBB")}
+        for data_dir in self.data_dirs.values():
+            write_results(data_dir)
+        self.cache_dir = root / "cache"
+        self.today = datetime(2025, 11, 6)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_tasks(self, max_workers=2):
+        tasks = build_tasks(list(self.data_dirs), periods=("week",))
+        tasks = {task_id: task for task_id, task in tasks.items() if task.kind != "comparison"}
+        orchestrator = ReportOrchestrator(
+            list(self.data_dirs), self.data_dirs, self.cache_dir, max_workers=max_workers, today=self.today
+        )
+        return orchestrator.run(tasks)
+
+    def test_build_tasks(self):
+        tasks = build_tasks(["AAA", "BBB"], periods=("week", "month"))
+        self.assertEqual(len(tasks), 2 * 2 + 2 * (4 + 1))
+        self.assertEqual(len(tasks["comparison:month"].deps), 4)
+
+    def test_run_and_cache(self):
+        results = self.run_tasks()
+        self.assertTrue(all(result.status == "done" for result in results.values()))
+        score = results["score:AAA:daily:week"].value
+        self.assertEqual(score['trades_count'], 1)
+        self.assertAlmostEqual(score['total_profit'], 100.0)
+        weekly_file = Path(results["weekly:AAA"].value['file'])
+        self.assertTrue(weekly_file.exists())
+        self.assertIn("2025-11-03 ~ 2025-11-09", weekly_file.read_text(encoding='utf-8'))
+
+        # 输入未变: 全部命中缓存, 缺失的报告文件从缓存补写
+        weekly_file.unlink()
+        cached = self.run_tasks(max_workers=0)
+        self.assertTrue(all(result.status == "cached" for result in cached.values()))
+        self.assertTrue(weekly_file.exists())
+
+        # 只有 BBB 的结果变化, 只重新运行 BBB 的任务
+        write_results(self.data_dirs["BBB"], profit_scale=2.0)
+        rerun = self.run_tasks(max_workers=0)
+        rerun_ids = sorted(task_id for task_id, result in rerun.items() if result.status == "done")
+        self.assertTrue(rerun_ids and all("BBB" in task_id for task_id in rerun_ids))
+        self.assertAlmostEqual(rerun["score:BBB:weekly:week"].value['total_profit'], 200.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+稳健性分析单元测试
+"""
+import unittest
+import numpy as np
+import pandas as pd
+
+from src.backtest.robustness import (
+    analyze_backtest, block_bootstrap, pnls_from_trades, trade_resample
+)
+
+
+class TestBlockBootstrap(unittest.TestCase):
+    """测试块自助法"""
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.returns = rng.normal(0.001, 0.02, 250)
+
+    def test_shapes_and_reproducibility(self):
+        a = block_bootstrap(self.returns, n_paths=500, block_size=5, batch_size=128, seed=3)
+        b = block_bootstrap(self.returns, n_paths=500, block_size=5, batch_size=128, seed=3)
+        self.assertEqual(a.n_paths, 500)
+        np.testing.assert_array_equal(a.sharpe, b.sharpe)
+
+    def test_confidence_interval_ordering(self):
+        result = block_bootstrap(self.returns, n_paths=1000, seed=0)
+        for metric, stats in result.summary().items():
+            self.assertLessEqual(stats['ci_low'], stats['median'])
+            self.assertLessEqual(stats['median'], stats['ci_high'])
+        self.assertTrue((result.max_drawdown >= 0).all())
+
+    def test_constant_returns(self):
+        """收益率恒定时所有路径一致, 无回撤"""
+        result = block_bootstrap(np.full(100, 0.001), n_paths=50, seed=0)
+        self.assertTrue(np.allclose(result.cagr, result.cagr[0]))
+        self.assertTrue(np.allclose(result.max_drawdown, 0.0))
+
+
+class TestTradeResample(unittest.TestCase):
+    """测试交易顺序置换"""
+
+    def test_permutation_preserves_final_equity(self):
+        pnls = np.array([500.0, -300.0, 800.0, -200.0, 100.0])
+        result = trade_resample(pnls, initial_cash=10000.0, years=1.0, n_paths=200, seed=0)
+        self.assertTrue(np.allclose(result.cagr, pnls.sum() / 10000.0))
+        self.assertGreater(result.max_drawdown.max(), 0.0)
+
+    def test_pnls_from_trades(self):
+        trades = pd.DataFrame({
+            'action': ['BUY', 'SELL', 'BUY', 'SELL'],
+            'symbol': ['TSLA'] * 4,
+            'quantity': [10, 10, 5, 5],
+            'price': [100.0, 110.0, 120.0, 115.0],
+            'commission': [0.0] * 4,
+        })
+        np.testing.assert_allclose(pnls_from_trades(trades), [100.0, -25.0])
+
+    def test_analyze_backtest(self):
+        dates = pd.date_range('2024-01-01', periods=60, freq='B')
+        equity = pd.DataFrame({'date': dates, 'equity': np.linspace(10000, 11000, 60)})
+        trades = pd.DataFrame({
+            'action': ['BUY', 'SELL', 'BUY', 'SELL'],
+            'symbol': ['TSLA'] * 4,
+            'quantity': [10, 10, 10, 10],
+            'price': [100.0, 150.0, 100.0, 90.0],
+            'commission': [0.0] * 4,
+        })
+        results = analyze_backtest(equity, trades, n_paths=100, seed=0)
+        self.assertSetEqual(set(results), {'bootstrap', 'permutation'})
+
+
+if __name__ == '__main__':
+    unittest.main()
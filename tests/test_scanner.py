@@ -0,0 +1,62 @@
+"""
+全市场扫描单元测试
+"""
+import unittest
+
+import pandas as pd
+
+from src.pipeline.run_daily_strategy import DailyTradingStrategy
+from src.signals.scanner import ScanConfig, UniversePanel, compute_signals, scan
+from tests.test_incremental import make_bars
+
+
+class TestScanner(unittest.TestCase):
+    """测试二维批量计算与逐股票策略一致"""
+
+    def setUp(self):
+        self.strategy = DailyTradingStrategy(volume_threshold=1.2)
+        self.bars = {f"S{k}": make_bars(90 + 10 * k, seed=k) for k in range(6)}
+        frame = pd.concat(
+            pd.DataFrame([vars(bar) for bar in bars]).assign(symbol=symbol)
+            for symbol, bars in self.bars.items()
+        )
+        self.panel = UniversePanel.from_long_frame(frame)
+        self.config = ScanConfig.from_strategy(self.strategy)
+
+    def test_conditions_match_strategy(self):
+        signals = compute_signals(self.panel, self.config)
+        width = self.panel.shape[1]
+        for row, symbol in enumerate(self.panel.symbols):
+            bars = self.bars[symbol]
+            offset = width - len(bars)
+            for idx in range(len(bars)):
+                self.assertEqual(
+                    bool(signals['buy'][row, offset + idx]),
+                    self.strategy.should_buy(bars, idx, False)
+                )
+                self.assertEqual(
+                    bool(signals['exit_momentum'][row, offset + idx]),
+                    self.strategy.calculate_momentum(bars, idx) < -0.02
+                )
+
+    def test_scan_ranks_latest_bar(self):
+        signals = compute_signals(self.panel, self.config)
+        last_date = self.panel.dates[:, -1].max()
+        expected = {
+            symbol for symbol, buy, date in zip(self.panel.symbols, signals['buy'][:, -1], self.panel.dates[:, -1])
+            if buy and date == last_date
+        }
+        candidates = scan(self.panel, self.config)
+        self.assertEqual(set(candidates['symbol']), expected)
+        self.assertTrue(candidates['momentum'].is_monotonic_decreasing)
+
+    def test_holdings_trigger_exits(self):
+        symbol = self.panel.symbols[-1]
+        entry = float(self.panel.close[-1, -1]) / 1.5
+        candidates = scan(self.panel, self.config, holdings={symbol: entry})
+        row = candidates[candidates['symbol'] == symbol].iloc[0]
+        self.assertEqual((row['action'], row['reason']), ('SELL', '止盈'))
+
+
+if __name__ == '__main__':
+    unittest.main()
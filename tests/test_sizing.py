@@ -0,0 +1,124 @@
+"""
+波动率目标仓位单元测试
+"""
+import datetime as dt
+import unittest
+
+import numpy as np
+
+from src.data.loader import PriceBar
+from src.pipeline.run_improved_strategy import ImprovedStrategy
+from src.portfolio.allocator import PositionAllocator, RiskBudget
+from src.portfolio.sizing import (
+    EWMACovariance, SizingConfig, VolatilityTargetSizer, rolling_target_weights
+)
+from src.signals.momentum import SignalDecision, TradeAction
+
+
+def make_history(days: int = 120, seed: int = 3) -> dict:
+    """三只股票: B 与 A 高度相关, C 独立且波动更大"""
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, days)
+    returns = {
+        'A': common + rng.normal(0, 0.002, days),
+        'B': common + rng.normal(0, 0.002, days),
+        'C': rng.normal(0, 0.03, days),
+    }
+    start = dt.date(2025, 1, 1)
+    history = {}
+    for symbol, r in returns.items():
+        closes = 100 * np.cumprod(1 + r)
+        history[symbol] = [
+            PriceBar(date=start + dt.timedelta(days=i), open=c, high=c * 1.01, low=c * 0.99, close=c, volume=1000)
+            for i, c in enumerate(closes)
+        ]
+    return history
+
+
+class TestEWMACovariance(unittest.TestCase):
+    """测试批量与逐日更新一致、状态往返"""
+
+    def test_fit_matches_updates(self):
+        closes = np.array([[bar.close for bar in bars] for bars in make_history(60).values()]).T
+        batch = EWMACovariance(['A', 'B', 'C'], halflife=10)
+        batch.fit(closes[:30])
+        batch.fit(closes[30:])
+        daily = EWMACovariance(['A', 'B', 'C'], halflife=10)
+        for row in closes:
+            daily.update_closes(row)
+
+        self.assertEqual(batch.count, 59)
+        np.testing.assert_allclose(batch.covariance(), daily.covariance())
+        restored = EWMACovariance.from_state(batch.to_state())
+        np.testing.assert_allclose(restored.covariance(), batch.covariance())
+
+
+class TestVolatilityTargetSizer(unittest.TestCase):
+    """测试目标波动率、相关性上限和股数"""
+
+    def setUp(self):
+        self.history = make_history()
+        self.config = SizingConfig(target_vol=0.10, max_weight=0.5)
+        self.sizer = VolatilityTargetSizer(['A', 'B', 'C'], self.config)
+        self.sizer.fit(self.history)
+
+    def test_weights(self):
+        weights = self.sizer.weights()
+        vols = self.sizer.volatilities()
+        corr = self.sizer.covariance.correlation()
+        portfolio_vol = np.sqrt(weights @ (np.outer(vols, vols) * corr) @ weights)
+
+        self.assertAlmostEqual(portfolio_vol, 0.10)
+        self.assertGreater(corr[0, 1], 0.8)
+        self.assertLess(weights[2], weights[0])          # 波动更大
+        # 相关的 A、B 共享风险预算: 去掉惩罚后 A 的权重更高
+        free = VolatilityTargetSizer(['A', 'B', 'C'], SizingConfig(target_vol=0.10, correlation_penalty=0.0,
+                                                                  max_weight=0.5))
+        free.fit(self.history)
+        self.assertLess(weights[0] / weights[2], free.weights()[0] / free.weights()[2])
+
+    def test_caps_and_targets(self):
+        capped = VolatilityTargetSizer(['A', 'B', 'C'], SizingConfig(target_vol=1.0, max_weight=0.3, max_gross=0.8))
+        capped.fit(self.history)
+        weights = capped.weights()
+        self.assertLessEqual(weights.max(), 0.3)
+        self.assertAlmostEqual(weights.sum(), 0.8)
+
+        targets = self.sizer.target_positions(100_000)
+        last = {symbol: bars[-1].close for symbol, bars in self.history.items()}
+        for symbol, weight in self.sizer.target_weights().items():
+            self.assertEqual(targets[symbol], int(100_000 * weight // last[symbol]))
+
+        atr = VolatilityTargetSizer(['A', 'B', 'C'], SizingConfig(method='atr'))
+        atr.fit(self.history)
+        self.assertTrue(np.all(atr.volatilities() > 0))
+        with self.assertRaises(ValueError):
+            SizingConfig(method='garch')
+
+    def test_rolling_matches_fit(self):
+        sizer = VolatilityTargetSizer(['A', 'B', 'C'], self.config)
+        weights = rolling_target_weights(sizer, self.history)
+        self.assertEqual(len(weights), len(self.history['A']) - self.config.min_periods)
+        np.testing.assert_allclose(weights.iloc[-1].to_numpy(), self.sizer.weights())
+
+
+class TestSizingIntegration(unittest.TestCase):
+    """测试 PositionAllocator 和 ImprovedStrategy 使用目标仓位"""
+
+    def test_allocator_target_quantity(self):
+        bar = make_history(1)['A'][0]
+        decision = SignalDecision(bar=bar, action=TradeAction.BUY, score=1.0, reason='r')
+        allocator = PositionAllocator('A', RiskBudget(capital=100_000))
+        self.assertEqual(allocator.propose(decision).quantity, int(4000 // bar.close))
+        self.assertEqual(allocator.propose(decision, target_quantity=50).quantity, 50)
+        self.assertEqual(allocator.propose(decision, target_quantity=10_000).quantity, int(20_000 // bar.close))
+        self.assertIsNone(allocator.propose(decision, target_quantity=0))
+
+    def test_improved_strategy_target_weight(self):
+        strategy = ImprovedStrategy(max_position_pct=0.6)
+        self.assertEqual(strategy.calculate_position_size(0.5, 10.0, 1000.0, target_weight=0.25), 25)
+        self.assertEqual(strategy.calculate_position_size(0.5, 10.0, 1000.0, target_weight=0.9), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
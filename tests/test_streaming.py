@@ -0,0 +1,101 @@
+"""
+流式策略(on_bar)单元测试
+"""
+import unittest
+
+from src.pipeline.run_daily_strategy import DailyTradingStrategy
+from src.pipeline.run_daily_strategy_nvda import DailyTradingStrategyNVDA
+from src.signals.streaming import RollingWindow, StreamingDailyStrategy, StreamingMomentumRSIStrategy
+from tests.test_incremental import make_bars
+
+
+class TestRollingWindow(unittest.TestCase):
+    """测试滚动窗口"""
+
+    def test_running_sum_and_oldest(self):
+        window = RollingWindow(3)
+        for value in [1.0, 2.0, 3.0, 4.0]:
+            window.push(value)
+        self.assertTrue(window.full)
+        self.assertAlmostEqual(window.sum, 9.0)
+        self.assertEqual(window.oldest(), 2.0)
+
+    def test_state_round_trip(self):
+        window = RollingWindow(4)
+        for value in range(7):
+            window.push(float(value))
+        restored = RollingWindow.from_state(window.to_state())
+        self.assertEqual(restored.sum, window.sum)
+        self.assertEqual(restored.oldest(), window.oldest())
+
+
+class TestStreamingDailyStrategy(unittest.TestCase):
+    """测试流式策略与 generate_signals 一致"""
+
+    def setUp(self):
+        self.bars = make_bars(600, seed=11)
+        self.strategy = DailyTradingStrategy(volume_threshold=1.2)
+
+    def test_matches_generate_signals(self):
+        expected = self.strategy.generate_signals(self.bars)
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(self.strategy.stream().run(self.bars), expected)
+
+    def test_peek_does_not_mutate(self):
+        """peek 只评估, 不改变状态"""
+        stream = self.strategy.stream()
+        stream.warm_up(self.bars[:-1])
+        before = stream.to_state()
+        peeked = stream.peek(self.bars[-1])
+        self.assertEqual(stream.to_state(), before)
+        self.assertEqual(stream.on_bar(self.bars[-1]), peeked)
+
+    def test_resume_from_state(self):
+        """从状态快照恢复后继续推进, 结果与一次性推进一致"""
+        full = self.strategy.stream().warm_up(self.bars)
+
+        first = self.strategy.stream()
+        head = first.warm_up(self.bars[:300])
+        resumed = StreamingDailyStrategy.from_strategy(self.strategy)
+        resumed.load_state(first.to_state())
+        tail = resumed.warm_up(self.bars[300:])
+
+        self.assertEqual(head + tail, full)
+
+
+class TestStreamingMomentumRSIStrategy(unittest.TestCase):
+    """测试 NVDA 流式策略(RSI 过滤 + ATR 止损)与 generate_signals 一致"""
+
+    def setUp(self):
+        self.bars = make_bars(600, seed=11)
+
+    def test_matches_generate_signals(self):
+        for use_atr_stop in (False, True):
+            with self.subTest(use_atr_stop=use_atr_stop):
+                strategy = DailyTradingStrategyNVDA(use_atr_stop=use_atr_stop, atr_multiplier=1.0)
+                expected = strategy.generate_signals(self.bars)
+                self.assertGreater(len(expected), 0)
+                stream = strategy.stream()
+                self.assertIsInstance(stream, StreamingMomentumRSIStrategy)
+                self.assertEqual(stream.run(self.bars), expected)
+
+    def test_peek_and_resume(self):
+        strategy = DailyTradingStrategyNVDA(use_atr_stop=True, atr_multiplier=1.0)
+        full = strategy.stream().warm_up(self.bars)
+
+        first = strategy.stream()
+        head = first.warm_up(self.bars[:300])
+        before = first.to_state()
+        peeked = first.peek(self.bars[300])
+        self.assertEqual(first.to_state(), before)
+
+        resumed = strategy.stream()
+        resumed.load_state(before)
+        self.assertEqual(resumed.on_bar(self.bars[300]), peeked)
+        tail = [peeked] if peeked else []
+        tail += resumed.warm_up(self.bars[301:])
+        self.assertEqual(head + tail, full)
+
+
+if __name__ == '__main__':
+    unittest.main()
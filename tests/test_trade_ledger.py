@@ -0,0 +1,77 @@
+"""
+成交记录持仓账本单元测试
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.analysis.trade_ledger import TradeLedger, current_position
+
+HEADER = "date,action,symbol,quantity,price,commission,total\n"
+ROWS = [
+    "2025-09-01,BUY,TSLA,100,10.0,0,1000.0\n",
+    "2025-09-02,BUY,TSLA,100,20.0,0,2000.0\n",
+    "2025-09-03,SELL,TSLA,150,30.0,0,4500.0\n",
+    "2025-09-04,BUY,NVDA,10,100.0,5.0,1005.0\n",
+]
+
+
+class TestTradeLedger(unittest.TestCase):
+    """测试批次回放、增量应用和文件重写"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "trades_daily.csv"
+        self.path.write_text(HEADER + "".join(ROWS[:3]), encoding='utf-8')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fifo_and_average(self):
+        fifo = TradeLedger(self.path)
+        fifo.refresh()
+        self.assertEqual(fifo.holding("TSLA"), (50.0, 1000.0))      # 剩下第二批的 50 股
+        self.assertEqual(fifo.realized["TSLA"], 4500.0 - 1000.0 - 1000.0)
+
+        average = TradeLedger(self.path, method="average")
+        average.refresh()
+        self.assertEqual(average.holding("TSLA"), (50.0, 750.0))
+        info = average.position("TSLA", 20.0)
+        self.assertEqual(info['avg_price'], 15.0)
+        self.assertEqual(info['profit_loss'], 250.0)
+
+        with self.assertRaises(ValueError):
+            TradeLedger(self.path, method="lifo")
+
+    def test_incremental_snapshot(self):
+        self.assertEqual(TradeLedger(self.path).refresh(), 3)
+        self.assertTrue(Path(str(self.path) + ".ledger.json").exists())
+
+        ledger = TradeLedger(self.path)          # 从快照恢复
+        self.assertEqual(ledger.refresh(), 0)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(ROWS[3] + "2025-09-05,SELL,NVDA")   # 末尾未写完的行
+        self.assertEqual(ledger.refresh(), 1)
+        self.assertEqual(ledger.rows, 4)
+        self.assertEqual(set(ledger.positions()), {"TSLA", "NVDA"})
+        self.assertAlmostEqual(ledger.holding("NVDA")[1], 1005.0)
+        self.assertEqual(ledger.holding()[0], 60.0)
+
+    def test_rewritten_file_replays(self):
+        TradeLedger(self.path).refresh()
+        self.path.write_text(HEADER + ROWS[0], encoding='utf-8')
+        ledger = TradeLedger(self.path)
+        self.assertEqual(ledger.refresh(), 1)
+        self.assertEqual(ledger.holding(), (100.0, 1000.0))
+
+    def test_current_position(self):
+        info = current_position(self.path, 'TSLA', 40.0)
+        self.assertEqual(info['symbol'], 'TSLA')
+        self.assertEqual(info['quantity'], 50)
+        self.assertEqual(info['market_value'], 2000.0)
+        missing = current_position(self.path.with_name("none.csv"), 'NVDA', 1.0)
+        self.assertEqual(missing['quantity'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+回测图表渲染单元测试
+"""
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.visualizer import ChartRenderer, generate_reports, monthly_returns_table
+
+logging.getLogger('matplotlib').setLevel(logging.ERROR)
+
+
+def make_equity(periods: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.bdate_range('2021-03-15', periods=periods),
+        'equity': 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, periods)),
+    })
+
+
+class TestMonthlyReturns(unittest.TestCase):
+    """测试向量化月度收益表与逐月分组结果一致"""
+
+    def test_matches_groupby(self):
+        equity_df = make_equity()
+        grouped = equity_df.assign(year=equity_df['date'].dt.year, month=equity_df['date'].dt.month)
+        monthly = grouped.groupby(['year', 'month'])['equity'].last().reset_index()
+        monthly['returns'] = monthly['equity'].pct_change() * 100
+        expected = monthly.pivot(index='year', columns='month', values='returns').reindex(columns=range(1, 13))
+
+        table = monthly_returns_table(equity_df)
+        self.assertEqual(table.shape, (2, 12))
+        np.testing.assert_allclose(table.to_numpy(), expected.to_numpy(), equal_nan=True)
+        self.assertTrue(np.isnan(table.loc[2021, 3]))
+
+
+class TestChartRenderer(unittest.TestCase):
+    """测试模板复用与批量渲染"""
+
+    def test_reuses_templates(self):
+        renderer = ChartRenderer(dpi=20)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for seed in range(2):
+                renderer.equity_curve(make_equity(seed=seed), Path(temp_dir) / f"equity_{seed}.png")
+                renderer.monthly_returns(make_equity(seed=seed), Path(temp_dir) / f"monthly_{seed}.png")
+            self.assertEqual(len(renderer._templates), 2)
+            fig, axes, _ = renderer._templates[("equity", (12, 6))]
+            self.assertEqual(len(fig.axes), 1)
+            self.assertEqual(len(axes[0].lines), 1)
+            self.assertTrue((Path(temp_dir) / "monthly_1.png").exists())
+
+    def test_generate_reports(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results_dir = Path(temp_dir) / "daily"
+            results_dir.mkdir()
+            make_equity().to_csv(results_dir / "equity_curve_daily.csv", index=False)
+            pd.DataFrame({
+                'date': ['2021-04-01', '2021-05-03'],
+                'action': ['BUY', 'SELL'],
+                'quantity': [10, 10],
+                'price': [100.0, 110.0],
+            }).to_csv(results_dir / "trades_daily.csv", index=False)
+            timings = generate_reports([results_dir], dpi=20)
+            self.assertIn(results_dir, timings)
+            charts = sorted(p.name for p in (results_dir / "charts").iterdir())
+            self.assertEqual(charts, ["drawdown.png", "equity_curve.png",
+                                      "monthly_returns.png", "trades_distribution.png"])
+
+
+if __name__ == '__main__':
+    unittest.main()